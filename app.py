@@ -1,13 +1,27 @@
+import hmac
 import os
-from flask import Flask, render_template, send_from_directory, make_response
+from flask import (
+    Flask,
+    render_template,
+    send_from_directory,
+    make_response,
+    jsonify,
+    request,
+)
 from dotenv import load_dotenv
 
 from services.history import HistoryService
 from services.economy import EconomyService
 from services.gsheet import GSheetService
+from services.write_buffer import SheetWriteError
+from services.sheets_client import SheetsClient
 from services.shop import ShopService
 from services.job import JobService
+from services.warmup import WarmupService
+from services.archiver import ArchiveService
+from services.row_lock import RowShiftLock
 from handlers import study
+from utils.cache_snapshot import CacheSnapshot
 
 # Import Blueprints
 from blueprints.bot import bot_bp
@@ -21,6 +35,72 @@ app = Flask(__name__, template_folder="templates/html")
 app.register_blueprint(bot_bp)
 app.register_blueprint(web_bp)
 
+# スリープ復帰直後の最初のリクエストでシートを全件読みしないよう、
+# 前回書き出したキャッシュを読み戻す（以降は定期的・終了時に書き出す）
+CacheSnapshot.start()
+# 残りの重い読み込みは裏で並行して済ませる（状況は /ready で確認）
+WarmupService.start()
+
+
+# 行番号を調べてから書き込むまでの間に、アーカイブの行削除で行がずれないようにする
+# （最初に登録するので、解放は他の teardown と書き込みの反映より後になる）
+# ヘルスチェックと LINE の webhook は待たせない（webhook は study_log を扱う処理の
+# 中だけで持ち、行は session_id で引き直す）
+@app.before_request
+def hold_row_positions():
+    if request.endpoint in ("ready", "bot.callback"):
+        return
+    RowShiftLock.acquire_shared()
+
+
+@app.teardown_request
+def release_row_positions(exc):
+    RowShiftLock.release_shared()
+
+
+# シートの全件読み込みはリクエスト単位でメモし、同じタブを何度も読まない
+@app.before_request
+def begin_sheet_reads():
+    GSheetService.begin_reads()
+
+
+@app.teardown_request
+def end_sheet_reads(exc):
+    GSheetService.end_reads()
+
+
+# シートへのセル書き込みはリクエスト単位でまとめて送る
+# LINE の Webhook はハンドラ内で返信するので、返信前に書き込みが確定するよう
+# バッファせずにその場で書き込む（失敗はハンドラ側のエラー処理に任せる）
+@app.before_request
+def begin_sheet_writes():
+    if request.endpoint == "bot.callback":
+        return
+    GSheetService.begin_writes()
+
+
+@app.after_request
+def flush_sheet_writes(response):
+    """リクエスト中に溜めたセル書き込みを反映（失敗したらエラーを返す）"""
+    try:
+        GSheetService.end_writes()
+    except SheetWriteError as e:
+        print(f"【Error】シート書き込みの反映に失敗: {e}")
+        return make_response(
+            jsonify({"status": "error", "message": "シートへの保存に失敗しました"}),
+            500,
+        )
+    return response
+
+
+@app.teardown_request
+def close_sheet_writes(exc):
+    """例外で after_request が呼ばれなかった場合も書き込みを残さない"""
+    try:
+        GSheetService.end_writes()
+    except SheetWriteError as e:
+        print(f"【Error】シート書き込みの反映に失敗: {e}")
+
 
 # キャッシュ制御（全リクエストに適用）
 @app.after_request
@@ -48,59 +128,101 @@ def wake_up():
     return "I am awake! Saga Guardian Active", 200
 
 
+@app.route("/ready")
+def ready():
+    """全データを読み込めていれば 200、読み込み中・失敗があれば 503"""
+    status = WarmupService.status()
+    if status["failed"]:
+        # 失敗したデータは読み直しておき、次の確認で 200 を返せるようにする
+        WarmupService.retry_failed()
+    return jsonify(status), 200 if status["ready"] else 503
+
+
 @app.route("/cron/check_timeout")
 def cron_check_timeout():
-    # タイムアウトしたセッションを確認
-    expired_sessions = GSheetService.check_timeout_sessions(timeout_minutes=90)
+    # cron は対話的な処理より低い優先度で Sheets API を使う
+    with SheetsClient.background():
+        # タイムアウトしたセッションを確認
+        expired_sessions = GSheetService.check_timeout_sessions(timeout_minutes=90)
 
-    if expired_sessions:
-        # 通知と状態更新
-        study.process_timeout_sessions(expired_sessions)
-        return f"Processed {len(expired_sessions)} sessions.", 200
+        if expired_sessions:
+            # 通知と状態更新
+            study.process_timeout_sessions(expired_sessions)
+            return f"Processed {len(expired_sessions)} sessions.", 200
 
     return "No expired sessions.", 200
 
 
+@app.route("/cron/archive", methods=["POST"])
+def cron_archive():
+    # 締まった月の記録をアーカイブシートへ移す（月1回程度でよい）
+    # 行を削除するので、CRON_SECRET を X-Cron-Secret ヘッダーで送った呼び出しだけ受け付ける
+    secret = os.environ.get("CRON_SECRET", "")
+    given = request.headers.get("X-Cron-Secret", "")
+    if not secret or not hmac.compare_digest(given.encode(), secret.encode()):
+        return "Forbidden", 403
+
+    with SheetsClient.background():
+        result = ArchiveService.archive()
+
+    if result is None:
+        return "Archive already running.", 200
+    # 書き込み中のリクエストが終わらず見送った場合は次の cron で再試行させる
+    return jsonify(result), 503 if result.get("error") else 200
+
+
 @app.route("/admin/dashboard")
 def admin_dashboard():
     # 本来は認証が必要だが、簡易的にURLを知っている人のみアクセス可能とする
     # もしくはクエリパラメータで ?key=secret_key のように簡易認証を入れても良い
 
-    transactions = HistoryService.get_all_transactions()
-
-    # ユーザーIDを名前に変換
-    users = EconomyService.get_all_users()
-    user_map = {str(u["user_id"]): u["display_name"] for u in users}
-
-    # 詳細情報解決用のマップ
-    job_map = JobService.get_all_jobs_map()
-    shop_items = ShopService.get_items()
-
-    for tx in transactions:
-        uid = str(tx.get("user_id"))
-        tx["user_name"] = user_map.get(uid, uid[:4])
-
-        # 取引内容の解決
-        rtype = tx.get("tx_type")
-        rid = str(tx.get("related_id", ""))
-
-        desc = rid
-        if rtype == "REWARD":
-            if rid == "STUDY_REWARD":
-                desc = "✏️ 勉強報酬"
-            elif rid.startswith("JOB_"):
-                jid = rid.replace("JOB_", "")
-                jtitle = job_map.get(jid, "不明なタスク")
-                desc = f"🧹 {jtitle}"
-        elif rtype == "SPEND":
-            if rid.startswith("BUY_"):
-                ikey = rid.replace("BUY_", "")
-                iname = shop_items.get(ikey, {}).get("name", ikey)
-                desc = f"🛒 {iname}"
-        elif rtype == "REFUND":
-            desc = "↩️ 返金"
-
-        tx["description"] = desc
+    # 一括読み込みなので低い優先度で Sheets API を使う
+    # 表示に使うタブは1回の API 呼び出しでまとめて読む
+    # （キャッシュに結果が残っているタブは読まない）
+    cached_tabs = {
+        "users": EconomyService.get_all_users.is_cached(),
+        "jobs": JobService.get_all_jobs_map.is_cached(),
+        "shop_items": ShopService.get_items.is_cached(),
+    }
+    sheets = ["transactions"] + [
+        name for name, is_cached in cached_tabs.items() if not is_cached
+    ]
+    with SheetsClient.background(), GSheetService.use_snapshot(sheets):
+        transactions = HistoryService.get_all_transactions()
+
+        # ユーザーIDを名前に変換
+        users = EconomyService.get_all_users()
+        user_map = {str(u["user_id"]): u["display_name"] for u in users}
+
+        # 詳細情報解決用のマップ
+        job_map = JobService.get_all_jobs_map()
+        shop_items = ShopService.get_items()
+
+        for tx in transactions:
+            uid = str(tx.get("user_id"))
+            tx["user_name"] = user_map.get(uid, uid[:4])
+
+            # 取引内容の解決
+            rtype = tx.get("tx_type")
+            rid = str(tx.get("related_id", ""))
+
+            desc = rid
+            if rtype == "REWARD":
+                if rid == "STUDY_REWARD":
+                    desc = "✏️ 勉強報酬"
+                elif rid.startswith("JOB_"):
+                    jid = rid.replace("JOB_", "")
+                    jtitle = job_map.get(jid, "不明なタスク")
+                    desc = f"🧹 {jtitle}"
+            elif rtype == "SPEND":
+                if rid.startswith("BUY_"):
+                    ikey = rid.replace("BUY_", "")
+                    iname = shop_items.get(ikey, {}).get("name", ikey)
+                    desc = f"🛒 {iname}"
+            elif rtype == "REFUND":
+                desc = "↩️ 返金"
+
+            tx["description"] = desc
 
     return render_template("admin_dashboard.html", transactions=transactions)
 
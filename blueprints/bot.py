@@ -1,7 +1,9 @@
+import functools
 from flask import Blueprint, request, abort
 from linebot.exceptions import InvalidSignatureError
 from linebot.models import MessageEvent, TextMessage, PostbackEvent
 from bot_instance import handler
+from services.gsheet import GSheetService
 from utils.debouncer import Debouncer
 
 # Handlers imply logic registration on import
@@ -10,6 +12,21 @@ from handlers import study, shop, job, admin, status, common, help, gacha, missi
 bot_bp = Blueprint("bot", __name__)
 
 
+def per_event_reads(func):
+    """LINE イベントごとにシート読み込みのメモを張り直す
+
+    1回の Webhook に複数イベントが届いても、イベントごとに最新の内容を読む。
+    （line-bot-sdk は引数の数を見て呼び分けるので event だけを受け取る）
+    """
+
+    @functools.wraps(func)
+    def wrapper(event):
+        with GSheetService.read_scope():
+            return func(event)
+
+    return wrapper
+
+
 @bot_bp.route("/callback", methods=["POST"])
 def callback():
     signature = request.headers["X-Line-Signature"]
@@ -22,6 +39,7 @@ def callback():
 
 
 @handler.add(PostbackEvent)
+@per_event_reads
 def handle_postback(event):
     user_id = event.source.user_id
     data_str = event.postback.data
@@ -62,6 +80,7 @@ def handle_postback(event):
 
 
 @handler.add(MessageEvent, message=TextMessage)
+@per_event_reads
 def handle_message(event):
     msg = event.message.text
     user_id = event.source.user_id
@@ -5,15 +5,20 @@ import gspread
 from services.job import JobService
 from services.shop import ShopService
 from services.gsheet import GSheetService
+from services.sheet_replica import study_log_replica, study_log_rollup
+from services.sheet_schema import SheetSchema
 from services.economy import EconomyService
 from services.history import HistoryService
+from services.archiver import ArchiveService
 from services.status_service import StatusService
 from services.stats import SagaStats
+from services.sheets_client import SheetsClient
 from bot_instance import line_bot_api
 from utils.template_loader import load_template
 from linebot.models import FlexSendMessage, TextSendMessage
 from handlers import study
 from utils.achievements import AchievementManager, ACHIEVEMENT_MASTER
+from utils.cache import SimpleCache
 
 web_bp = Blueprint("web", __name__)
 
@@ -46,6 +51,60 @@ def api_admin_users():
     return jsonify({"status": "success", "users": user_list})
 
 
+@web_bp.route("/api/admin/cache_stats")
+def api_admin_cache_stats():
+    """キャッシュごとのヒット率・再計算時間・メモリと Sheets API の使用状況（管理者のみ）"""
+    user_id = request.args.get("user_id")
+    if not user_id or not EconomyService.is_admin(user_id):
+        return jsonify({"status": "error", "message": "権限がありません"}), 403
+
+    caches = sorted(
+        (cache.stats() for cache in SimpleCache.all_caches()),
+        key=lambda s: s["api_calls_saved_estimate"],
+        reverse=True,
+    )
+    totals = {
+        "hits": sum(c["hits"] + c["stale_hits"] for c in caches),
+        "misses": sum(c["misses"] for c in caches),
+        "memory_bytes": sum(c["memory_bytes"] for c in caches),
+        "api_calls_saved_estimate": sum(c["api_calls_saved_estimate"] for c in caches),
+    }
+    return jsonify(
+        {
+            "status": "ok",
+            "caches": caches,
+            "totals": totals,
+            "sheets_api": SheetsClient.headroom(),
+        }
+    )
+
+
+@web_bp.route("/api/admin/study_rollup/rebuild", methods=["POST"])
+def api_admin_rebuild_study_rollup():
+    """勉強時間のロールアップを学習ログ全体から作り直す（管理者のみ）"""
+    user_id = (request.json or {}).get("user_id")
+    if not user_id or not EconomyService.is_admin(user_id):
+        return jsonify({"status": "error", "message": "権限がありません"}), 403
+
+    if not study_log_replica.rebuild_aggregates():
+        return jsonify({"status": "error", "message": "Sheet not found"}), 500
+    return jsonify({"status": "ok", "rollup": study_log_rollup.stats()})
+
+
+@web_bp.route("/api/admin/monthly_totals/rebuild", methods=["POST"])
+def api_admin_rebuild_monthly_totals():
+    """アーカイブ済みの月別集計をアーカイブシートから作り直す（管理者のみ）"""
+    user_id = (request.json or {}).get("user_id")
+    if not user_id or not EconomyService.is_admin(user_id):
+        return jsonify({"status": "error", "message": "権限がありません"}), 403
+
+    with SheetsClient.background():
+        rows = ArchiveService.rebuild_totals()
+    if rows is None:
+        return jsonify({"status": "error", "message": "Sheet not found"}), 500
+    return jsonify({"status": "ok", "rows": rows})
+
+
 @web_bp.route("/api/admin/add_task", methods=["POST"])
 def api_admin_add_task():
     """タスク追加"""
@@ -247,6 +306,7 @@ def api_start_study():
         return jsonify({"status": "error", "message": "Missing parameters"}), 400
 
     row_index = None  # ロールバック用
+    session_id = GSheetService.new_session_id()
     try:
         # ユーザー名取得（エラー時も処理継続）
         user_name = "User"
@@ -263,7 +323,7 @@ def api_start_study():
 
         # 学習ログを記録し、行番号を取得（ロールバック用）
         row_index = GSheetService.log_activity_with_row(
-            user_id, user_name, today, current_time, subject
+            user_id, user_name, today, current_time, subject, session_id=session_id
         )
         if not row_index:
             return jsonify(
@@ -286,14 +346,16 @@ def api_start_study():
         except Exception as push_error:
             print(f"Push Message Error (non-critical): {push_error}")
 
-        return jsonify({"status": "ok", "start_time": current_time})
+        return jsonify(
+            {"status": "ok", "start_time": current_time, "session_id": session_id}
+        )
 
     except Exception as e:
         print(f"Study Start Error: {e}")
         # ロールバック: ログを記録していた場合は削除
         if row_index:
             try:
-                GSheetService.delete_study_log_row(row_index)
+                GSheetService.delete_study_log_row(row_index, session_id=session_id)
                 print(f"Rollback: Deleted row {row_index}")
             except Exception as rollback_err:
                 print(f"Rollback failed: {rollback_err}")
@@ -493,12 +555,15 @@ def api_finish_study():
         ), 404
 
     row_index = result["row_index"]
+    session_id = result.get("session_id")
     start_time_str = result.get("start_time", "")
     subject = result.get("subject", "")
 
     # 2. Save Details (Memo/Concentration)
     try:
-        GSheetService.update_study_details(row_index, memo, concentration)
+        GSheetService.update_study_details(
+            row_index, memo, concentration, session_id=session_id
+        )
     except Exception as e:
         print(f"Details update error: {e}")
 
@@ -520,7 +585,9 @@ def api_finish_study():
         # 4. Update Stats (Rank/Duration)
         stats = SagaStats.calculate(minutes)
         if stats:
-            GSheetService.update_study_stats(row_index, minutes, stats["rank"])
+            GSheetService.update_study_stats(
+                row_index, minutes, stats["rank"], session_id=session_id
+            )
 
         # 5. Bonus Calculation
         bonus_msg = ""
@@ -601,6 +668,7 @@ def api_finish_study():
                     concentration=concentration,
                     timestamp=timestamp_str,
                     row_index=row_index,
+                    session_id=session_id or "",
                 )
                 line_bot_api.multicast(
                     admin_ids,
@@ -724,6 +792,7 @@ def api_sync_evolution():
                 sheet = spreadsheet.add_worksheet(
                     title="evolution_data", rows=100, cols=15
                 )
+                GSheetService.register_worksheet(sheet)
                 sheet.append_row(
                     [
                         "user_id",
@@ -761,11 +830,17 @@ def api_sync_evolution():
 
         if len(headers) < len(expected_headers):
             # 不足しているヘッダーを追加
-            for i, h in enumerate(expected_headers):
-                if i < len(headers):
-                    continue
-                sheet.update_cell(1, i + 1, h)
+            GSheetService.update_cells(
+                sheet,
+                [
+                    (1, i + 1, h)
+                    for i, h in enumerate(expected_headers)
+                    if i >= len(headers)
+                ],
+            )
             headers = expected_headers
+            # ヘッダーを修復したのでキャッシュを破棄
+            SheetSchema.invalidate("evolution_data")
 
         col_map = {str(h).strip(): i for i, h in enumerate(headers)}
 
@@ -800,8 +875,7 @@ def api_sync_evolution():
                 (target_row, get_col("prestige_points", 8), prestige_points),
                 (target_row, get_col("last_sync", 9), timestamp),
             ]
-            for row, col, val in updates:
-                sheet.update_cell(row, col, val)
+            GSheetService.update_cells(sheet, updates)
         else:
             # 新規追加
             new_row = [
@@ -891,17 +965,20 @@ def api_admin_approve_study():
     data = request.json
     print(f"[DEBUG] approve_study received: {data}")
     row_index = data.get("row_index")
+    session_id = data.get("session_id")
     user_id = data.get("user_id")
     minutes = data.get("minutes", 0)
 
-    if not row_index:
+    if not row_index and not session_id:
         print(f"[DEBUG] Missing row_index in data: {data}")
         return jsonify({"status": "error", "message": "Missing row_index"}), 400
 
     try:
         # 承認処理
         print(f"[DEBUG] Calling approve_study with row_index={row_index}")
-        if GSheetService.approve_study(int(row_index)):
+        if GSheetService.approve_study(
+            row_index, session_id=session_id, user_id=user_id
+        ):
             # EXP付与
             earned_exp = int(minutes) if minutes else 0
             if earned_exp > 0 and user_id:
@@ -943,13 +1020,16 @@ def api_admin_reject_study():
     """勉強記録を却下"""
     data = request.json
     row_index = data.get("row_index")
+    session_id = data.get("session_id")
     user_id = data.get("user_id")
 
-    if not row_index:
+    if not row_index and not session_id:
         return jsonify({"status": "error", "message": "Missing row_index"}), 400
 
     try:
-        if GSheetService.reject_study(int(row_index)):
+        if GSheetService.reject_study(
+            row_index, session_id=session_id, user_id=user_id
+        ):
             # ユーザーに通知（LINE + アプリ内）
             if user_id:
                 # アプリ内通知を保存
@@ -1242,30 +1322,27 @@ def api_admin_manual_study():
 
         display_name = user_info.get("display_name", "Unknown")
 
-        # study_log に直接承認済みで追加
-        sheet = GSheetService.get_worksheet("study_log")
-        if not sheet:
-            return jsonify({"status": "error", "message": "Sheet not found"}), 500
-
         now = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9)))
         date_str = now.strftime("%Y-%m-%d")
         time_str = now.strftime("%H:%M:%S")
 
-        # ステータスは直接APPROVEDにする
-        new_row = [
-            user_id,
-            display_name,
-            date_str,
-            time_str,  # start_time
-            time_str,  # end_time (同じ)
-            "APPROVED",
-            minutes,
-            "",  # rank_score
-            subject,
-            comment,
-            3,  # concentration (default)
-        ]
-        sheet.append_row(new_row)
+        # study_log に直接承認済みで追加（列名で配置し、session_id も振る）
+        row_index = GSheetService.append_study_row(
+            {
+                "user_id": user_id,
+                "display_name": display_name,
+                "date": date_str,
+                "start_time": time_str,
+                "end_time": time_str,  # 開始と同じ
+                "status": "APPROVED",
+                "duration_min": minutes,
+                "subject": subject,
+                "comment": comment,
+                "concentration": 3,  # デフォルト
+            }
+        )
+        if not row_index:
+            return jsonify({"status": "error", "message": "Failed to write log"}), 500
 
         # EXP付与
         EconomyService.add_exp(user_id, minutes, "MANUAL_STUDY")
@@ -1630,13 +1707,16 @@ def api_toggle_like():
     """勉強記録にいいねをトグル"""
     data = request.json
     study_row_index = data.get("study_row_index")
+    session_id = data.get("session_id")
     user_id = data.get("user_id")
 
-    if not study_row_index or not user_id:
+    if not (study_row_index or session_id) or not user_id:
         return jsonify({"status": "error", "message": "Missing parameters"}), 400
 
     try:
-        result = HistoryService.toggle_like(int(study_row_index), user_id)
+        result = HistoryService.toggle_like(
+            study_row_index, user_id, session_id=session_id
+        )
         if result.get("success"):
             return jsonify({"status": "ok", **result})
         else:
@@ -1650,7 +1730,9 @@ def api_toggle_like():
 def api_get_comments(study_row_index):
     """勉強記録のコメント一覧を取得"""
     try:
-        comments = HistoryService.get_comments(study_row_index)
+        comments = HistoryService.get_comments(
+            study_row_index, session_id=request.args.get("session_id")
+        )
         return jsonify({"status": "ok", "comments": comments})
     except Exception as e:
         print(f"Get Comments Error: {e}")
@@ -1662,16 +1744,17 @@ def api_add_comment():
     """勉強記録にコメントを追加"""
     data = request.json
     study_row_index = data.get("study_row_index")
+    session_id = data.get("session_id")
     user_id = data.get("user_id")
     user_name = data.get("user_name", "")
     comment = data.get("comment", "")
 
-    if not study_row_index or not user_id or not comment:
+    if not (study_row_index or session_id) or not user_id or not comment:
         return jsonify({"status": "error", "message": "Missing parameters"}), 400
 
     try:
         result = HistoryService.add_comment(
-            int(study_row_index), user_id, user_name, comment
+            study_row_index, user_id, user_name, comment, session_id=session_id
         )
         if result.get("success"):
             return jsonify({"status": "ok", **result})
@@ -924,6 +924,7 @@ def handle_message(event, text):
                         subject=data.get("subject", ""),
                         comment=data.get("comment", ""),
                         row_index=data["row_index"],
+                        session_id=data.get("session_id", ""),
                         user_id=data["user_id"],
                         time=study_time,
                     )
@@ -946,6 +947,7 @@ def handle_message(event, text):
                                 end_time=data.get("end_time", ""),
                                 earned_exp=mins,
                                 row_index=data["row_index"],
+                                session_id=data.get("session_id", ""),
                                 user_id=data["user_id"],
                                 time=study_time,
                             )
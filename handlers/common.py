@@ -433,7 +433,8 @@ def handle_message(event, text):
 
 def show_weekly_ranking(reply_token, current_user_id):
     """週間ポイントランキングを表示"""
-    ranking = HistoryService.get_weekly_exp_ranking()
+    # 上位10件と自分の順位だけを取得
+    ranking, me = HistoryService.get_weekly_exp_top(current_user_id, limit=10)
 
     if not ranking:
         line_bot_api.reply_message(
@@ -448,7 +449,7 @@ def show_weekly_ranking(reply_token, current_user_id):
     medal_emojis = ["🥇", "🥈", "🥉"]
     lines = ["📊 週間ポイントランキング\n"]
 
-    for i, entry in enumerate(ranking[:10]):
+    for i, entry in enumerate(ranking):
         medal = medal_emojis[i] if i < 3 else f"{i + 1}."
         name = entry.get("display_name", "Unknown")[:8]
         exp = entry.get("weekly_exp", 0)
@@ -460,15 +461,8 @@ def show_weekly_ranking(reply_token, current_user_id):
         lines.append(f"{medal} {name}: {exp}pt{marker}")
 
     # 自分が10位以下の場合は自分の順位も表示
-    my_rank = None
-    for i, entry in enumerate(ranking):
-        if str(entry.get("user_id")) == str(current_user_id):
-            my_rank = i + 1
-            my_exp = entry.get("weekly_exp", 0)
-            break
-
-    if my_rank and my_rank > 10:
-        lines.append(f"\n...\n{my_rank}. あなた: {my_exp}pt ⭐")
+    if me and me["rank"] > 10:
+        lines.append(f"\n...\n{me['rank']}. あなた: {me.get('weekly_exp', 0)}pt ⭐")
 
     lines.append("\n頑張って上位を目指そう！💪")
 
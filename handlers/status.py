@@ -7,6 +7,7 @@ from linebot.models import (
 )
 from bot_instance import line_bot_api
 from services.economy import EconomyService
+from services.gsheet import GSheetService
 from services.history import HistoryService
 from services.status_service import StatusService
 from utils.template_loader import load_template
@@ -16,20 +17,25 @@ from handlers import common
 def send_user_status_view(reply_token, user_id, is_detailed=False):
     """ユーザーのステータス画面を送信する共通関数"""
     # A. Personal Stats
-    user_info = EconomyService.get_user_info(user_id)
-    if not user_info:
-        line_bot_api.reply_message(
-            reply_token,
-            TextSendMessage(
-                text="まだ登録されてないみたい💦 何かメッセージを送って登録してね！"
-            ),
-        )
-        return
-
-    study_stats = HistoryService.get_user_study_stats_summary(user_id)
-    job_count = HistoryService.get_user_job_count(user_id)
-    inventory = EconomyService.get_user_inventory(user_id)
-    weekly_ranking = HistoryService.get_weekly_exp_ranking()
+    # users / jobs の読み込みを1回の API 呼び出しにまとめる
+    # （週間ランキングは順位表が差分で持つので transactions は通常読まない）
+    with GSheetService.use_snapshot(["users", "jobs"]):
+        user_info = EconomyService.get_user_info(user_id)
+        if not user_info:
+            line_bot_api.reply_message(
+                reply_token,
+                TextSendMessage(
+                    text="まだ登録されてないみたい💦 何かメッセージを送って登録してね！"
+                ),
+            )
+            return
+
+        study_stats = HistoryService.get_user_study_stats_summary(user_id)
+        job_count = HistoryService.get_user_job_count(user_id)
+        inventory = EconomyService.get_user_inventory(user_id)
+        # 勲章ホームに出すのは上位3件と自分の順位だけ
+        top, me = HistoryService.get_weekly_exp_top(user_id, limit=3)
+        weekly_ranking = top + [me] if me and me["rank"] > 3 else top
 
     # Prepare data for StatusService
     user_data = user_info.copy()
@@ -126,7 +126,10 @@ def handle_postback(event, action, data):
                 stats = SagaStats.calculate(minutes)
                 if stats:
                     GSheetService.update_study_stats(
-                        result["row_index"], minutes, stats["rank"]
+                        result["row_index"],
+                        minutes,
+                        stats["rank"],
+                        session_id=result.get("session_id"),
                     )
             except:
                 pass
@@ -216,13 +219,17 @@ def handle_postback(event, action, data):
                 stats = SagaStats.calculate(minutes)
                 if stats:
                     GSheetService.update_study_stats(
-                        result["row_index"], minutes, stats["rank"]
+                        result["row_index"],
+                        minutes,
+                        stats["rank"],
+                        session_id=result.get("session_id"),
                     )
 
                 # 状態を保存して、成果報告を促す
                 user_states[user_id] = {
                     "state": "WAITING_COMMENT",
                     "row_index": result["row_index"],
+                    "session_id": result.get("session_id"),
                     "minutes": minutes,
                     "subject": result.get("subject", ""),
                     "start_time": start_time_str,  # 実績判定用に開始時間を保存
@@ -251,6 +258,7 @@ def handle_postback(event, action, data):
                 user_states[user_id] = {
                     "state": "WAITING_COMMENT",
                     "row_index": pending["row_index"],
+                    "session_id": pending.get("session_id"),
                     "minutes": pending["minutes"],
                     "subject": pending["subject"],
                     "start_time": pending["start_time"],
@@ -279,6 +287,7 @@ def handle_postback(event, action, data):
 
         target_id = data.get("target")
         row_id = data.get("row_id")
+        session_id = data.get("session_id")
 
         # 承認者名を取得
         try:
@@ -287,7 +296,10 @@ def handle_postback(event, action, data):
         except:
             approver_name = "管理者"
 
-        if row_id and GSheetService.reject_study(int(row_id)):
+        # 古いカードには session_id が無いので、その場合だけ行番号で指定する
+        if (row_id or session_id) and GSheetService.reject_study(
+            row_id, session_id=session_id, user_id=target_id
+        ):
             line_bot_api.reply_message(
                 event.reply_token,
                 TextSendMessage(
@@ -322,6 +334,7 @@ def handle_postback(event, action, data):
         minutes = int(data.get("minutes"))
         exp = int(data.get("exp", minutes))
         row_id = data.get("row_id")
+        session_id = data.get("session_id")
         request_time = data.get("time", "")
 
         # 承認者名を取得
@@ -343,7 +356,9 @@ def handle_postback(event, action, data):
         old_rank_info = StatusService.get_rank_info(old_total)
 
         # 1. シートのステータスを更新
-        if row_id and GSheetService.approve_study(int(row_id)):
+        if (row_id or session_id) and GSheetService.approve_study(
+            row_id, session_id=session_id, user_id=target_id
+        ):
             # 2. EXP付与 (承認成功時のみ)
             new_balance = EconomyService.add_exp(target_id, exp, "STUDY_REWARD")
 
@@ -556,13 +571,17 @@ def handle_message(event, text):
 
 
 def finalize_study(event, user_id, state_data, concentration):
-    row_index = state_data["row_index"]
+    session_id = state_data.get("session_id")
+    # 行がずれていても session_id から現在の行番号を引き直す
+    row_index = GSheetService.resolve_study_row(state_data["row_index"], session_id)
     minutes = state_data["minutes"]
     subject = state_data.get("subject", "")
     comment = state_data.get("comment", "なし")
 
     # 詳細情報を保存
-    GSheetService.update_study_details(row_index, comment, concentration)
+    GSheetService.update_study_details(
+        row_index, comment, concentration, session_id=session_id
+    )
 
     hours, mins = divmod(minutes, 60)
     earned_exp = minutes
@@ -662,6 +681,7 @@ def finalize_study(event, user_id, state_data, concentration):
                 concentration=concentration,
                 timestamp=timestamp,
                 row_index=row_index,
+                session_id=session_id or "",
             )
             line_bot_api.multicast(
                 admin_ids,
@@ -685,18 +705,22 @@ def process_timeout_sessions(sessions):
         user_id = session["user_id"]
         minutes = session["minutes"]
         row_index = session["row_index"]
+        session_id = session.get("session_id")
         subject = session["subject"]
         start_time = session["start_time"]
 
         # ランク計算と保存
         stats = SagaStats.calculate(minutes)
         if stats:
-            GSheetService.update_study_stats(row_index, minutes, stats["rank"])
+            GSheetService.update_study_stats(
+                row_index, minutes, stats["rank"], session_id=session_id
+            )
 
         # 状態を保存して、成果報告を促す
         user_states[user_id] = {
             "state": "WAITING_COMMENT",
             "row_index": row_index,
+            "session_id": session_id,
             "minutes": minutes,
             "subject": subject,
             "start_time": start_time,
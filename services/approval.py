@@ -7,10 +7,20 @@ from utils.cache import pending_cache, cached
 
 
 class ApprovalService:
+    # 承認待ち一覧で読むタブ（study_log はレプリカから読む）
+    PENDING_SHEETS = ["users", "jobs", "shop_requests", "shop_items", "missions"]
+
     @staticmethod
-    @cached(pending_cache)
+    # 期限切れ後60秒までは古い一覧を返して裏で更新する
+    @cached(pending_cache, stale_ttl=60)
     def get_all_pending():
         """全ての承認待ち項目をフラットなリストで取得"""
+        # 各タブの読み込みを1回の API 呼び出しにまとめる
+        with GSheetService.use_snapshot(ApprovalService.PENDING_SHEETS):
+            return ApprovalService._collect_pending()
+
+    @staticmethod
+    def _collect_pending():
         results = []
 
         try:
@@ -47,6 +57,7 @@ class ApprovalService:
 
                 data = {
                     "row_index": s.get("row_index"),
+                    "session_id": s.get("session_id", ""),
                     "user_id": uid,
                     "user_name": uname,
                     "date": s.get("date", ""),
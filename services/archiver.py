@@ -0,0 +1,510 @@
+import bisect
+import datetime
+import os
+import re
+import threading
+
+from gspread.utils import rowcol_to_a1
+
+from services.gsheet import GSheetService
+from services.row_lock import RowShiftLock
+from services.sheet_replica import study_log_replica
+from services.sheet_snapshot import SheetSnapshot
+from utils.cache import monthly_totals_cache, cached, invalidate_sheet
+
+
+class _Skipped(Exception):
+    """行を削除できずにそのシートのアーカイブを見送った"""
+
+
+class ArchiveService:
+    """締まった月の記録をアーカイブ用のシートへ移す
+
+    study_log / transactions / notifications は増え続け、全件読み込みが
+    月ごとに重くなるので、直近の期間より前の行は年ごとのアーカイブシート
+    （例: study_log_archive_2025）へ移して元のシートから削除する。
+    移した行の月別集計は monthly_totals シートに残し、生涯の合計は
+    「元のシートに残っている分 + 月別集計」で求める。
+
+    行を削除すると以降の行番号がずれるので、シートごとの行削除（と study_comments の
+    study_row_index の付け替え）の間だけ RowShiftLock を exclusive で取る。
+    読み込みとアーカイブへの書き込みはロックの外で行うので、リクエストが
+    待たされるのは削除している間だけ。削除できなかったシートはアーカイブへの
+    写しを取り消し、次回の実行でまとめて移し直す。
+    """
+
+    # シート名 -> 月の判定に使う列（値の先頭 "YYYY-MM"）
+    TARGETS = {
+        "study_log": "date",
+        "transactions": "timestamp",
+        "notifications": "created_at",
+    }
+    # まだ処理中なのでアーカイブしない study_log のステータス
+    OPEN_STATUSES = ("STARTED", "PENDING")
+    # 今月に加えて元のシートに残す月数（週間・4週間の集計が前月にまたがるため1以上）
+    KEEP_MONTHS = max(1, int(os.environ.get("ARCHIVE_KEEP_MONTHS", "1")))
+    # 行を削除する前に、書き込み中のリクエストが途切れるのを待つ上限（秒）
+    LOCK_TIMEOUT = 60
+
+    TOTALS_SHEET = "monthly_totals"
+    TOTALS_HEADERS = ["month", "user_id", "display_name", "metric", "subject", "value"]
+    # 月別集計の種類
+    # approved_min: 承認済みの勉強時間（ロールアップと同じ条件）
+    # logged_min: 分数が入っている全記録（Web の学習統計と同じ条件）
+    # exp_<tx_type>: 取引種別ごとの EXP 合計
+    APPROVED_MINUTES = "approved_min"
+    LOGGED_MINUTES = "logged_min"
+
+    ARCHIVE_TITLE = re.compile(r"^(study_log|transactions)_archive_\d{4}$")
+    MONTH = re.compile(r"^\d{4}-\d{2}$")
+
+    _lock = threading.Lock()
+
+    # ---------- アーカイブ ----------
+
+    @classmethod
+    def cutoff_month(cls, today=None):
+        """これより前の月（"YYYY-MM"）を締まった月としてアーカイブする"""
+        if today is None:
+            today = datetime.datetime.now(
+                datetime.timezone(datetime.timedelta(hours=9))
+            ).date()
+        year, month = divmod(today.year * 12 + today.month - 1 - cls.KEEP_MONTHS, 12)
+        return f"{year:04d}-{month + 1:02d}"
+
+    @classmethod
+    def archive(cls, today=None):
+        """締まった月の行を移し、{"cutoff", "archived": {シート名: 行数}} を返す
+
+        既に実行中なら None。行を削除できずに見送ったシートがあれば
+        "error" と "skipped"（シート名のリスト）を付けて返す。
+        """
+        if not cls._lock.acquire(blocking=False):
+            return None
+        try:
+            cutoff = cls.cutoff_month(today)
+            archived, totals, skipped = cls._archive_all(cutoff)
+            if totals:
+                cls._append_totals(totals)
+            result = {"cutoff": cutoff, "archived": archived}
+            if skipped:
+                result["error"] = "busy"
+                result["skipped"] = skipped
+            return result
+        finally:
+            cls._lock.release()
+
+    @classmethod
+    def _archive_all(cls, cutoff):
+        """各シートの締まった月を移し、({シート名: 行数}, 月別集計, [見送ったシート]) を返す"""
+        archived = {}
+        totals = {}
+        skipped = []
+        for sheet_name in cls.TARGETS:
+            try:
+                moved = cls._archive_sheet(sheet_name, cutoff)
+            except _Skipped as e:
+                print(f"【Error】{sheet_name} のアーカイブを見送りました: {e}")
+                skipped.append(sheet_name)
+                continue
+            except Exception as e:
+                print(f"【Error】アーカイブ失敗 ({sheet_name}): {e}")
+                continue
+
+            archived[sheet_name] = len(moved[1]) if moved else 0
+            if not moved:
+                continue
+            headers, rows = moved
+            cls._add_totals(totals, sheet_name, headers, rows)
+        return archived, totals, skipped
+
+    @staticmethod
+    def _month_of(value):
+        month = str(value).lstrip("'").strip()[:7]
+        return month if ArchiveService.MONTH.match(month) else None
+
+    @classmethod
+    def _archive_sheet(cls, sheet_name, cutoff):
+        """cutoff より前の行を移して (ヘッダー, [(行番号, 行, 月)]) を返す（無ければ None）"""
+        sheet = GSheetService.get_worksheet(sheet_name)
+        if not sheet:
+            return None
+
+        # 読んでから削除するまでに別の処理が行を消していないか確かめるため
+        shifts = RowShiftLock.shift_count(sheet_name)
+        values = sheet.get_all_values()
+        if len(values) <= 1:
+            return None
+
+        headers = values[0]
+        col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+        idx_month = col_map.get(cls.TARGETS[sheet_name])
+        if idx_month is None:
+            print(
+                f"【Info】{sheet_name} に {cls.TARGETS[sheet_name]} 列が無いためアーカイブしません"
+            )
+            return None
+        idx_status = col_map.get("status") if sheet_name == "study_log" else None
+        # 未読の通知は get_user_notifications から消えないよう残す
+        idx_read = col_map.get("read") if sheet_name == "notifications" else None
+
+        moved = []
+        for row_index, row in enumerate(values[1:], start=2):
+            month = cls._month_of(row[idx_month]) if idx_month < len(row) else None
+            if not month or month >= cutoff:
+                continue
+            if (
+                idx_status is not None
+                and idx_status < len(row)
+                and row[idx_status].strip() in cls.OPEN_STATUSES
+            ):
+                continue
+            if sheet_name == "notifications" and (
+                idx_read is None
+                or idx_read >= len(row)
+                or row[idx_read].strip().lower() != "true"
+            ):
+                continue
+            moved.append((row_index, row, month))
+        if not moved:
+            return None
+
+        # 先にアーカイブへ書き込み、成功してから元のシートから消す
+        by_year = {}
+        for _, row, month in moved:
+            by_year.setdefault(month[:4], []).append(row)
+        copies = []
+        for year, rows in sorted(by_year.items()):
+            copies.append(
+                cls._append_archive(f"{sheet_name}_archive_{year}", headers, rows)
+            )
+
+        # 行番号がずれるのは削除の間だけなので、ロックはここだけで取る
+        with RowShiftLock.exclusive(timeout=cls.LOCK_TIMEOUT) as acquired:
+            if acquired and RowShiftLock.shift_count(sheet_name) == shifts:
+                try:
+                    cls._delete_rows(sheet, [row_index for row_index, _, _ in moved])
+                except Exception:
+                    cls._undo_archive(copies)
+                    raise
+                SheetSnapshot.discard_current(sheet_name)
+                invalidate_sheet(sheet_name)
+                if sheet_name == "study_log":
+                    cls._remap_comments(headers, moved)
+                    # 行番号がずれたのでレプリカ（とロールアップ）は取り直す
+                    study_log_replica.invalidate()
+                print(f"【Info】{sheet_name} の {len(moved)} 行をアーカイブしました")
+                return headers, moved
+
+        # 消せなかった行が次回また写されないよう、アーカイブ側の写しを取り消す
+        cls._undo_archive(copies)
+        if not acquired:
+            raise _Skipped("書き込み中のリクエストが途切れませんでした")
+        raise _Skipped("読み込み後に行が削除されました")
+
+    @staticmethod
+    def _append_archive(title, headers, rows):
+        """アーカイブシートへ列名を揃えて追記（無ければ作成）
+
+        (アーカイブシート, (追記した最初の行, 最後の行)) を返す（行が分からなければ None）。
+        """
+        archive = GSheetService.get_worksheet(title)
+        if not archive:
+            doc = GSheetService.get_spreadsheet()
+            if not doc:
+                raise RuntimeError("スプレッドシートに接続できませんでした")
+            archive = doc.add_worksheet(title=title, rows=1, cols=len(headers))
+            GSheetService.register_worksheet(archive)
+            response = archive.append_rows(
+                [list(headers)] + rows, value_input_option="RAW"
+            )
+            span = ArchiveService._appended_span(response)
+            # ヘッダー行は取り消さない
+            return archive, (span[0] + 1, span[1]) if span else None
+
+        # 元のシートに後から増えた列はアーカイブ側にも足す
+        archive_headers = archive.row_values(1)
+        missing = [h for h in headers if h and h not in archive_headers]
+        if missing:
+            archive_headers = archive_headers + missing
+            if len(archive_headers) > archive.col_count:
+                archive.add_cols(len(archive_headers) - archive.col_count)
+            archive.update(
+                [archive_headers], f"A1:{rowcol_to_a1(1, len(archive_headers))}"
+            )
+
+        positions = {h: i for i, h in enumerate(headers) if h}
+        mapped = [
+            [
+                row[positions[h]] if h in positions and positions[h] < len(row) else ""
+                for h in archive_headers
+            ]
+            for row in rows
+        ]
+        response = archive.append_rows(mapped, value_input_option="RAW")
+        return archive, ArchiveService._appended_span(response)
+
+    @staticmethod
+    def _appended_span(response):
+        """append_rows の応答（updates.updatedRange）から (最初の行, 最後の行) を取得"""
+        try:
+            updated_range = response["updates"]["updatedRange"]
+            m = re.search(r"![A-Z]+(\d+)(?::[A-Z]+(\d+))?$", updated_range)
+            return (int(m.group(1)), int(m.group(2) or m.group(1))) if m else None
+        except Exception:
+            return None
+
+    @staticmethod
+    def _undo_archive(copies):
+        """_append_archive で追記した行を消す（元の行を消せなかった場合用）"""
+        for archive, span in copies:
+            if span is None:
+                print(
+                    f"【Error】{archive.title} に追記した行を特定できません。"
+                    "次回のアーカイブで重複するので手動で消してください"
+                )
+                continue
+            try:
+                ArchiveService._delete_rows(archive, range(span[0], span[1] + 1))
+            except Exception as e:
+                print(f"【Error】{archive.title} への追記の取り消しに失敗: {e}")
+
+    @staticmethod
+    def _delete_rows(sheet, row_indexes):
+        """連続した行をまとめ、下から順に1回の batch_update で削除"""
+        runs = []
+        for row_index in sorted(row_indexes):
+            if runs and runs[-1][1] == row_index - 1:
+                runs[-1][1] = row_index
+            else:
+                runs.append([row_index, row_index])
+
+        requests = [
+            {
+                "deleteDimension": {
+                    "range": {
+                        "sheetId": sheet.id,
+                        "dimension": "ROWS",
+                        "startIndex": start - 1,
+                        "endIndex": end,
+                    }
+                }
+            }
+            for start, end in reversed(runs)
+        ]
+        GSheetService.get_spreadsheet().batch_update({"requests": requests})
+
+    @staticmethod
+    def _remap_comments(headers, moved):
+        """study_comments の study_row_index を削除後の行番号に付け替える
+
+        アーカイブした記録へのコメントは "archived:<session_id>" にする。
+        """
+        sheet = GSheetService.get_worksheet("study_comments")
+        if not sheet:
+            return
+
+        try:
+            values = sheet.get_all_values()
+            if len(values) <= 1:
+                return
+            idx_row = {str(h).strip(): i for i, h in enumerate(values[0])}.get(
+                "study_row_index"
+            )
+            if idx_row is None:
+                return
+
+            idx_sid = {str(h).strip(): i for i, h in enumerate(headers)}.get(
+                "session_id"
+            )
+            deleted = [row_index for row_index, _, _ in moved]
+            archived = {
+                row_index: (
+                    row[idx_sid] if idx_sid is not None and idx_sid < len(row) else ""
+                )
+                for row_index, row, _ in moved
+            }
+
+            updates = []
+            for comment_row, row in enumerate(values[1:], start=2):
+                value = str(row[idx_row]).strip() if idx_row < len(row) else ""
+                if not value.isdigit():
+                    continue
+                old = int(value)
+                if old in archived:
+                    new = f"archived:{archived[old]}" if archived[old] else "archived"
+                else:
+                    new = old - bisect.bisect_left(deleted, old)
+                if str(new) != value:
+                    updates.append((comment_row, idx_row + 1, new))
+
+            if updates:
+                GSheetService.update_cells(sheet, updates)
+                # 付け替えは行削除のロックを外す前に反映しておく
+                GSheetService.flush_writes()
+        except Exception as e:
+            print(f"【Error】コメントの行番号付け替えエラー: {e}")
+
+    # ---------- 月別集計 ----------
+
+    @classmethod
+    def _add_totals(cls, totals, sheet_name, headers, moved):
+        """移した行の月別集計を totals（(月, user_id, 表示名, 種類, 教科) -> 値）に加える"""
+        col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+
+        def get_val(row, name):
+            idx = col_map.get(name)
+            return str(row[idx]).strip() if idx is not None and idx < len(row) else ""
+
+        def add(key, value):
+            totals[key] = totals.get(key, 0) + value
+
+        for _, row, month in moved:
+            uid = get_val(row, "user_id")
+            if sheet_name == "study_log":
+                duration = get_val(row, "duration_min")
+                if not duration.isdigit() or int(duration) == 0:
+                    continue
+                minutes = int(duration)
+                name = get_val(row, "display_name")
+                if uid:
+                    # Web の学習統計と同じく教科名はそのまま
+                    idx_subj = col_map.get("subject")
+                    subject = (
+                        row[idx_subj]
+                        if idx_subj is not None and idx_subj < len(row)
+                        else "その他"
+                    )
+                    add((month, uid, "", cls.LOGGED_MINUTES, subject), minutes)
+                if get_val(row, "status") == "APPROVED" and (uid or name):
+                    subject = get_val(row, "subject") or "その他"
+                    add((month, uid, name, cls.APPROVED_MINUTES, subject), minutes)
+            elif sheet_name == "transactions":
+                amount = get_val(row, "amount")
+                tx_type = get_val(row, "tx_type")
+                if uid and tx_type and amount.lstrip("-").isdigit():
+                    add((month, uid, "", f"exp_{tx_type.lower()}", ""), int(amount))
+
+    @classmethod
+    def _totals_sheet(cls):
+        sheet = GSheetService.get_worksheet(cls.TOTALS_SHEET)
+        if sheet:
+            return sheet
+        doc = GSheetService.get_spreadsheet()
+        if not doc:
+            return None
+        sheet = doc.add_worksheet(
+            title=cls.TOTALS_SHEET, rows=1, cols=len(cls.TOTALS_HEADERS)
+        )
+        GSheetService.register_worksheet(sheet)
+        sheet.append_row(cls.TOTALS_HEADERS)
+        return sheet
+
+    @classmethod
+    def _append_totals(cls, totals):
+        """月別集計を追記（同じ月が複数回アーカイブされた場合は読み出し時に合算）"""
+        try:
+            sheet = cls._totals_sheet()
+            if not sheet:
+                raise RuntimeError("スプレッドシートに接続できませんでした")
+            sheet.append_rows(
+                [list(key) + [value] for key, value in sorted(totals.items())],
+                value_input_option="RAW",
+            )
+            invalidate_sheet(cls.TOTALS_SHEET)
+        except Exception as e:
+            # アーカイブシートは書けているので rebuild_totals() で作り直せる
+            print(f"【Error】月別集計の書き込みエラー: {e}")
+
+    @classmethod
+    def rebuild_totals(cls):
+        """アーカイブシート全体から monthly_totals を作り直す（集計行数を返す）"""
+        doc = GSheetService.get_spreadsheet()
+        if not doc:
+            return None
+
+        totals = {}
+        for archive in doc.worksheets():
+            match = cls.ARCHIVE_TITLE.match(archive.title)
+            if not match:
+                continue
+            values = archive.get_all_values()
+            if len(values) <= 1:
+                continue
+            sheet_name = match.group(1)
+            headers = values[0]
+            idx_month = {str(h).strip(): i for i, h in enumerate(headers)}.get(
+                cls.TARGETS[sheet_name]
+            )
+            if idx_month is None:
+                continue
+            moved = []
+            for row in values[1:]:
+                month = cls._month_of(row[idx_month]) if idx_month < len(row) else None
+                if month:
+                    moved.append((None, row, month))
+            cls._add_totals(totals, sheet_name, headers, moved)
+
+        sheet = cls._totals_sheet()
+        if not sheet:
+            return None
+        sheet.clear()
+        sheet.append_rows(
+            [cls.TOTALS_HEADERS]
+            + [list(key) + [value] for key, value in sorted(totals.items())],
+            value_input_option="RAW",
+        )
+        invalidate_sheet(cls.TOTALS_SHEET)
+        return len(totals)
+
+    @staticmethod
+    @cached(monthly_totals_cache)
+    def get_monthly_totals():
+        """monthly_totals の [(月, user_id, 表示名, 種類, 教科, 値)]"""
+        sheet = GSheetService.get_worksheet(ArchiveService.TOTALS_SHEET)
+        if not sheet:
+            return []
+
+        try:
+            values = sheet.get_all_values()
+            if len(values) <= 1:
+                return []
+            col_map = {str(h).strip(): i for i, h in enumerate(values[0])}
+
+            totals = []
+            for row in values[1:]:
+                entry = [
+                    str(row[col_map[h]]).strip()
+                    if h in col_map and col_map[h] < len(row)
+                    else ""
+                    for h in ArchiveService.TOTALS_HEADERS
+                ]
+                if not entry[5].lstrip("-").isdigit():
+                    continue
+                totals.append(tuple(entry[:5]) + (int(entry[5]),))
+            return totals
+        except Exception as e:
+            print(f"【Error】月別集計の取得エラー: {e}")
+            return []
+
+    @staticmethod
+    def archived_by_subject(metric, user_id, user_name=None):
+        """アーカイブ済みの期間の教科別合計 {教科: 値}
+
+        user_name を渡すと、表示名が一致する記録（user_id が空の古い行）も含める。
+        """
+        user_id = str(user_id)
+        subjects = {}
+        for (
+            _,
+            uid,
+            name,
+            entry_metric,
+            subject,
+            value,
+        ) in ArchiveService.get_monthly_totals():
+            if entry_metric != metric:
+                continue
+            if uid == user_id or (user_name and name == str(user_name)):
+                subjects[subject] = subjects.get(subject, 0) + value
+        return subjects
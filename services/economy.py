@@ -1,6 +1,9 @@
 from services.gsheet import GSheetService
+from services.sheet_schema import SheetSchema
 import datetime
 import json
+from utils.cache import user_info_cache, cached
+from services.leaderboard import weekly_exp_board
 
 
 class EconomyService:
@@ -27,6 +30,7 @@ class EconomyService:
         return user.get("role") == "ADMIN"
 
     @staticmethod
+    @cached(user_info_cache, negative_ttl=30, user_arg="user_id")
     def get_user_info(user_id):
         """ユーザー情報を取得（動的カラムマッピング）"""
         sheet = GSheetService.get_worksheet("users")
@@ -55,6 +59,7 @@ class EconomyService:
         return None
 
     @staticmethod
+    @cached(user_info_cache, cache_empty=False)
     def get_all_users():
         """全ユーザー情報を取得（動的カラムマッピング）"""
         sheet = GSheetService.get_worksheet("users")
@@ -94,8 +99,8 @@ class EconomyService:
             return True  # 登録済み
 
         try:
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            headers = SheetSchema.headers(sheet)
+            col_map = SheetSchema.col_map(sheet)
 
             row_data = [""] * len(headers)
 
@@ -127,8 +132,7 @@ class EconomyService:
         try:
             cell = sheet.find(user_id)
             if cell:
-                headers = sheet.row_values(1)
-                col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+                col_map = SheetSchema.col_map(sheet)
 
                 idx_name = col_map.get("display_name")
                 # スプレッドシート側で avatar_url カラムがなくても name が変われば更新したい
@@ -155,8 +159,7 @@ class EconomyService:
         try:
             cell = sheet.find(user_id)
             if cell:
-                headers = sheet.row_values(1)
-                col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+                col_map = SheetSchema.col_map(sheet)
                 idx_rank = col_map.get("rank")
                 if idx_rank is not None:
                     sheet.update_cell(cell.row, idx_rank + 1, rank)
@@ -176,8 +179,7 @@ class EconomyService:
         try:
             cell = sheet.find(user_id)
             if cell:
-                headers = sheet.row_values(1)
-                col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+                col_map = SheetSchema.col_map(sheet)
                 # Looking for 'achievements', usually not present in initial schema but added here
                 idx_ach = col_map.get("achievements")
                 if idx_ach is None:
@@ -204,8 +206,7 @@ class EconomyService:
         try:
             cell = sheet.find(user_id)
             if cell:
-                headers = sheet.row_values(1)
-                col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+                col_map = SheetSchema.col_map(sheet)
                 idx_role = col_map.get("role")
                 if idx_role is not None:
                     sheet.update_cell(cell.row, idx_role + 1, role)
@@ -300,8 +301,7 @@ class EconomyService:
 
             row_num = cell.row
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            col_map = SheetSchema.col_map(sheet)
             idx_inv = col_map.get("inventory_json")
             if idx_inv is None:
                 return False
@@ -337,8 +337,7 @@ class EconomyService:
             if not cell:
                 return False
 
-            headers_u = users_sheet.row_values(1)
-            col_map_u = {str(h).strip(): i for i, h in enumerate(headers_u)}
+            col_map_u = SheetSchema.col_map(users_sheet)
             idx_name = col_map_u.get("display_name")
             idx_exp = col_map_u.get("current_exp")
 
@@ -360,8 +359,8 @@ class EconomyService:
             tx_type = "REWARD" if amount > 0 else "SPEND"
             now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            headers_tx = tx_sheet.row_values(1)
-            col_map_tx = {str(h).strip(): i for i, h in enumerate(headers_tx)}
+            headers_tx = SheetSchema.headers(tx_sheet)
+            col_map_tx = SheetSchema.col_map(tx_sheet)
 
             row_data_tx = [""] * len(headers_tx)
 
@@ -388,6 +387,9 @@ class EconomyService:
             except Exception as e:
                 print(f"Transaction Log Error: {e}")
                 return False
+            if tx_type == "REWARD":
+                # 週間EXPランキングにも差分で反映（取引履歴は読み直さない）
+                weekly_exp_board.add(user_id, now_str[:10], amount, key=now_str)
 
             # 3. 残高更新
             try:
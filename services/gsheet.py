@@ -1,58 +1,223 @@
-import os
-import json
+import re
+import uuid
 import datetime
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from utils.cache import goals_cache, cached
+from contextlib import contextmanager
+from gspread.utils import rowcol_to_a1
+from utils.cache import goals_cache, active_session_cache, cached, invalidate_sheet
+from services.sheet_replica import study_log_replica
+from services.sheet_schema import SheetSchema
+from services.row_lock import RowShiftLock
+from services.write_buffer import WriteBuffer
+from services.sheets_pool import SheetsPool
+from services.sheet_snapshot import SheetSnapshot
 
 
 class GSheetService:
     _instance = None
-    _client = None
-    _doc = None
 
     @classmethod
     def _connect(cls):
-        """スプレッドシートへの接続を確立（内部利用）"""
-        if cls._client and cls._doc:
-            return
-
-        try:
-            creds_json = os.environ.get("GOOGLE_CREDENTIALS")
-            sheet_id = os.environ.get("SPREADSHEET_ID")
+        """このスレッド用の接続をプールから取得（内部利用）"""
+        return SheetsPool.connection()
 
-            if not creds_json or not sheet_id:
-                print("【Error】環境変数が不足しています")
-                return
+    @classmethod
+    def refresh_worksheets(cls):
+        """全タブのメタデータを取得し直して Worksheet キャッシュを作り直す"""
+        conn = cls._connect()
+        if conn:
+            conn.refresh_worksheets()
 
-            creds_dict = json.loads(creds_json)
-            scope = [
-                "https://spreadsheets.google.com/feeds",
-                "https://www.googleapis.com/auth/drive",
-            ]
-            creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-            cls._client = gspread.authorize(creds)
-            cls._doc = cls._client.open_by_key(sheet_id)
-        except Exception as e:
-            print(f"【Error】GSheet接続失敗: {e}")
+    @classmethod
+    def register_worksheet(cls, worksheet):
+        """新規作成したシートをキャッシュに登録"""
+        if worksheet is None:
+            return
+        conn = cls._connect()
+        if conn:
+            conn.register(worksheet)
+        # 他の接続が「存在しない」と覚えていたら忘れさせる
+        for other in SheetsPool.connections():
+            other.forget_missing(worksheet.title)
 
     @classmethod
     def get_worksheet(cls, sheet_name):
-        """シート名を指定してワークシートを取得"""
-        cls._connect()
-        if not cls._doc:
-            return None
-        try:
-            return cls._doc.worksheet(sheet_name)
-        except gspread.WorksheetNotFound:
-            print(f"【Error】シート '{sheet_name}' が見つかりません")
+        """シート名を指定してワークシートを取得（キャッシュ済みならAPI呼び出しなし）"""
+        conn = cls._connect()
+        if not conn:
             return None
+        return conn.worksheet(sheet_name)
 
     @classmethod
     def get_spreadsheet(cls):
         """スプレッドシート本体を取得（シート追加用）"""
-        cls._connect()
-        return cls._doc
+        conn = cls._connect()
+        return conn.doc if conn else None
+
+    # ---------- 複数タブの一括読み込み ----------
+
+    @staticmethod
+    def fetch_snapshot(sheet_names):
+        """指定したタブの全セルを1回の values_batch_get で取得"""
+        doc = GSheetService.get_spreadsheet()
+        if not doc:
+            return SheetSnapshot()
+
+        # 存在しないタブを含めると全体がエラーになるので除く
+        names = [name for name in sheet_names if GSheetService.get_worksheet(name)]
+        if not names:
+            return SheetSnapshot()
+
+        try:
+            response = doc.values_batch_get([f"'{name}'" for name in names])
+            return SheetSnapshot.from_batch_response(names, response)
+        except Exception as e:
+            # 失敗したら各関数がこれまで通り個別に読む
+            print(f"【Error】スナップショット取得失敗: {e}")
+            return SheetSnapshot()
+
+    @staticmethod
+    def get_columns(sheet_name, columns):
+        """指定した列だけを読み、{列名: [2行目以降の値]} を返す
+
+        列ごとの範囲（例: D2:D）を1回の batch_get で列方向に取得するので、
+        コメントなど使わない列は転送もパースもしない。各列の長さはそろえる
+        （足りない分は ""）。ヘッダーに無い列名は結果に含めない。
+        スナップショット / リクエスト内メモにそのタブがあればそこから切り出す。
+        """
+        sheet = GSheetService.get_worksheet(sheet_name)
+        if not sheet:
+            return {}
+
+        try:
+            col_map = SheetSchema.col_map(sheet)
+            names = [name for name in columns if name in col_map]
+            if not names:
+                return {}
+
+            values = SheetSnapshot.lookup_values(sheet.title)
+            if values is not None:
+                return {
+                    name: [
+                        row[col_map[name]] if col_map[name] < len(row) else ""
+                        for row in values[1:]
+                    ]
+                    for name in names
+                }
+
+            ranges = []
+            for name in names:
+                letter = re.sub(r"\d", "", rowcol_to_a1(1, col_map[name] + 1))
+                ranges.append(f"{letter}2:{letter}")
+            response = sheet.batch_get(ranges, major_dimension="COLUMNS")
+            # 列の末尾の空セルは返ってこないので長さをそろえる
+            arrays = [
+                list(value_range[0]) if value_range else [] for value_range in response
+            ]
+            length = max((len(a) for a in arrays), default=0)
+            return {
+                name: array + [""] * (length - len(array))
+                for name, array in zip(names, arrays)
+            }
+        except Exception as e:
+            print(f"【Error】列の取得失敗 ({sheet_name}): {e}")
+            return {}
+
+    @staticmethod
+    @contextmanager
+    def use_snapshot(sheet_names):
+        """with ブロック内の指定タブの読み込みを1回の API 呼び出しにまとめる
+
+        ブロック内では各サービス関数の get_all_values() / get_all_records() が
+        スナップショットから返される（入れ子にした場合は外側の内容も引き継ぐ）。
+        """
+        previous = SheetSnapshot.current()
+        known = previous.sheet_names() if previous else []
+        fetched = GSheetService.fetch_snapshot(
+            [name for name in sheet_names if name not in known]
+        )
+        snapshot = previous.merged(fetched) if previous else fetched
+        SheetSnapshot.activate(snapshot)
+        try:
+            yield snapshot
+        finally:
+            if previous is not None:
+                # ブロック内で読んだタブ・書き込んで捨てたタブを外側にも反映
+                previous.replace_with(snapshot)
+            SheetSnapshot.activate(previous)
+
+    @staticmethod
+    def begin_reads():
+        """リクエスト単位の読み込みメモを開始
+
+        以降このスレッドで引数なしの get_all_values() / get_all_records() を
+        呼ぶと、タブごとに最初の1回だけ API から読み、2回目からはメモから返す。
+        書き込んだタブはメモから捨てて読み直す。
+        """
+        SheetSnapshot.activate(SheetSnapshot())
+
+    @staticmethod
+    def end_reads():
+        """読み込みメモを終了（次のリクエストに持ち越さない）"""
+        SheetSnapshot.activate(None)
+
+    @staticmethod
+    @contextmanager
+    def read_scope():
+        """with ブロック内を1つのリクエストとして読み込みをメモする（LINE イベント単位など）"""
+        previous = SheetSnapshot.current()
+        SheetSnapshot.activate(SheetSnapshot())
+        try:
+            yield
+        finally:
+            SheetSnapshot.activate(previous)
+
+    # ---------- セル書き込みのまとめ送信 ----------
+
+    @staticmethod
+    def update_cells(sheet, updates):
+        """複数セルを書き込む（updates: [(row, col, value)]、行・列とも1始まり）
+
+        バッファリング中はリクエスト終了時（または flush_writes）にまとめて反映し、
+        そうでなければその場で1回の batch_update として書き込む。
+        """
+        # レプリカは先に更新されるので、依存するキャッシュもここで捨てる
+        # （実際の書き込み後にも MeteredWorksheet がもう一度無効化する）
+        invalidate_sheet(sheet.title)
+        # リクエスト内メモも捨てる。溜めた分は次にこのタブを読む前に送られる
+        SheetSnapshot.discard_current(sheet.title)
+        WriteBuffer.add(sheet, updates)
+
+    @staticmethod
+    def _on_write_failure(titles):
+        # ローカルに先行反映した内容と食い違うのでレプリカは取り直す
+        if "study_log" in titles:
+            study_log_replica.invalidate()
+
+    @staticmethod
+    def begin_writes():
+        """セル書き込みのバッファリングを開始"""
+        WriteBuffer.begin()
+
+    @staticmethod
+    def end_writes():
+        """バッファリングを終了し、最も外側なら溜めた書き込みを反映"""
+        if WriteBuffer.end():
+            GSheetService.flush_writes()
+
+    @staticmethod
+    def flush_writes():
+        """溜めた書き込みを今すぐ反映（失敗時は SheetWriteError）"""
+        WriteBuffer.flush()
+
+    @staticmethod
+    @contextmanager
+    def batch_writes():
+        """with ブロック内のセル書き込みをワークシートごとに1回の batch_update にまとめる"""
+        GSheetService.begin_writes()
+        try:
+            yield
+        finally:
+            GSheetService.end_writes()
 
     @staticmethod
     def log_activity(user_id, user_name, today, time, subject=""):
@@ -63,72 +228,160 @@ class GSheetService:
         return row_index is not None
 
     @staticmethod
-    def log_activity_with_row(user_id, user_name, today, time, subject=""):
-        """学習記録ログを保存し、追加した行番号を返す（原子性サポート）"""
+    def new_session_id():
+        """学習セッションIDを発行"""
+        return f"ses_{uuid.uuid4().hex[:12]}"
+
+    @staticmethod
+    def _appended_row_index(response):
+        """append_row の応答（updates.updatedRange）から追記した行番号を取得"""
+        try:
+            updated_range = response["updates"]["updatedRange"]
+            m = re.search(r"![A-Z]+(\d+)", updated_range)
+            return int(m.group(1)) if m else None
+        except Exception:
+            return None
+
+    @staticmethod
+    def _ensure_session_column(sheet):
+        """study_log に session_id 列がなければ追加し、ヘッダー行を返す"""
+        headers = SheetSchema.headers(sheet)
+        if not headers or "session_id" in headers:
+            return headers
+
+        col = len(headers)
+        sheet.update_cell(1, col + 1, "session_id")
+        study_log_replica.apply_update(1, col, "session_id")
+        headers = headers + ["session_id"]
+        SheetSchema.register("study_log", headers)
+        return headers
+
+    @staticmethod
+    def resolve_study_row(row_index=None, session_id=None):
+        """session_id があればその現在の行番号、なければ row_index を返す
+
+        行削除で行がずれても session_id なら正しい行を指せる。
+        session_id の行が見つからない（削除・アーカイブ済み）場合は、
+        古い行番号が別の行を指しているかもしれないので None を返す。
+        row_index だけで指定するのは session_id 導入前のカード・画面のみ。
+        """
+        if session_id:
+            return study_log_replica.locate(session_id)
+        return int(row_index) if row_index else None
+
+    @staticmethod
+    def _is_users_study(row_index, user_id):
+        """study_log の row_index 行目が user_id の記録か（user_id 省略時は常に True）
+
+        行番号だけで指定された古いカードが、行のずれで別の人の記録を指していないかの確認用。
+        """
+        if not user_id:
+            return True
+        col_map = {str(h).strip(): i for i, h in enumerate(study_log_replica.header())}
+        idx_uid = col_map.get("user_id")
+        row = study_log_replica.row(row_index)
+        if row is None or idx_uid is None:
+            return False
+        return str(row[idx_uid]).strip() == str(user_id)
+
+    @staticmethod
+    def append_study_row(fields):
+        """study_log に {列名: 値} の行を追記し、追記した行番号を返す
+
+        session_id が無ければ発行して書き込む。append_row の応答から行番号が
+        分からなくても追記は済んでいるので、追記分を同期して session_id から引き直す。
+        """
         sheet = GSheetService.get_worksheet("study_log")
         if not sheet:
             print("【Error】study_log シートが見つかりません。作成してください。")
             return None
 
-        try:
-            # ヘッダー行を取得してカラム位置を特定
-            headers = sheet.row_values(1)
-            if not headers:
-                print("【Error】ヘッダー情報が取得できません")
-                return None
-
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
-
-            # データ用配列初期化
-            row_data = [""] * len(headers)
+        # ヘッダー行を取得してカラム位置を特定
+        headers = GSheetService._ensure_session_column(sheet)
+        if not headers:
+            print("【Error】ヘッダー情報が取得できません")
+            return None
 
-            def set_val(name, val):
-                if name in col_map:
-                    row_data[col_map[name]] = val
+        col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+        fields = dict(fields)
+        if not fields.get("session_id"):
+            fields["session_id"] = GSheetService.new_session_id()
+
+        row_data = [""] * len(headers)
+        for name, val in fields.items():
+            if name in col_map:
+                row_data[col_map[name]] = val
+
+        response = sheet.append_row(row_data)
+        # 応答の更新範囲から実際に追記された行番号を取得
+        row_index = GSheetService._appended_row_index(response)
+        study_log_replica.apply_append(row_index, row_data)
+        if row_index is None:
+            row_index = study_log_replica.locate(fields["session_id"])
+            if row_index is None:
+                print(
+                    f"【Error】追記した行を特定できません (session_id={fields['session_id']})"
+                )
+        return row_index
 
-            set_val("user_id", user_id)
-            set_val("display_name", user_name)
-            set_val("date", today)
-            set_val("start_time", time)
-            set_val("status", "STARTED")
-            set_val("subject", subject)
+    @staticmethod
+    def log_activity_with_row(
+        user_id, user_name, today, time, subject="", session_id=None
+    ):
+        """学習記録ログを保存し、追加した行番号を返す（原子性サポート）
 
-            sheet.append_row(row_data)
-            # 追加した行の番号を返す（最後の行）
-            return sheet.row_count
+        session_id を省略した場合は新しく発行する。
+        """
+        try:
+            return GSheetService.append_study_row(
+                {
+                    "user_id": user_id,
+                    "display_name": user_name,
+                    "date": today,
+                    "start_time": time,
+                    "status": "STARTED",
+                    "subject": subject,
+                    "session_id": session_id,
+                }
+            )
         except Exception as e:
             print(f"ログ記録エラー: {e}")
             return None
 
     @staticmethod
-    def delete_study_log_row(row_index):
+    @RowShiftLock.holding
+    def delete_study_log_row(row_index, session_id=None):
         """指定した行を削除（ロールバック用）"""
         sheet = GSheetService.get_worksheet("study_log")
         if not sheet:
             return False
         try:
+            row_index = GSheetService.resolve_study_row(row_index, session_id)
+            if not row_index:
+                return False
             sheet.delete_rows(row_index)
+            # アーカイブが読んだ行番号とずれたことを知らせる
+            RowShiftLock.note_shift("study_log")
+            study_log_replica.apply_delete(row_index)
             return True
         except Exception as e:
             print(f"行削除エラー: {e}")
             return False
 
     @staticmethod
+    @RowShiftLock.holding
     def cancel_study(user_id, user_name=None):
         """学習記録をキャンセル（動的カラムマッピング）"""
         sheet = GSheetService.get_worksheet("study_log")
         if not sheet:
             return False
 
-        all_records = sheet.get_all_values()
-        if not all_records:
+        headers = study_log_replica.header()
+        if not headers:
             return False
 
-        headers = all_records[0]
         col_map = {str(h).strip(): i for i, h in enumerate(headers)}
 
-        idx_uid = col_map.get("user_id")
-        idx_name = col_map.get("display_name")
         idx_end = col_map.get("end_time")
         idx_status = col_map.get("status")
 
@@ -138,38 +391,27 @@ class GSheetService:
         target_row = None
 
         # 後ろから検索
-        for i in range(len(all_records), 1, -1):
-            row = all_records[i - 1]
-            if not row:
-                continue
+        for i, row in reversed(study_log_replica.user_rows(user_id, user_name)):
 
             def get_val(idx):
                 return (
                     str(row[idx]).strip() if idx is not None and idx < len(row) else ""
                 )
 
-            is_match = False
-            if idx_uid is not None and get_val(idx_uid) == str(user_id):
-                is_match = True
-            elif (
-                user_name
-                and idx_name is not None
-                and get_val(idx_name) == str(user_name)
-            ):
-                is_match = True
-
-            if is_match:
-                end_val = get_val(idx_end)
-                status_val = get_val(idx_status)
+            end_val = get_val(idx_end)
+            status_val = get_val(idx_status)
 
-                # 終了時刻が空 かつ statusがSTARTED (念のため)
-                if end_val == "" and status_val == "STARTED":
-                    target_row = i
-                    break
+            # 終了時刻が空 かつ statusがSTARTED (念のため)
+            if end_val == "" and status_val == "STARTED":
+                target_row = i
+                break
 
         if target_row:
             try:
-                sheet.update_cell(target_row, idx_status + 1, "CANCELLED")
+                GSheetService.update_cells(
+                    sheet, [(target_row, idx_status + 1, "CANCELLED")]
+                )
+                study_log_replica.apply_update(target_row, idx_status, "CANCELLED")
                 return True
             except Exception as e:
                 print(f"Cancel Study Error: {e}")
@@ -179,15 +421,10 @@ class GSheetService:
     @staticmethod
     def get_all_active_sessions():
         """全ユーザーのアクティブセッション（STARTED）を取得"""
-        sheet = GSheetService.get_worksheet("study_log")
-        if not sheet:
-            return []
-
-        all_records = sheet.get_all_values()
-        if not all_records:
+        headers = study_log_replica.header()
+        if not headers:
             return []
 
-        headers = all_records[0]
         col_map = {str(h).strip(): i for i, h in enumerate(headers)}
 
         idx_uid = col_map.get("user_id")
@@ -203,21 +440,14 @@ class GSheetService:
         active_sessions = []
         seen_users = set()  # 同じユーザーの重複を防ぐ
 
-        # 後ろから検索（最新を優先）
-        for i in range(len(all_records) - 1, 0, -1):
-            row = all_records[i]
-            if not row:
-                continue
+        # status インデックスで STARTED の行だけを取得し、後ろから（最新を優先）
+        for _, row in reversed(study_log_replica.query(status="STARTED")):
 
             def get_val(idx):
                 return (
                     str(row[idx]).strip() if idx is not None and idx < len(row) else ""
                 )
 
-            status_val = get_val(idx_status)
-            if status_val != "STARTED":
-                continue
-
             user_id = get_val(idx_uid) if idx_uid is not None else ""
             if user_id in seen_users:
                 continue
@@ -241,83 +471,63 @@ class GSheetService:
         return active_sessions
 
     @staticmethod
+    @cached(active_session_cache, negative_ttl=60, user_arg="user_id")
     def get_user_active_session(user_id, user_name=None):
         """ユーザーのアクティブセッション（STARTED）を取得"""
-        sheet = GSheetService.get_worksheet("study_log")
-        if not sheet:
-            return None
-
-        all_records = sheet.get_all_values()
-        if not all_records:
+        headers = study_log_replica.header()
+        if not headers:
             return None
 
-        headers = all_records[0]
         col_map = {str(h).strip(): i for i, h in enumerate(headers)}
 
-        idx_uid = col_map.get("user_id")
-        idx_name = col_map.get("display_name")
         idx_status = col_map.get("status")
         idx_start = col_map.get("start_time")
         idx_subj = col_map.get("subject")
+        idx_sid = col_map.get("session_id")
 
         if idx_status is None:
             return None
 
         # 後ろから検索
-        for i in range(len(all_records), 1, -1):
-            row = all_records[i - 1]
-            if not row:
-                continue
+        for i, row in reversed(study_log_replica.user_rows(user_id, user_name)):
 
             def get_val(idx):
                 return (
                     str(row[idx]).strip() if idx is not None and idx < len(row) else ""
                 )
 
-            # Match Logic
-            is_match = False
-            if idx_uid is not None and get_val(idx_uid) == str(user_id):
-                is_match = True
-            elif (
-                user_name
-                and idx_name is not None
-                and get_val(idx_name) == str(user_name)
-            ):
-                is_match = True
-
-            if is_match:
-                status_val = get_val(idx_status)
-                if status_val == "STARTED":
-                    start_time = get_val(idx_start) if idx_start is not None else ""
-                    subject = get_val(idx_subj) if idx_subj is not None else ""
-                    return {
-                        "row_index": i,
-                        "start_time": start_time,
-                        "subject": subject,
-                    }
-                return None  # 最新の記録がSTARTEDでなければアクティブなし
+            status_val = get_val(idx_status)
+            if status_val == "STARTED":
+                start_time = get_val(idx_start) if idx_start is not None else ""
+                subject = get_val(idx_subj) if idx_subj is not None else ""
+                return {
+                    "row_index": i,
+                    "start_time": start_time,
+                    "subject": subject,
+                    "session_id": get_val(idx_sid),
+                }
+            return None  # 最新の記録がSTARTEDでなければアクティブなし
         return None
 
     @staticmethod
+    @RowShiftLock.holding
     def update_end_time(user_id, end_time, user_name=None):
         """終了時刻を study_log シートに更新（動的カラムマッピング）"""
         sheet = GSheetService.get_worksheet("study_log")
         if not sheet:
             return None
 
-        all_records = sheet.get_all_values()
-        if not all_records:
+        headers = study_log_replica.header()
+        if not headers:
             return None
 
-        headers = all_records[0]
         col_map = {str(h).strip(): i for i, h in enumerate(headers)}
 
-        idx_uid = col_map.get("user_id")
-        idx_name = col_map.get("display_name")
         idx_end = col_map.get("end_time")
         idx_status = col_map.get("status")
         idx_start = col_map.get("start_time")
         idx_subj = col_map.get("subject")
+        idx_sid = col_map.get("session_id")
 
         if idx_status is None or idx_end is None:
             return None
@@ -325,94 +535,108 @@ class GSheetService:
         target_row = None
 
         # 後ろから検索
-        for i in range(len(all_records), 1, -1):
-            row = all_records[i - 1]
-            if not row:
-                continue
+        for i, row in reversed(study_log_replica.user_rows(user_id, user_name)):
 
             def get_val(idx):
                 return (
                     str(row[idx]).strip() if idx is not None and idx < len(row) else ""
                 )
 
-            # Match Logic
-            is_match = False
-            if idx_uid is not None and get_val(idx_uid) == str(user_id):
-                is_match = True
-            elif (
-                user_name
-                and idx_name is not None
-                and get_val(idx_name) == str(user_name)
-            ):
-                is_match = True
-
             # EndTime, Status
-            if is_match:
-                end_val = get_val(idx_end)
-                status_val = get_val(idx_status)
+            end_val = get_val(idx_end)
+            status_val = get_val(idx_status)
 
-                if end_val == "" and status_val == "STARTED":
-                    target_row = i
-                    break
+            if end_val == "" and status_val == "STARTED":
+                target_row = i
+                target_record = row
+                break
 
         if target_row:
-            sheet.update_cell(target_row, idx_end + 1, end_time)
-            sheet.update_cell(target_row, idx_status + 1, "PENDING")
+            GSheetService.update_cells(
+                sheet,
+                [
+                    (target_row, idx_end + 1, end_time),
+                    (target_row, idx_status + 1, "PENDING"),
+                ],
+            )
+            study_log_replica.apply_update(target_row, idx_end, end_time)
+            study_log_replica.apply_update(target_row, idx_status, "PENDING")
 
             subject = ""
-            if idx_subj is not None and idx_subj < len(all_records[target_row - 1]):
-                subject = all_records[target_row - 1][idx_subj]
+            if idx_subj is not None and idx_subj < len(target_record):
+                subject = target_record[idx_subj]
 
             start_time = ""
-            if idx_start is not None and idx_start < len(all_records[target_row - 1]):
-                start_time = all_records[target_row - 1][idx_start]
+            if idx_start is not None and idx_start < len(target_record):
+                start_time = target_record[idx_start]
 
             return {
                 "start_time": start_time,
                 "row_index": target_row,
                 "subject": subject,
+                "session_id": (
+                    target_record[idx_sid]
+                    if idx_sid is not None and idx_sid < len(target_record)
+                    else ""
+                ),
             }
         return None
 
     @staticmethod
-    def update_study_stats(row_index, duration, rank):
+    @RowShiftLock.holding
+    def update_study_stats(row_index, duration, rank, session_id=None):
         """学習時間とランクを study_log シートに追記（動的カラムマッピング）"""
         sheet = GSheetService.get_worksheet("study_log")
         if not sheet:
             return False
         try:
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            row_index = GSheetService.resolve_study_row(row_index, session_id)
+            if not row_index:
+                return False
 
-            idx_dur = col_map.get("duration_min")
-            idx_rank = col_map.get("rank_score")
+            cols = SheetSchema.columns(sheet)
+            idx_dur = cols.duration_min
+            idx_rank = cols.rank_score
 
+            updates = []
             if idx_dur is not None:
-                sheet.update_cell(row_index, idx_dur + 1, duration)
+                updates.append((row_index, idx_dur + 1, duration))
+                study_log_replica.apply_update(row_index, idx_dur, duration)
             if idx_rank is not None:
-                sheet.update_cell(row_index, idx_rank + 1, rank)
+                updates.append((row_index, idx_rank + 1, rank))
+                study_log_replica.apply_update(row_index, idx_rank, rank)
+            # 分数はロールアップ・ランキング・合計の元になるので、
+            # リクエスト内でまとめて反映し、失敗したらエラーとして返す
+            GSheetService.update_cells(sheet, updates)
             return True
         except Exception as e:
             print(f"Stats Update Error: {e}")
             return False
 
     @staticmethod
-    def update_study_details(row_index, comment, concentration):
+    @RowShiftLock.holding
+    def update_study_details(row_index, comment, concentration, session_id=None):
         """学習の成果と集中度を study_log シートに追記（動的カラムマッピング）"""
         sheet = GSheetService.get_worksheet("study_log")
         if not sheet:
             return False
         try:
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            row_index = GSheetService.resolve_study_row(row_index, session_id)
+            if not row_index:
+                return False
 
-            idx_com = col_map.get("comment")
-            idx_conc = col_map.get("concentration")
+            cols = SheetSchema.columns(sheet)
+            idx_com = cols.comment
+            idx_conc = cols.concentration
 
+            updates = []
             if idx_com is not None:
-                sheet.update_cell(row_index, idx_com + 1, comment)
+                updates.append((row_index, idx_com + 1, comment))
+                study_log_replica.apply_update(row_index, idx_com, comment)
             if idx_conc is not None:
-                sheet.update_cell(row_index, idx_conc + 1, concentration)
+                updates.append((row_index, idx_conc + 1, concentration))
+                study_log_replica.apply_update(row_index, idx_conc, concentration)
+            GSheetService.update_cells(sheet, updates)
             return True
         except Exception as e:
             print(f"Details Update Error: {e}")
@@ -421,17 +645,12 @@ class GSheetService:
     @staticmethod
     def get_pending_studies():
         """承認待ちの学習記録を取得（動的カラムマッピング）"""
-        sheet = GSheetService.get_worksheet("study_log")
-        if not sheet:
-            return []
-
         pending = []
         try:
-            records = sheet.get_all_values()
-            if not records:
+            headers = study_log_replica.header()
+            if not headers:
                 return []
 
-            headers = records[0]
             col_map = {str(h).strip(): i for i, h in enumerate(headers)}
 
             idx_status = col_map.get("status")
@@ -443,14 +662,13 @@ class GSheetService:
             idx_subject = col_map.get("subject")
             idx_comment = col_map.get("comment")
             idx_duration = col_map.get("duration_min")
+            idx_sid = col_map.get("session_id")
 
             if idx_status is None:
                 return []
 
-            # ヘッダー飛ばす
-            for i, row in enumerate(records[1:], start=2):
-                if not row:
-                    continue
+            # status インデックスで PENDING の行だけを取得
+            for i, row in study_log_replica.query(status="PENDING"):
 
                 def get_val(idx):
                     return (
@@ -459,20 +677,20 @@ class GSheetService:
                         else ""
                     )
 
-                if get_val(idx_status) == "PENDING":
-                    pending.append(
-                        {
-                            "row_index": i,
-                            "user_id": get_val(idx_uid),
-                            "user_name": get_val(idx_name),
-                            "date": get_val(idx_date),
-                            "start_time": get_val(idx_start),
-                            "end_time": get_val(idx_end),
-                            "subject": get_val(idx_subject) or "勉強",
-                            "comment": get_val(idx_comment),
-                            "duration_min": get_val(idx_duration),
-                        }
-                    )
+                pending.append(
+                    {
+                        "row_index": i,
+                        "user_id": get_val(idx_uid),
+                        "user_name": get_val(idx_name),
+                        "date": get_val(idx_date),
+                        "start_time": get_val(idx_start),
+                        "end_time": get_val(idx_end),
+                        "subject": get_val(idx_subject) or "勉強",
+                        "comment": get_val(idx_comment),
+                        "duration_min": get_val(idx_duration),
+                        "session_id": get_val(idx_sid),
+                    }
+                )
         except Exception as e:
             print(f"Pending Study Error: {e}")
         return pending
@@ -480,50 +698,31 @@ class GSheetService:
     @staticmethod
     def get_user_latest_pending_session(user_id, user_name=None):
         """ユーザーの最新のPENDING（コメント待ち）セッションを取得（動的カラムマッピング）"""
-        sheet = GSheetService.get_worksheet("study_log")
-        if not sheet:
-            return None
-
-        all_records = sheet.get_all_values()
-        if not all_records:
+        headers = study_log_replica.header()
+        if not headers:
             return None
 
-        headers = all_records[0]
         col_map = {str(h).strip(): i for i, h in enumerate(headers)}
 
         idx_status = col_map.get("status")
-        idx_uid = col_map.get("user_id")
-        idx_name = col_map.get("display_name")
         idx_comment = col_map.get("comment")
         idx_dur = col_map.get("duration_min")
         idx_subj = col_map.get("subject")
         idx_start = col_map.get("start_time")
+        idx_sid = col_map.get("session_id")
 
         if idx_status is None:
             return None
 
         # 後ろから検索
-        for i in range(len(all_records), 1, -1):
-            row = all_records[i - 1]
-            if not row:
-                continue
+        for i, row in reversed(study_log_replica.user_rows(user_id, user_name)):
 
             def get_val(idx):
                 return (
                     str(row[idx]).strip() if idx is not None and idx < len(row) else ""
                 )
 
-            is_match = False
-            if idx_uid is not None and get_val(idx_uid) == str(user_id):
-                is_match = True
-            elif (
-                user_name
-                and idx_name is not None
-                and get_val(idx_name) == str(user_name)
-            ):
-                is_match = True
-
-            if is_match and get_val(idx_status) == "PENDING":
+            if get_val(idx_status) == "PENDING":
                 comment = get_val(idx_comment)
                 if not comment:
                     dur_str = get_val(idx_dur)
@@ -534,62 +733,97 @@ class GSheetService:
                         "minutes": int(dur_str) if dur_str.isdigit() else 0,
                         "subject": get_val(idx_subj),
                         "state": "WAITING_COMMENT",
+                        "session_id": get_val(idx_sid),
                     }
         return None
 
     @staticmethod
-    def approve_study(row_index):
-        """学習記録を承認済みに更新（動的カラムマッピング）"""
+    @RowShiftLock.holding
+    def approve_study(row_index, session_id=None, user_id=None):
+        """学習記録を承認済みに更新（動的カラムマッピング）
+
+        user_id を渡すと、その行が本人の記録でなければ更新しない。
+        """
         sheet = GSheetService.get_worksheet("study_log")
         if not sheet:
             print(f"approve_study: sheet not found")
             return False
         try:
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
-            idx_status = col_map.get("status")
+            row_index = GSheetService.resolve_study_row(row_index, session_id)
+            if not row_index or not GSheetService._is_users_study(row_index, user_id):
+                print(
+                    f"approve_study: record not found (row={row_index}, session={session_id})"
+                )
+                return False
+
+            cols = SheetSchema.columns(sheet)
+            idx_status = cols.status
             if idx_status is None:
-                print(f"approve_study: status column not found in headers: {headers}")
+                print(
+                    f"approve_study: status column not found in headers: {cols.headers}"
+                )
                 return False  # Status column not found
 
-            current_status = sheet.cell(row_index, idx_status + 1).value
+            # 現在の状態はレプリカから読む（書き込みごとに反映済み）
+            row = study_log_replica.row(row_index) or []
+            current_status = row[idx_status] if idx_status < len(row) else ""
             if current_status == "APPROVED":
                 print(f"approve_study: row {row_index} already approved")
                 return False
 
-            sheet.update_cell(row_index, idx_status + 1, "APPROVED")
+            GSheetService.update_cells(sheet, [(row_index, idx_status + 1, "APPROVED")])
+            # 承認できたかどうかで EXP を付与するので、ここで書き込みを確定させる
+            GSheetService.flush_writes()
+            study_log_replica.apply_update(row_index, idx_status, "APPROVED")
             return True
         except Exception as e:
             print(f"approve_study error: {e}")
             return False
 
     @staticmethod
-    def reject_study(row_index):
-        """学習記録を却下（REJECTED）に更新（動的カラムマッピング）"""
+    @RowShiftLock.holding
+    def reject_study(row_index, session_id=None, user_id=None):
+        """学習記録を却下（REJECTED）に更新（動的カラムマッピング）
+
+        user_id を渡すと、その行が本人の記録でなければ更新しない。
+        """
         sheet = GSheetService.get_worksheet("study_log")
         if not sheet:
             print(f"reject_study: sheet not found")
             return False
         try:
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
-            idx_status = col_map.get("status")
+            row_index = GSheetService.resolve_study_row(row_index, session_id)
+            if not row_index or not GSheetService._is_users_study(row_index, user_id):
+                print(
+                    f"reject_study: record not found (row={row_index}, session={session_id})"
+                )
+                return False
+
+            cols = SheetSchema.columns(sheet)
+            idx_status = cols.status
             if idx_status is None:
-                print(f"reject_study: status column not found in headers: {headers}")
+                print(
+                    f"reject_study: status column not found in headers: {cols.headers}"
+                )
                 return False
 
-            current_status = sheet.cell(row_index, idx_status + 1).value
+            # 現在の状態はレプリカから読む（書き込みごとに反映済み）
+            row = study_log_replica.row(row_index) or []
+            current_status = row[idx_status] if idx_status < len(row) else ""
             if current_status == "APPROVED":
                 print(f"reject_study: row {row_index} already approved, cannot reject")
                 return False
 
-            sheet.update_cell(row_index, idx_status + 1, "REJECTED")
+            GSheetService.update_cells(sheet, [(row_index, idx_status + 1, "REJECTED")])
+            GSheetService.flush_writes()
+            study_log_replica.apply_update(row_index, idx_status, "REJECTED")
             return True
         except Exception as e:
             print(f"reject_study error: {e}")
             return False
 
     @staticmethod
+    @RowShiftLock.holding
     def check_timeout_sessions(timeout_minutes=90):
         """制限時間を超えた学習セッションを強制終了する（動的カラムマッピング）"""
         sheet = GSheetService.get_worksheet("study_log")
@@ -597,11 +831,10 @@ class GSheetService:
             return []
 
         try:
-            all_records = sheet.get_all_values()
-            if not all_records:
+            headers = study_log_replica.header()
+            if not headers:
                 return []
 
-            headers = all_records[0]
             col_map = {str(h).strip(): i for i, h in enumerate(headers)}
 
             idx_status = col_map.get("status")
@@ -610,6 +843,7 @@ class GSheetService:
             idx_start = col_map.get("start_time")
             idx_uid = col_map.get("user_id")
             idx_subj = col_map.get("subject")
+            idx_sid = col_map.get("session_id")
 
             # 必須カラムチェック
             if (
@@ -624,17 +858,15 @@ class GSheetService:
 
             now = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9)))
 
-            for i in range(1, len(all_records)):
-                row = all_records[i]
-
+            # 勉強中の行だけをレプリカの索引から取り出す
+            for row_index, row in study_log_replica.query(status="STARTED"):
                 # 安全なアクセス
                 def get_val(idx):
                     return row[idx] if idx is not None and idx < len(row) else ""
 
-                status = get_val(idx_status)
                 end_time = get_val(idx_end)
 
-                if status == "STARTED" and end_time == "":
+                if end_time == "":
                     date_str = get_val(idx_date)
                     start_time_str = get_val(idx_start)
 
@@ -655,12 +887,19 @@ class GSheetService:
                             )
                             force_end_time_str = force_end_dt.strftime("%H:%M:%S")
 
-                            row_index = i + 1
-
-                            sheet.update_cell(
-                                row_index, idx_end + 1, force_end_time_str
+                            GSheetService.update_cells(
+                                sheet,
+                                [
+                                    (row_index, idx_end + 1, force_end_time_str),
+                                    (row_index, idx_status + 1, "PENDING"),
+                                ],
+                            )
+                            study_log_replica.apply_update(
+                                row_index, idx_end, force_end_time_str
+                            )
+                            study_log_replica.apply_update(
+                                row_index, idx_status, "PENDING"
                             )
-                            sheet.update_cell(row_index, idx_status + 1, "PENDING")
 
                             uid = get_val(idx_uid)
                             subject = get_val(idx_subj)
@@ -672,6 +911,7 @@ class GSheetService:
                                     "minutes": timeout_minutes,
                                     "subject": subject,
                                     "start_time": start_time_str,
+                                    "session_id": get_val(idx_sid),
                                 }
                             )
                     except Exception as e:
@@ -713,6 +953,8 @@ class GSheetService:
                 "completed_at",
             ]
             sheet.append_row(headers)
+            SheetSchema.register("goals", headers)
+            GSheetService.register_worksheet(sheet)
             print("【Info】goalsシートを作成しました")
             return sheet
         except Exception as e:
@@ -922,6 +1164,8 @@ class GSheetService:
                 "status",
             ]
             sheet.append_row(headers)
+            SheetSchema.register("bookshelf", headers)
+            GSheetService.register_worksheet(sheet)
             print("【Info】bookshelfシートを作成しました")
             return sheet
         except Exception as e:
@@ -977,15 +1221,13 @@ class GSheetService:
             return False, "シートが見つかりません"
 
         try:
-            import uuid
-
             book_id = str(uuid.uuid4())[:8]
             now = datetime.datetime.now(
                 datetime.timezone(datetime.timedelta(hours=9))
             ).strftime("%Y-%m-%d %H:%M:%S")
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            headers = SheetSchema.headers(sheet)
+            col_map = SheetSchema.col_map(sheet)
 
             row_data = [""] * len(headers)
 
@@ -1101,6 +1343,8 @@ class GSheetService:
                 "created_at",
             ]
             sheet.append_row(headers)
+            SheetSchema.register("notifications", headers)
+            GSheetService.register_worksheet(sheet)
             print("【Info】notificationsシートを作成しました")
             return sheet
         except Exception as e:
@@ -1115,15 +1359,13 @@ class GSheetService:
             return False
 
         try:
-            import uuid
-
             notif_id = str(uuid.uuid4())[:8]
             now = datetime.datetime.now(
                 datetime.timezone(datetime.timedelta(hours=9))
             ).strftime("%Y-%m-%d %H:%M:%S")
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            headers = SheetSchema.headers(sheet)
+            col_map = SheetSchema.col_map(sheet)
 
             row_data = [""] * len(headers)
 
@@ -1188,6 +1430,7 @@ class GSheetService:
             return []
 
     @staticmethod
+    @RowShiftLock.holding
     def mark_notification_read(notif_id, user_id):
         """通知を既読にする"""
         sheet = GSheetService.get_or_create_notifications_sheet()
@@ -1214,6 +1457,7 @@ class GSheetService:
             return False
 
     @staticmethod
+    @RowShiftLock.holding
     def mark_all_notifications_read(user_id):
         """ユーザーの全通知を既読にする"""
         sheet = GSheetService.get_or_create_notifications_sheet()
@@ -1235,9 +1479,12 @@ class GSheetService:
                         updates.append((i, idx_read + 1, "true"))
 
             # バッチ更新
-            for row_idx, col_idx, val in updates:
-                sheet.update_cell(row_idx, col_idx, val)
+            GSheetService.update_cells(sheet, updates)
             return True
         except Exception as e:
             print(f"【Error】全通知既読更新エラー: {e}")
             return False
+
+
+# バッファした書き込みが失敗したらレプリカを取り直す
+WriteBuffer.set_failure_handler(GSheetService._on_write_failure)
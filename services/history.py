@@ -1,7 +1,15 @@
 import datetime
+import threading
+import time
 from services.gsheet import GSheetService
+from services.sheet_schema import SheetSchema
 from services.economy import EconomyService
-from utils.cache import ranking_cache, user_stats_cache, activity_cache, cached
+from services.sheet_replica import study_log_replica, study_log_rollup
+from services.study_aggregate import UserStudyAggregate
+from services.archiver import ArchiveService
+from services.row_lock import RowShiftLock
+from services.leaderboard import study_time_board, weekly_exp_board
+from utils.cache import user_stats_cache, activity_cache, cached
 
 
 class HistoryService:
@@ -56,91 +64,74 @@ class HistoryService:
         all_tx = HistoryService.get_all_transactions()
         return all_tx[:limit]
 
+    # ---------- ユーザー別の学習統計（1回の集計から各形式を組み立てる） ----------
+
     @staticmethod
-    def get_user_study_stats(user_id):
-        """ユーザーの学習統計情報を収集（Web表示用）"""
-        sheet = GSheetService.get_worksheet("study_log")
-        if not sheet:
-            return {"weekly": [], "subject": [], "recent": []}
+    def get_user_study_aggregate(user_id):
+        """ユーザーの study_log を1回走査した集計（UserStudyAggregate）
 
-        try:
-            records = sheet.get_all_values()
-            if not records:
-                return {"weekly": [], "subject": [], "recent": []}
+        今日の日付もキーに含め、日付が変わったら集計し直す。
+        """
+        today = datetime.datetime.now(
+            datetime.timezone(datetime.timedelta(hours=9))
+        ).date()
+        return HistoryService._build_user_study_aggregate(user_id, today)
 
-            headers = records[0]
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+    @staticmethod
+    @cached(user_stats_cache, user_arg="user_id")
+    def _build_user_study_aggregate(user_id, today):
+        # (user_id / 表示名) の索引で自分の行だけを取得
+        user_name = HistoryService._resolve_user_name(user_id)
+        return UserStudyAggregate.build(
+            study_log_replica.header(),
+            study_log_replica.user_rows(user_id, user_name),
+            user_id,
+            today,
+        )
 
-            idx_uid = col_map.get("user_id")
-            idx_date = col_map.get("date")
-            idx_dur = col_map.get("duration_min")
-            idx_subj = col_map.get("subject")
-            idx_stat = col_map.get("status")
+    @staticmethod
+    def _resolve_user_name(user_id):
+        """表示名（user_id が空の古い行を表示名で拾うため）"""
+        try:
+            u_info = EconomyService.get_user_info(user_id)
+            if u_info:
+                return u_info.get("display_name")
+        except:
+            pass
+        return None
 
-            if None in [idx_uid, idx_date, idx_dur, idx_subj]:
+    @staticmethod
+    def get_user_study_days(user_id):
+        """ユーザーの承認済み勉強時間の日別集計（ロールアップから取得）"""
+        user_name = HistoryService._resolve_user_name(user_id)
+        study_log_replica.sync()
+        return study_log_rollup.user_days(user_id, user_name)
+
+    @staticmethod
+    def get_user_study_stats(user_id):
+        """ユーザーの学習統計情報を収集（Web表示用）"""
+        try:
+            agg = HistoryService.get_user_study_aggregate(user_id)
+            if not agg.has_log_columns:
                 return {"weekly": [], "subject": [], "recent": []}
 
             # 7日間の日付リスト生成
-            today = datetime.datetime.now(
-                datetime.timezone(datetime.timedelta(hours=9))
-            ).date()
-            last_7_days = [today - datetime.timedelta(days=i) for i in range(6, -1, -1)]
-            weekly_map = {d.strftime("%Y-%m-%d"): 0 for d in last_7_days}
+            last_7_days = [
+                agg.today - datetime.timedelta(days=i) for i in range(6, -1, -1)
+            ]
             days_jp = ["月", "火", "水", "木", "金", "土", "日"]
 
-            subject_map = {}
-            recent_logs = []
-
-            for row in records[1:]:
-                # User Filter
-                if len(row) <= idx_uid or str(row[idx_uid]) != str(user_id):
-                    continue
-
-                # Status Filter (DONE or PENDING or updated ones which have duration)
-                duration_str = row[idx_dur] if len(row) > idx_dur else "0"
-                status = (
-                    row[idx_stat]
-                    if idx_stat is not None and len(row) > idx_stat
-                    else ""
-                )
-
-                # デバッグログ
-                print(
-                    f"[DEBUG STATS] user_id={row[idx_uid] if len(row) > idx_uid else 'N/A'}, duration_str='{duration_str}', status='{status}'"
-                )
-
-                if not duration_str.isdigit() or int(duration_str) == 0:
-                    print(f"[DEBUG STATS] Skipped due to invalid duration")
-                    continue
-
-                duration = int(duration_str)
-                date_str = row[idx_date] if len(row) > idx_date else ""
-                # シングルクォートが先頭についている場合に除去（スプレッドシートの書式問題対策）
-                date_str = date_str.lstrip("'").strip()
-                subject = row[idx_subj] if len(row) > idx_subj else "その他"
-
-                # Weekly Data
-                if date_str in weekly_map:
-                    weekly_map[date_str] += duration
-
-                # Subject Data
-                if subject in subject_map:
-                    subject_map[subject] += duration
-                else:
-                    subject_map[subject] = duration
-
-                # Recent Data (Keep all, sort later)
-                recent_logs.append(
-                    {"subject": subject, "date": date_str, "minutes": duration}
-                )
-
             # Format Weekly Data
             weekly_data = []
             for d in last_7_days:
                 d_str = d.strftime("%Y-%m-%d")
                 weekday = days_jp[d.weekday()]
                 weekly_data.append(
-                    {"day": weekday, "date": d_str, "minutes": weekly_map[d_str]}
+                    {
+                        "day": weekday,
+                        "date": d_str,
+                        "minutes": agg.log_minutes_by_date.get(d_str, 0),
+                    }
                 )
 
             # Format Subject Data
@@ -154,8 +145,14 @@ class HistoryService:
                 "社会": "#9D4EDD",
                 "その他": "#95A5A6",
             }
-            total_sub_min = sum(subject_map.values())
-            for sub, mins in subject_map.items():
+            # 教科別・合計はアーカイブ済みの月の分も含めた全期間
+            subject_minutes = dict(agg.log_minutes_by_subject)
+            for sub, mins in ArchiveService.archived_by_subject(
+                ArchiveService.LOGGED_MINUTES, user_id
+            ).items():
+                subject_minutes[sub] = subject_minutes.get(sub, 0) + mins
+            total_sub_min = sum(subject_minutes.values())
+            for sub, mins in subject_minutes.items():
                 subject_data.append(
                     {
                         "subject": sub,
@@ -169,25 +166,17 @@ class HistoryService:
             subject_data.sort(key=lambda x: x["minutes"], reverse=True)
 
             # Format Recent Data
-            recent_logs.sort(key=lambda x: x["date"], reverse=True)
-            all_logs = list(recent_logs)  # Keep all for weekly/monthly calc
-            recent_logs = recent_logs[:10]  # Last 10 for display
-
-            # Calculate total minutes
-            total_minutes = sum(subject_map.values())
-
-            # デバッグログ
-            print(f"[DEBUG STATS] Final weekly_data: {weekly_data}")
-            print(
-                f"[DEBUG STATS] Total records found: {len(all_logs)}, total_minutes: {total_minutes}"
-            )
+            all_logs = [dict(log) for log in agg.logs]
+            all_logs.sort(key=lambda x: x["date"], reverse=True)
+            recent_logs = all_logs[:10]  # Last 10 for display
 
             return {
                 "weekly": weekly_data,
                 "subject": subject_data,
                 "recent": recent_logs,
-                "all_records": all_logs,  # For weekly/monthly subject breakdown
-                "total": total_minutes,
+                # For weekly/monthly subject breakdown（アーカイブしていない期間のみ）
+                "all_records": all_logs,
+                "total": total_sub_min,
             }
 
         except Exception as e:
@@ -197,70 +186,8 @@ class HistoryService:
     @staticmethod
     def is_first_study_today(user_id):
         """その日の最初の勉強かどうか判定"""
-        sheet = GSheetService.get_worksheet("study_log")
-        if not sheet:
-            return False
-
-        now = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9)))
-        today_str = now.strftime("%Y-%m-%d")
-
-        # Resolve User Name for fallback
-        user_name = None
-        try:
-            u_info = EconomyService.get_user_info(user_id)
-            if u_info:
-                user_name = u_info.get("display_name")
-        except:
-            pass
-
         try:
-            records = sheet.get_all_values()
-            if not records:
-                return False
-
-            headers = records[0]
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
-
-            idx_uid = col_map.get("user_id")
-            idx_name = col_map.get("display_name")
-            idx_date = col_map.get("date")
-            idx_status = col_map.get("status")
-
-            if idx_status is None or idx_date is None:
-                return False
-
-            count = 0
-            for row in records[1:]:
-
-                def get_val(idx):
-                    return (
-                        str(row[idx]).strip()
-                        if idx is not None and idx < len(row)
-                        else ""
-                    )
-
-                # ID Check
-                is_match = False
-                if idx_uid is not None and get_val(idx_uid) == str(user_id):
-                    is_match = True
-                elif (
-                    user_name
-                    and idx_name is not None
-                    and get_val(idx_name) == str(user_name)
-                ):
-                    is_match = True
-
-                if not is_match:
-                    continue
-
-                if get_val(idx_date) == today_str:
-                    status = get_val(idx_status)
-                    if status not in ["CANCELLED", "REJECTED"]:
-                        count += 1
-
-            # 今のセッションも含まれるため、1なら初回
-            return count == 1
-
+            return HistoryService.get_user_study_aggregate(user_id).is_first_today
         except Exception as e:
             print(f"First Study Check Error: {e}")
             return False
@@ -268,67 +195,8 @@ class HistoryService:
     @staticmethod
     def get_today_study_count(user_id):
         """今日の勉強回数を取得"""
-        sheet = GSheetService.get_worksheet("study_log")
-        if not sheet:
-            return 0
-
-        now = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9)))
-        today_str = now.strftime("%Y-%m-%d")
-
-        # Resolve User Name for fallback
-        user_name = None
         try:
-            u_info = EconomyService.get_user_info(user_id)
-            if u_info:
-                user_name = u_info.get("display_name")
-        except:
-            pass
-
-        try:
-            records = sheet.get_all_values()
-            if not records:
-                return 0
-
-            headers = records[0]
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
-
-            idx_uid = col_map.get("user_id")
-            idx_name = col_map.get("display_name")
-            idx_date = col_map.get("date")
-            idx_status = col_map.get("status")
-
-            if idx_status is None or idx_date is None:
-                return 0
-
-            count = 0
-            for row in records[1:]:
-
-                def get_val(idx):
-                    return (
-                        str(row[idx]).strip()
-                        if idx is not None and idx < len(row)
-                        else ""
-                    )
-
-                # ID Check
-                is_match = False
-                if idx_uid is not None and get_val(idx_uid) == str(user_id):
-                    is_match = True
-                elif (
-                    user_name
-                    and idx_name is not None
-                    and get_val(idx_name) == str(user_name)
-                ):
-                    is_match = True
-
-                if not is_match:
-                    continue
-
-                if get_val(idx_date) == today_str:
-                    status = get_val(idx_status)
-                    if status not in ["CANCELLED", "REJECTED"]:
-                        count += 1
-            return count
+            return HistoryService.get_user_study_aggregate(user_id).today_count
         except Exception as e:
             print(f"Study Count Error: {e}")
             return 0
@@ -336,93 +204,22 @@ class HistoryService:
     @staticmethod
     def get_user_study_stats_summary(user_id):
         """ユーザーの学習履歴統計（週間・月間の合計分数のみ）※カレンダー基準 - LINE Bot用"""
-        sheet = GSheetService.get_worksheet("study_log")
-        if not sheet:
-            return {"weekly": 0, "monthly": 0, "total": 0}
-
-        now = datetime.datetime.now()
-        # 今週の月曜日 (0:00:00)
-        week_start = (now - datetime.timedelta(days=now.weekday())).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        # 今月の1日 (0:00:00)
-        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
         stats = {"weekly": 0, "monthly": 0, "total": 0}
-
-        # Resolve User Name for fallback
-        user_name = None
-        try:
-            u_info = EconomyService.get_user_info(user_id)
-            if u_info:
-                user_name = u_info.get("display_name")
-        except:
-            pass
-
         try:
-            records = sheet.get_all_values()
-            if not records:
-                return stats
-
-            headers = records[0]
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
-
-            idx_uid = col_map.get("user_id")
-            idx_name = col_map.get("display_name")
-            idx_date = col_map.get("date")
-            idx_status = col_map.get("status")
-            idx_dur = col_map.get("duration_min")
-
-            if idx_status is None or idx_date is None or idx_dur is None:
-                return stats
-
-            for row in records[1:]:
-
-                def get_val(idx):
-                    return (
-                        str(row[idx]).strip()
-                        if idx is not None and idx < len(row)
-                        else ""
-                    )
-
-                # ID Check
-                is_match = False
-                if idx_uid is not None and get_val(idx_uid) == str(user_id):
-                    is_match = True
-                elif (
-                    user_name
-                    and idx_name is not None
-                    and get_val(idx_name) == str(user_name)
-                ):
-                    is_match = True
-
-                if not is_match:
-                    continue
-
-                if get_val(idx_status) != "APPROVED":
-                    continue  # 承認済みのみ
-
-                date_str = get_val(idx_date)
-
-                try:
-                    log_date = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-
-                    minutes = 0
-                    dur_val = get_val(idx_dur)
-                    if dur_val and dur_val.isdigit():
-                        minutes = int(dur_val)
-
-                    stats["total"] += minutes
-
-                    if log_date >= week_start:
-                        stats["weekly"] += minutes
-
-                    if log_date >= month_start:
-                        stats["monthly"] += minutes
-
-                except:
-                    continue
-
+            days = HistoryService.get_user_study_days(user_id)
+            today = datetime.datetime.now().date()
+            # 今週の月曜日 / 今月の1日
+            week_start = today - datetime.timedelta(days=today.weekday())
+            month_start = today.replace(day=1)
+
+            stats["weekly"] = days.minutes(since=week_start)
+            stats["monthly"] = days.minutes(since=month_start)
+            # 全期間の合計はアーカイブ済みの月の集計を足す
+            user_name = HistoryService._resolve_user_name(user_id)
+            archived = ArchiveService.archived_by_subject(
+                ArchiveService.APPROVED_MINUTES, user_id, user_name
+            )
+            stats["total"] = days.minutes() + sum(archived.values())
         except Exception as e:
             print(f"Study Stats Error: {e}")
 
@@ -431,111 +228,21 @@ class HistoryService:
     @staticmethod
     def get_user_weekly_daily_stats(user_id):
         """ユーザーの直近7日間の日別学習時間（教科別）"""
-        now = datetime.datetime.now()
-        # 今日を含む過去7日間
-        dates = [(now - datetime.timedelta(days=i)) for i in range(6, -1, -1)]
-        weekdays = ["月", "火", "水", "木", "金", "土", "日"]
-
-        sheet = GSheetService.get_worksheet("study_log")
-        if not sheet:
-            # シートがない場合でも空のデータを返す
-            return [
-                {
-                    "date": d.strftime("%Y-%m-%d"),
-                    "label": f"{d.month}/{d.day}({weekdays[d.weekday()]})",
-                    "minutes": 0,
-                    "subjects": {},
-                }
-                for d in dates
-            ]
-
-        # date_str keys: "YYYY-MM-DD"
-        # Value structure: {"total": 0, "subjects": {"math": 0, "eng": 0, ...}}
-        daily_map = {
-            d.strftime("%Y-%m-%d"): {"total": 0, "subjects": {}} for d in dates
-        }
-
-        # Resolve Name
-        user_name = None
+        today = datetime.datetime.now().date()
         try:
-            u = EconomyService.get_user_info(user_id)
-            if u:
-                user_name = u.get("display_name")
-        except:
-            pass
-
-        try:
-            records = sheet.get_all_values()
-            if not records:
-                raise Exception("No records")
-
-            headers = records[0]
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
-
-            idx_uid = col_map.get("user_id")
-            idx_name = col_map.get("display_name")
-            idx_date = col_map.get("date")
-            idx_status = col_map.get("status")
-            idx_dur = col_map.get("duration_min")
-            idx_subj = col_map.get("subject")
-
-            for row in records[1:]:
-
-                def get_val(idx):
-                    return (
-                        str(row[idx]).strip()
-                        if idx is not None and idx < len(row)
-                        else ""
-                    )
-
-                # ID Check
-                is_match = False
-                if idx_uid is not None and get_val(idx_uid) == str(user_id):
-                    is_match = True
-                elif (
-                    user_name
-                    and idx_name is not None
-                    and get_val(idx_name) == str(user_name)
-                ):
-                    is_match = True
-
-                if not is_match:
-                    continue
-
-                if idx_status is not None and get_val(idx_status) != "APPROVED":
-                    continue
-
-                if idx_date is None:
-                    continue
-                date_str = get_val(idx_date)
-
-                if date_str in daily_map:
-                    # Subject
-                    subject = get_val(idx_subj) if idx_subj is not None else "その他"
-                    if not subject:
-                        subject = "その他"
-
-                    try:
-                        # Duration
-                        minutes = 0
-                        dur_val = get_val(idx_dur)
-                        if dur_val and dur_val.isdigit():
-                            minutes = int(dur_val)
-
-                        daily_map[date_str]["total"] += minutes
-                        if subject not in daily_map[date_str]["subjects"]:
-                            daily_map[date_str]["subjects"][subject] = 0
-                        daily_map[date_str]["subjects"][subject] += minutes
-                    except:
-                        pass
+            days = HistoryService.get_user_study_days(user_id)
         except Exception as e:
             print(f"Daily Stats Error: {e}")
+            days = None
+
+        # 今日を含む過去7日間
+        dates = [(today - datetime.timedelta(days=i)) for i in range(6, -1, -1)]
+        weekdays = ["月", "火", "水", "木", "金", "土", "日"]
 
-        # リスト形式に変換
         result = []
         for d in dates:
             d_str = d.strftime("%Y-%m-%d")
-            data = daily_map[d_str]
+            data = days.on(d_str) if days else {"total": 0, "subjects": {}}
             label = f"{d.month}/{d.day}({weekdays[d.weekday()]})"
             result.append(
                 {
@@ -550,128 +257,30 @@ class HistoryService:
     @staticmethod
     def get_user_monthly_weekly_stats(user_id):
         """ユーザーの直近4週間の週別学習時間（教科別）"""
-        now = datetime.datetime.now()
-        # 過去4週間 (28日間)
+        today = datetime.datetime.now().date()
+        try:
+            days = HistoryService.get_user_study_days(user_id)
+        except Exception as e:
+            print(f"Monthly Stats Error: {e}")
+            days = None
+
         # 4つの期間を作る: [3週間前, 2週間前, 1週間前, 今週]
-        weeks = []
+        result = []
         for i in range(3, -1, -1):
             # i=3: 21-27日前, i=0: 0-6日前
-            end_d = now - datetime.timedelta(days=i * 7)
+            end_d = today - datetime.timedelta(days=i * 7)
             start_d = end_d - datetime.timedelta(days=6)
-
-            # 日付比較用にdateオブジェクトにする
-            weeks.append(
+            data = (
+                days.between(start_d, end_d) if days else {"total": 0, "subjects": {}}
+            )
+            result.append(
                 {
-                    "start_date": start_d.date(),
-                    "end_date": end_d.date(),
                     "label": f"{start_d.month}/{start_d.day}~",
-                    "total": 0,
-                    "subjects": {},
+                    "minutes": data["total"],
+                    "subjects": data["subjects"],
                 }
             )
 
-        sheet = GSheetService.get_worksheet("study_log")
-        if not sheet:
-            # シートがない場合でも空のデータを返す
-            result = []
-            for w in weeks:
-                result.append({"label": w["label"], "minutes": 0, "subjects": {}})
-            return result
-
-        # Resolve Name
-        user_name = None
-        try:
-            u = EconomyService.get_user_info(user_id)
-            if u:
-                user_name = u.get("display_name")
-        except:
-            pass
-
-        try:
-            records = sheet.get_all_values()
-            if not records:
-                raise Exception("No records")
-
-            headers = records[0]
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
-
-            idx_uid = col_map.get("user_id")
-            idx_name = col_map.get("display_name")
-            idx_date = col_map.get("date")
-            idx_status = col_map.get("status")
-            idx_dur = col_map.get("duration_min")
-            idx_subj = col_map.get("subject")
-
-            for row in records[1:]:
-
-                def get_val(idx):
-                    return (
-                        str(row[idx]).strip()
-                        if idx is not None and idx < len(row)
-                        else ""
-                    )
-
-                # ID Check
-                is_match = False
-                if idx_uid is not None and get_val(idx_uid) == str(user_id):
-                    is_match = True
-                elif (
-                    user_name
-                    and idx_name is not None
-                    and get_val(idx_name) == str(user_name)
-                ):
-                    is_match = True
-
-                if not is_match:
-                    continue
-
-                if idx_status is not None and get_val(idx_status) != "APPROVED":
-                    continue
-
-                if idx_date is None:
-                    continue
-                date_str = get_val(idx_date)
-
-                try:
-                    log_date = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
-
-                    # どの週に該当するかチェック
-                    target_week = None
-                    for w in weeks:
-                        if w["start_date"] <= log_date <= w["end_date"]:
-                            target_week = w
-                            break
-
-                    if target_week:
-                        subject = (
-                            get_val(idx_subj) if idx_subj is not None else "その他"
-                        )
-                        if not subject:
-                            subject = "その他"
-
-                        # Duration
-                        minutes = 0
-                        dur_val = get_val(idx_dur)
-                        if dur_val and dur_val.isdigit():
-                            minutes = int(dur_val)
-
-                        target_week["total"] += minutes
-                        if subject not in target_week["subjects"]:
-                            target_week["subjects"][subject] = 0
-                        target_week["subjects"][subject] += minutes
-
-                except:
-                    pass
-        except Exception as e:
-            print(f"Monthly Stats Error: {e}")
-
-        # 結果整形
-        result = []
-        for w in weeks:
-            result.append(
-                {"label": w["label"], "minutes": w["total"], "subjects": w["subjects"]}
-            )
-
         return result
 
     @staticmethod
@@ -746,88 +355,20 @@ class HistoryService:
             return users
 
     @staticmethod
-    @cached(ranking_cache, key_func=lambda: "study_time_ranking")
     def get_weekly_study_time_ranking():
-        """過去7日間の勉強時間ランキング（科目別内訳付き）"""
-        sheet = GSheetService.get_worksheet("study_log")
-        if not sheet:
-            return []
-
+        """過去7日間の勉強時間ランキング（科目別内訳付き・承認済みの記録のみ）"""
         try:
-            records = sheet.get_all_values()
-            if len(records) <= 1:
+            if not study_log_replica.sync():
                 return []
 
-            headers = records[0]
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            # 順位は差分で維持している順位表から、科目別内訳はロールアップの7日分から
+            week_start_str = study_time_board.window_start()
+            user_stats = study_log_rollup.totals_since(week_start_str)
 
-            idx_uid = col_map.get("user_id")
-            idx_name = col_map.get("display_name")
-            idx_date = col_map.get("date")
-            idx_dur = col_map.get("duration_min")
-            idx_subj = col_map.get("subject")
-
-            if None in [idx_uid, idx_date, idx_dur]:
-                print("[DEBUG] Missing columns for study ranking")
-                return []
-
-            # 過去7日間の日付範囲
-            today = datetime.datetime.now(
-                datetime.timezone(datetime.timedelta(hours=9))
-            ).date()
-            week_start = today - datetime.timedelta(days=6)
-            week_start_str = week_start.strftime("%Y-%m-%d")
-
-            user_stats = {}  # {user_id: {total: int, subjects: {subject: minutes}, display_name: str}}
-
-            for row in records[1:]:
-                if len(row) <= idx_uid:
-                    continue
-
-                uid = str(row[idx_uid])
-                date_str = row[idx_date] if len(row) > idx_date else ""
-                # シングルクォート除去
-                date_str = date_str.lstrip("'").strip()
-
-                duration_str = row[idx_dur] if len(row) > idx_dur else "0"
-                subject = (
-                    row[idx_subj] if idx_subj and len(row) > idx_subj else "その他"
-                )
-                display_name = (
-                    row[idx_name] if idx_name and len(row) > idx_name else uid
-                )
-
-                # 日付フィルタ
-                if date_str < week_start_str:
-                    continue
-
-                # duration チェック
-                if not duration_str.isdigit() or int(duration_str) == 0:
-                    continue
-
-                duration = int(duration_str)
-
-                if uid not in user_stats:
-                    user_stats[uid] = {
-                        "total": 0,
-                        "subjects": {},
-                        "display_name": display_name,
-                    }
-
-                user_stats[uid]["total"] += duration
-                if subject in user_stats[uid]["subjects"]:
-                    user_stats[uid]["subjects"][subject] += duration
-                else:
-                    user_stats[uid]["subjects"][subject] = duration
-
-                # display_nameを最新のものに更新
-                if display_name and display_name != uid:
-                    user_stats[uid]["display_name"] = display_name
-
-            # ランキング作成
             ranking = []
-            for uid, stats in user_stats.items():
-                # 科目を分単位から時間に変換してソート
+            for uid, total in study_time_board.top():
+                stats = user_stats.get(uid, {"subjects": {}, "display_name": uid})
+                # 科目を分数の多い順に並べる
                 subjects_list = [
                     {"subject": s, "minutes": m}
                     for s, m in sorted(
@@ -838,18 +379,11 @@ class HistoryService:
                     {
                         "user_id": uid,
                         "display_name": stats["display_name"],
-                        "total_minutes": stats["total"],
+                        "total_minutes": total,
                         "subjects": subjects_list,
+                        "rank": len(ranking) + 1,
                     }
                 )
-
-            # 勉強時間でソート
-            ranking.sort(key=lambda x: x["total_minutes"], reverse=True)
-
-            # 順位付け
-            for i, r in enumerate(ranking):
-                r["rank"] = i + 1
-
             return ranking
 
         except Exception as e:
@@ -859,188 +393,249 @@ class HistoryService:
             traceback.print_exc()
             return []
 
+    # 取引履歴を読み直す間隔（秒）。他のワーカーでの加算やシートの直接編集への追従用
+    EXP_BOARD_RELOAD_INTERVAL = 900
+    # 取引履歴の読み直しは同時に1つだけ
+    _exp_board_lock = threading.Lock()
+
     @staticmethod
-    @cached(ranking_cache)
-    def get_weekly_exp_ranking():
-        """今週の獲得EXPランキング（USERのみ）"""
-        sheet = GSheetService.get_worksheet("transactions")
-        if not sheet:
-            return []
+    def _exp_board_stale():
+        loaded_at = weekly_exp_board.loaded_at
+        return (
+            loaded_at is None
+            or time.time() - loaded_at >= HistoryService.EXP_BOARD_RELOAD_INTERVAL
+        )
 
-        now = datetime.datetime.now()
-        week_start = now - datetime.timedelta(days=7)
+    @staticmethod
+    def _sync_exp_board():
+        """週間EXPの順位表を用意し、ランキング対象の {user_id: ユーザー情報} を返す
+
+        取引履歴は初回と一定間隔ごとにだけ読み、その間は add_exp の差分で更新する。
+        読み込み中に届いた add_exp の差分は、読んだ結果に含まれていなければ加え直す。
+        """
+        if HistoryService._exp_board_stale():
+            with HistoryService._exp_board_lock:
+                # 待っている間に他のスレッドが読み直していれば不要
+                if HistoryService._exp_board_stale():
+                    if not HistoryService._reload_exp_board():
+                        return None
+
+        # ユーザー情報と結合してフィルタリング
+        all_users = EconomyService.get_all_users()
+
+        # Admin IDを特定 (重複エントリ対策: どこかにADMINがあればそのIDはAdminとみなす)
+        admin_ids = set()
+        for u in all_users:
+            if str(u.get("role", "")).strip().upper() == "ADMIN":
+                admin_ids.add(str(u.get("user_id")))
+
+        members = {}
+        for u in all_users:
+            uid = str(u.get("user_id"))
+            # Adminとして特定されたIDはスキップ
+            if uid in admin_ids:
+                continue
+            if str(u.get("role", "")).strip().upper() != "USER":
+                continue
+            members.setdefault(uid, u)
+
+        weekly_exp_board.set_members(members)
+        return members
 
-        user_exp = {}  # {user_id: total_exp}
+    @staticmethod
+    def _reload_exp_board():
+        """取引履歴から週間EXPの順位表を作り直す（読めなければ False）"""
+        if not GSheetService.get_worksheet("transactions"):
+            return False
 
+        started = time.time()
+        weekly_exp_board.begin_load()
         try:
-            records = sheet.get_all_records()
-            for tx in records:
-                # tx: tx_id, user_id, amount, tx_type, related_id, timestamp
-                if tx.get("tx_type") != "REWARD":
+            # 必要な4列だけを読む（tx_id / related_id などは取得しない）
+            cols = GSheetService.get_columns(
+                "transactions", ["user_id", "amount", "tx_type", "timestamp"]
+            )
+            if not cols:
+                # 読めなかったら順位表は前回のまま（次回また読み込む）
+                return False
+            entries = []
+            for uid, amount, tx_type, ts_str in zip(
+                cols.get("user_id", []),
+                cols.get("amount", []),
+                cols.get("tx_type", []),
+                cols.get("timestamp", []),
+            ):
+                if tx_type != "REWARD":
                     continue
 
-                ts_str = str(tx.get("timestamp"))
                 try:
                     # フォーマットは "YYYY-MM-DD HH:MM:SS"
                     tx_date = datetime.datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S")
+                    amount = int(amount or 0)
                 except:
                     continue
 
-                if tx_date < week_start:
-                    continue
-
-                uid = str(tx.get("user_id"))
-                amount = int(tx.get("amount", 0))
-                user_exp[uid] = user_exp.get(uid, 0) + amount
-
-            # ユーザー情報と結合してフィルタリング
-            all_users = EconomyService.get_all_users()
-
-            # Admin IDを特定 (重複エントリ対策: どこかにADMINがあればそのIDはAdminとみなす)
-            admin_ids = set()
-            for u in all_users:
-                if str(u.get("role", "")).strip().upper() == "ADMIN":
-                    admin_ids.add(str(u.get("user_id")))
+                entries.append((str(uid), tx_date.strftime("%Y-%m-%d"), amount, ts_str))
+            # 今週より前の記録は順位表側で除かれる
+            weekly_exp_board.load(entries, started)
+            return True
+        finally:
+            weekly_exp_board.end_load()
 
-            ranking = []
-
-            for u in all_users:
-                uid = str(u.get("user_id"))
-
-                # Adminとして特定されたIDはスキップ
-                if uid in admin_ids:
-                    continue
-
-                role = str(u.get("role", "")).strip().upper()
-                if role != "USER":
-                    continue
-
-                earned = user_exp.get(uid, 0)
-                ranking.append(
-                    {
-                        "user_id": uid,
-                        "display_name": u.get("display_name"),
-                        "weekly_exp": earned,
-                        "total_study_time": u.get("total_study_time", 0),
-                        "user_rank": u.get("rank", "E"),  # シートのランク情報を追加
-                    }
-                )
-
-            # ソート
-            ranking.sort(key=lambda x: x["weekly_exp"], reverse=True)
+    @staticmethod
+    def _exp_ranking_entry(user, rank, weekly_exp):
+        return {
+            "user_id": str(user.get("user_id")),
+            "display_name": user.get("display_name"),
+            "weekly_exp": weekly_exp,
+            "total_study_time": user.get("total_study_time", 0),
+            "user_rank": user.get("rank", "E"),  # シートのランク情報を追加
+            "rank": rank,
+        }
 
-            # 順位付け
-            for i, r in enumerate(ranking):
-                r["rank"] = i + 1
+    @staticmethod
+    def get_weekly_exp_ranking():
+        """今週（月曜始まり）の獲得EXPランキング（USERのみ・全員分）"""
+        try:
+            members = HistoryService._sync_exp_board()
+            if not members:
+                return []
+            return [
+                HistoryService._exp_ranking_entry(members[uid], i, exp)
+                for i, (uid, exp) in enumerate(weekly_exp_board.top(), start=1)
+            ]
+        except Exception as e:
+            print(f"Weekly Ranking Error: {e}")
+            return []
 
-            return ranking
+    @staticmethod
+    def get_weekly_exp_top(user_id=None, limit=10):
+        """週間EXPランキングの上位 limit 件と、user_id 自身の順位を返す
 
+        (上位のリスト, 自分のエントリ or None)。全員分を並べ直さずに済む。
+        """
+        try:
+            members = HistoryService._sync_exp_board()
+            if not members:
+                return [], None
+            top = [
+                HistoryService._exp_ranking_entry(members[uid], i, exp)
+                for i, (uid, exp) in enumerate(weekly_exp_board.top(limit), start=1)
+            ]
+            me = None
+            found = weekly_exp_board.rank(user_id) if user_id else None
+            if found:
+                rank, exp = found
+                me = HistoryService._exp_ranking_entry(members[str(user_id)], rank, exp)
+            return top, me
         except Exception as e:
             print(f"Weekly Ranking Error: {e}")
-            return []
+            return [], None
 
     @staticmethod
-    @cached(activity_cache, key_func=lambda limit=10: f"recent_activity_{limit}")
+    @cached(
+        activity_cache,
+        key_func=lambda limit=10: f"recent_activity_{limit}",
+        stale_ttl=120,
+    )
     def get_all_recent_activity(limit=10):
         """全ユーザーの最近の勉強・お手伝い履歴を取得"""
         recent_items = []
 
         # 1) 勉強履歴を取得
         try:
-            study_sheet = GSheetService.get_worksheet("study_log")
-            if study_sheet:
-                records = study_sheet.get_all_values()
-                if len(records) > 1:
-                    headers = records[0]
-                    col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            records = study_log_replica.get_all_values()
+            if len(records) > 1:
+                headers = records[0]
+                col_map = {str(h).strip(): i for i, h in enumerate(headers)}
 
-                    idx_name = col_map.get("display_name")
-                    idx_date = col_map.get("date")
-                    idx_dur = col_map.get("duration_min")
-                    idx_subj = col_map.get("subject")
-                    idx_stat = col_map.get("status")
-                    idx_time = col_map.get("start_time")
-                    idx_comment = col_map.get("comment")
-                    idx_likes = col_map.get("likes")
-                    idx_liked_by = col_map.get("liked_by")
-                    idx_comments = col_map.get("comments")
+                idx_name = col_map.get("display_name")
+                idx_date = col_map.get("date")
+                idx_dur = col_map.get("duration_min")
+                idx_subj = col_map.get("subject")
+                idx_stat = col_map.get("status")
+                idx_time = col_map.get("start_time")
+                idx_comment = col_map.get("comment")
+                idx_likes = col_map.get("likes")
+                idx_liked_by = col_map.get("liked_by")
+                idx_comments = col_map.get("comments")
+                idx_sid = col_map.get("session_id")
 
-                    import json
+                import json
 
-                    for row_index, row in enumerate(records[1:], start=2):
-                        # APPROVED または DONE のもののみ
-                        status = (
-                            row[idx_stat] if idx_stat and len(row) > idx_stat else ""
-                        )
-                        if status.upper() not in ["APPROVED", "DONE"]:
-                            continue
+                for row_index, row in enumerate(records[1:], start=2):
+                    # APPROVED または DONE のもののみ
+                    status = row[idx_stat] if idx_stat and len(row) > idx_stat else ""
+                    if status.upper() not in ["APPROVED", "DONE"]:
+                        continue
 
-                        duration_str = (
-                            row[idx_dur] if idx_dur and len(row) > idx_dur else "0"
-                        )
-                        if not duration_str.isdigit() or int(duration_str) == 0:
-                            continue
+                    duration_str = (
+                        row[idx_dur] if idx_dur and len(row) > idx_dur else "0"
+                    )
+                    if not duration_str.isdigit() or int(duration_str) == 0:
+                        continue
 
-                        name = (
-                            row[idx_name]
-                            if idx_name and len(row) > idx_name
-                            else "Unknown"
-                        )
-                        date = row[idx_date] if idx_date and len(row) > idx_date else ""
-                        subject = (
-                            row[idx_subj] if idx_subj and len(row) > idx_subj else ""
-                        )
-                        start_time = (
-                            row[idx_time] if idx_time and len(row) > idx_time else ""
-                        )
-                        comment = (
-                            row[idx_comment]
-                            if idx_comment and len(row) > idx_comment
-                            else ""
-                        )
+                    name = (
+                        row[idx_name] if idx_name and len(row) > idx_name else "Unknown"
+                    )
+                    date = row[idx_date] if idx_date and len(row) > idx_date else ""
+                    subject = row[idx_subj] if idx_subj and len(row) > idx_subj else ""
+                    start_time = (
+                        row[idx_time] if idx_time and len(row) > idx_time else ""
+                    )
+                    comment = (
+                        row[idx_comment]
+                        if idx_comment and len(row) > idx_comment
+                        else ""
+                    )
 
-                        # いいね・コメント情報
-                        likes = (
-                            int(row[idx_likes])
-                            if idx_likes
-                            and len(row) > idx_likes
-                            and row[idx_likes].isdigit()
-                            else 0
-                        )
-                        liked_by_str = (
-                            row[idx_liked_by]
-                            if idx_liked_by and len(row) > idx_liked_by
-                            else "[]"
-                        )
-                        try:
-                            liked_by = json.loads(liked_by_str) if liked_by_str else []
-                        except:
-                            liked_by = []
-                        comments_count = (
-                            int(row[idx_comments])
-                            if idx_comments
-                            and len(row) > idx_comments
-                            and row[idx_comments].isdigit()
-                            else 0
-                        )
+                    # いいね・コメント情報
+                    likes = (
+                        int(row[idx_likes])
+                        if idx_likes
+                        and len(row) > idx_likes
+                        and row[idx_likes].isdigit()
+                        else 0
+                    )
+                    liked_by_str = (
+                        row[idx_liked_by]
+                        if idx_liked_by and len(row) > idx_liked_by
+                        else "[]"
+                    )
+                    try:
+                        liked_by = json.loads(liked_by_str) if liked_by_str else []
+                    except:
+                        liked_by = []
+                    comments_count = (
+                        int(row[idx_comments])
+                        if idx_comments
+                        and len(row) > idx_comments
+                        and row[idx_comments].isdigit()
+                        else 0
+                    )
 
-                        # タイムスタンプ用にdate + start_timeを結合
-                        timestamp = f"{date} {start_time}" if start_time else date
+                    # タイムスタンプ用にdate + start_timeを結合
+                    timestamp = f"{date} {start_time}" if start_time else date
 
-                        recent_items.append(
-                            {
-                                "type": "study",
-                                "row_index": row_index,  # いいね・コメント用
-                                "user_name": name,
-                                "description": f"{subject} {duration_str}分",
-                                "comment": comment,
-                                "timestamp": timestamp,
-                                "icon": "📚",
-                                "likes": likes,
-                                "liked_by": liked_by,
-                                "comments_count": comments_count,
-                            }
-                        )
+                    recent_items.append(
+                        {
+                            "type": "study",
+                            "row_index": row_index,  # いいね・コメント用
+                            "user_name": name,
+                            "description": f"{subject} {duration_str}分",
+                            "comment": comment,
+                            "timestamp": timestamp,
+                            "icon": "📚",
+                            "likes": likes,
+                            "liked_by": liked_by,
+                            "comments_count": comments_count,
+                            "session_id": (
+                                row[idx_sid]
+                                if idx_sid is not None and len(row) > idx_sid
+                                else ""
+                            ),
+                        }
+                    )
         except Exception as e:
             print(f"Study Activity Error: {e}")
 
@@ -1111,15 +706,22 @@ class HistoryService:
     # ========== いいね・コメント機能 ==========
 
     @staticmethod
-    def toggle_like(study_row_index, user_id):
+    @RowShiftLock.holding
+    def toggle_like(study_row_index, user_id, session_id=None):
         """勉強記録にいいねをトグル"""
         sheet = GSheetService.get_worksheet("study_log")
         if not sheet:
             return {"success": False, "message": "シートが見つかりません"}
 
         try:
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            study_row_index = GSheetService.resolve_study_row(
+                study_row_index, session_id
+            )
+            if not study_row_index:
+                return {"success": False, "message": "記録が見つかりません"}
+
+            headers = SheetSchema.headers(sheet)
+            col_map = SheetSchema.col_map(sheet)
 
             idx_likes = col_map.get("likes")
             idx_liked_by = col_map.get("liked_by")
@@ -1128,12 +730,17 @@ class HistoryService:
             if idx_likes is None:
                 idx_likes = len(headers)
                 sheet.update_cell(1, idx_likes + 1, "likes")
+                study_log_replica.apply_update(1, idx_likes, "likes")
             if idx_liked_by is None:
                 idx_liked_by = len(headers) + (1 if idx_likes == len(headers) else 0)
                 sheet.update_cell(1, idx_liked_by + 1, "liked_by")
+                study_log_replica.apply_update(1, idx_liked_by, "liked_by")
+            if len(headers) <= max(idx_likes, idx_liked_by):
+                # カラムを追加したのでヘッダーキャッシュを破棄
+                SheetSchema.invalidate("study_log")
 
-            # 現在の値を取得
-            row = sheet.row_values(study_row_index)
+            # 現在の値はレプリカから取得（書き込みごとに反映済み）
+            row = study_log_replica.row(study_row_index) or []
             current_likes = (
                 int(row[idx_likes])
                 if len(row) > idx_likes and row[idx_likes].isdigit()
@@ -1159,8 +766,17 @@ class HistoryService:
                 action = "liked"
 
             # 更新
-            sheet.update_cell(study_row_index, idx_likes + 1, current_likes)
-            sheet.update_cell(study_row_index, idx_liked_by + 1, json.dumps(liked_by))
+            GSheetService.update_cells(
+                sheet,
+                [
+                    (study_row_index, idx_likes + 1, current_likes),
+                    (study_row_index, idx_liked_by + 1, json.dumps(liked_by)),
+                ],
+            )
+            study_log_replica.apply_update(study_row_index, idx_likes, current_likes)
+            study_log_replica.apply_update(
+                study_row_index, idx_liked_by, json.dumps(liked_by)
+            )
 
             return {
                 "success": True,
@@ -1173,12 +789,16 @@ class HistoryService:
             return {"success": False, "message": str(e)}
 
     @staticmethod
-    def get_comments(study_row_index):
+    def get_comments(study_row_index, session_id=None):
         """勉強記録のコメント一覧を取得"""
         sheet = GSheetService.get_worksheet("study_comments")
         if not sheet:
             return []
 
+        study_row_index = GSheetService.resolve_study_row(study_row_index, session_id)
+        if not study_row_index:
+            return []
+
         try:
             records = sheet.get_all_values()
             if len(records) <= 1:
@@ -1215,8 +835,13 @@ class HistoryService:
             return []
 
     @staticmethod
-    def add_comment(study_row_index, user_id, user_name, comment):
+    @RowShiftLock.holding
+    def add_comment(study_row_index, user_id, user_name, comment, session_id=None):
         """勉強記録にコメントを追加"""
+        study_row_index = GSheetService.resolve_study_row(study_row_index, session_id)
+        if not study_row_index:
+            return {"success": False, "message": "記録が見つかりません"}
+
         sheet = GSheetService.get_worksheet("study_comments")
         if not sheet:
             # シートがなければ作成
@@ -1228,6 +853,7 @@ class HistoryService:
                         "message": "スプレッドシートに接続できませんでした",
                     }
                 sheet = doc.add_worksheet(title="study_comments", rows=100, cols=10)
+                GSheetService.register_worksheet(sheet)
                 sheet.update(
                     "A1:E1",
                     [
@@ -1255,22 +881,28 @@ class HistoryService:
             # study_logのコメント数も更新
             study_sheet = GSheetService.get_worksheet("study_log")
             if study_sheet:
-                headers = study_sheet.row_values(1)
-                col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+                headers = SheetSchema.headers(study_sheet)
+                col_map = SheetSchema.col_map(study_sheet)
                 idx_comments = col_map.get("comments")
 
                 if idx_comments is None:
                     idx_comments = len(headers)
                     study_sheet.update_cell(1, idx_comments + 1, "comments")
+                    study_log_replica.apply_update(1, idx_comments, "comments")
+                    SheetSchema.invalidate("study_log")
 
-                row = study_sheet.row_values(study_row_index)
+                row = study_log_replica.row(study_row_index) or []
                 current_count = (
                     int(row[idx_comments])
                     if len(row) > idx_comments and row[idx_comments].isdigit()
                     else 0
                 )
-                study_sheet.update_cell(
-                    study_row_index, idx_comments + 1, current_count + 1
+                GSheetService.update_cells(
+                    study_sheet,
+                    [(study_row_index, idx_comments + 1, current_count + 1)],
+                )
+                study_log_replica.apply_update(
+                    study_row_index, idx_comments, current_count + 1
                 )
 
             return {"success": True, "created_at": created_at}
@@ -1,4 +1,5 @@
 from services.gsheet import GSheetService
+from services.sheet_schema import SheetSchema
 from services.economy import EconomyService
 from utils.cache import job_list_cache, cached
 import datetime
@@ -6,6 +7,7 @@ import datetime
 
 class JobService:
     @staticmethod
+    @cached(job_list_cache, cache_empty=False)
     def get_all_jobs_map():
         """全ジョブをID:Titleの辞書で取得（管理画面用・動的カラムマッピング）"""
         sheet = GSheetService.get_worksheet("jobs")
@@ -181,8 +183,8 @@ class JobService:
             return False, "シートエラー"
 
         try:
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            headers = SheetSchema.headers(sheet)
+            col_map = SheetSchema.col_map(sheet)
 
             # Construct row based on headers
             row_data = [""] * len(headers)
@@ -221,8 +223,7 @@ class JobService:
             if not cell:
                 return False, "ジョブが見つかりません"
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            col_map = SheetSchema.col_map(sheet)
 
             idx_status = col_map.get("status")
             idx_worker = col_map.get("worker_id")
@@ -262,8 +263,7 @@ class JobService:
             if not cell:
                 return False, "ジョブが見つかりません"
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            col_map = SheetSchema.col_map(sheet)
 
             idx_status = col_map.get("status")
             idx_worker = col_map.get("worker_id")
@@ -281,14 +281,15 @@ class JobService:
             if worker != user_id:
                 return False, "担当者ではありません"
 
-            sheet.update_cell(row, idx_status + 1, "REVIEW")
+            updates = [(row, idx_status + 1, "REVIEW")]
 
             # コメントと完了時刻を記録
             now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             if idx_comment is not None:
-                sheet.update_cell(row, idx_comment + 1, comment)
+                updates.append((row, idx_comment + 1, comment))
             if idx_finished is not None:
-                sheet.update_cell(row, idx_finished + 1, now_str)
+                updates.append((row, idx_finished + 1, now_str))
+            GSheetService.update_cells(sheet, updates)
 
             title = (
                 sheet.cell(row, idx_title + 1).value if idx_title is not None else ""
@@ -312,8 +313,7 @@ class JobService:
             if not cell:
                 return False, "ジョブが見つかりません"
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            col_map = SheetSchema.col_map(sheet)
 
             idx_status = col_map.get("status")
             idx_worker = col_map.get("worker_id")
@@ -370,8 +370,7 @@ class JobService:
             if not cell:
                 return False, "ジョブが見つかりません"
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            col_map = SheetSchema.col_map(sheet)
 
             idx_status = col_map.get("status")
             idx_title = col_map.get("title")
@@ -402,8 +401,8 @@ class JobService:
             return False, "Sheet not found"
 
         try:
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            headers = SheetSchema.headers(sheet)
+            col_map = SheetSchema.col_map(sheet)
 
             row_data = [""] * len(headers)
 
@@ -423,8 +422,6 @@ class JobService:
             set_val("created_at", datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
             sheet.append_row(row_data)
-            # キャッシュクリア
-            job_list_cache.clear()
             return True, job_id
         except Exception as e:
             return False, str(e)
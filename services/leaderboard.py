@@ -0,0 +1,245 @@
+import bisect
+import datetime
+import threading
+
+
+class Leaderboard:
+    """スコア順の順位表
+
+    (−スコア, user_id) の昇順リストを bisect で維持するので、スコアの更新と
+    自分の順位の検索は O(log n)、上位 K 件は先頭から K 件読むだけで済む。
+    同点は user_id 順に並べる。
+    """
+
+    def __init__(self):
+        self._scores = {}
+        self._order = []
+
+    def __len__(self):
+        return len(self._order)
+
+    def set(self, user_id, score):
+        self.discard(user_id)
+        self._scores[user_id] = score
+        bisect.insort(self._order, (-score, user_id))
+
+    def discard(self, user_id):
+        score = self._scores.pop(user_id, None)
+        if score is not None:
+            del self._order[bisect.bisect_left(self._order, (-score, user_id))]
+
+    def score(self, user_id):
+        return self._scores.get(user_id)
+
+    def rank(self, user_id):
+        """1始まりの順位（載っていなければ None）"""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return bisect.bisect_left(self._order, (-score, user_id)) + 1
+
+    def top(self, k=None):
+        """上位 k 件の [(user_id, スコア)]（k=None なら全件）"""
+        entries = self._order if k is None else self._order[:k]
+        return [(user_id, -neg_score) for neg_score, user_id in entries]
+
+
+class WeeklyLeaderboard:
+    """集計期間（週）内のスコアを差分で更新する順位表
+
+    日付ごとの差分を持っておき、期間の開始日が進んだら範囲外になった日の
+    差分だけを引いて繰り越す（元データを読み直さない）。
+    window_start() は現在の期間の開始日（"YYYY-MM-DD"）を返す関数。
+    set_members() で対象ユーザーを指定すると、そのユーザーだけを
+    （スコア0も含めて）順位表に載せる。指定しなければスコアのあるユーザーのみ。
+    """
+
+    def __init__(self, window_start):
+        self.window_start = window_start
+        self._lock = threading.RLock()
+        self._board = Leaderboard()
+        # 期間内の合計（対象外のユーザーも含む）
+        self._totals = {}
+        # 日付 -> {user_id: 合計}
+        self._days = {}
+        self._start = window_start()
+        self._members = None
+        # begin_load() から load() までに届いた add() の [(user_id, 日付, 差分, key)]
+        self._pending = None
+        # 元データから読み込んだ時刻（差分だけで維持するものは None のまま）
+        self.loaded_at = None
+
+    # ---------- 更新 ----------
+
+    def reset(self):
+        """空にする（元データから作り直す前に呼ぶ）"""
+        with self._lock:
+            self._board = Leaderboard()
+            self._totals = {}
+            self._days = {}
+            self._start = self.window_start()
+            if self._members is not None:
+                for user_id in self._members:
+                    self._board.set(user_id, 0)
+
+    def replace(self, entries):
+        """[(user_id, 日付, スコア)] から作り直した中身に一度に差し替える
+
+        別の順位表に組み立ててから入れ替えるので、読み出し側が空や
+        途中の状態を見ることはない。
+        """
+        fresh = WeeklyLeaderboard(self.window_start)
+        with self._lock:
+            members = self._members
+        if members is not None:
+            fresh.set_members(members)
+        for user_id, date_str, delta in entries:
+            fresh._add(str(user_id), date_str, delta)
+
+        with self._lock:
+            current = self._members
+            self._board = fresh._board
+            self._totals = fresh._totals
+            self._days = fresh._days
+            self._start = fresh._start
+            self._members = members
+            if current is not None and current != members:
+                # 組み立てている間に対象ユーザーが変わったので並べ直す
+                self._members = None
+                self.set_members(current)
+
+    def begin_load(self):
+        """元データを読む直前に呼ぶ（load() までに届いた add() を覚えておく）"""
+        with self._lock:
+            self._pending = []
+
+    def end_load(self):
+        """読み込みを終える（load() しなかった場合の後始末。順位表はそのまま）"""
+        with self._lock:
+            self._pending = None
+
+    def load(self, entries, loaded_at):
+        """元データの [(user_id, 日付, スコア, key)] で丸ごと置き換える
+
+        begin_load() 以降に add() された差分のうち、読み込んだ元データに
+        同じ (user_id, スコア, key) が無いもの（読んだ後に記録されたもの）は
+        置き換えた後に加え直す。
+        """
+        with self._lock:
+            pending = self._pending or []
+            self._pending = None
+            self.reset()
+            loaded = {}
+            for user_id, date_str, delta, key in entries:
+                self._add(str(user_id), date_str, delta)
+                entry = (str(user_id), delta, key)
+                loaded[entry] = loaded.get(entry, 0) + 1
+            for user_id, date_str, delta, key in pending:
+                entry = (user_id, delta, key)
+                if key is not None and loaded.get(entry):
+                    loaded[entry] -= 1
+                    continue
+                self._add(user_id, date_str, delta)
+            self.loaded_at = loaded_at
+
+    def add(self, user_id, date_str, delta, key=None):
+        """date_str（"YYYY-MM-DD"）の日に user_id のスコアを delta 増やす
+
+        key は元データの行を特定する値（取引履歴なら timestamp）。
+        読み込み中の差分が元データに含まれていたかの判定に使う。
+        """
+        if not user_id or not delta:
+            return
+        user_id = str(user_id)
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((user_id, date_str, delta, key))
+            self._add(user_id, date_str, delta)
+
+    def _add(self, user_id, date_str, delta):
+        if not user_id or not delta:
+            return
+        self._roll()
+        if date_str < self._start:
+            return
+        day = self._days.setdefault(date_str, {})
+        day[user_id] = day.get(user_id, 0) + delta
+        if day[user_id] == 0:
+            del day[user_id]
+        self._bump(user_id, delta)
+
+    def set_members(self, user_ids):
+        """順位表に載せるユーザーを指定（変わったときだけ並べ直す）"""
+        members = frozenset(str(u) for u in user_ids)
+        with self._lock:
+            if members == self._members:
+                return
+            self._members = members
+            self._board = Leaderboard()
+            for user_id in members:
+                self._board.set(user_id, self._totals.get(user_id, 0))
+
+    def _bump(self, user_id, delta):
+        total = self._totals.get(user_id, 0) + delta
+        if total:
+            self._totals[user_id] = total
+        else:
+            self._totals.pop(user_id, None)
+
+        if self._members is None:
+            if total:
+                self._board.set(user_id, total)
+            else:
+                self._board.discard(user_id)
+        elif user_id in self._members:
+            self._board.set(user_id, total)
+
+    def _roll(self):
+        """期間の開始日が進んでいたら範囲外の日の差分を引く"""
+        start = self.window_start()
+        if start <= self._start:
+            return
+        for date_str in [d for d in self._days if d < start]:
+            for user_id, delta in self._days.pop(date_str).items():
+                self._bump(user_id, -delta)
+        self._start = start
+
+    # ---------- 読み出し ----------
+
+    def top(self, k=None):
+        """上位 k 件の [(user_id, スコア)]（k=None なら全件）"""
+        with self._lock:
+            self._roll()
+            return self._board.top(k)
+
+    def rank(self, user_id):
+        """(順位, スコア) を返す（順位表に載っていなければ None）"""
+        with self._lock:
+            self._roll()
+            user_id = str(user_id)
+            rank = self._board.rank(user_id)
+            return (rank, self._board.score(user_id)) if rank else None
+
+    def __len__(self):
+        with self._lock:
+            self._roll()
+            return len(self._board)
+
+
+def _last_7_days_start():
+    """今日（JST）を含む過去7日間の開始日"""
+    today = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9))).date()
+    return (today - datetime.timedelta(days=6)).strftime("%Y-%m-%d")
+
+
+def _this_week_start():
+    """今週の月曜日（取引履歴の timestamp と同じくサーバー時刻）"""
+    today = datetime.datetime.now().date()
+    return (today - datetime.timedelta(days=today.weekday())).strftime("%Y-%m-%d")
+
+
+# 過去7日間の勉強時間（承認済み）。study_log のロールアップから差分で更新される
+study_time_board = WeeklyLeaderboard(_last_7_days_start)
+
+# 今週（月曜始まり）の獲得EXP。取引履歴から読み込み、add_exp で差分を加える
+weekly_exp_board = WeeklyLeaderboard(_this_week_start)
@@ -0,0 +1,168 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
+
+class LocalStore:
+    """シートレプリカの行をローカルの SQLite に保存する写し
+
+    プロセス再起動時に全件取得の代わりにここから復元するためだけに使い、
+    検索はメモリ上のレプリカ（とその索引）で行う。
+    Render のディスクは再デプロイで消えるため、正本はあくまでスプレッドシート
+    （保護者が直接閲覧・編集する）。
+    行番号はシートと同じ（1始まり、1 = ヘッダー）。
+    """
+
+    _conn = None
+    _lock = threading.RLock()
+    _disabled = False
+
+    @staticmethod
+    def _db_path():
+        return os.environ.get("LOCAL_STORE_PATH") or os.path.join(
+            tempfile.gettempdir(), "saga_local_store.sqlite3"
+        )
+
+    @classmethod
+    def _get_conn(cls):
+        if cls._conn is not None or cls._disabled:
+            return cls._conn
+        try:
+            conn = sqlite3.connect(cls._db_path(), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # 旧形式（索引列付き）のテーブルは使わないので消しておく
+            conn.executescript(
+                """
+                DROP TABLE IF EXISTS sheet_rows;
+                CREATE TABLE IF NOT EXISTS replica_rows (
+                    sheet_name TEXT NOT NULL,
+                    row_index INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (sheet_name, row_index)
+                );
+                CREATE TABLE IF NOT EXISTS sheet_meta (
+                    sheet_name TEXT PRIMARY KEY,
+                    loaded_at REAL NOT NULL
+                );
+                """
+            )
+            cls._conn = conn
+        except Exception as e:
+            # ローカルストアは高速化のためだけなので、使えなければ無効化して続行
+            print(f"【Error】ローカルストア初期化失敗: {e}")
+            cls._disabled = True
+        return cls._conn
+
+    @staticmethod
+    def _record(sheet_name, row_index, row):
+        return (sheet_name, row_index, json.dumps(row, ensure_ascii=False))
+
+    @classmethod
+    def _run(cls, fn):
+        with cls._lock:
+            conn = cls._get_conn()
+            if conn is None:
+                return None
+            try:
+                with conn:
+                    return fn(conn)
+            except Exception as e:
+                print(f"【Error】ローカルストア操作失敗: {e}")
+                return None
+
+    @classmethod
+    def save_all(cls, sheet_name, rows, loaded_at):
+        """シート全体（get_all_values() 形式）を保存し直す"""
+
+        def op(conn):
+            conn.execute("DELETE FROM replica_rows WHERE sheet_name = ?", (sheet_name,))
+            if rows:
+                conn.executemany(
+                    "INSERT INTO replica_rows VALUES (?, ?, ?)",
+                    [
+                        cls._record(sheet_name, i, row)
+                        for i, row in enumerate(rows, start=1)
+                    ],
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO sheet_meta VALUES (?, ?)",
+                (sheet_name, loaded_at),
+            )
+
+        cls._run(op)
+
+    @classmethod
+    def save_rows(cls, sheet_name, start_index, rows):
+        """start_index 行目から rows を上書き保存（追記・セル更新用）"""
+        if not rows:
+            return
+
+        def op(conn):
+            conn.executemany(
+                "INSERT OR REPLACE INTO replica_rows VALUES (?, ?, ?)",
+                [
+                    cls._record(sheet_name, i, row)
+                    for i, row in enumerate(rows, start=start_index)
+                ],
+            )
+
+        cls._run(op)
+
+    @classmethod
+    def delete_row(cls, sheet_name, row_index):
+        """行を削除し、以降の行番号を1つ繰り上げる"""
+
+        def op(conn):
+            conn.execute(
+                "DELETE FROM replica_rows WHERE sheet_name = ? AND row_index = ?",
+                (sheet_name, row_index),
+            )
+            # 主キーの衝突を避けるため一度負数に退避してから戻す
+            conn.execute(
+                "UPDATE replica_rows SET row_index = -(row_index - 1) "
+                "WHERE sheet_name = ? AND row_index > ?",
+                (sheet_name, row_index),
+            )
+            conn.execute(
+                "UPDATE replica_rows SET row_index = -row_index "
+                "WHERE sheet_name = ? AND row_index < 0",
+                (sheet_name,),
+            )
+
+        cls._run(op)
+
+    @classmethod
+    def load(cls, sheet_name):
+        """保存済みの (rows, loaded_at) を返す（無ければ None）"""
+
+        def op(conn):
+            meta = conn.execute(
+                "SELECT loaded_at FROM sheet_meta WHERE sheet_name = ?", (sheet_name,)
+            ).fetchone()
+            if not meta:
+                return None
+            cur = conn.execute(
+                "SELECT row_index, data FROM replica_rows "
+                "WHERE sheet_name = ? ORDER BY row_index",
+                (sheet_name,),
+            )
+            rows = []
+            for row_index, data in cur:
+                # 行番号が飛んでいたら壊れているとみなす
+                if row_index != len(rows) + 1:
+                    return None
+                rows.append(json.loads(data))
+            return (rows, meta[0]) if rows else None
+
+        return cls._run(op)
+
+    @classmethod
+    def clear(cls, sheet_name):
+        def op(conn):
+            conn.execute("DELETE FROM replica_rows WHERE sheet_name = ?", (sheet_name,))
+            conn.execute("DELETE FROM sheet_meta WHERE sheet_name = ?", (sheet_name,))
+
+        cls._run(op)
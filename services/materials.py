@@ -25,6 +25,7 @@ class MaterialsService:
             if not sh:
                 raise Exception("スプレッドシートに接続できません")
             ws = sh.add_worksheet(title=cls.SHEET_NAME, rows=1000, cols=10)
+            GSheetService.register_worksheet(ws)
             # ヘッダ行を追加
             ws.update(
                 "A1:H1",
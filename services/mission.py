@@ -1,5 +1,6 @@
 import datetime
 from services.gsheet import GSheetService
+from services.sheet_schema import SheetSchema
 from services.economy import EconomyService
 
 
@@ -15,8 +16,8 @@ class MissionService:
             mission_id = f"msn_{int(datetime.datetime.now().timestamp())}"
             now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            headers = SheetSchema.headers(sheet)
+            col_map = SheetSchema.col_map(sheet)
 
             row_data = [""] * len(headers)
 
@@ -100,8 +101,7 @@ class MissionService:
             if not cell:
                 return False
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            col_map = SheetSchema.col_map(sheet)
 
             idx_uid = col_map.get("user_id")
             idx_status = col_map.get("status")
@@ -133,8 +133,7 @@ class MissionService:
             if not cell:
                 return False, "Mission not found"
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            col_map = SheetSchema.col_map(sheet)
 
             idx_uid = col_map.get("user_id")
             idx_title = col_map.get("title")
@@ -239,8 +238,7 @@ class MissionService:
             if not cell:
                 return False
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            col_map = SheetSchema.col_map(sheet)
             idx_status = col_map.get("status")
             if idx_status is None:
                 return False
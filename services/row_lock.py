@@ -0,0 +1,108 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+
+class RowShiftLock:
+    """行番号を指定した書き込みと、行番号がずれる一括削除を排他するロック
+
+    行番号を調べてから書き込むまでの間は shared を持つ（LIFF などのリクエストは
+    リクエスト全体、LINE のイベントは study_log の行を扱う処理の間）。
+    アーカイブの行削除は削除のたびに exclusive を取り、shared が1つも無い
+    隙間を待ってから消す。待っている間も新しい shared は待たせないので、
+    リクエストが止まるのは実際に削除している間だけ。
+    exclusive を取らずに行を消す処理（ロールバックなど）は note_shift() で記録し、
+    アーカイブ側は shift_count() が変わっていたらその回の削除を見送る。
+    """
+
+    _cond = threading.Condition()
+    _readers = 0
+    _writer = None
+    _shifts = {}
+    _local = threading.local()
+
+    @classmethod
+    def _held(cls):
+        return getattr(cls._local, "shared", 0)
+
+    @classmethod
+    def acquire_shared(cls):
+        me = threading.get_ident()
+        with cls._cond:
+            if cls._held() == 0 and cls._writer != me:
+                while cls._writer is not None:
+                    cls._cond.wait()
+            cls._readers += 1
+        cls._local.shared = cls._held() + 1
+
+    @classmethod
+    def release_shared(cls):
+        if cls._held() == 0:
+            return
+        cls._local.shared = cls._held() - 1
+        with cls._cond:
+            cls._readers -= 1
+            cls._cond.notify_all()
+
+    @classmethod
+    @contextmanager
+    def shared(cls):
+        cls.acquire_shared()
+        try:
+            yield
+        finally:
+            cls.release_shared()
+
+    @classmethod
+    def holding(cls, func):
+        """実行中 shared を持つデコレータ（行番号を調べてその場で書き込む処理用）"""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with cls.shared():
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    @classmethod
+    @contextmanager
+    def exclusive(cls, timeout=None):
+        """他のスレッドの shared がすべて外れるまで待つ（取れたかどうかを返す）
+
+        自分が持っている shared（cron のリクエストなど）は数えない。
+        """
+        me = threading.get_ident()
+        own = cls._held()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        acquired = False
+        with cls._cond:
+            while cls._writer is not None or cls._readers - own > 0:
+                if deadline is None:
+                    cls._cond.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                cls._cond.wait(remaining)
+            else:
+                cls._writer = me
+                acquired = True
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                with cls._cond:
+                    cls._writer = None
+                    cls._cond.notify_all()
+
+    @classmethod
+    def note_shift(cls, sheet_title):
+        """exclusive を取らずに sheet_title の行を削除したことを記録"""
+        with cls._cond:
+            cls._shifts[sheet_title] = cls._shifts.get(sheet_title, 0) + 1
+
+    @classmethod
+    def shift_count(cls, sheet_title):
+        with cls._cond:
+            return cls._shifts.get(sheet_title, 0)
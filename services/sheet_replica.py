@@ -0,0 +1,398 @@
+import threading
+import time
+
+from services.local_store import LocalStore
+from services.sheet_schema import SheetSchema
+from services.study_rollup import StudyRollup
+from services.leaderboard import study_time_board
+from utils.cache import invalidate_sheet
+
+
+def _col_letter(col):
+    """1始まりの列番号をA1形式の列名に変換"""
+    letters = ""
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+class SheetReplica:
+    """ワークシートのプロセス内レプリカ
+
+    初回のみ get_all_values() で全件を読み込み、以降は前回同期以降に
+    追記された行だけを取得する。自プロセスでの書き込みは apply_* で
+    ローカルにも反映するので、書き込み直後の再読込は不要。
+    行の構造は get_all_values() と同じ（[0] がヘッダー、行番号 = index + 1）。
+    persist=True の場合は内容を LocalStore（SQLite）にも書き込み、
+    プロセス再起動後は全件取得の代わりにそこから復元して追記分だけ同期する。
+
+    user_id / display_name / status / (user_id, date) → 行番号 の索引を
+    メモリ上で維持しており、ユーザー単位の検索は全行を走査せずに済む。
+    session_id 列があれば session_id → 行番号 の索引（locate）も持つ。
+    aggregates に渡したオブジェクト（StudyRollup など）も索引と同じく
+    reset(header) / add(row) / remove(row) で行の変化ごとに差分更新する。
+    全行から作り直すときは reset(header) → 全行の add(row) → rebuilt() の順に呼ぶ。
+    """
+
+    # 索引を張る列（ヘッダー名）
+    INDEXED_COLUMNS = ("user_id", "display_name", "status", "date", "session_id")
+
+    def __init__(
+        self,
+        sheet_name,
+        tail_sync_interval=15,
+        full_sync_interval=300,
+        persist=True,
+        aggregates=(),
+    ):
+        self.sheet_name = sheet_name
+        self.persist = persist
+        # 追記分の同期間隔（秒）。シートを直接編集された場合の追従用
+        self.tail_sync_interval = tail_sync_interval
+        # 全件再読込の間隔（秒）。既存行の手動編集や行削除への追従用
+        self.full_sync_interval = full_sync_interval
+        self.aggregates = list(aggregates)
+
+        self._rows = []
+        self._loaded = False
+        self._loaded_at = 0
+        self._synced_at = 0
+        self._tail_dirty = False
+        self._lock = threading.RLock()
+
+        # 索引（値は行番号の集合。行番号は1始まり）
+        self._positions = {}
+        self._by_user = {}
+        self._by_name = {}
+        self._by_status = {}
+        self._by_user_date = {}
+        self._by_session = {}
+
+    def _get_sheet(self):
+        from services.gsheet import GSheetService
+
+        return GSheetService.get_worksheet(self.sheet_name)
+
+    def _width(self):
+        return len(self._rows[0]) if self._rows else 0
+
+    def _pad(self, row):
+        width = self._width()
+        row = [str(v) if v is not None else "" for v in row]
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+        return row
+
+    # ---------- 索引 ----------
+
+    def _key(self, row, name):
+        idx = self._positions.get(name)
+        return str(row[idx]).strip() if idx is not None and idx < len(row) else ""
+
+    @staticmethod
+    def _add(index, key, row_index):
+        index.setdefault(key, set()).add(row_index)
+
+    @staticmethod
+    def _discard(index, key, row_index):
+        found = index.get(key)
+        if found is not None:
+            found.discard(row_index)
+            if not found:
+                del index[key]
+
+    def _index_row(self, row_index, row, add=True):
+        op = self._add if add else self._discard
+        uid = self._key(row, "user_id")
+        name = self._key(row, "display_name")
+        status = self._key(row, "status")
+        if uid:
+            op(self._by_user, uid, row_index)
+            op(self._by_user_date, (uid, self._key(row, "date")), row_index)
+        if name:
+            op(self._by_name, name, row_index)
+        if status:
+            op(self._by_status, status, row_index)
+        session_id = self._key(row, "session_id")
+        if session_id:
+            if add:
+                self._by_session[session_id] = row_index
+            elif self._by_session.get(session_id) == row_index:
+                del self._by_session[session_id]
+        for aggregate in self.aggregates:
+            if add:
+                aggregate.add(row)
+            else:
+                aggregate.remove(row)
+
+    def _rebuild_indexes(self):
+        header = self._rows[0] if self._rows else []
+        col_map = {str(h).strip(): i for i, h in enumerate(header)}
+        self._positions = {name: col_map.get(name) for name in self.INDEXED_COLUMNS}
+        self._by_user = {}
+        self._by_name = {}
+        self._by_status = {}
+        self._by_user_date = {}
+        self._by_session = {}
+        for aggregate in self.aggregates:
+            aggregate.reset(header)
+        for i, row in enumerate(self._rows[1:], start=2):
+            self._index_row(i, row)
+        for aggregate in self.aggregates:
+            aggregate.rebuilt()
+
+    def _full_load(self, sheet):
+        rows = [list(r) for r in sheet.get_all_values()]
+        now = time.time()
+        changed = rows != self._rows
+        self._rows = rows
+        if self._rows:
+            # 全件取得のついでにヘッダーをスキーマレジストリへ登録
+            SheetSchema.register(self.sheet_name, self._rows[0])
+        self._rebuild_indexes()
+        self._loaded = True
+        self._loaded_at = now
+        self._synced_at = now
+        self._tail_dirty = False
+        if self.persist:
+            LocalStore.save_all(self.sheet_name, self._rows, now)
+        if changed:
+            # シート側で直接編集された可能性があるので、依存するキャッシュも捨てる
+            invalidate_sheet(self.sheet_name)
+
+    def _restore(self):
+        """LocalStore に残っている写しから復元（全件再読込の期限内のものだけ）"""
+        if not self.persist:
+            return False
+        stored = LocalStore.load(self.sheet_name)
+        if not stored:
+            return False
+        rows, loaded_at = stored
+        if time.time() - loaded_at >= self.full_sync_interval:
+            return False
+        self._rows = rows
+        SheetSchema.register(self.sheet_name, rows[0])
+        self._rebuild_indexes()
+        self._loaded = True
+        self._loaded_at = loaded_at
+        # 保存以降の追記分は次の同期で取得する
+        self._tail_dirty = True
+        return True
+
+    def _tail_sync(self, sheet):
+        """前回同期以降に追記された行だけを取得"""
+        width = self._width()
+        if width == 0:
+            self._full_load(sheet)
+            return
+
+        next_row = len(self._rows) + 1
+        tail = [self._pad(r) for r in sheet.get(f"A{next_row}:{_col_letter(width)}")]
+        for i, row in enumerate(tail, start=next_row):
+            self._index_row(i, row)
+        self._rows.extend(tail)
+        if tail:
+            if self.persist:
+                LocalStore.save_rows(self.sheet_name, next_row, tail)
+            invalidate_sheet(self.sheet_name)
+        self._synced_at = time.time()
+        self._tail_dirty = False
+
+    def _ensure_fresh(self):
+        if not self._loaded:
+            self._restore()
+
+        now = time.time()
+        if self._loaded and not self._tail_dirty:
+            if now - self._synced_at < self.tail_sync_interval:
+                return True
+
+        sheet = self._get_sheet()
+        if not sheet:
+            return False
+
+        if not self._loaded or now - self._loaded_at >= self.full_sync_interval:
+            self._full_load(sheet)
+        else:
+            self._tail_sync(sheet)
+        return True
+
+    def sync(self):
+        """必要なら追記分・全件を同期する（シートが無ければ False）
+
+        aggregates を読む前に呼んでおく。
+        """
+        with self._lock:
+            return self._ensure_fresh()
+
+    def rebuild_aggregates(self):
+        """索引と aggregates を手元の全行から作り直す（API は呼ばない）"""
+        with self._lock:
+            if not self._ensure_fresh():
+                return False
+            self._rebuild_indexes()
+        invalidate_sheet(self.sheet_name)
+        return True
+
+    def get_all_values(self):
+        """get_all_values() 互換の行リストを返す（シートが無ければ空リスト）"""
+        with self._lock:
+            if not self._ensure_fresh():
+                return []
+            # 行の更新はコピーオンライトなので浅いコピーで十分
+            return list(self._rows)
+
+    def header(self):
+        """ヘッダー行（シートが無ければ空リスト）"""
+        with self._lock:
+            if not self._ensure_fresh() or not self._rows:
+                return []
+            return list(self._rows[0])
+
+    def _rows_at(self, row_indexes):
+        return [(i, self._rows[i - 1]) for i in sorted(row_indexes)]
+
+    def row(self, row_index):
+        """row_index 行目（1始まり、ヘッダーの幅に揃えたもの）。範囲外なら None"""
+        with self._lock:
+            if not self._ensure_fresh() or not 2 <= row_index <= len(self._rows):
+                return None
+            return list(self._rows[row_index - 1])
+
+    def query(self, user_id=None, status=None, date=None):
+        """user_id / status / date で絞り込んだ [(row_index, row)] を行番号順で返す"""
+        with self._lock:
+            if not self._ensure_fresh():
+                return []
+
+            candidates = None
+            if user_id is not None:
+                if date is not None:
+                    candidates = self._by_user_date.get((str(user_id), date), set())
+                else:
+                    candidates = self._by_user.get(str(user_id), set())
+            if status is not None:
+                found = self._by_status.get(status, set())
+                candidates = found if candidates is None else candidates & found
+            if candidates is None:
+                candidates = range(2, len(self._rows) + 1)
+
+            if date is not None and user_id is None:
+                candidates = [
+                    i
+                    for i in candidates
+                    if self._key(self._rows[i - 1], "date") == date
+                ]
+            return self._rows_at(candidates)
+
+    def user_rows(self, user_id, user_name=None, date=None):
+        """user_id が一致する行と、display_name が user_name に一致する行を行番号順で返す
+
+        既存の検索処理と同じく、user_id が空の古い行も表示名でヒットさせる。
+        """
+        with self._lock:
+            if not self._ensure_fresh():
+                return []
+
+            if date is not None:
+                found = set(self._by_user_date.get((str(user_id), date), ()))
+            else:
+                found = set(self._by_user.get(str(user_id), ()))
+            if user_name:
+                for i in self._by_name.get(str(user_name), ()):
+                    if date is None or self._key(self._rows[i - 1], "date") == date:
+                        found.add(i)
+            return self._rows_at(found)
+
+    # ---------- 自プロセスの書き込みをローカルに反映 ----------
+    # 反映後はこのシートに依存するキャッシュを捨てる（書き込み直後の読み込みで
+    # レプリカ反映前の内容がキャッシュされていることがあるため）
+
+    def mark_appended(self):
+        """行を追記したことを記録（次回読込時に追記分を同期）"""
+        with self._lock:
+            self._tail_dirty = True
+        invalidate_sheet(self.sheet_name)
+
+    def apply_append(self, row_index, values):
+        """append_row の応答で分かった行番号に追記行を反映
+
+        ローカルの末尾と一致しない（他で追記された）場合は次回読込時に同期する。
+        """
+        with self._lock:
+            if (
+                not self._loaded
+                or self._tail_dirty
+                or row_index is None
+                or row_index != len(self._rows) + 1
+            ):
+                self._tail_dirty = True
+            else:
+                row = self._pad(values)
+                self._rows.append(row)
+                self._index_row(row_index, row)
+                if self.persist:
+                    LocalStore.save_rows(self.sheet_name, row_index, [row])
+        invalidate_sheet(self.sheet_name)
+
+    def locate(self, session_id):
+        """session_id の行番号を返す（見つからなければ None）"""
+        if not session_id:
+            return None
+        with self._lock:
+            if not self._ensure_fresh():
+                return None
+            return self._by_session.get(str(session_id))
+
+    def apply_update(self, row_index, col_index, value):
+        """セル更新を反映（row_index は1始まり、col_index は0始まり）"""
+        with self._lock:
+            if not self._loaded or row_index < 1 or row_index > len(self._rows):
+                return
+            row = list(self._rows[row_index - 1])
+            if col_index >= len(row):
+                row.extend([""] * (col_index + 1 - len(row)))
+            row[col_index] = str(value) if value is not None else ""
+            if row_index == 1:
+                # ヘッダーが変わったら列位置から索引を作り直す
+                self._rows[0] = row
+                self._rebuild_indexes()
+            else:
+                self._index_row(row_index, self._rows[row_index - 1], add=False)
+                self._rows[row_index - 1] = row
+                self._index_row(row_index, row)
+            if self.persist:
+                LocalStore.save_rows(self.sheet_name, row_index, [row])
+        invalidate_sheet(self.sheet_name)
+
+    def apply_delete(self, row_index):
+        """行削除を反映（以降の行は1つずつ繰り上がる）"""
+        with self._lock:
+            if not self._loaded or row_index < 1 or row_index > len(self._rows):
+                return
+            del self._rows[row_index - 1]
+            # 以降の行番号がずれるので索引は作り直す
+            self._rebuild_indexes()
+            if self.persist:
+                LocalStore.delete_row(self.sheet_name, row_index)
+        invalidate_sheet(self.sheet_name)
+
+    def invalidate(self):
+        """レプリカを破棄（次回読込時に全件取得）"""
+        with self._lock:
+            self._rows = []
+            self._loaded = False
+            self._rebuild_indexes()
+            if self.persist:
+                LocalStore.clear(self.sheet_name)
+        invalidate_sheet(self.sheet_name)
+
+
+# 承認済み勉強時間の (ユーザー × 日付 × 教科) ロールアップ
+study_log_rollup = StudyRollup()
+# 過去7日間の勉強時間ランキングはロールアップの差分で更新する
+study_log_rollup.watch(study_time_board)
+
+# 学習ログ（全処理がこのレプリカ経由で読む）
+study_log_replica = SheetReplica("study_log", aggregates=[study_log_rollup])
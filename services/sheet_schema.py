@@ -0,0 +1,98 @@
+import threading
+
+
+class Columns:
+    """ヘッダー名 → 0始まりの列番号 のアクセサ
+
+    cols.status のように属性でアクセスでき、存在しない列は None を返す。
+    """
+
+    def __init__(self, sheet_name, headers, version):
+        self.sheet_name = sheet_name
+        self.headers = list(headers)
+        self.version = version
+        self._map = {str(h).strip(): i for i, h in enumerate(self.headers)}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._map.get(name)
+
+    def get(self, name, default=None):
+        return self._map.get(name, default)
+
+    def __contains__(self, name):
+        return name in self._map
+
+    def __len__(self):
+        return len(self.headers)
+
+    def as_dict(self):
+        return dict(self._map)
+
+    def new_row(self):
+        """ヘッダー幅の空行を作成（append_row 用）"""
+        return [""] * len(self.headers)
+
+
+class SheetSchema:
+    """ワークシートごとのヘッダー情報キャッシュ（スキーマレジストリ）
+
+    書き込みのたびに row_values(1) でヘッダーを取りに行く代わりに、
+    一度取得したヘッダーをプロセス内で使い回す。カラムを追加する処理は
+    invalidate() / register() を呼んでキャッシュを更新すること。
+    シートごとにバージョン番号を持ち、ヘッダーが変わるたびに増える。
+    """
+
+    _columns = {}  # sheet_name -> Columns
+    _versions = {}  # sheet_name -> int
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, sheet_name, headers):
+        """取得済みのヘッダー行を登録（変更があればバージョンを上げる）"""
+        headers = [str(h) for h in headers]
+        with cls._lock:
+            current = cls._columns.get(sheet_name)
+            if current is not None and current.headers == headers:
+                return current
+            version = cls._versions.get(sheet_name, 0) + 1
+            cls._versions[sheet_name] = version
+            cols = Columns(sheet_name, headers, version)
+            cls._columns[sheet_name] = cols
+            return cols
+
+    @classmethod
+    def invalidate(cls, sheet_name):
+        """ヘッダーキャッシュを破棄（カラム追加・ヘッダー修復の後に呼ぶ）"""
+        with cls._lock:
+            if cls._columns.pop(sheet_name, None) is not None:
+                cls._versions[sheet_name] = cls._versions.get(sheet_name, 0) + 1
+
+    @classmethod
+    def version(cls, sheet_name):
+        with cls._lock:
+            return cls._versions.get(sheet_name, 0)
+
+    @classmethod
+    def columns(cls, sheet):
+        """ワークシートの Columns を取得（未登録ならヘッダー行を1回だけ取得）"""
+        with cls._lock:
+            cols = cls._columns.get(sheet.title)
+        if cols is not None:
+            return cols
+        headers = sheet.row_values(1)
+        if not headers:
+            # 空シートはキャッシュしない（ヘッダー作成後に取り直す）
+            return Columns(sheet.title, [], cls.version(sheet.title))
+        return cls.register(sheet.title, headers)
+
+    @classmethod
+    def headers(cls, sheet):
+        """ヘッダー行のリスト（row_values(1) 互換）"""
+        return list(cls.columns(sheet).headers)
+
+    @classmethod
+    def col_map(cls, sheet):
+        """{ヘッダー名: 0始まりの列番号} の辞書"""
+        return cls.columns(sheet).as_dict()
@@ -0,0 +1,102 @@
+import threading
+
+from gspread.utils import fill_gaps, numericise_all
+
+
+class SheetSnapshot:
+    """複数タブを1回の values_batch_get で取得したスナップショット
+
+    GSheetService.use_snapshot() の with ブロック内では、スナップショットに
+    含まれるタブの get_all_values() / get_all_records() が API を呼ばずに
+    ここから返される（MeteredWorksheet 経由）。同じブロック内でそのタブに
+    書き込んだら、以降はスナップショットを使わず API から読み直す。
+
+    GSheetService.read_scope()（Flask のリクエスト / LINE イベント単位）では
+    空のスナップショットから始め、最初に API から読んだタブを remember() で
+    覚えておくので、同じタブは1リクエストにつき1回しか読まない。
+    """
+
+    _local = threading.local()
+
+    def __init__(self, values_by_sheet=None):
+        self._values = dict(values_by_sheet or {})
+
+    @staticmethod
+    def from_batch_response(sheet_names, response):
+        """values_batch_get の応答から作成（ranges と同じ順で返ってくる）"""
+        value_ranges = response.get("valueRanges", [])
+        return SheetSnapshot(
+            {
+                name: fill_gaps(vr.get("values", []))
+                for name, vr in zip(sheet_names, value_ranges)
+            }
+        )
+
+    def sheet_names(self):
+        return list(self._values)
+
+    def merged(self, other):
+        """other の内容を上書きした新しいスナップショット"""
+        values = dict(self._values)
+        if other is not None:
+            values.update(other._values)
+        return SheetSnapshot(values)
+
+    def replace_with(self, other):
+        """other と同じ内容にする（入れ子のブロックで読んだ・捨てたタブを外側へ戻す）"""
+        self._values = dict(other._values)
+
+    def get_all_values(self, title):
+        values = self._values.get(title)
+        if values is None:
+            return None
+        return [list(row) for row in values]
+
+    def get_all_records(self, title):
+        """get_all_records() と同じ形（1行目がキー、数値は数値に変換）"""
+        values = self._values.get(title)
+        if values is None:
+            return None
+        if not values:
+            return []
+        keys = values[0]
+        return [dict(zip(keys, numericise_all(row))) for row in values[1:]]
+
+    def remember(self, title, values):
+        self._values[title] = [list(row) for row in values]
+
+    def discard(self, title):
+        self._values.pop(title, None)
+
+    # ---------- スレッドごとの有効なスナップショット ----------
+
+    @classmethod
+    def current(cls):
+        return getattr(cls._local, "snapshot", None)
+
+    @classmethod
+    def activate(cls, snapshot):
+        cls._local.snapshot = snapshot
+
+    @classmethod
+    def lookup_values(cls, title):
+        snapshot = cls.current()
+        return snapshot.get_all_values(title) if snapshot else None
+
+    @classmethod
+    def lookup_records(cls, title):
+        snapshot = cls.current()
+        return snapshot.get_all_records(title) if snapshot else None
+
+    @classmethod
+    def remember_current(cls, title, values):
+        """有効なスナップショットがあれば API から読んだタブを覚えておく"""
+        snapshot = cls.current()
+        if snapshot is not None:
+            snapshot.remember(title, values)
+
+    @classmethod
+    def discard_current(cls, title):
+        snapshot = cls.current()
+        if snapshot:
+            snapshot.discard(title)
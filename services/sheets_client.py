@@ -0,0 +1,390 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import gspread
+import requests
+
+from services.sheet_snapshot import SheetSnapshot
+from services.write_buffer import WriteBuffer
+from utils.cache import SimpleCache, invalidate_sheet
+
+
+def _status_code(error):
+    """APIError から HTTP ステータスコードを取り出す"""
+    code = getattr(error, "code", None)
+    if code is None:
+        response = getattr(error, "response", None)
+        code = getattr(response, "status_code", None)
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """1分あたりの呼び出し回数を制限するトークンバケット
+
+    バックグラウンドの呼び出しは reserve 分のトークンを残して待つので、
+    その分は常に対話的な呼び出し（LINE返信・LIFF）用に確保される。
+    """
+
+    def __init__(self, per_minute, reserve_ratio=0.25):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.reserve = self.capacity * reserve_ratio
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self, background=False, timeout=None):
+        """トークンを1つ取得（timeout 秒待っても取れなければ False）"""
+        floor = self.reserve if background else 0
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens - 1 >= floor:
+                    self.tokens -= 1
+                    return True
+                wait = (floor + 1 - self.tokens) / self.rate
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self._cond.wait(wait)
+
+    def drain(self):
+        """429 を受けたらバケットを空にして、しばらく送信を控える"""
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.tokens, 0)
+
+    def available(self):
+        with self._cond:
+            self._refill()
+            return self.tokens
+
+
+class SheetsClient:
+    """Sheets API 呼び出しの共通窓口
+
+    - 読み込み / 書き込みそれぞれの1分あたりクォータをトークンバケットで管理
+    - 429 / 5xx は揺らぎ付きの指数バックオフで再試行
+      （追記など冪等でない書き込みは、反映されていないことが確実な 429 のみ再試行）
+    - 対話的な処理を優先し、cron や管理画面の一括読み込みは background() で後回し
+    """
+
+    READ_PER_MINUTE = int(os.environ.get("SHEETS_READ_QUOTA", "60"))
+    WRITE_PER_MINUTE = int(os.environ.get("SHEETS_WRITE_QUOTA", "60"))
+
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+    MAX_RETRIES = {"interactive": 3, "background": 5}
+    # トークン待ちの上限（秒）。対話的な処理は待ちすぎるより送って再試行に任せる
+    MAX_WAIT = {"interactive": 10, "background": 120}
+    BACKOFF_BASE = 1.0
+    BACKOFF_MAX = 30.0
+
+    _buckets = {
+        "read": TokenBucket(READ_PER_MINUTE),
+        "write": TokenBucket(WRITE_PER_MINUTE),
+    }
+    _local = threading.local()
+    _stats_lock = threading.Lock()
+    _stats = {"read": 0, "write": 0, "retries": 0, "throttled": 0, "errors": 0}
+
+    @classmethod
+    def lane(cls):
+        return getattr(cls._local, "lane", "interactive")
+
+    @classmethod
+    @contextmanager
+    def background(cls):
+        """with ブロック内の呼び出しを低優先度（バックグラウンド）で行う"""
+        previous = cls.lane()
+        cls._local.lane = "background"
+        try:
+            yield
+        finally:
+            cls._local.lane = previous
+
+    @classmethod
+    def set_background(cls):
+        """このスレッドの呼び出しを常にバックグラウンド扱いにする（ワーカースレッド用）"""
+        cls._local.lane = "background"
+
+    @classmethod
+    def thread_call_count(cls):
+        """このスレッドがこれまでに送った API リクエスト数（キャッシュの効果測定用）"""
+        return getattr(cls._local, "calls", 0)
+
+    @classmethod
+    def _count(cls, key):
+        with cls._stats_lock:
+            cls._stats[key] += 1
+
+    @classmethod
+    def call(cls, kind, fn, *args, idempotent=True, **kwargs):
+        """kind（"read" / "write"）のクォータを消費して fn を呼び出す"""
+        lane = cls.lane()
+        background = lane == "background"
+        bucket = cls._buckets[kind]
+        max_retries = cls.MAX_RETRIES[lane]
+
+        attempt = 0
+        while True:
+            if not bucket.acquire(background=background, timeout=cls.MAX_WAIT[lane]):
+                cls._count("throttled")
+            cls._count(kind)
+            cls._local.calls = cls.thread_call_count() + 1
+            try:
+                return fn(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                code = _status_code(e)
+                if code == 429:
+                    bucket.drain()
+                retryable = code == 429 or (idempotent and code in cls.RETRY_STATUS)
+                if not retryable or attempt >= max_retries:
+                    cls._count("errors")
+                    raise
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not idempotent or attempt >= max_retries:
+                    cls._count("errors")
+                    raise
+
+            cls._count("retries")
+            # 揺らぎ付きの指数バックオフ
+            cap = min(cls.BACKOFF_MAX, cls.BACKOFF_BASE * (2**attempt))
+            time.sleep(random.uniform(cap / 2, cap))
+            attempt += 1
+
+    @classmethod
+    def headroom(cls):
+        """現在のクォータ残量（トークン数）と統計"""
+        with cls._stats_lock:
+            stats = dict(cls._stats)
+        headroom = {
+            kind: {
+                "available": round(bucket.available(), 1),
+                "per_minute": int(bucket.capacity),
+                "reserved_for_interactive": int(bucket.reserve),
+            }
+            for kind, bucket in cls._buckets.items()
+        }
+        headroom["stats"] = stats
+        return headroom
+
+
+class _Metered:
+    """gspread オブジェクトのプロキシ。API を呼ぶメソッドだけ SheetsClient を経由させる"""
+
+    READS = frozenset()
+    WRITES = frozenset()
+    # 再試行すると重複しうる書き込み
+    NON_IDEMPOTENT = frozenset()
+
+    def __init__(self, target):
+        object.__setattr__(self, "_target", target)
+
+    @property
+    def unwrapped(self):
+        return self._target
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name in self.READS:
+            kind = "read"
+        elif name in self.WRITES:
+            kind = "write"
+        else:
+            return attr
+
+        idempotent = name not in self.NON_IDEMPOTENT
+
+        def metered(*args, **kwargs):
+            if kind == "read":
+                self._before_read()
+            elif kind == "write":
+                self._on_write()
+            result = SheetsClient.call(
+                kind, attr, *args, idempotent=idempotent, **kwargs
+            )
+            if kind == "write":
+                # 書き込み中に再計算されたキャッシュも捨てる
+                self._on_write()
+            return _wrap(result)
+
+        return metered
+
+    def _before_read(self):
+        pass
+
+    def _on_write(self):
+        pass
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __eq__(self, other):
+        if isinstance(other, _Metered):
+            other = other.unwrapped
+        return self._target == other
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __repr__(self):
+        return f"<Metered {self._target!r}>"
+
+
+class MeteredWorksheet(_Metered):
+    """Worksheet のプロキシ
+
+    GSheetService.use_snapshot() / read_scope() の中では get_all_values() /
+    get_all_records() をスナップショットから返す（引数なしで呼ばれた場合のみ）。
+    スナップショットに無いタブは API から読んで覚えておく。
+    """
+
+    READS = frozenset(
+        {
+            "get",
+            "get_values",
+            "get_all_values",
+            "get_all_records",
+            "get_all_cells",
+            "batch_get",
+            "row_values",
+            "col_values",
+            "cell",
+            "acell",
+            "find",
+            "findall",
+            "get_note",
+            "get_notes",
+        }
+    )
+    WRITES = frozenset(
+        {
+            "update",
+            "update_cell",
+            "update_acell",
+            "update_cells",
+            "batch_update",
+            "append_row",
+            "append_rows",
+            "insert_row",
+            "insert_rows",
+            "insert_cols",
+            "delete_rows",
+            "delete_columns",
+            "add_rows",
+            "add_cols",
+            "resize",
+            "clear",
+            "batch_clear",
+            "format",
+            "batch_format",
+            "update_title",
+        }
+    )
+    NON_IDEMPOTENT = frozenset(
+        {
+            "append_row",
+            "append_rows",
+            "insert_row",
+            "insert_rows",
+            "insert_cols",
+            "delete_rows",
+            "delete_columns",
+            "add_rows",
+            "add_cols",
+        }
+    )
+
+    def get_all_values(self, *args, **kwargs):
+        if not args and not kwargs:
+            title = self._target.title
+            values = SheetSnapshot.lookup_values(title)
+            if values is not None:
+                return values
+            values = _Metered.__getattr__(self, "get_all_values")()
+            # 同じリクエスト内で再度読まれたらスナップショットから返す
+            SheetSnapshot.remember_current(title, values)
+            return values
+        return _Metered.__getattr__(self, "get_all_values")(*args, **kwargs)
+
+    def get_all_records(self, *args, **kwargs):
+        if not args and not kwargs:
+            title = self._target.title
+            records = SheetSnapshot.lookup_records(title)
+            if records is not None:
+                return records
+            if SheetSnapshot.current() is not None:
+                # 全体を読んで覚えておき、get_all_values() と読み込みを共有する
+                self.get_all_values()
+                records = SheetSnapshot.lookup_records(title)
+                if records is not None:
+                    return records
+        return _Metered.__getattr__(self, "get_all_records")(*args, **kwargs)
+
+    def _before_read(self):
+        # このリクエストで溜めている書き込みがあれば、読む前に送っておく
+        WriteBuffer.flush_sheet(self._target.id)
+
+    def _on_write(self):
+        # 書き込んだタブはスナップショットが古くなるので以降は API から読む
+        SheetSnapshot.discard_current(self._target.title)
+        # このタブを元にしたキャッシュを無効化
+        invalidate_sheet(self._target.title)
+
+
+class MeteredSpreadsheet(_Metered):
+    READS = frozenset(
+        {
+            "worksheets",
+            "worksheet",
+            "get_worksheet",
+            "get_worksheet_by_id",
+            "fetch_sheet_metadata",
+            "values_get",
+            "values_batch_get",
+        }
+    )
+    WRITES = frozenset(
+        {
+            "add_worksheet",
+            "del_worksheet",
+            "duplicate_sheet",
+            "batch_update",
+            "values_update",
+            "values_append",
+            "values_batch_update",
+            "values_clear",
+        }
+    )
+    NON_IDEMPOTENT = frozenset(
+        {"add_worksheet", "duplicate_sheet", "values_append", "batch_update"}
+    )
+
+
+# キャッシュの再計算で何回 API を呼んだかを数えられるようにする
+SimpleCache.set_cost_counter(SheetsClient.thread_call_count)
+
+
+def _wrap(result):
+    """API の戻り値に含まれる Worksheet もメーター付きにする"""
+    if isinstance(result, gspread.Worksheet):
+        return MeteredWorksheet(result)
+    if isinstance(result, list) and result and isinstance(result[0], gspread.Worksheet):
+        return [MeteredWorksheet(ws) for ws in result]
+    return result
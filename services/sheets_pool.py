@@ -0,0 +1,176 @@
+import datetime
+import itertools
+import json
+import os
+import threading
+import time
+
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+
+from services.sheets_client import MeteredSpreadsheet, MeteredWorksheet
+
+SCOPE = [
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/drive",
+]
+
+
+class SheetsConnection:
+    """認証済みの gspread クライアント1本分
+
+    HTTP セッション・スプレッドシート・Worksheet のキャッシュをまとめて持つ。
+    Worksheet はクライアント（セッション）を参照するので、キャッシュも接続ごとに分ける。
+    """
+
+    # 有効期限がこの時間を切ったらトークンを先に更新する
+    TOKEN_REFRESH_MARGIN = datetime.timedelta(minutes=5)
+    TOKEN_CHECK_INTERVAL = 60
+    # 存在しないと分かったシートを再確認しない時間（秒）
+    MISSING_WORKSHEET_TTL = 60
+
+    def __init__(self, creds_dict, sheet_id):
+        self.credentials = ServiceAccountCredentials.from_json_keyfile_dict(
+            creds_dict, SCOPE
+        )
+        self.client = gspread.authorize(self.credentials)
+        # 以降の API 呼び出しはすべてクォータ管理付きのプロキシ経由
+        self.doc = MeteredSpreadsheet(self.client.open_by_key(sheet_id))
+        self.worksheets = {}
+        self.missing = {}
+        self.lock = threading.Lock()
+        self._token_checked_at = 0
+        self.refresh_worksheets()
+
+    def refresh_worksheets(self):
+        """全タブのメタデータを取得し直して Worksheet キャッシュを作り直す"""
+        worksheets = {ws.title: ws for ws in self.doc.worksheets()}
+        with self.lock:
+            self.worksheets = worksheets
+            self.missing = {}
+
+    def register(self, worksheet):
+        if isinstance(worksheet, gspread.Worksheet):
+            worksheet = MeteredWorksheet(worksheet)
+        with self.lock:
+            self.worksheets[worksheet.title] = worksheet
+            self.missing.pop(worksheet.title, None)
+
+    def forget_missing(self, title):
+        with self.lock:
+            self.missing.pop(title, None)
+
+    def worksheet(self, sheet_name):
+        """キャッシュから Worksheet を取得（無ければメタデータを取り直す）"""
+        with self.lock:
+            ws = self.worksheets.get(sheet_name)
+            checked_at = self.missing.get(sheet_name)
+        if ws is not None:
+            return ws
+
+        # 直前に存在しないと分かったシートはしばらく再確認しない
+        if checked_at and time.time() - checked_at < self.MISSING_WORKSHEET_TTL:
+            return None
+
+        # キャッシュに無い場合はメタデータを取り直す（他で作成された可能性）
+        try:
+            self.refresh_worksheets()
+        except Exception as e:
+            print(f"【Error】シート一覧の取得に失敗: {e}")
+            return None
+
+        with self.lock:
+            ws = self.worksheets.get(sheet_name)
+            if ws is None:
+                self.missing[sheet_name] = time.time()
+        if ws is None:
+            print(f"【Error】シート '{sheet_name}' が見つかりません")
+        return ws
+
+    def ensure_token(self):
+        """アクセストークンの期限が近ければ、リクエスト中に切れる前に更新する
+
+        gspread 6 は authorize() 時に oauth2client の認証情報を google-auth のものへ
+        変換してセッションに渡すので、更新するのはセッションが使っている
+        client.http_client.auth の方（self.credentials を更新しても反映されない）。
+        """
+        now = time.time()
+        if now - self._token_checked_at < self.TOKEN_CHECK_INTERVAL:
+            return
+        self._token_checked_at = now
+
+        auth = getattr(self.client.http_client, "auth", None)
+        if auth is None:
+            return
+        expiry = getattr(auth, "expiry", None)
+        # google-auth の expiry は UTC の naive datetime
+        if getattr(auth, "token", None) and expiry is not None:
+            if expiry - datetime.datetime.utcnow() > self.TOKEN_REFRESH_MARGIN:
+                return
+        try:
+            from google.auth.transport.requests import Request
+
+            with self.lock:
+                auth.refresh(Request())
+        except Exception as e:
+            # 更新に失敗しても、期限切れ時はセッション側で再取得される
+            print(f"【Error】アクセストークン更新失敗: {e}")
+
+
+class SheetsPool:
+    """スレッド間で共有する gspread クライアントのプール
+
+    SIZE 本の認証済みクライアントを使い回す。各スレッドは最初に割り当てられた
+    スロットを使い続けるので、同じ HTTP セッションを並行して叩くことは少なく、
+    接続（keep-alive）も再利用される。スロットは初回利用時に作成する。
+    """
+
+    SIZE = max(1, int(os.environ.get("SHEETS_POOL_SIZE", "4")))
+
+    _slots = [None] * SIZE
+    _slot_locks = [threading.Lock() for _ in range(SIZE)]
+    _local = threading.local()
+    _counter = itertools.count()
+
+    @classmethod
+    def _slot_index(cls):
+        slot = getattr(cls._local, "slot", None)
+        if slot is None:
+            slot = next(cls._counter) % cls.SIZE
+            cls._local.slot = slot
+        return slot
+
+    @staticmethod
+    def _open():
+        creds_json = os.environ.get("GOOGLE_CREDENTIALS")
+        sheet_id = os.environ.get("SPREADSHEET_ID")
+
+        if not creds_json or not sheet_id:
+            print("【Error】環境変数が不足しています")
+            return None
+
+        try:
+            return SheetsConnection(json.loads(creds_json), sheet_id)
+        except Exception as e:
+            print(f"【Error】GSheet接続失敗: {e}")
+            return None
+
+    @classmethod
+    def connection(cls):
+        """このスレッドに割り当てられた接続を返す（接続できなければ None）"""
+        slot = cls._slot_index()
+        conn = cls._slots[slot]
+        if conn is None:
+            with cls._slot_locks[slot]:
+                conn = cls._slots[slot]
+                if conn is None:
+                    conn = cls._open()
+                    cls._slots[slot] = conn
+        if conn is not None:
+            conn.ensure_token()
+        return conn
+
+    @classmethod
+    def connections(cls):
+        """作成済みの接続一覧"""
+        return [conn for conn in cls._slots if conn is not None]
@@ -1,6 +1,7 @@
 import datetime
 from collections import OrderedDict
 from services.gsheet import GSheetService
+from services.sheet_schema import SheetSchema
 from utils.cache import shop_items_cache, cached
 
 
@@ -16,8 +17,8 @@ class ShopService:
             req_id = f"req_{int(datetime.datetime.now().timestamp())}"
             now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            headers = SheetSchema.headers(sheet)
+            col_map = SheetSchema.col_map(sheet)
 
             row_data = [""] * len(headers)
 
@@ -97,8 +98,7 @@ class ShopService:
             if not cell:
                 return False
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            col_map = SheetSchema.col_map(sheet)
             idx_status = col_map.get("status")
             idx_item = col_map.get("item_key")
 
@@ -134,8 +134,7 @@ class ShopService:
             if not cell:
                 return False
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            col_map = SheetSchema.col_map(sheet)
             idx_status = col_map.get("status")
             idx_item = col_map.get("item_key")
 
@@ -229,8 +228,8 @@ class ShopService:
         try:
             item_key = f"item_{int(datetime.datetime.now().timestamp())}"
 
-            headers = sheet.row_values(1)
-            col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+            headers = SheetSchema.headers(sheet)
+            col_map = SheetSchema.col_map(sheet)
 
             row_data = [""] * len(headers)
 
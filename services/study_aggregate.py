@@ -0,0 +1,91 @@
+class UserStudyAggregate:
+    """1ユーザー分の study_log を1回の走査で集計した結果
+
+    HistoryService の Web 用の統計と今日の回数はここから組み立てる
+    （承認済みの日別・週別・月別の分数は StudyRollup が持つ）。集計はキャッシュに載るので、
+    呼び出し側で中身を書き換えないこと（各 view は新しい dict / list を返す）。
+    """
+
+    # 今日の勉強回数に数えないステータス
+    INACTIVE_STATUSES = ("CANCELLED", "REJECTED")
+
+    def __init__(self, user_id, today):
+        self.user_id = str(user_id)
+        # JST の今日
+        self.today = today
+
+        # 今日の（取消・却下以外の）記録数
+        self.today_count = 0
+
+        # Web 表示用: user_id が一致し、分数が入っている記録（ステータス問わず・行順）
+        self.has_log_columns = False
+        self.logs = []
+        self.log_minutes_by_date = {}
+        self.log_minutes_by_subject = {}
+
+    @staticmethod
+    def build(headers, rows, user_id, today):
+        """headers と、user_id / 表示名で絞り込んだ [(row_index, row)] から集計"""
+        agg = UserStudyAggregate(user_id, today)
+        if not headers:
+            return agg
+
+        col_map = {str(h).strip(): i for i, h in enumerate(headers)}
+        idx_uid = col_map.get("user_id")
+        idx_date = col_map.get("date")
+        idx_dur = col_map.get("duration_min")
+        idx_subj = col_map.get("subject")
+        idx_status = col_map.get("status")
+
+        agg.has_log_columns = None not in [idx_uid, idx_date, idx_dur, idx_subj]
+        today_str = today.strftime("%Y-%m-%d")
+
+        get_val = UserStudyAggregate._get_val
+        for _, row in rows:
+            status = get_val(row, idx_status)
+            date_str = get_val(row, idx_date)
+
+            if (
+                idx_status is not None
+                and idx_date is not None
+                and date_str == today_str
+                and status not in UserStudyAggregate.INACTIVE_STATUSES
+            ):
+                agg.today_count += 1
+
+            if (
+                agg.has_log_columns
+                and len(row) > idx_uid
+                and str(row[idx_uid]) == agg.user_id
+            ):
+                agg._add_log(row, idx_date, idx_dur, idx_subj)
+
+        return agg
+
+    @staticmethod
+    def _get_val(row, idx):
+        return str(row[idx]).strip() if idx is not None and idx < len(row) else ""
+
+    def _add_log(self, row, idx_date, idx_dur, idx_subj):
+        duration_str = row[idx_dur] if len(row) > idx_dur else "0"
+        if not duration_str.isdigit() or int(duration_str) == 0:
+            return
+
+        minutes = int(duration_str)
+        date_str = row[idx_date] if len(row) > idx_date else ""
+        # シングルクォートが先頭についている場合に除去（スプレッドシートの書式問題対策）
+        date_str = date_str.lstrip("'").strip()
+        subject = row[idx_subj] if len(row) > idx_subj else "その他"
+
+        self.logs.append({"subject": subject, "date": date_str, "minutes": minutes})
+        self.log_minutes_by_date[date_str] = (
+            self.log_minutes_by_date.get(date_str, 0) + minutes
+        )
+        self.log_minutes_by_subject[subject] = (
+            self.log_minutes_by_subject.get(subject, 0) + minutes
+        )
+
+    @property
+    def is_first_today(self):
+        # 今のセッションも含まれるため、1なら初回
+        return self.today_count == 1
@@ -0,0 +1,248 @@
+import datetime
+import threading
+
+
+class UserStudyDays:
+    """1ユーザーの承認済み勉強時間（日付文字列 -> {"total": 分, "subjects": {教科: 分}}）"""
+
+    def __init__(self, days=None):
+        self.days = days or {}
+
+    def _parsed_days(self):
+        """(日付, 集計) を返す（日付として読めない記録は除く）"""
+        for date_str, day in self.days.items():
+            try:
+                yield datetime.datetime.strptime(date_str, "%Y-%m-%d").date(), day
+            except ValueError:
+                continue
+
+    def minutes(self, since=None):
+        """since（date）以降の合計分数（None なら全期間）"""
+        return sum(
+            day["total"]
+            for log_date, day in self._parsed_days()
+            if since is None or log_date >= since
+        )
+
+    def on(self, date_str):
+        """その日の {"total", "subjects"}"""
+        day = self.days.get(date_str)
+        if not day:
+            return {"total": 0, "subjects": {}}
+        return {"total": day["total"], "subjects": dict(day["subjects"])}
+
+    def between(self, start_date, end_date):
+        """start_date〜end_date（両端含む）の {"total", "subjects"}"""
+        total = 0
+        subjects = {}
+        for log_date, day in self._parsed_days():
+            if start_date <= log_date <= end_date:
+                total += day["total"]
+                for subject, minutes in day["subjects"].items():
+                    subjects[subject] = subjects.get(subject, 0) + minutes
+        return {"total": total, "subjects": subjects}
+
+
+class _RollupState:
+    """ロールアップの中身（作り直すときは新しいものを組み立ててから差し替える）"""
+
+    def __init__(self):
+        # (user_id, 表示名, 日付) -> {教科: 分}
+        self.minutes = {}
+        # 索引（値はエントリのキーの集合）
+        self.by_user = {}
+        self.by_name = {}
+        self.by_date = {}
+        # user_id -> 最後に見た表示名（ランキング表示用）
+        self.names = {}
+
+
+class StudyRollup:
+    """承認済みの勉強時間を (user_id, 表示名, 日付) × 教科 ごとに合計したロールアップ
+
+    study_log レプリカの索引の1つとして、行の追加・更新・削除のたびに差分で
+    更新される（承認・手動記録・追記分の同期はいずれもレプリカ経由で届く）。
+    全件からの作り直しはレプリカの全件読込時と rebuild_aggregates() のときだけで、
+    集計関数は生ログではなく日数分のエントリだけを読む。
+    作り直しは reset() から rebuilt() までの間、別の中身に組み立てて最後に
+    差し替えるので、読み出し側が空や途中の状態を見ることはない。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._positions = {}
+        self._state = _RollupState()
+        # reset() から rebuilt() までの間に組み立て中の中身
+        self._staging = None
+        # 差分を受け取る順位表（WeeklyLeaderboard）
+        self._watchers = []
+
+    def watch(self, watcher):
+        """承認済み勉強時間の差分を watcher.add(user_id, 日付, 分) で受け取る
+
+        ロールアップを作り直したときは watcher.replace([(user_id, 日付, 分)]) で
+        全件分を一度に受け取る。
+        """
+        self._watchers.append(watcher)
+
+    def _key(self, row, name):
+        idx = self._positions.get(name)
+        return str(row[idx]).strip() if idx is not None and idx < len(row) else ""
+
+    # ---------- レプリカから呼ばれる更新 ----------
+
+    def reset(self, header):
+        """ヘッダーから列位置を取り直し、作り直しを始める（この後全行が add される）"""
+        col_map = {str(h).strip(): i for i, h in enumerate(header)}
+        with self._lock:
+            self._positions = {
+                name: col_map.get(name)
+                for name in (
+                    "user_id",
+                    "display_name",
+                    "date",
+                    "duration_min",
+                    "subject",
+                    "status",
+                )
+            }
+            self._staging = _RollupState()
+
+    def rebuilt(self):
+        """作り直した中身に差し替え、順位表にも全件分を渡す（全行の add の後に呼ぶ）"""
+        with self._lock:
+            if self._staging is None:
+                return
+            self._state = self._staging
+            self._staging = None
+            daily = {}
+            for (uid, _, date_str), subjects in self._state.minutes.items():
+                key = (uid, date_str)
+                daily[key] = daily.get(key, 0) + sum(subjects.values())
+            entries = [
+                (uid, date_str, total) for (uid, date_str), total in daily.items()
+            ]
+            for watcher in self._watchers:
+                watcher.replace(entries)
+
+    def add(self, row):
+        self._apply(row, 1)
+
+    def remove(self, row):
+        self._apply(row, -1)
+
+    def _apply(self, row, sign):
+        if self._key(row, "status") != "APPROVED":
+            return
+        duration = self._key(row, "duration_min")
+        if not duration.isdigit() or int(duration) == 0:
+            return
+
+        uid = self._key(row, "user_id")
+        name = self._key(row, "display_name")
+        if not uid and not name:
+            return
+        # シングルクォートが先頭についている場合に除去（スプレッドシートの書式問題対策）
+        date_str = self._key(row, "date").lstrip("'").strip()
+        subject = self._key(row, "subject") or "その他"
+        key = (uid, name, date_str)
+
+        with self._lock:
+            rebuilding = self._staging is not None
+            state = self._staging if rebuilding else self._state
+            subjects = state.minutes.setdefault(key, {})
+            subjects[subject] = subjects.get(subject, 0) + sign * int(duration)
+            if subjects[subject] <= 0:
+                del subjects[subject]
+            if subjects:
+                for index, value in (
+                    (state.by_user, uid),
+                    (state.by_name, name),
+                    (state.by_date, date_str),
+                ):
+                    if value:
+                        index.setdefault(value, set()).add(key)
+            else:
+                del state.minutes[key]
+                for index, value in (
+                    (state.by_user, uid),
+                    (state.by_name, name),
+                    (state.by_date, date_str),
+                ):
+                    found = index.get(value)
+                    if found is not None:
+                        found.discard(key)
+                        if not found:
+                            del index[value]
+            if sign > 0 and uid and name:
+                state.names[uid] = name
+            # 作り直し中の分は rebuilt() でまとめて渡す
+            if not rebuilding:
+                for watcher in self._watchers:
+                    watcher.add(uid, date_str, sign * int(duration))
+
+    # ---------- 読み出し ----------
+
+    @staticmethod
+    def _day_totals(subjects_list):
+        subjects = {}
+        for entry in subjects_list:
+            for subject, minutes in entry.items():
+                subjects[subject] = subjects.get(subject, 0) + minutes
+        return {"total": sum(subjects.values()), "subjects": subjects}
+
+    def user_days(self, user_id, user_name=None):
+        """user_id か表示名が一致する記録の日別集計（UserStudyDays）"""
+        with self._lock:
+            state = self._state
+            keys = set(state.by_user.get(str(user_id), ()))
+            if user_name:
+                keys |= state.by_name.get(str(user_name), set())
+            by_date = {}
+            for key in keys:
+                by_date.setdefault(key[2], []).append(state.minutes[key])
+            return UserStudyDays(
+                {
+                    date_str: self._day_totals(entries)
+                    for date_str, entries in by_date.items()
+                }
+            )
+
+    def totals_since(self, start_date_str):
+        """start_date_str（YYYY-MM-DD）以降の user_id ごとの集計
+
+        {user_id: {"total", "subjects", "display_name"}} を返す。
+        """
+        with self._lock:
+            state = self._state
+            result = {}
+            for date_str, keys in state.by_date.items():
+                if date_str < start_date_str:
+                    continue
+                for key in keys:
+                    uid = key[0]
+                    if not uid:
+                        continue
+                    stats = result.setdefault(
+                        uid,
+                        {
+                            "total": 0,
+                            "subjects": {},
+                            "display_name": state.names.get(uid, uid),
+                        },
+                    )
+                    for subject, minutes in state.minutes[key].items():
+                        stats["total"] += minutes
+                        stats["subjects"][subject] = (
+                            stats["subjects"].get(subject, 0) + minutes
+                        )
+            return result
+
+    def stats(self):
+        with self._lock:
+            state = self._state
+            return {
+                "entries": len(state.minutes),
+                "users": len(state.by_user),
+                "dates": len(state.by_date),
+            }
@@ -0,0 +1,160 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.economy import EconomyService
+from services.gsheet import GSheetService
+from services.history import HistoryService
+from services.job import JobService
+from services.sheets_client import SheetsClient
+from services.shop import ShopService
+
+
+class WarmupService:
+    """起動直後に重い読み込みを並行して済ませておく
+
+    各データの読み込み結果はそれぞれのキャッシュ（study_log はレプリカ）に
+    残るので、最初のリクエストからシートを全件読みせずに済む。
+    状態は /ready で返し、全部読み込めるまでは準備中（503）として扱う。
+    失敗したデータは間隔を空けて数回読み直し、それでも失敗したものは
+    retry_failed() で（/ready を叩かれたときに）もう一度読み込む。
+    """
+
+    # (名前, 読み込み関数)
+    TASKS = [
+        ("users", EconomyService.get_all_users),
+        ("shop_items", ShopService.get_items),
+        ("jobs_map", JobService.get_all_jobs_map),
+        # study_log レプリカの全件読み込みも兼ねる
+        ("active_sessions", GSheetService.get_all_active_sessions),
+        ("study_time_ranking", HistoryService.get_weekly_study_time_ranking),
+        ("exp_ranking", HistoryService.get_weekly_exp_ranking),
+    ]
+    MAX_WORKERS = 4
+    # 1回のウォームアップでの試行回数と、再試行までの待ち時間（秒、回ごとに倍）
+    MAX_ATTEMPTS = 3
+    RETRY_WAIT = 5
+
+    _lock = threading.Lock()
+    _status = {}
+    _started_at = None
+    _finished_at = None
+
+    @classmethod
+    def _set_status(cls, name, **values):
+        with cls._lock:
+            cls._status.setdefault(name, {}).update(values)
+
+    @classmethod
+    def _load(cls, name, fn):
+        cls._set_status(name, state="loading")
+        started = time.time()
+        for attempt in range(1, cls.MAX_ATTEMPTS + 1):
+            try:
+                # 起動直後に届いた LINE 返信を優先できるよう低優先度で読む
+                with SheetsClient.background():
+                    fn()
+                cls._set_status(
+                    name,
+                    state="ready",
+                    attempts=attempt,
+                    seconds=round(time.time() - started, 2),
+                    error=None,
+                )
+                return
+            except Exception as e:
+                print(f"【Error】ウォームアップ失敗 ({name}, {attempt}回目): {e}")
+                cls._set_status(name, attempts=attempt, error=str(e))
+                if attempt < cls.MAX_ATTEMPTS:
+                    time.sleep(cls.RETRY_WAIT * (2 ** (attempt - 1)))
+
+        cls._set_status(name, state="failed", seconds=round(time.time() - started, 2))
+
+    @classmethod
+    def run(cls):
+        """全データを並行して読み込む（終わるまで戻らない）"""
+        with cls._lock:
+            cls._started_at = time.time()
+            cls._finished_at = None
+            cls._status = {name: {"state": "pending"} for name, _ in cls.TASKS}
+
+        with ThreadPoolExecutor(
+            max_workers=cls.MAX_WORKERS, thread_name_prefix="warmup"
+        ) as pool:
+            for name, fn in cls.TASKS:
+                pool.submit(cls._load, name, fn)
+
+        with cls._lock:
+            cls._finished_at = time.time()
+        print(
+            f"【Info】ウォームアップ完了 ({cls._finished_at - cls._started_at:.1f}秒)"
+        )
+
+    @classmethod
+    def start(cls):
+        """バックグラウンドでウォームアップを開始（起動時に1回）"""
+        with cls._lock:
+            if cls._started_at is not None:
+                return
+            cls._started_at = time.time()
+        threading.Thread(target=cls.run, name="warmup", daemon=True).start()
+
+    @classmethod
+    def retry_failed(cls):
+        """失敗したデータだけをバックグラウンドで読み直す（読み直し中なら何もしない）"""
+        with cls._lock:
+            if cls._finished_at is None:
+                return False
+            failed = [
+                (name, fn)
+                for name, fn in cls.TASKS
+                if cls._status.get(name, {}).get("state") == "failed"
+            ]
+            if not failed:
+                return False
+            # 読み直しが終わるまでは準備中のまま
+            cls._finished_at = None
+            for name, _ in failed:
+                cls._status[name]["state"] = "pending"
+
+        def run():
+            with ThreadPoolExecutor(
+                max_workers=cls.MAX_WORKERS, thread_name_prefix="warmup-retry"
+            ) as pool:
+                for name, fn in failed:
+                    pool.submit(cls._load, name, fn)
+            with cls._lock:
+                cls._finished_at = time.time()
+
+        threading.Thread(target=run, name="warmup-retry", daemon=True).start()
+        return True
+
+    @classmethod
+    def status(cls):
+        """準備状況と各データの読み込み時間
+
+        全データを読み込めたときだけ ready。失敗したものは failed に名前を返す。
+        """
+        with cls._lock:
+            datasets = {name: dict(values) for name, values in cls._status.items()}
+            started_at = cls._started_at
+            finished_at = cls._finished_at
+
+        failed = sorted(
+            name for name, values in datasets.items() if values["state"] == "failed"
+        )
+        ready = (
+            finished_at is not None
+            and bool(datasets)
+            and all(values["state"] == "ready" for values in datasets.values())
+        )
+        return {
+            "ready": ready,
+            "failed": failed,
+            "elapsed_seconds": (
+                round((finished_at or time.time()) - started_at, 2)
+                if started_at
+                else None
+            ),
+            "datasets": datasets,
+        }
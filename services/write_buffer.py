@@ -0,0 +1,131 @@
+import threading
+
+from gspread.utils import rowcol_to_a1
+
+
+class SheetWriteError(Exception):
+    """バッファしたセル書き込みの反映に失敗した"""
+
+    def __init__(self, errors):
+        # [(シート名, 例外)]
+        self.errors = errors
+        super().__init__("; ".join(f"{title}: {e}" for title, e in errors))
+
+
+class WriteBuffer:
+    """スレッド（リクエスト）単位のセル書き込みバッファ
+
+    update_cell を何度も呼ぶ代わりにセル書き込みを溜めておき、
+    flush() でワークシートごとに1回の batch_update にまとめて送る。
+    begin() していない間の add() はその場で書き込む（この場合も1回の batch_update）。
+    溜めている間にそのワークシートを API から読む場合は、先に flush_sheet() で
+    そのシート分だけ送っておく（MeteredWorksheet が読み込みの前に呼ぶ）。
+    """
+
+    _local = threading.local()
+    _on_failure = None
+
+    @classmethod
+    def set_failure_handler(cls, handler):
+        """書き込みに失敗したら handler([シート名]) を呼ぶ（先に反映したローカルの写しの破棄用）"""
+        cls._on_failure = handler
+
+    @classmethod
+    def _failed(cls, titles):
+        if cls._on_failure is not None:
+            try:
+                cls._on_failure(titles)
+            except Exception as e:
+                print(f"【Error】書き込み失敗時の処理で例外: {e}")
+
+    @classmethod
+    def _depth(cls):
+        return getattr(cls._local, "depth", 0)
+
+    @classmethod
+    def active(cls):
+        return cls._depth() > 0
+
+    @classmethod
+    def begin(cls):
+        """バッファリング開始（入れ子可。外側の end() でまとめて反映）"""
+        depth = cls._depth()
+        if depth == 0:
+            cls._local.pending = {}
+        cls._local.depth = depth + 1
+
+    @classmethod
+    def end(cls):
+        """バッファリング終了。最も外側なら True を返す（呼び出し側で flush する）"""
+        depth = cls._depth()
+        if depth == 0:
+            return False
+        cls._local.depth = depth - 1
+        return depth == 1
+
+    @classmethod
+    def add(cls, sheet, updates):
+        """セル書き込みを追加（updates: [(row, col, value)]、行・列とも1始まり）"""
+        updates = list(updates)
+        if not updates:
+            return
+
+        if not cls.active():
+            try:
+                cls.write(sheet, {(r, c): v for r, c, v in updates})
+            except Exception:
+                cls._failed([sheet.title])
+                raise
+            return
+
+        pending = cls._local.pending
+        _, cells = pending.setdefault(sheet.id, (sheet, {}))
+        for row, col, value in updates:
+            # 同じセルへの書き込みは後勝ち
+            cells[(row, col)] = value
+
+    @classmethod
+    def pending_count(cls):
+        pending = getattr(cls._local, "pending", None) or {}
+        return sum(len(cells) for _, cells in pending.values())
+
+    @classmethod
+    def flush(cls):
+        """溜めた書き込みを送信（失敗したシートがあれば SheetWriteError）"""
+        pending = getattr(cls._local, "pending", None)
+        if not pending:
+            return
+        cls._local.pending = {}
+
+        errors = []
+        for sheet, cells in pending.values():
+            try:
+                cls.write(sheet, cells)
+            except Exception as e:
+                errors.append((sheet.title, e))
+        if errors:
+            cls._failed([title for title, _ in errors])
+            raise SheetWriteError(errors)
+
+    @classmethod
+    def flush_sheet(cls, sheet_id):
+        """そのワークシートに溜めた分だけを送信（失敗したら SheetWriteError）"""
+        pending = getattr(cls._local, "pending", None)
+        if not pending or sheet_id not in pending:
+            return
+        sheet, cells = pending.pop(sheet_id)
+        try:
+            cls.write(sheet, cells)
+        except Exception as e:
+            cls._failed([sheet.title])
+            raise SheetWriteError([(sheet.title, e)])
+
+    @staticmethod
+    def write(sheet, cells):
+        """セルの辞書 {(row, col): value} を1回の batch_update で書き込む"""
+        data = [
+            {"range": rowcol_to_a1(row, col), "values": [[value]]}
+            for (row, col), value in cells.items()
+        ]
+        # update_cell と同じく入力値として解釈させる
+        sheet.batch_update(data, value_input_option="USER_ENTERED")
@@ -42,7 +42,7 @@ ${A.message}`)}return 0},S=async()=>{if(await n({type:"warning",title:"記録の
 ページを再読み込みしてください`),yt(0,"エラーが発生しました")}},n=()=>{typeof liff<"u"&&liff.isInClient()&&liff.closeWindow()},l=ee(()=>typeof liff<"u"&&liff.isInClient());return{initLiff:o,closeWindow:n,isInitialized:Nl,liffError:Fl,isInApp:l}}const Xe=(e,t)=>{const o=e.__vccOpts||e;for(const[n,l]of t)o[n]=l;return o},hu={class:"fixed inset-0 z-50 flex items-center justify-center overflow-hidden"},yu={class:"relative text-center px-8"},_u={class:"text-white/70 text-xs max-w-xs mx-auto animate-fade-in"},wu={__name:"LoadingSpinner",props:{message:{type:String,default:"読み込み中..."}},setup(e){const t=["💡 毎日の勉強でEXPを貯めよう！","🏆 ランキング上位を目指せ！","🎯 ミッションをクリアしてボーナスGET","📊 データで成長を確認しよう","⚔️ 勉強時間でバトルに勝利！","🛒 貯めたEXPでごほうび交換","🌟 連続勉強でストリークボーナス","📚 教材を登録して効率アップ"],o=j(t[0]);let n=null;return qe(()=>{o.value=t[Math.floor(Math.random()*t.length)],n=setInterval(()=>{o.value=t[Math.floor(Math.random()*t.length)]},3e3)}),As(()=>{n&&clearInterval(n)}),(l,r)=>(f(),v("div",hu,[r[1]||(r[1]=oo('<div class="absolute inset-0 bg-gradient-to-br from-indigo-600 via-purple-600 to-pink-500" data-v-832ba095><div class="absolute inset-0 opacity-30" data-v-832ba095><div class="absolute top-0 -left-4 w-72 h-72 bg-purple-300 rounded-full mix-blend-multiply filter blur-xl animate-blob" data-v-832ba095></div><div class="absolute top-0 -right-4 w-72 h-72 bg-yellow-300 rounded-full mix-blend-multiply filter blur-xl animate-blob animation-delay-2000" data-v-832ba095></div><div class="absolute -bottom-8 left-20 w-72 h-72 bg-pink-300 rounded-full mix-blend-multiply filter blur-xl animate-blob animation-delay-4000" data-v-832ba095></div></div></div>',1)),s("div",yu,[r[0]||(r[0]=oo('<div class="mb-6" data-v-832ba095><div class="relative inline-block" data-v-832ba095><span class="text-7xl animate-bounce-slow" data-v-832ba095>📖</span><span class="absolute -top-1 -right-1 text-3xl animate-pulse" data-v-832ba095>✨</span></div></div><h1 class="text-2xl font-bold text-white mb-2 tracking-wider" data-v-832ba095> Study Guardian </h1><p class="text-white/80 text-sm mb-8" data-v-832ba095>勉強の旅を始めよう</p><div class="w-48 mx-auto mb-6" data-v-832ba095><div class="h-2 bg-white/20 rounded-full overflow-hidden" data-v-832ba095><div class="h-full bg-white rounded-full animate-loading-bar" data-v-832ba095></div></div></div>',4)),s("p",_u,m(o.value),1)])]))}},ku=Xe(wu,[["__scopeId","data-v-832ba095"]]),$u={class:"fixed bottom-4 left-1/2 transform -translate-x-1/2 bg-white/80 backdrop-blur-lg rounded-full shadow-lg px-6 py-3 z-40 w-[90%] max-w-sm"},Cu={class:"flex justify-between items-center px-4"},Su=["onClick","disabled"],Tu={class:"text-xl"},ju={class:"text-xs mt-1"},Mu={__name:"BottomNav",props:{modelValue:{type:String,required:!0},inSession:{type:Boolean,default:!1}},emits:["update:modelValue"],setup(e,{emit:t}){const o=e,n=t,{playSound:l}=rs(),r=[{id:"data",icon:"📊",label:"データ"},{id:"study",icon:"📖",label:"勉強"},{id:"game",icon:"⚔️",label:"ゲーム"},{id:"other",icon:"⚙️",label:"その他"}],i=a=>{a!==o.modelValue&&l("select3"),n("update:modelValue",a)};return(a,c)=>(f(),v("nav",$u,[s("div",Cu,[(f(),v(ie,null,fe(r,u=>s("button",{key:u.id,onClick:d=>i(u.id),class:ce(["flex flex-col items-center transition-transform",e.modelValue===u.id?"text-indigo-600 scale-110":"text-gray-400"]),disabled:u.id!=="study"&&e.inSession},[s("span",Tu,m(u.icon),1),s("span",ju,m(u.label),1)],10,Su)),64))])]))}},Pu={__name:"FloatingButton",props:{inSession:{type:Boolean,default:!1}},emits:["click"],setup(e,{emit:t}){const o=t;return(n,l)=>(f(),v("button",{onClick:l[0]||(l[0]=r=>o("click")),class:"fixed bottom-24 right-6 w-16 h-16 bg-gradient-to-br from-indigo-500 to-purple-600 text-white rounded-full shadow-xl flex items-center justify-center text-3xl z-30 transition-transform hover:scale-110 active:scale-95"},[s("span",{class:ce(e.inSession?"animate-pulse":"")},m(e.inSession?"⏱️":"▶️"),3)]))}},mi="sg_notifications",bi=7*24*60*60*1e3,Iu=()=>{try{const e=localStorage.getItem(mi);if(e){const t=JSON.parse(e),o=Date.now()-bi;return t.filter(n=>new Date(n.timestamp).getTime()>o)}}catch(e){console.warn("Failed to load notifications:",e)}return[]},mo=e=>{try{localStorage.setItem(mi,JSON.stringify(e))}catch(t){console.warn("Failed to save notifications:",t)}},Au=bs("notification",()=>{const e=j(Iu()),t=j(e.value.filter(g=>!g.read).length),o=j(null),n=g=>{const x=Date.now();e.value.unshift({id:x,...g,read:!1,timestamp:new Date().toISOString()}),t.value++;const b=Date.now()-bi;e.value=e.value.filter(y=>new Date(y.timestamp).getTime()>b).slice(0,100),mo(e.value)},l=g=>{const x=e.value.find(b=>b.id===g);x&&!x.read&&(x.read=!0,t.value=Math.max(0,t.value-1),mo(e.value))},r=()=>{e.value.forEach(g=>g.read=!0),t.value=0,mo(e.value)},i=()=>{e.value=[],t.value=0,mo(e.value)},a=async()=>{if(at().isAdmin)try{const b=await(await fetch("/api/admin/pending")).json();if(b.status==="ok"&&b.data){const y=b.data.length,_=parseInt(localStorage.getItem("lastPendingCount")||"0");if(y>_&&_>0){const T=y-_;n({type:"pending",title:"新しい承認待ち",message:`${T}件の新しい承認リクエストがあります`,icon:"📬"})}localStorage.setItem("lastPendingCount",y.toString())}}catch(x){console.error("Pending check error:",x)}},c=async()=>{const g=at();if(g.currentUserId)try{const b=await(await fetch(`/api/user/${g.currentUserId}/notifications`)).json();b.status==="ok"&&b.notifications&&b.notifications.forEach(y=>{e.value.some(T=>T.originalId===y.id)||n({...y,originalId:y.id})})}catch{}};return{notifications:e,unreadCount:t,addNotification:n,markAsRead:l,markAllAsRead:r,clearAll:i,startPolling:()=>{o.value||(setTimeout(()=>{a(),c()},5e3),o.value=setInterval(()=>{a(),c()},6e4))},stopPolling:()=>{o.value&&(clearInterval(o.value),o.value=null)},checkPendingForAdmin:a}}),Eu={class:"relative"},Du={key:0,class:"absolute -top-1 -right-1 w-5 h-5 bg-red-500 rounded-full flex items-center justify-center text-white text-[10px] font-bold animate-bounce"},Ou={key:0,class:"absolute right-0 top-full mt-2 w-80 max-h-96 overflow-y-auto bg-white rounded-2xl shadow-2xl border border-gray-200 z-50"},Uu={class:"sticky top-0 bg-white p-4 border-b border-gray-100 flex justify-between items-center"},Bu={key:0,class:"p-8 text-center text-gray-400"},Nu={key:1,class:"divide-y divide-gray-100"},Fu=["onClick"],Lu={class:"flex items-start gap-3"},Ru={class:"text-2xl"},Vu={class:"flex-1 min-w-0"},Hu={class:"font-medium text-gray-800 text-sm"},Ku={class:"text-xs text-gray-500 mt-1"},Gu={class:"text-[10px] text-gray-400 mt-2"},Wu={key:0,class:"w-2 h-2 bg-blue-500 rounded-full mt-1"},zu={key:2,class:"p-3 border-t border-gray-100"},Ju={__name:"NotificationBell",emits:["navigate"],setup(e,{emit:t}){const o=Au(),n=j(!1),l=t,r=a=>{o.markAsRead(a.id),a.type==="pending"&&l("navigate","admin"),n.value=!1},i=a=>{if(!a)return"";const c=new Date(a),d=Math.floor((new Date-c)/1e3);return d<60?"たった今":d<3600?`${Math.floor(d/60)}分前`:d<86400?`${Math.floor(d/3600)}時間前`:`${Math.floor(d/86400)}日前`};return qe(()=>{o.startPolling()}),As(()=>{o.stopPolling()}),(a,c)=>(f(),v("div",Eu,[s("button",{onClick:c[0]||(c[0]=u=>n.value=!n.value),class:"relative p-2 rounded-xl bg-white/10 hover:bg-white/20 transition-colors"},[c[4]||(c[4]=s("span",{class:"text-xl"},"🔔",-1)),H(o).unreadCount>0?(f(),v("span",Du,m(H(o).unreadCount>9?"9+":H(o).unreadCount),1)):X("",!0)]),me(Gt,{name:"fade-slide"},{default:Te(()=>[n.value?(f(),v("div",Ou,[s("div",Uu,[c[5]||(c[5]=s("h3",{class:"font-bold text-gray-800"},"🔔 通知",-1)),H(o).notifications.length>0?(f(),v("button",{key:0,onClick:c[1]||(c[1]=u=>H(o).markAllAsRead()),class:"text-xs text-blue-500 hover:text-blue-700"}," すべて既読 ")):X("",!0)]),H(o).notifications.length===0?(f(),v("div",Bu,[...c[6]||(c[6]=[s("span",{class:"text-4xl block mb-2"},"📭",-1),s("p",null,"通知はありません",-1)])])):(f(),v("div",Nu,[(f(!0),v(ie,null,fe(H(o).notifications,u=>(f(),v("div",{key:u.id,onClick:d=>r(u),class:ce(["p-4 hover:bg-gray-50 cursor-pointer transition-colors",!u.read&&"bg-blue-50"])},[s("div",Lu,[s("span",Ru,m(u.icon||"📌"),1),s("div",Vu,[s("p",Hu,m(u.title),1),s("p",Ku,m(u.message),1),s("p",Gu,m(i(u.timestamp)),1)]),u.read?X("",!0):(f(),v("span",Wu))])],10,Fu))),128))])),H(o).notifications.length>0?(f(),v("div",zu,[s("button",{onClick:c[2]||(c[2]=u=>H(o).clearAll()),class:"w-full text-center text-xs text-gray-400 hover:text-red-500"}," すべてクリア ")])):X("",!0)])):X("",!0)]),_:1}),n.value?(f(),v("div",{key:0,class:"fixed inset-0 z-40",onClick:c[3]||(c[3]=u=>n.value=!1)})):X("",!0)]))}},qu=Xe(Ju,[["__scopeId","data-v-f7c2d944"]]),Xu={class:"fixed top-4 left-1/2 transform -translate-x-1/2 z-[100] flex flex-col gap-2 max-w-[90vw]"},Yu=["onClick"],Qu={class:"flex items-center justify-center gap-2"},Zu={class:"text-lg"},ed={class:"text-sm font-medium whitespace-pre-line"},td={__name:"ToastContainer",setup(e){const t=At(),o=ee(()=>t.toasts),n=t.dismiss,l={success:"bg-green-500/90 text-white",error:"bg-red-500/90 text-white",warning:"bg-amber-500/90 text-white",info:"bg-blue-500/90 text-white"},r={success:"✅",error:"❌",warning:"⚠️",info:"ℹ️"};return(i,a)=>(f(),Se(ms,{to:"body"},[s("div",Xu,[me(Rc,{name:"toast"},{default:Te(()=>[(f(!0),v(ie,null,fe(o.value,c=>(f(),v("div",{key:c.id,class:ce(["px-4 py-3 rounded-xl shadow-lg backdrop-blur-lg text-center transform transition-all duration-300",l[c.type]]),onClick:u=>H(n)(c.id)},[s("div",Qu,[s("span",Zu,m(r[c.type]),1),s("span",ed,m(c.message),1)])],10,Yu))),128))]),_:1})])]))}},sd=Xe(td,[["__scopeId","data-v-4983955f"]]),od={key:0,class:"relative w-full max-w-sm bg-gradient-to-b from-white to-gray-50 rounded-3xl shadow-2xl overflow-hidden"},nd={class:"pt-8 pb-4 flex justify-center"},ld={class:"text-xl font-bold text-center text-gray-800 px-6"},rd={class:"text-center text-gray-500 text-sm px-6 py-4 leading-relaxed"},id={class:"px-6 pb-6 space-y-3"},ad={class:"flex items-center justify-center gap-2"},cd={key:0},ud={__name:"ConfirmDialog",props:{modelValue:{type:Boolean,default:!1},type:{type:String,default:"info",validator:e=>["info","warning","danger","success"].includes(e)},title:{type:String,default:"確認"},message:{type:String,default:"この操作を実行しますか？"},confirmText:{type:String,default:"はい"},cancelText:{type:String,default:"キャンセル"},icon:{type:String,default:""},confirmIcon:{type:String,default:""}},emits:["update:modelValue","confirm","cancel"],setup(e,{emit:t}){const o=e,n=t,l=ee(()=>({info:{gradient:"from-blue-400 to-indigo-500",iconBg:"bg-gradient-to-br from-blue-100 to-indigo-100",button:"bg-gradient-to-r from-blue-500 to-indigo-600 hover:from-blue-600 hover:to-indigo-700 shadow-blue-500/30",icon:"❓"},warning:{gradient:"from-amber-400 to-orange-500",iconBg:"bg-gradient-to-br from-amber-100 to-orange-100",button:"bg-gradient-to-r from-amber-500 to-orange-600 hover:from-amber-600 hover:to-orange-700 shadow-amber-500/30",icon:"⚠️"},danger:{gradient:"from-red-400 to-pink-500",iconBg:"bg-gradient-to-br from-red-100 to-pink-100",button:"bg-gradient-to-r from-red-500 to-pink-600 hover:from-red-600 hover:to-pink-700 shadow-red-500/30",icon:"🗑️"},success:{gradient:"from-green-400 to-emerald-500",iconBg:"bg-gradient-to-br from-green-100 to-emerald-100",button:"bg-gradient-to-r from-green-500 to-emerald-600 hover:from-green-600 hover:to-emerald-700 shadow-green-500/30",icon:"✅"}})[o.type]),r=ee(()=>l.value.gradient),i=ee(()=>l.value.iconBg),a=ee(()=>l.value.button),c=ee(()=>o.icon||l.value.icon),u=()=>{n("confirm"),n("update:modelValue",!1)},d=()=>{n("cancel"),n("update:modelValue",!1)};return(g,x)=>(f(),Se(ms,{to:"body"},[me(Gt,{name:"fade"},{default:Te(()=>[e.modelValue?(f(),v("div",{key:0,class:"fixed inset-0 z-[100] flex items-center justify-center p-4",onClick:lt(d,["self"])},[x[0]||(x[0]=s("div",{class:"absolute inset-0 bg-black/60 backdrop-blur-sm"},null,-1)),me(Gt,{name:"scale"},{default:Te(()=>[e.modelValue?(f(),v("div",od,[s("div",{class:ce(["absolute top-0 left-0 right-0 h-1 bg-gradient-to-r",r.value])},null,2),s("div",nd,[s("div",{class:ce(["w-20 h-20 rounded-full flex items-center justify-center text-4xl animate-bounce-slow",i.value])},m(c.value),3)]),s("h3",ld,m(e.title),1),s("p",rd,m(e.message),1),s("div",id,[s("button",{onClick:u,class:ce(["w-full py-4 rounded-2xl font-bold text-lg text-white shadow-lg transform active:scale-95 transition-all duration-200",a.value])},[s("span",ad,[s("span",null,m(e.confirmText),1),e.confirmIcon?(f(),v("span",cd,m(e.confirmIcon),1)):X("",!0)])],2),s("button",{onClick:d,class:"w-full py-4 rounded-2xl font-bold text-lg bg-gray-100 text-gray-600 hover:bg-gray-200 transform active:scale-95 transition-all duration-200"},m(e.cancelText),1)])])):X("",!0)]),_:1})])):X("",!0)]),_:1})]))}},dd=Xe(ud,[["__scopeId","data-v-6fd13499"]]),We={__name:"GlassPanel",props:{variant:{type:String,default:"glass"},customClass:{type:String,default:""}},setup(e){return(t,o)=>(f(),v("div",{class:ce(["rounded-2xl p-4 shadow-lg backdrop-blur-lg",[e.variant==="glass"?"bg-white/70":"bg-white",e.customClass]])},[Br(t.$slots,"default")],2))}},fd={class:"space-y-6"},pd={class:"flex items-center gap-4"},gd=["src"],vd={class:"text-left flex-1"},md={class:"font-bold text-lg text-gray-800"},bd={class:"text-sm text-gray-500"},xd={class:"mt-2"},hd={class:"flex justify-between text-xs text-gray-600 mb-1"},yd={class:"h-2 bg-gray-200 rounded-full overflow-hidden"},_d={class:"grid grid-cols-2 gap-4"},wd={class:"text-3xl font-bold text-indigo-600"},kd={class:"text-3xl font-bold text-amber-500"},$d={class:"flex items-center justify-between"},Cd={class:"text-sm text-gray-600"},Sd={class:"flex justify-between items-center mb-3"},Td={class:"flex items-center gap-3 mb-3 p-2 bg-gray-50 rounded-lg"},jd={class:"flex-1 h-2 bg-gray-200 rounded-full overflow-hidden"},Md={class:"text-xs font-medium text-gray-600"},Pd={key:0,class:"text-center text-gray-400 py-4 text-sm"},Id={key:1,class:"space-y-2 max-h-48 overflow-y-auto"},Ad={class:"flex items-start gap-2"},Ed=["onClick"],Dd={key:0,class:"text-xs"},Od={class:"flex-1 min-w-0"},Ud={key:0,class:"text-[10px] text-gray-400"},Bd={key:0,class:"text-[10px] px-1.5 py-0.5 rounded bg-blue-100 text-blue-600 flex-shrink-0"},Nd=["onClick"],Fd={class:"mt-3 pt-2 border-t border-gray-100 flex justify-between items-center text-xs text-gray-500"},Ld={key:0},Rd={class:"flex justify-between items-center mb-3"},Vd={key:0,class:"text-center text-gray-400 py-4 text-sm"},Hd={key:1,class:"space-y-2"},Kd={class:"flex justify-between items-start"},Gd={class:"flex-1 min-w-0"},Wd={class:"font-bold text-gray-800 text-sm truncate"},zd={key:0,class:"text-xs text-gray-500 truncate"},Jd={class:"flex justify-between items-center mt-2"},qd={class:"text-xs text-gray-400"},Xd={class:"flex gap-1"},Yd=["onClick"],Qd=["onClick"],Zd={class:"grid grid-cols-2 gap-3"},e0={key:1,class:"fixed inset-0 bg-black/50 backdrop-blur-sm z-50 flex items-center justify-center p-4"},t0={class:"bg-white rounded-2xl shadow-xl w-full max-w-sm overflow-hidden"},s0={class:"bg-gradient-to-r from-emerald-500 to-green-600 p-4 flex justify-between items-center"},o0={class:"p-4 space-y-4"},n0=["disabled"],l0="https://cdn-icons-png.flaticon.com/512/4333/4333609.png",r0={__name:"StudyView",emits:["timer","openGoalModal","openMaterials","openBookshelf","editGoal"],setup(e,{expose:t,emit:o}){const n=at(),l=Es(),r=Vn(),{playSound:i}=rs(),{showConfirm:a}=xs(),c=At(),u=o,d=j([]),g=j(0),x=j(!1),b=j([]),y=j({title:"",subject:"",targetMinutes:30}),_=ee(()=>b.value.filter(F=>F.completed).length),T=ee(()=>b.value.length===0?0:Math.round(_.value/b.value.length*100)),w=ee(()=>b.value.reduce((F,A)=>F+(A.targetMinutes||0),0)),U=()=>{const F=new Date().toISOString().split("T")[0];return`study_todos_${n.currentUserId}_${F}`},B=()=>{try{const F=localStorage.getItem(U());F?b.value=JSON.parse(F):b.value=[]}catch{b.value=[]}},E=()=>{localStorage.setItem(U(),JSON.stringify(b.value))},ne=()=>{if(!y.value.title.trim())return;const F={id:Date.now(),title:y.value.title.trim(),subject:y.value.subject,targetMinutes:y.value.targetMinutes||0,completed:!1,createdAt:new Date().toISOString()};b.value.push(F),E(),i("select1"),y.value={title:"",subject:"",targetMinutes:30},x.value=!1},de=F=>{const A=b.value.find(V=>V.id===F);A&&(A.completed=!A.completed,E(),A.completed&&(i("success"),c.success("タスク完了！🎉")))},ge=async F=>{await a({type:"warning",title:"削除確認",message:"この計画を削除しますか？",confirmText:"削除",cancelText:"キャンセル"})&&(b.value=b.value.filter(V=>V.id!==F),E())},K=()=>{i("select1"),r.openShopList()},S=()=>{i("select2"),c.info(`ガチャは現在準備中です！
 アップデートをお楽しみに！`)},M=async()=>{if(n.currentUserId)try{const A=await(await fetch(`/api/user/${n.currentUserId}/stats`)).json();if(Array.isArray(A.weekly)&&A.weekly.length>0){const V=A.weekly[A.weekly.length-1];g.value=(V==null?void 0:V.minutes)||0}}catch(F){console.error("Failed to fetch today stats:",F)}},O=async()=>{if(n.currentUserId)try{const A=await(await fetch(`/api/goals/user/${n.currentUserId}`)).json();A.status==="ok"&&(d.value=A.goals||[])}catch(F){console.error("Failed to fetch goals:",F)}},p=F=>{if(!F)return"";const A=new Date(F);return`${A.getMonth()+1}月${A.getDate()}日`},P=F=>{if(!F)return"";const A=new Date(F),V=new Date;V.setHours(0,0,0,0),A.setHours(0,0,0,0);const ue=Math.ceil((A-V)/(1e3*60*60*24));return ue<0?"期限切れ":ue===0?"今日!":ue===1?"明日":`あと${ue}日`},G=F=>{if(!F)return"bg-gray-100 text-gray-600";const A=new Date(F),V=new Date;V.setHours(0,0,0,0),A.setHours(0,0,0,0);const ue=Math.ceil((A-V)/(1e3*60*60*24));return ue<0?"bg-red-100 text-red-600":ue<=3?"bg-orange-100 text-orange-600":ue<=7?"bg-yellow-100 text-yellow-600":"bg-green-100 text-green-600"},N=async F=>{if(await a({type:"success",title:"目標達成！🎉",message:`この目標を達成済みにしますか？
 おめでとう！頑張ったね！`,confirmText:"達成！",cancelText:"まだ続ける",icon:"🏆"}))try{(await(await fetch(`/api/goals/${F}/complete`,{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({user_id:n.currentUserId})})).json()).status==="ok"?(i("success"),await O()):c.error("完了処理に失敗しました")}catch(V){console.error("Complete goal error:",V),c.error("完了処理に失敗しました")}};return qe(()=>{M(),O(),B()}),t({fetchMyGoals:O}),(F,A)=>(f(),v("div",fd,[me(We,{class:"text-center"},{default:Te(()=>[s("div",pd,[s("img",{src:H(n).user.avatar_url||l0,class:"w-16 h-16 rounded-full border-2 border-indigo-300",alt:"avatar"},null,8,gd),s("div",vd,[s("h2",md,m(H(n).user.name),1),s("p",bd,m(H(n).user.rank_name),1),s("div",xd,[s("div",hd,[s("span",null,"Lv."+m(H(n).user.level),1),s("span",null,m(H(n).user.exp)+" / "+m(H(n).user.next_exp)+" XP",1)]),s("div",yd,[s("div",{class:"h-full bg-gradient-to-r from-indigo-500 to-purple-500 transition-all duration-500",style:ke({width:H(n).expPercentage+"%"})},null,4)])])])])]),_:1}),s("div",_d,[me(We,{class:"text-center"},{default:Te(()=>{var V;return[s("p",wd,m(((V=H(n).user.total_hours)==null?void 0:V.toFixed(1))||"0"),1),A[9]||(A[9]=s("p",{class:"text-sm text-gray-500"},"累計時間",-1))]}),_:1}),me(We,{class:"text-center"},{default:Te(()=>[s("p",kd,m(H(n).user.xp||0),1),A[10]||(A[10]=s("p",{class:"text-sm text-gray-500"},"所持 XP",-1))]),_:1})]),H(l).isPaused?(f(),Se(We,{key:0,class:"border-2 border-amber-300 animate-pulse"},{default:Te(()=>[s("div",$d,[s("div",null,[A[11]||(A[11]=s("p",{class:"text-amber-600 font-bold"},"⏸️ 勉強中断中",-1)),s("p",Cd,m(H(l).currentSubject)+" - "+m(H(l).lastSessionTime),1)]),s("button",{onClick:A[0]||(A[0]=V=>u("timer")),class:"bg-amber-500 text-white px-4 py-2 rounded-lg font-bold"}," 再開 ")])]),_:1})):X("",!0),me(We,null,{default:Te(()=>[s("div",Sd,[A[12]||(A[12]=s("h3",{class:"font-bold text-gray-700"},"📌 今日の学習計画",-1)),s("button",{onClick:A[1]||(A[1]=V=>x.value=!0),class:"text-xs px-3 py-1.5 rounded-lg bg-emerald-100 text-emerald-600 font-medium hover:bg-emerald-200 transition-colors"}," + 追加 ")]),s("div",Td,[s("div",jd,[s("div",{class:"h-full bg-gradient-to-r from-green-400 to-emerald-500 transition-all duration-300",style:ke({width:T.value+"%"})},null,4)]),s("span",Md,m(_.value)+"/"+m(b.value.length)+" 完了 ",1)]),b.value.length===0?(f(),v("div",Pd," 今日の学習計画を立てよう！📚 ")):(f(),v("div",Id,[(f(!0),v(ie,null,fe(b.value,V=>(f(),v("div",{key:V.id,class:ce(["p-2.5 rounded-xl border transition-all",V.completed?"bg-green-50 border-green-200":"bg-white border-gray-100 hover:border-emerald-200"])},[s("div",Ad,[s("button",{onClick:ue=>de(V.id),class:ce(["w-5 h-5 rounded-full border-2 flex items-center justify-center flex-shrink-0 mt-0.5 transition-all",V.completed?"bg-emerald-500 border-emerald-500 text-white":"border-gray-300 hover:border-emerald-400"])},[V.completed?(f(),v("span",Dd,"✓")):X("",!0)],10,Ed),s("div",Od,[s("p",{class:ce(["text-sm font-medium",V.completed?"text-gray-400 line-through":"text-gray-800"])},m(V.title),3),V.subject?(f(),v("p",Ud,m(V.subject),1)):X("",!0)]),V.targetMinutes?(f(),v("span",Bd,m(V.targetMinutes)+"分 ",1)):X("",!0),s("button",{onClick:ue=>ge(V.id),class:"text-gray-300 hover:text-red-400 text-xs flex-shrink-0"}," ✕ ",8,Nd)])],2))),128))])),s("div",Fd,[s("span",null,"今日の勉強: "+m(g.value)+"分",1),w.value>0?(f(),v("span",Ld,"目標: "+m(w.value)+"分",1)):X("",!0)])]),_:1}),me(We,null,{default:Te(()=>[s("div",Rd,[A[13]||(A[13]=s("h3",{class:"font-bold text-gray-700"},"🎯 マイ目標",-1)),s("button",{onClick:A[2]||(A[2]=V=>u("openGoalModal")),class:"text-xs px-3 py-1.5 rounded-lg bg-indigo-100 text-indigo-600 font-medium hover:bg-indigo-200 transition-colors"}," + 追加 ")]),d.value.length===0?(f(),v("div",Vd," 目標を設定してモチベーションアップ！ ")):(f(),v("div",Hd,[(f(!0),v(ie,null,fe(d.value,V=>(f(),v("div",{key:V.id,class:"p-3 bg-gradient-to-r from-indigo-50 to-purple-50 rounded-xl"},[s("div",Kd,[s("div",Gd,[s("h4",Wd,m(V.title),1),V.description?(f(),v("p",zd,m(V.description),1)):X("",!0)]),s("span",{class:ce(["text-xs px-2 py-0.5 rounded-full ml-2 flex-shrink-0",G(V.target_date)])},m(P(V.target_date)),3)]),s("div",Jd,[s("span",qd,"🗓️ "+m(p(V.target_date)),1),s("div",Xd,[s("button",{onClick:ue=>u("editGoal",V),class:"text-xs px-2 py-1 rounded bg-blue-100 text-blue-600 font-medium hover:bg-blue-200"}," ✏️ 編集 ",8,Yd),s("button",{onClick:ue=>N(V.id),class:"text-xs px-2 py-1 rounded bg-green-100 text-green-600 font-medium hover:bg-green-200"}," ✅ 達成 ",8,Qd)])])]))),128))]))]),_:1}),s("div",{class:"grid grid-cols-2 gap-3"},[s("button",{onClick:K,class:"bg-white/90 backdrop-blur-sm rounded-2xl p-4 shadow-lg flex flex-col items-center justify-center gap-1 transition-transform active:scale-95 border-b-4 border-amber-200"},[...A[14]||(A[14]=[s("span",{class:"text-4xl"},"🏪",-1),s("span",{class:"font-bold text-gray-700"},"ショップ",-1)])]),s("button",{onClick:S,class:"bg-white/90 backdrop-blur-sm rounded-2xl p-4 shadow-lg flex flex-col items-center justify-center gap-1 transition-transform active:scale-95 border-b-4 border-purple-200"},[...A[15]||(A[15]=[s("span",{class:"text-4xl"},"🔮",-1),s("span",{class:"font-bold text-gray-700"},"ガチャ",-1),s("span",{class:"text-[10px] text-red-500 font-bold bg-red-100 px-1.5 py-0.5 rounded-full"},"準備中",-1)])])]),s("div",Zd,[s("button",{onClick:A[3]||(A[3]=V=>u("openMaterials")),class:"bg-white/90 backdrop-blur-sm rounded-2xl p-4 shadow-lg flex flex-col items-center justify-center gap-1 transition-transform active:scale-95 border-b-4 border-green-200"},[...A[16]||(A[16]=[s("span",{class:"text-4xl"},"📖",-1),s("span",{class:"font-bold text-gray-700"},"教材",-1)])]),s("button",{onClick:A[4]||(A[4]=V=>u("openBookshelf")),class:"bg-white/90 backdrop-blur-sm rounded-2xl p-4 shadow-lg flex flex-col items-center justify-center gap-1 transition-transform active:scale-95 border-b-4 border-blue-200"},[...A[17]||(A[17]=[s("span",{class:"text-4xl"},"📚",-1),s("span",{class:"font-bold text-gray-700"},"本棚",-1)])])]),x.value?(f(),v("div",e0,[s("div",t0,[s("div",s0,[A[18]||(A[18]=s("h3",{class:"text-white font-bold"},"📝 学習計画を追加",-1)),s("button",{onClick:A[5]||(A[5]=V=>x.value=!1),class:"text-white/80 hover:text-white"},"✕")]),s("div",o0,[s("div",null,[A[19]||(A[19]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"何を学ぶ？ *",-1)),Ee(s("input",{"onUpdate:modelValue":A[6]||(A[6]=V=>y.value.title=V),type:"text",placeholder:"例: 数学の二次方程式を理解する",class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-emerald-400 focus:outline-none"},null,512),[[Ke,y.value.title]])]),s("div",null,[A[21]||(A[21]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"科目（任意）",-1)),Ee(s("select",{"onUpdate:modelValue":A[7]||(A[7]=V=>y.value.subject=V),class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-emerald-400 focus:outline-none"},[...A[20]||(A[20]=[oo('<option value="">選択しない</option><option value="国語">国語</option><option value="数学">数学</option><option value="英語">英語</option><option value="理科">理科</option><option value="社会">社会</option><option value="その他">その他</option>',7)])],512),[[Pt,y.value.subject]])]),s("div",null,[A[22]||(A[22]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"目標時間（分）",-1)),Ee(s("input",{"onUpdate:modelValue":A[8]||(A[8]=V=>y.value.targetMinutes=V),type:"number",min:"0",max:"120",placeholder:"30",class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-emerald-400 focus:outline-none"},null,512),[[Ke,y.value.targetMinutes,void 0,{number:!0}]])]),s("button",{onClick:ne,disabled:!y.value.title,class:"w-full py-3 bg-emerald-500 text-white font-bold rounded-xl disabled:bg-gray-300 hover:bg-emerald-600 transition-colors"}," 追加する ",8,n0)])])])):X("",!0)]))}},i0={class:"space-y-6 mt-8"},a0={class:"text-6xl font-mono font-bold text-indigo-700 tracking-wider"},c0={class:"mt-2 text-gray-600"},u0={key:0,class:"mt-2 text-sm text-gray-500"},d0={class:"flex justify-center gap-4"},f0={__name:"TimerView",emits:["back"],setup(e,{emit:t}){const o=Es(),n=t,l=()=>{o.openMemoConfirm()},r=async()=>{await o.pauseStudy()&&n("back")},i=async()=>{await o.cancelStudy(),n("back")};return(a,c)=>(f(),v("div",i0,[me(We,{class:"text-center py-8"},{default:Te(()=>[s("p",a0,m(H(o).timerDisplay),1),s("p",c0,[s("span",{class:"inline-block px-3 py-1 rounded-full text-sm font-medium text-white",style:ke({backgroundColor:H(o).currentSubjectColor})},m(H(o).currentSubject),5)]),H(o).currentMaterial?(f(),v("p",u0," 📚 "+m(H(o).currentMaterial.title),1)):X("",!0)]),_:1}),me(We,null,{default:Te(()=>[c[2]||(c[2]=s("label",{class:"block text-sm font-medium text-gray-700 mb-2"}," 📝 勉強メモ ",-1)),Ee(s("textarea",{"onUpdate:modelValue":c[0]||(c[0]=u=>H(o).studyMemo=u),class:"w-full h-24 p-3 border border-gray-200 rounded-lg resize-none focus:ring-2 focus:ring-indigo-500 focus:border-transparent",placeholder:"今日の勉強内容を記録しよう..."},null,512),[[Ke,H(o).studyMemo]])]),_:1}),s("div",{class:"grid grid-cols-2 gap-4"},[s("button",{onClick:l,class:"bg-gradient-to-r from-green-500 to-emerald-600 text-white py-4 rounded-xl font-bold text-lg shadow-lg hover:shadow-xl transition-all active:scale-95"}," ✓ 記録して終了 "),s("button",{onClick:r,class:"bg-gradient-to-r from-amber-500 to-orange-500 text-white py-4 rounded-xl font-bold text-lg shadow-lg hover:shadow-xl transition-all active:scale-95"}," ⏸️ 一時中断 ")]),s("div",d0,[s("button",{onClick:i,class:"text-red-500 underline text-sm"}," 記録を取り消す "),s("button",{onClick:c[1]||(c[1]=u=>n("back")),class:"text-gray-500 underline text-sm"}," 戻る ")])]))}},p0={class:"fixed inset-0 bg-black/50 backdrop-blur-sm z-50 flex items-center justify-center px-4"},g0={class:"bg-white rounded-2xl shadow-2xl w-full max-w-md overflow-hidden animate-fadeInUp max-h-[85vh] flex flex-col"},v0={class:"flex border-b bg-gray-50 flex-shrink-0"},m0={class:"flex-1 overflow-y-auto p-4"},b0={key:0},x0={class:"grid grid-cols-2 gap-3"},h0=["onClick","disabled"],y0={key:0,class:"text-center py-8"},_0={key:1},w0={class:"flex overflow-x-auto -mx-4 px-4 pb-3 mb-3 border-b scrollbar-hide"},k0=["onClick"],$0={key:0,class:"text-center py-8"},C0={key:1,class:"text-center py-8"},S0={class:"text-gray-500 text-sm"},T0={key:2,class:"grid grid-cols-2 gap-3"},j0=["onClick"],M0={class:"flex gap-3"},P0=["src","alt"],I0={key:1,class:"w-full h-full flex items-center justify-center text-white text-lg"},A0={class:"flex-1 min-w-0"},E0={class:"font-medium text-sm text-gray-800 line-clamp-2"},D0={class:"text-xs text-gray-400 mt-0.5"},O0={key:0,class:"mt-2"},U0={class:"flex justify-between text-[10px] text-gray-400 mb-0.5"},B0={class:"h-1.5 bg-gray-200 rounded-full overflow-hidden"},N0={class:"p-4 border-t flex-shrink-0"},F0={__name:"SubjectModal",emits:["close","start"],setup(e,{emit:t}){const o=Es(),n=at(),l=t,r=j("subject"),i=j([]),a=j(!1),c=j(""),u=[{name:"国語",color:"#EF5350"},{name:"数学",color:"#42A5F5"},{name:"理科",color:"#66BB6A"},{name:"社会",color:"#AB47BC"},{name:"英語",color:"#7986CB"},{name:"その他",color:"#90A4AE"}],d=ee(()=>c.value?i.value.filter(w=>w.subject===c.value):i.value),g=w=>i.value.filter(U=>U.subject===w).length,x=w=>{const U=u.find(B=>B.name===w);return(U==null?void 0:U.color)||"#90A4AE"},b=w=>{const U=x(w);return`linear-gradient(135deg, ${U} 0%, ${U}AA 100%)`},y=async()=>{if(!(i.value.length>0)&&n.currentUserId){a.value=!0;try{const U=await(await fetch(`/api/bookshelf/${n.currentUserId}`)).json();U.status==="ok"&&(i.value=U.books||[])}catch(w){console.error("Failed to load books:",w)}finally{a.value=!1}}},_=w=>{l("start",{subject:w,material:null})},T=w=>{l("start",{subject:w.subject,material:w})};return qe(()=>{y()}),(w,U)=>(f(),Se(ms,{to:"body"},[s("div",p0,[s("div",g0,[U[9]||(U[9]=s("div",{class:"bg-gradient-to-r from-indigo-500 to-purple-600 p-4 flex-shrink-0"},[s("h3",{class:"text-white font-bold text-lg text-center"},"📚 勉強を始める")],-1)),s("div",v0,[s("button",{onClick:U[0]||(U[0]=B=>r.value="subject"),class:ce(["flex-1 py-3 font-medium text-sm transition-colors",r.value==="subject"?"text-indigo-600 border-b-2 border-indigo-500 bg-white":"text-gray-500 hover:bg-gray-100"])}," 📝 科目から選ぶ ",2),s("button",{onClick:U[1]||(U[1]=B=>{r.value="bookshelf",y()}),class:ce(["flex-1 py-3 font-medium text-sm transition-colors",r.value==="bookshelf"?"text-indigo-600 border-b-2 border-indigo-500 bg-white":"text-gray-500 hover:bg-gray-100"])}," 📚 本棚から選ぶ ",2)]),s("div",m0,[r.value==="subject"?(f(),v("div",b0,[s("div",x0,[(f(!0),v(ie,null,fe(H(o).subjects,(B,E)=>(f(),v("button",{key:E,onClick:ne=>_(E),disabled:H(o).studying,class:"p-4 rounded-xl border-2 font-medium text-center transition-all hover:scale-105 active:scale-95 disabled:opacity-50",style:ke({borderColor:B,backgroundColor:B+"20",color:B})},m(E),13,h0))),128))]),Object.keys(H(o).subjects).length===0?(f(),v("div",y0,[...U[4]||(U[4]=[s("div",{class:"animate-spin rounded-full h-8 w-8 border-4 border-indigo-300 border-t-indigo-600 mx-auto"},null,-1),s("p",{class:"mt-2 text-gray-500"},"科目を読み込み中...",-1)])])):X("",!0)])):X("",!0),r.value==="bookshelf"?(f(),v("div",_0,[s("div",w0,[s("button",{onClick:U[2]||(U[2]=B=>c.value=""),class:ce(["flex-shrink-0 px-3 py-1.5 rounded-full text-xs font-medium mr-2 transition-colors",c.value===""?"bg-indigo-500 text-white":"bg-gray-100 text-gray-600 hover:bg-gray-200"])}," すべて ",2),(f(),v(ie,null,fe(u,B=>s("button",{key:B.name,onClick:E=>c.value=B.name,class:ce(["flex-shrink-0 px-3 py-1.5 rounded-full text-xs font-medium mr-2 transition-colors",c.value===B.name?"text-white":"bg-gray-100 text-gray-600 hover:bg-gray-200"]),style:ke(c.value===B.name?{backgroundColor:B.color}:{})},m(B.name)+" ("+m(g(B.name))+") ",15,k0)),64))]),a.value?(f(),v("div",$0,[...U[5]||(U[5]=[s("div",{class:"animate-spin rounded-full h-8 w-8 border-4 border-indigo-300 border-t-indigo-600 mx-auto"},null,-1),s("p",{class:"mt-2 text-gray-500"},"本棚を読み込み中...",-1)])])):d.value.length===0?(f(),v("div",C0,[U[6]||(U[6]=s("div",{class:"text-5xl mb-3"},"📕",-1)),s("p",S0,m(c.value?`${c.value}の教材がありません`:"本棚に教材がありません"),1),U[7]||(U[7]=s("p",{class:"text-gray-400 text-xs mt-1"},"本棚から教材を追加してね",-1))])):(f(),v("div",T0,[(f(!0),v(ie,null,fe(d.value,B=>(f(),v("div",{key:B.book_id,onClick:E=>T(B),class:"bg-gray-50 rounded-xl p-3 cursor-pointer transition-all hover:bg-indigo-50 hover:scale-[1.02] active:scale-95 border-2 border-transparent hover:border-indigo-300"},[s("div",M0,[s("div",{class:"w-12 h-16 flex-shrink-0 rounded-lg overflow-hidden shadow-sm",style:ke({background:b(B.subject)})},[B.cover_url?(f(),v("img",{key:0,src:B.cover_url,alt:B.title,class:"w-full h-full object-cover"},null,8,P0)):(f(),v("div",I0," 📖 "))],4),s("div",A0,[s("p",E0,m(B.title),1),s("p",D0,m(B.author||"著者不明"),1),s("span",{class:"inline-block px-2 py-0.5 rounded-full text-[10px] mt-1 text-white",style:ke({backgroundColor:x(B.subject)})},m(B.subject),5)])]),B.progress!==void 0&&B.progress>0?(f(),v("div",O0,[s("div",U0,[U[8]||(U[8]=s("span",null,"進捗",-1)),s("span",null,m(B.progress)+"%",1)]),s("div",B0,[s("div",{class:"h-full bg-green-500 transition-all",style:ke({width:B.progress+"%"})},null,4)])])):X("",!0)],8,j0))),128))]))])):X("",!0)]),s("div",N0,[s("button",{onClick:U[3]||(U[3]=B=>l("close")),class:"w-full py-3 text-gray-600 font-medium hover:bg-gray-100 rounded-xl transition-colors"}," キャンセル ")])])])]))}},L0={class:"fixed inset-0 bg-black/50 backdrop-blur-sm z-[9999] flex items-center justify-center px-4"},R0={class:"bg-white rounded-2xl shadow-2xl w-full max-w-md overflow-hidden animate-fadeInUp max-h-[90vh] flex flex-col"},V0={class:"bg-gradient-to-r from-green-500 to-emerald-600 p-4 flex-shrink-0"},H0={class:"flex items-center justify-between"},K0={class:"text-right"},G0={class:"text-white font-mono font-bold text-xl"},W0={class:"p-4 overflow-y-auto flex-1"},z0={key:0,class:"bg-indigo-50 border border-indigo-200 rounded-xl p-3 mb-4"},J0={class:"flex items-center gap-3"},q0={class:"font-bold text-sm text-indigo-800"},X0={class:"text-xs text-indigo-600"},Y0={class:"mb-4"},Q0={class:"mb-4"},Z0={class:"flex flex-wrap gap-2"},ef=["onClick"],tf={class:"mb-4"},sf={key:1,class:"mb-4"},of={key:0,class:"mt-2 bg-gray-50 rounded-lg p-3"},nf={class:"text-gray-600 text-xs whitespace-pre-wrap"},lf={__name:"MemoConfirmDialog",props:{memo:{type:String,default:""}},emits:["confirm","cancel"],setup(e,{emit:t}){const o=t,{playSound:n}=rs(),l=Es(),r=j(""),i=j(null),a=j(""),c=j(!1),u=[{value:"perfect",emoji:"🌟",label:"バッチリ！"},{value:"good",emoji:"😊",label:"だいたいOK"},{value:"partial",emoji:"🤔",label:"半分くらい"},{value:"confused",emoji:"😵",label:"まだ難しい"}],d=()=>{n("select2");const x={reflection:r.value,understanding:i.value,reviewNote:a.value,hasReflection:r.value.trim().length>0};o("confirm",x)},g=()=>{n("click"),o("cancel")};return(x,b)=>(f(),Se(ms,{to:"body"},[s("div",L0,[s("div",R0,[s("div",V0,[s("div",H0,[b[4]||(b[4]=s("div",null,[s("h3",{class:"text-white font-bold text-lg"},"🧠 学習の振り返り"),s("p",{class:"text-green-100 text-xs mt-0.5"},"ファインマンテクニックで記憶定着！")],-1)),s("div",K0,[b[3]||(b[3]=s("p",{class:"text-white/70 text-[10px]"},"勉強時間",-1)),s("p",G0,m(H(l).timerDisplay),1)])])]),s("div",W0,[H(l).currentMaterial?(f(),v("div",z0,[s("div",J0,[b[5]||(b[5]=s("span",{class:"text-2xl"},"📚",-1)),s("div",null,[s("p",q0,m(H(l).currentMaterial.title),1),s("p",X0,m(H(l).currentSubject),1)])])])):X("",!0),b[10]||(b[10]=s("div",{class:"bg-amber-50 border border-amber-200 rounded-xl p-3 mb-4"},[s("div",{class:"flex items-start gap-2"},[s("span",{class:"text-xl"},"💡"),s("div",{class:"text-xs text-amber-800"},[s("p",{class:"font-bold mb-1"},"ファインマンテクニックとは？"),s("p",null,"学んだことを「誰かに教えるように」説明することで、理解度が格段にアップ！自分の言葉で書いてみよう。")])])],-1)),s("div",Y0,[b[6]||(b[6]=s("label",{class:"block text-sm font-bold text-gray-700 mb-2"}," 📝 今日学んだことを説明してね ",-1)),Ee(s("textarea",{"onUpdate:modelValue":b[0]||(b[0]=y=>r.value=y),class:"w-full px-3 py-2 border border-gray-200 rounded-xl focus:outline-none focus:ring-2 focus:ring-emerald-500 text-sm resize-none",rows:"3",placeholder:"例：因数分解は、式をかけ算の形に分解すること。x²+5x+6は(x+2)(x+3)になる！"},null,512),[[Ke,r.value]])]),s("div",Q0,[b[7]||(b[7]=s("label",{class:"block text-sm font-bold text-gray-700 mb-2"}," 🏷️ 理解度はどのくらい？ ",-1)),s("div",Z0,[(f(),v(ie,null,fe(u,y=>s("button",{key:y.value,onClick:_=>i.value=y.value,class:ce(["px-3 py-1.5 rounded-full text-xs font-medium transition-all",i.value===y.value?"bg-emerald-500 text-white scale-105":"bg-gray-100 text-gray-600 hover:bg-gray-200"])},m(y.emoji)+" "+m(y.label),11,ef)),64))])]),s("div",tf,[b[8]||(b[8]=s("label",{class:"block text-sm font-bold text-gray-700 mb-2"}," 🔄 次回復習したいこと（任意） ",-1)),Ee(s("input",{"onUpdate:modelValue":b[1]||(b[1]=y=>a.value=y),type:"text",class:"w-full px-3 py-2 border border-gray-200 rounded-xl focus:outline-none focus:ring-2 focus:ring-emerald-500 text-sm",placeholder:"例：公式の導出をもう一度確認"},null,512),[[Ke,a.value]])]),e.memo?(f(),v("div",sf,[s("button",{onClick:b[2]||(b[2]=y=>c.value=!c.value),class:"flex items-center gap-1 text-xs text-gray-500 hover:text-gray-700"},[s("span",null,m(c.value?"▼":"▶"),1),b[9]||(b[9]=pt(" 勉強中のメモを見る ",-1))]),c.value?(f(),v("div",of,[s("p",nf,m(e.memo),1)])):X("",!0)])):X("",!0),b[11]||(b[11]=s("div",{class:"bg-purple-50 border border-purple-200 rounded-xl p-3"},[s("div",{class:"flex items-center gap-2"},[s("span",{class:"text-lg"},"💎"),s("p",{class:"text-xs text-purple-700"},[s("span",{class:"font-bold"},"ボーナス！"),pt(" 振り返りを書くと、勉強石が+1もらえるよ！ ")])])],-1))]),s("div",{class:"p-4 border-t flex gap-3 flex-shrink-0"},[s("button",{onClick:g,class:"flex-1 py-3 bg-gray-200 text-gray-700 rounded-xl font-medium transition-colors hover:bg-gray-300 active:bg-gray-400"}," 戻る "),s("button",{onClick:d,class:"flex-1 py-3 bg-gradient-to-r from-green-500 to-emerald-600 text-white rounded-xl font-bold transition-transform hover:scale-105 active:scale-95"}," 記録完了 ✨ ")])])])]))}},rf={__name:"AnimatedCounter",props:{value:{type:Number,default:0},duration:{type:Number,default:500}},setup(e){const t=e,o=j("0"),n=j(!1);let l=null;const r=c=>c>=1e9?(c/1e9).toFixed(2)+"B":c>=1e6?(c/1e6).toFixed(2)+"M":c>=1e3?(c/1e3).toFixed(1)+"K":Math.floor(c).toLocaleString(),i=(c,u,d)=>{l&&cancelAnimationFrame(l);const g=performance.now(),x=u-c;x>0&&(n.value=!0,setTimeout(()=>n.value=!1,d+200));const b=y=>{const _=y-g,T=Math.min(_/d,1),w=1-Math.pow(2,-10*T),U=c+x*w;o.value=r(U),T<1&&(l=requestAnimationFrame(b))};l=requestAnimationFrame(b)};let a=0;return ss(()=>t.value,(c,u)=>{const d=u||a||0;a=c,i(d,c,t.duration)},{immediate:!0}),qe(()=>{o.value=r(t.value)}),(c,u)=>(f(),v("span",{class:ce(["odometer",{"text-glow":n.value}])},m(o.value),3))}},Hn=Xe(rf,[["__scopeId","data-v-eb50a094"]]),af={class:"particle-inner"},cf={__name:"KPParticlesAdvanced",props:{icon:{type:String,default:"💡"}},setup(e,{expose:t}){const o=e,n=j(null),l=j([]);let r=0;return t({emit:(a={})=>{const{count:c=5,startX:u=null,startY:d=null,targetX:g=null,targetY:x=null}=a,b=n.value;if(!b)return;const y=b.getBoundingClientRect(),_=u??y.width/2,T=d??y.height/2,w=g??y.width/2,U=x??0;for(let B=0;B<c;B++){const E=r++,ne=Math.PI*2*B/c+Math.random()*.5,de=40+Math.random()*60,ge=B*40,K=_+(Math.random()-.5)*30,S=T+(Math.random()-.5)*30,M=K+Math.cos(ne)*de,O=S+Math.sin(ne)*de*.5-30,p=w,P=U,G={id:E,icon:o.icon,style:{left:`${K}px`,top:`${S}px`,"--mid-x":`${M-K}px`,"--mid-y":`${O-S}px`,"--end-x":`${p-K}px`,"--end-y":`${P-S}px`,"--delay":`${ge}ms`,"--scale-start":.5+Math.random()*.3,"--rotation":`${Math.random()*360}deg`}};l.value.push(G),setTimeout(()=>{l.value=l.value.filter(N=>N.id!==E)},1200+ge)}}}),(a,c)=>(f(),v("div",{class:"particle-system",ref_key:"containerRef",ref:n},[(f(!0),v(ie,null,fe(l.value,u=>(f(),v("div",{key:u.id,class:"kp-particle",style:ke(u.style)},[s("span",af,m(u.icon),1)],4))),128))],512))}},uf=Xe(cf,[["__scopeId","data-v-c5d908a6"]]),df={class:"ambient-particles"},ff={__name:"SpaceBackground",props:{progress:{type:Number,default:0},parallaxOffset:{type:Object,default:()=>({x:0,y:0})}},setup(e){const t=e,o=ee(()=>{const u=t.progress;return u<5e3?{background:"radial-gradient(ellipse at bottom, #1B2838 0%, #0a0e17 50%, #000005 100%)"}:u<5e4?{background:"radial-gradient(ellipse at bottom, #1a1a3e 0%, #0d0d24 50%, #050510 100%)"}:u<5e5?{background:"radial-gradient(ellipse at bottom, #2a1810 0%, #150a08 50%, #0a0505 100%)"}:{background:"radial-gradient(ellipse at bottom, #1a0a2e 0%, #0a0518 50%, #020108 100%)"}}),n=ee(()=>{const u=t.progress;return u<5e3?"nebula-blue":u<5e4?"nebula-purple":u<5e5?"nebula-orange":"nebula-cosmic"}),l=j([]);let r=0,i=null;const a=()=>{const u=r++,d={id:u,style:{left:`${Math.random()*100}%`,top:`${Math.random()*50}%`,"--angle":`${-30+Math.random()*20}deg`,"--duration":`${.5+Math.random()*.5}s`,animationDelay:"0s"}};l.value.push(d),setTimeout(()=>{l.value=l.value.filter(g=>g.id!==u)},1500)},c=u=>({"--delay":`${Math.random()*20}s`,"--duration":`${15+Math.random()*15}s`,"--x-start":`${Math.random()*100}%`,"--y-start":`${Math.random()*100}%`,"--drift":`${(Math.random()-.5)*100}px`,opacity:.2+Math.random()*.3,width:`${1+Math.random()*2}px`,height:`${1+Math.random()*2}px`});return qe(()=>{i=setInterval(()=>{Math.random()>.7&&a()},3e3)}),As(()=>{clearInterval(i)}),(u,d)=>(f(),v("div",{class:"space-background",style:ke(o.value)},[s("div",{class:"star-layer star-layer-1",style:ke({transform:`translate(${e.parallaxOffset.x*.1}px, ${e.parallaxOffset.y*.1}px)`})},null,4),s("div",{class:"star-layer star-layer-2",style:ke({transform:`translate(${e.parallaxOffset.x*.3}px, ${e.parallaxOffset.y*.3}px)`})},null,4),s("div",{class:"star-layer star-layer-3",style:ke({transform:`translate(${e.parallaxOffset.x*.5}px, ${e.parallaxOffset.y*.5}px)`})},null,4),s("div",{class:ce(["nebula-overlay",n.value]),style:ke({transform:`translate(${e.parallaxOffset.x*.2}px, ${e.parallaxOffset.y*.2}px)`})},null,6),(f(!0),v(ie,null,fe(l.value,g=>(f(),v("div",{key:g.id,class:"shooting-star",style:ke(g.style)},null,4))),128)),s("div",df,[(f(),v(ie,null,fe(30,g=>s("div",{key:g,class:"dust-particle",style:ke(c())},null,4)),64))])],4))}},xi=Xe(ff,[["__scopeId","data-v-69227696"]]),pf={class:"stage-icon"},gf={class:"stage-name"},vf={key:0,class:"orbiting-elements"},mf={__name:"EvolutionStage",props:{totalKP:{type:Number,default:0},isActive:{type:Boolean,default:!1}},setup(e){const t=e,o=[{tier:1,minKP:0,name:"学習の始まり",emoji:"🌍",description:"知識の種を蒔く"},{tier:2,minKP:5e3,name:"軌道上へ",emoji:"🛰️",description:"視野が広がる"},{tier:3,minKP:5e4,name:"月への到達",emoji:"🌙",description:"新たなフロンティア"},{tier:4,minKP:2e5,name:"火星開拓",emoji:"🔴",description:"惑星間文明"},{tier:5,minKP:1e6,name:"銀河進出",emoji:"🌌",description:"星々の海へ"},{tier:6,minKP:1e7,name:"技術的特異点",emoji:"✨",description:"無限の知性"}],n=ee(()=>{const u=t.totalKP;let d=o[0];for(const g of o)u>=g.minKP&&(d=g);return d}),l=ee(()=>`stage-tier-${n.value.tier}`),r=ee(()=>{const u=n.value.tier;return{1:"glow-blue",2:"glow-cyan",3:"glow-silver",4:"glow-orange",5:"glow-purple",6:"glow-gold"}[u]||"glow-blue"}),i=ee(()=>{const u=n.value.tier;return u<3?0:u===3?1:u===4?2:u===5?3:5}),a=ee(()=>{const u=n.value.tier;return{3:"🛰️",4:"🚀",5:"⭐",6:"💫"}[u]||"⭐"}),c=u=>{const d=360/i.value*u,g=10+u*2;return{"--orbit-angle":`${d}deg`,"--orbit-duration":`${g}s`,animationDelay:`${u*-2}s`}};return(u,d)=>(f(),v("div",{class:ce(["evolution-stage relative",{active:e.isActive}])},[s("div",{class:ce(["glow-ring",r.value])},null,2),s("div",{class:ce(["stage-visual",l.value])},[s("div",pf,m(n.value.emoji),1),s("div",gf,m(n.value.name),1),n.value.tier>=3?(f(),v("div",vf,[(f(!0),v(ie,null,fe(i.value,g=>(f(),v("div",{key:g,class:"orbit-item",style:ke(c(g))},m(a.value),5))),128))])):X("",!0)],2),d[0]||(d[0]=s("div",{class:"tap-indicator"},[s("span",{class:"tap-text"},"タップ"),s("div",{class:"tap-arrow"},"↓")],-1))],2))}},bf=Xe(mf,[["__scopeId","data-v-3e9938dd"]]),xf={class:"flex justify-between items-start p-4 gap-2"},hf={class:"flex items-center gap-3"},yf={class:"bg-black/50 backdrop-blur-xl rounded-2xl px-4 py-3 border border-white/20 shadow-lg"},_f={class:"flex items-center gap-2"},wf={class:"text-right"},kf={class:"text-xl font-bold text-cyan-300 tabular-nums"},$f={class:"px-4"},Cf={class:"bg-black/40 backdrop-blur-lg rounded-full px-4 py-2 inline-flex items-center gap-2"},Sf={class:"text-sm text-amber-300 font-bold tabular-nums"},Tf={class:"absolute inset-0 flex items-center justify-center pointer-events-none"},jf={class:"absolute bottom-24 left-3 right-3 z-20 sm:bottom-28 sm:left-4 sm:right-4"},Mf={key:0,class:"bg-black/50 backdrop-blur-xl rounded-2xl p-3 sm:p-4 border border-white/20 shadow-lg"},Pf={class:"flex justify-between text-xs text-white/80 mb-2"},If={class:"flex items-center gap-1.5"},Af={class:"text-cyan-300 font-bold text-xs sm:text-sm truncate max-w-[100px] sm:max-w-none"},Ef={class:"text-yellow-300 font-bold tabular-nums"},Df={class:"h-3 sm:h-4 bg-white/10 rounded-full overflow-hidden relative"},Of={class:"absolute bottom-2 left-1 right-1 z-20 ios-safe-bottom sm:bottom-4 sm:left-2 sm:right-2"},Uf={class:"flex gap-1 sm:gap-1.5 justify-center px-1"},Bf={class:"absolute inset-0 pointer-events-none overflow-hidden"},Nf={class:"unlock-celebration relative z-10 max-w-sm mx-4 bg-gradient-to-br from-slate-900/95 via-indigo-900/95 to-purple-900/95 rounded-3xl p-8 border border-yellow-400/30 shadow-2xl"},Ff={class:"relative mt-4 mb-6"},Lf={class:"relative text-8xl text-center animate-bounce-in filter drop-shadow-[0_0_20px_rgba(250,204,21,0.5)]"},Rf={class:"text-3xl font-black text-transparent bg-clip-text bg-gradient-to-r from-yellow-300 via-amber-400 to-yellow-300 text-center mb-2 animate-shimmer-text"},Vf={class:"flex justify-center mb-4"},Hf={class:"text-white/80 text-center text-sm leading-relaxed mb-4"},Kf={key:0,class:"bg-black/40 rounded-xl p-4 mb-6 border border-cyan-400/30"},Gf={class:"flex items-start gap-2"},Wf={class:"text-xs text-cyan-100/80 leading-relaxed italic"},zf={class:"grid grid-cols-2 gap-3 mb-6"},Jf={class:"bg-white/10 rounded-xl p-3 text-center"},qf={class:"text-lg font-bold text-green-400"},Xf={class:"bg-white/10 rounded-xl p-3 text-center"},Yf={class:"text-lg font-bold text-yellow-400"},Qf={key:1,class:"text-center text-white/50 text-xs italic mb-6"},Zf={class:"confetti-container"},ep={__name:"MainGameView",emits:["navigate"],setup(e,{emit:t}){const o=zt(),n=at(),l=t;qe(()=>{document.addEventListener("click",()=>mt.init(),{once:!0})});const r=O=>{mt.play("click"),l("navigate",O)},i=j(null),a=j(null),c=j(!1),u=j(!1),d=j(!1),g=j([]),x=j({x:0,y:0}),b=j(!1),y=j(null);let _=0;const T=ee(()=>{var p;const O=((p=o.nextUnlock)==null?void 0:p.progressToUnlock)||0;return O>=80?"bg-gradient-to-r from-yellow-400 via-amber-400 to-yellow-300 animate-pulse-urgent":O>=50?"bg-gradient-to-r from-cyan-400 to-blue-400":"bg-gradient-to-r from-indigo-500 to-purple-500"}),w=O=>{mt.play("click");const p=O.currentTarget.getBoundingClientRect(),P=O.clientX-p.left,G=O.clientY-p.top,N=_++;g.value.push({id:N,x:P,y:G}),setTimeout(()=>{g.value=g.value.filter(we=>we.id!==N)},600);const F=Math.max(1,Math.floor(o.totalMultiplier*.01)),A=B++;if(U.value.push({id:A,x:P,y:G,value:F}),setTimeout(()=>{U.value=U.value.filter(we=>we.id!==A)},1e3),d.value=!0,setTimeout(()=>d.value=!1,100),o.addPoints(F),i.value&&a.value){const we=a.value.getBoundingClientRect();i.value.emit({count:Math.min(8,F),startX:P,startY:G,targetX:we.left+60,targetY:we.top+40})}const V=p.width/2,ue=p.height/2;x.value={x:(P-V)*.02,y:(G-ue)*.02}},U=j([]);let B=0;const E=O=>{},ne=O=>{if(O.touches.length===1){const p=O.touches[0],P=O.currentTarget.getBoundingClientRect(),G=P.width/2,N=P.height/2;x.value={x:(p.clientX-P.left-G)*.015,y:(p.clientY-P.top-N)*.015}}};ss(()=>o.knowledgePoints,(O,p)=>{O>(p||0)&&(c.value=!0,setTimeout(()=>c.value=!1,500))});let de=[];ss(()=>o.facilitiesWithState,O=>{const p=O.filter(G=>G.state==="unlocked").map(G=>G.id),P=p.filter(G=>!de.includes(G));if(P.length>0&&de.length>0){const G=O.find(N=>N.id===P[0]);G&&ge(G)}de=p},{deep:!0});const ge=O=>{u.value=!0,setTimeout(()=>u.value=!1,500),y.value=O,b.value=!0},K=O=>{const p=["#FFD700","#FF6B6B","#4ECDC4","#45B7D1","#96CEB4","#FFEAA7","#DDA0DD"];return{"--delay":`${Math.random()*3}s`,"--x-end":`${(Math.random()-.5)*400}px`,"--rotation":`${Math.random()*720}deg`,left:`${Math.random()*100}%`,backgroundColor:p[O%p.length],animationDelay:`${Math.random()*.5}s`}},S=O=>({"--sparkle-delay":`${Math.random()*2}s`,"--sparkle-x":`${Math.random()*100}%`,"--sparkle-y":`${Math.random()*100}%`,"--sparkle-size":`${4+Math.random()*8}px`,left:`${Math.random()*100}%`,top:`${Math.random()*100}%`}),M=O=>({1:"bg-slate-600 text-slate-200",2:"bg-blue-600 text-blue-100",3:"bg-purple-600 text-purple-100",4:"bg-orange-600 text-orange-100",5:"bg-pink-600 text-pink-100",6:"bg-amber-600 text-amber-100"})[O]||"bg-gray-600 text-gray-200";return qe(()=>{de=o.facilitiesWithState.filter(O=>O.state==="unlocked").map(O=>O.id)}),(O,p)=>(f(),v("div",{class:"main-game-view relative min-h-[calc(100vh-180px)] overflow-hidden",onClick:w,onTouchstartPassive:E,onTouchmovePassive:ne},[me(xi,{progress:H(o).totalEarnedPoints,parallaxOffset:x.value},null,8,["progress","parallaxOffset"]),me(uf,{ref_key:"particleSystem",ref:i},null,512),s("div",{class:ce({"animate-shake":u.value})},[s("div",{class:"absolute top-0 left-0 right-0 z-30 ios-safe-top",ref_key:"kpTargetRef",ref:a},[s("div",xf,[s("div",{class:ce(["kp-display bg-black/50 backdrop-blur-xl rounded-2xl px-4 py-3 border border-white/20 shadow-lg flex-1",{"animate-glow-pulse":c.value}])},[s("div",hf,[p[7]||(p[7]=s("span",{class:"text-3xl"},"💡",-1)),s("div",null,[p[6]||(p[6]=s("p",{class:"text-[10px] text-white/70 font-medium uppercase tracking-wider"},"Knowledge",-1)),me(Hn,{value:H(o).knowledgePoints,class:"text-2xl font-bold text-yellow-300 tabular-nums",duration:300},null,8,["value"])])])],2),s("div",yf,[s("div",_f,[p[9]||(p[9]=s("span",{class:"text-2xl"},"🔬",-1)),s("div",wf,[p[8]||(p[8]=s("p",{class:"text-[10px] text-white/70 font-medium uppercase tracking-wider"},"効率",-1)),s("p",kf,"×"+m(H(o).totalMultiplier.toFixed(1)),1)])])])]),s("div",$f,[s("div",Cf,[p[10]||(p[10]=s("span",{class:"text-lg"},"⭐",-1)),s("span",Sf,m(H(n).user.xp||0),1),p[11]||(p[11]=s("span",{class:"text-[10px] text-white/50"},"XP",-1))])])],512),s("div",Tf,[me(bf,{totalKP:H(o).totalEarnedPoints,isActive:d.value,class:"pointer-events-auto transform-gpu"},null,8,["totalKP","isActive"])]),(f(!0),v(ie,null,fe(U.value,P=>(f(),v("div",{key:P.id,class:"floating-number",style:ke({left:P.x+"px",top:P.y+"px"})}," +"+m(P.value),5))),128)),(f(!0),v(ie,null,fe(g.value,P=>(f(),v("div",{key:P.id,class:"tap-ripple",style:ke({left:P.x+"px",top:P.y+"px"})},null,4))),128)),s("div",jf,[H(o).nextUnlock?(f(),v("div",Mf,[s("div",Pf,[s("span",If,[p[12]||(p[12]=s("span",{class:"text-base"},"🔮",-1)),p[13]||(p[13]=s("span",{class:"font-medium hidden sm:inline"},"次の解放:",-1)),s("span",Af,m(H(o).nextUnlock.state==="revealed"?H(o).nextUnlock.name:"???"),1)]),s("span",Ef,m(Math.floor(H(o).nextUnlock.progressToUnlock))+"%",1)]),s("div",Df,[s("div",{class:ce(["h-full transition-all duration-500 rounded-full relative",T.value]),style:ke({width:H(o).nextUnlock.progressToUnlock+"%"})},[...p[14]||(p[14]=[s("div",{class:"absolute inset-0 bg-gradient-to-r from-transparent via-white/40 to-transparent animate-shimmer-fast"},null,-1)])],6)])])):X("",!0)]),s("div",Of,[p[19]||(p[19]=s("p",{class:"text-[9px] sm:text-[10px] text-white/50 text-center mb-1 sm:mb-2 uppercase tracking-widest"},"タップでKP獲得",-1)),s("div",Uf,[s("button",{onClick:p[0]||(p[0]=lt(P=>r("list"),["stop"])),class:"ios-nav-button"},[...p[15]||(p[15]=[s("span",{class:"text-2xl sm:text-3xl"},"📋",-1),s("span",{class:"text-[10px] sm:text-xs font-bold"},"施設",-1)])]),s("button",{onClick:p[1]||(p[1]=lt(P=>r("tree"),["stop"])),class:"ios-nav-button"},[...p[16]||(p[16]=[s("span",{class:"text-2xl sm:text-3xl"},"🌳",-1),s("span",{class:"text-[10px] sm:text-xs font-bold"},"ツリー",-1)])]),s("button",{onClick:p[2]||(p[2]=lt(P=>r("upgrade"),["stop"])),class:"ios-nav-button"},[...p[17]||(p[17]=[s("span",{class:"text-2xl sm:text-3xl"},"🔬",-1),s("span",{class:"text-[10px] sm:text-xs font-bold"},"強化",-1)])]),s("button",{onClick:p[3]||(p[3]=lt(P=>r("prestige"),["stop"])),class:"ios-nav-button prestige-button"},[...p[18]||(p[18]=[s("span",{class:"text-2xl sm:text-3xl"},"🔄",-1),s("span",{class:"text-[10px] sm:text-xs font-bold"},"転生",-1)])])])])],2),me(Gt,{name:"celebrate"},{default:Te(()=>{var P,G,N,F,A,V,ue,we,Ve,Ae,tt;return[b.value?(f(),v("div",{key:0,class:"fixed inset-0 z-50 flex items-center justify-center bg-black/80 backdrop-blur-lg",onClick:p[5]||(p[5]=lt(He=>b.value=!1,["self"]))},[p[26]||(p[26]=s("div",{class:"absolute inset-0 flex items-center justify-center pointer-events-none"},[s("div",{class:"w-96 h-96 rounded-full bg-gradient-radial from-yellow-400/30 via-amber-500/10 to-transparent animate-pulse-slow"})],-1)),s("div",Bf,[(f(),v(ie,null,fe(20,He=>s("div",{key:"sparkle-"+He,class:"sparkle",style:ke(S(He))},null,4)),64))]),s("div",Nf,[p[25]||(p[25]=s("div",{class:"absolute -top-4 left-1/2 -translate-x-1/2 bg-gradient-to-r from-yellow-400 to-amber-500 px-6 py-2 rounded-full shadow-lg"},[s("span",{class:"text-black font-bold text-sm tracking-wider"},"🔓 NEW UNLOCK")],-1)),s("div",Ff,[p[20]||(p[20]=s("div",{class:"absolute inset-0 flex items-center justify-center"},[s("div",{class:"w-32 h-32 rounded-full bg-yellow-400/20 animate-ping-slow"})],-1)),s("div",Lf,m((P=y.value)==null?void 0:P.icon),1)]),s("h2",Rf,m((G=y.value)==null?void 0:G.name),1),s("div",Vf,[s("span",{class:ce(["px-3 py-1 text-xs font-bold rounded-full",M((N=y.value)==null?void 0:N.tier)])}," Tier "+m((F=y.value)==null?void 0:F.tier)+" 施設 ",3)]),s("p",Hf,m((A=y.value)==null?void 0:A.description),1),(V=y.value)!=null&&V.academicNote?(f(),v("div",Kf,[s("div",Gf,[p[22]||(p[22]=s("span",{class:"text-cyan-400 text-lg"},"📖",-1)),s("div",null,[p[21]||(p[21]=s("p",{class:"text-[10px] text-cyan-400 font-bold uppercase tracking-wider mb-1"},"Academic Note",-1)),s("p",Wf,m((ue=y.value)==null?void 0:ue.academicNote),1)])])])):X("",!0),s("div",zf,[s("div",Jf,[p[23]||(p[23]=s("p",{class:"text-[10px] text-white/50 uppercase"},"生産量",-1)),s("p",qf,"+"+m((we=y.value)==null?void 0:we.baseProduction)+"/分",1)]),s("div",Xf,[p[24]||(p[24]=s("p",{class:"text-[10px] text-white/50 uppercase"},"初期コスト",-1)),s("p",Yf,m((Ve=y.value)==null?void 0:Ve.baseCost)+" KP",1)])]),(Ae=y.value)!=null&&Ae.flavorText?(f(),v("p",Qf,m((tt=y.value)==null?void 0:tt.flavorText),1)):X("",!0),s("button",{onClick:p[4]||(p[4]=lt(He=>b.value=!1,["stop"])),class:"w-full py-4 bg-gradient-to-r from-yellow-400 via-amber-400 to-yellow-400 text-black font-bold rounded-2xl text-lg shadow-lg active:scale-95 transition-all hover:shadow-yellow-400/50 hover:shadow-xl"}," 🚀 研究を開始する ")]),s("div",Zf,[(f(),v(ie,null,fe(60,He=>s("div",{key:He,class:"confetti",style:ke(K(He))},null,4)),64))])])):X("",!0)]}),_:1})],32))}},tp=Xe(ep,[["__scopeId","data-v-fd3c520e"]]),sp={key:0,class:"p-3 flex flex-col items-center justify-center h-[180px]"},op={class:"relative w-14 h-14 mb-2"},np={class:"w-full h-full transform -rotate-90",viewBox:"0 0 64 64"},lp=["stroke-dashoffset"],rp={class:"absolute inset-0 flex items-center justify-center"},ip={class:"text-2xl filter grayscale blur-[2px] opacity-30"},ap={class:"text-[10px] text-gray-500"},cp={key:1,class:"p-3 flex flex-col items-center justify-center h-[180px]"},up={class:"relative w-14 h-14 mb-2"},dp={class:"w-full h-full transform -rotate-90",viewBox:"0 0 64 64"},fp=["stroke","stroke-dashoffset"],pp={class:"absolute inset-0 flex items-center justify-center"},gp={class:"text-2xl filter blur-[1px] opacity-60"},vp={class:"text-[10px] text-cyan-400"},mp={key:2,class:"p-3 flex flex-col items-center justify-center h-[180px] relative"},bp={class:"relative w-14 h-14 mb-2"},xp={class:"w-full h-full transform -rotate-90",viewBox:"0 0 64 64"},hp=["stroke-dashoffset"],yp={class:"absolute inset-0 flex items-center justify-center"},_p={class:"text-3xl animate-pulse"},wp={class:"text-amber-300 font-bold text-sm truncate max-w-full px-1"},kp={class:"text-[10px] text-amber-400"},$p={key:3,class:"p-3 flex flex-col h-[180px]"},Cp={class:"flex items-start justify-between mb-2"},Sp={class:"relative"},Tp={key:0,class:"bg-yellow-400/20 rounded-lg px-1.5 py-0.5"},jp={class:"text-[10px] text-yellow-400 font-bold"},Mp={class:"font-bold text-white text-sm truncate mb-1"},Pp={class:"flex-1"},Ip={key:0,class:"space-y-1"},Ap={class:"flex items-center gap-1 text-green-400 text-xs"},Ep={class:"font-bold"},Dp={class:"h-1.5 bg-white/10 rounded-full overflow-hidden"},Op={class:"text-[9px] text-white/40"},Up={key:1,class:"text-xs text-white/50"},Bp={class:"mt-auto pt-2 border-t border-white/10"},Np={class:"flex items-center gap-1"},Fp=["disabled"],Lp={__name:"FacilityCardHorizontal",props:{facility:{type:Object,required:!0}},emits:["buy"],setup(e,{emit:t}){const o=e,n=t,l=zt(),r=j(1),i=2*Math.PI*28,a=B=>l.formatNumber(B),c=()=>{const B=parseInt(r.value);n("buy",{facilityId:o.facility.id,amount:B})},u=ee(()=>{if(o.facility.state!=="unlocked")return{canBuy:0,totalCost:0};const B=parseInt(r.value),E=B===-1?1e3:B;let ne=0,de=0,ge=l.knowledgePoints,K=o.facility.level||0;for(let S=0;S<E;S++){const M=l.calculateCost(o.facility.baseCost,K);if(ge>=M)ge-=M,ne+=M,K++,de++;else break}return{canBuy:de,totalCost:ne}}),d=ee(()=>parseInt(r.value)===1?o.facility.currentCost:u.value.totalCost),g=ee(()=>u.value.canBuy>0),x=ee(()=>!o.facility.production||!l.currentProduction?0:o.facility.production/l.currentProduction*100),b={1:{color:"#64748b",bg:"bg-slate-700",badge:"bg-slate-500"},2:{color:"#3b82f6",bg:"bg-blue-900",badge:"bg-blue-500"},3:{color:"#8b5cf6",bg:"bg-purple-900",badge:"bg-purple-500"},4:{color:"#f97316",bg:"bg-orange-900",badge:"bg-orange-500"},5:{color:"#ec4899",bg:"bg-pink-900",badge:"bg-pink-500"},6:{color:"#f59e0b",bg:"bg-amber-900",badge:"bg-amber-500"}},y=ee(()=>{var B;return((B=b[o.facility.tier])==null?void 0:B.color)||"#64748b"}),_=ee(()=>{var B;return((B=b[o.facility.tier])==null?void 0:B.bg)||"bg-slate-700"}),T=ee(()=>{var B;return((B=b[o.facility.tier])==null?void 0:B.badge)||"bg-slate-500"}),w=ee(()=>{switch(o.facility.state){case"unlocked":return o.facility.level>0?"bg-slate-800/90 border border-white/20":"bg-slate-800/70 border border-white/10";case"revealed":return"bg-gradient-to-b from-amber-900/80 to-yellow-900/80 border border-amber-400/50";case"hint":return"bg-gray-800/80 border border-white/10";default:return"bg-gray-900/80 border border-white/5"}}),U=ee(()=>g.value?"bg-gradient-to-r from-indigo-500 to-purple-500 text-white active:scale-95":"bg-white/10 text-white/30 cursor-not-allowed");return(B,E)=>(f(),v("div",{class:ce(["facility-card-horizontal relative rounded-2xl overflow-hidden transition-all duration-300 flex-shrink-0",w.value]),style:{width:"160px"}},[e.facility.state==="locked"?(f(),v("div",sp,[s("div",op,[(f(),v("svg",np,[E[2]||(E[2]=s("circle",{cx:"32",cy:"32",r:"28",fill:"none",stroke:"rgba(255,255,255,0.1)","stroke-width":"4"},null,-1)),s("circle",{cx:"32",cy:"32",r:"28",fill:"none",stroke:"rgba(100,116,139,0.5)","stroke-width":"4","stroke-linecap":"round","stroke-dasharray":i,"stroke-dashoffset":i*(1-e.facility.progressToUnlock/100)},null,8,lp)])),s("div",rp,[s("span",ip,m(e.facility.icon),1)])]),E[3]||(E[3]=s("p",{class:"text-gray-400 font-semibold text-sm"},"???",-1)),s("p",ap,m(a(e.facility.unlockCondition))+" KP",1)])):e.facility.state==="hint"?(f(),v("div",cp,[s("div",up,[(f(),v("svg",dp,[E[4]||(E[4]=s("circle",{cx:"32",cy:"32",r:"28",fill:"none",stroke:"rgba(255,255,255,0.1)","stroke-width":"4"},null,-1)),s("circle",{cx:"32",cy:"32",r:"28",fill:"none",stroke:y.value,"stroke-width":"4","stroke-linecap":"round","stroke-dasharray":i,"stroke-dashoffset":i*(1-e.facility.progressToUnlock/100),class:"animate-pulse"},null,8,fp)])),s("div",pp,[s("span",gp,m(e.facility.icon),1)])]),E[5]||(E[5]=s("p",{class:"text-gray-300 font-semibold text-sm"},"???",-1)),s("p",vp,m(Math.floor(e.facility.progressToUnlock))+"%",1)])):e.facility.state==="revealed"?(f(),v("div",mp,[E[7]||(E[7]=s("div",{class:"absolute inset-0 bg-gradient-to-r from-transparent via-amber-400/10 to-transparent animate-shimmer-slow"},null,-1)),s("div",bp,[(f(),v("svg",xp,[E[6]||(E[6]=s("circle",{cx:"32",cy:"32",r:"28",fill:"none",stroke:"rgba(251,191,36,0.2)","stroke-width":"4"},null,-1)),s("circle",{cx:"32",cy:"32",r:"28",fill:"none",stroke:"#fbbf24","stroke-width":"4","stroke-linecap":"round","stroke-dasharray":i,"stroke-dashoffset":i*(1-e.facility.progressToUnlock/100),class:"animate-pulse"},null,8,hp)])),s("div",yp,[s("span",_p,m(e.facility.icon),1)])]),s("p",wp,m(e.facility.name),1),s("p",kp,m(Math.floor(e.facility.progressToUnlock))+"%",1)])):(f(),v("div",$p,[s("div",Cp,[s("div",Sp,[s("div",{class:ce(["w-12 h-12 rounded-xl flex items-center justify-center text-2xl",_.value])},m(e.facility.icon),3),e.facility.level>0?(f(),v("div",{key:0,class:ce(["absolute -top-1 -right-1 w-6 h-6 rounded-full flex items-center justify-center text-[10px] font-bold text-white shadow",T.value])},m(e.facility.level>99?"99+":e.facility.level),3)):X("",!0)]),e.facility.milestoneBonus>1?(f(),v("div",Tp,[s("span",jp,"×"+m(e.facility.milestoneBonus),1)])):X("",!0)]),s("h3",Mp,m(e.facility.name),1),s("div",Pp,[e.facility.level>0?(f(),v("div",Ip,[s("div",Ap,[E[8]||(E[8]=s("span",null,"⚡",-1)),s("span",Ep,"+"+m(a(e.facility.production))+"/分",1)]),s("div",Dp,[s("div",{class:"h-full bg-gradient-to-r from-green-400 to-emerald-400 transition-all",style:ke({width:x.value+"%"})},null,4)]),s("p",Op,"総生産の "+m(x.value.toFixed(1))+"%",1)])):(f(),v("div",Up," 未購入 "))]),s("div",Bp,[s("div",Np,[Ee(s("select",{"onUpdate:modelValue":E[0]||(E[0]=ne=>r.value=ne),onClick:E[1]||(E[1]=lt(()=>{},["stop"])),class:"flex-1 px-1 py-1.5 rounded-lg text-[10px] font-bold bg-white/10 text-white border border-white/20 appearance-none cursor-pointer text-center"},[...E[9]||(E[9]=[s("option",{value:"1"},"×1",-1),s("option",{value:"10"},"×10",-1),s("option",{value:"100"},"×100",-1),s("option",{value:"-1"},"MAX",-1)])],512),[[Pt,r.value]]),s("button",{onClick:lt(c,["stop"]),disabled:!g.value,class:ce(["flex-1 py-1.5 rounded-lg font-bold text-[10px] transition-all flex items-center justify-center gap-0.5",U.value])},[s("span",null,m(e.facility.level===0?"🔓":"⬆️"),1),s("span",null,m(a(d.value)),1)],10,Fp)])])]))],2))}},Rp=Xe(Lp,[["__scopeId","data-v-826af725"]]),Vp={class:"facility-list-view min-h-screen pb-32"},Hp={class:"sticky top-0 z-30 bg-slate-900/95 backdrop-blur-lg border-b border-white/10 ios-safe-top"},Kp={class:"p-4 flex items-center gap-3"},Gp={class:"flex-1"},Wp={class:"text-xs text-white/60 mt-0.5"},zp={class:"bg-white/15 rounded-2xl px-4 py-2.5 flex items-center gap-2 border border-white/10"},Jp={class:"px-4 pb-3 flex items-center gap-2"},qp={class:"flex-1 bg-gradient-to-r from-green-900/50 to-emerald-900/50 rounded-xl p-3 border border-green-400/20"},Xp={class:"flex items-center justify-between"},Yp={class:"text-lg font-bold text-green-400 tabular-nums"},Qp={class:"bg-white/10 rounded-xl p-3"},Zp={class:"flex items-center justify-between gap-2"},eg={class:"text-lg font-bold text-cyan-300 tabular-nums"},tg={class:"py-4 space-y-6"},sg={class:"px-4 mb-3"},og={class:"flex items-center gap-3"},ng={class:"flex-1"},lg={class:"font-bold text-white"},rg={class:"text-xs text-white/60"},ig={class:"text-right"},ag={class:"text-sm font-bold text-green-400"},cg={class:"overflow-x-auto scrollbar-hide"},ug={class:"flex gap-3 px-4 pb-2",style:{"min-width":"min-content"}},dg={class:"fixed bottom-0 left-0 right-0 p-4 bg-gradient-to-t from-slate-900 via-slate-900/95 to-transparent ios-safe-bottom"},fg={class:"flex gap-3 max-w-md mx-auto"},pg={__name:"FacilityListView",emits:["navigate"],setup(e,{emit:t}){const o=zt(),n=t,l=c=>{mt.play("click"),n("navigate",c)},r=ee(()=>o.stats),i=({facilityId:c,amount:u})=>{u===-1?o.buyFacility(c,1e3):o.buyFacility(c,u)},a=c=>{const u=c.facilities.filter(d=>d.state==="unlocked"&&d.level>0).reduce((d,g)=>d+g.production,0);return o.formatNumber(u)};return(c,u)=>(f(),v("div",Vp,[u[10]||(u[10]=s("div",{class:"fixed inset-0 -z-10"},[s("div",{class:"absolute inset-0 bg-gradient-to-b from-slate-900 via-slate-800 to-slate-900"}),s("div",{class:"star-layer-subtle"})],-1)),s("div",Hp,[s("div",Kp,[s("button",{onClick:u[0]||(u[0]=d=>l("main")),class:"w-12 h-12 rounded-2xl bg-white/15 flex items-center justify-center text-white active:bg-white/30 active:scale-95 transition-all text-lg"}," ← "),s("div",Gp,[u[3]||(u[3]=s("h1",{class:"text-xl font-bold text-white"},"研究施設",-1)),s("p",Wp,m(r.value.unlockedCount)+"/"+m(r.value.totalFacilities)+" 解放済み",1)]),s("div",zp,[u[4]||(u[4]=s("span",{class:"text-xl"},"💡",-1)),me(Hn,{value:H(o).knowledgePoints,class:"text-xl font-bold text-yellow-300 tabular-nums"},null,8,["value"])])]),s("div",Jp,[s("div",qp,[s("div",Xp,[u[5]||(u[5]=s("span",{class:"text-xs text-green-300/80"},"⚡ 総生産",-1)),s("span",Yp,"+"+m(H(o).formatNumber(H(o).currentProduction))+"/分",1)])]),s("div",Qp,[s("div",Zp,[u[6]||(u[6]=s("span",{class:"text-xs text-white/60"},"×",-1)),s("span",eg,m(H(o).totalMultiplier.toFixed(1)),1)])])])]),s("div",tg,[(f(!0),v(ie,null,fe(H(o).facilitiesByTier,d=>(f(),v("div",{key:d.tier,class:"tier-section"},[s("div",sg,[s("div",og,[s("div",{class:ce(["w-10 h-10 rounded-xl bg-gradient-to-br flex items-center justify-center text-white font-bold shadow-lg",d.color])},m(d.tier),3),s("div",ng,[s("p",lg,m(d.name),1),s("p",rg,m(d.facilities.filter(g=>g.state==="unlocked").length)+"/"+m(d.facilities.length)+" 解放 ",1)]),s("div",ig,[u[7]||(u[7]=s("p",{class:"text-xs text-white/50"},"Tier生産",-1)),s("p",ag,"+"+m(a(d))+"/分",1)])])]),s("div",cg,[s("div",ug,[(f(!0),v(ie,null,fe(d.facilities,g=>(f(),Se(Rp,{key:g.id,facility:g,onBuy:i},null,8,["facility"]))),128))])])]))),128))]),s("div",dg,[s("div",fg,[s("button",{onClick:u[1]||(u[1]=d=>l("main")),class:"flex-1 py-4 bg-white/15 backdrop-blur-xl rounded-2xl text-white font-bold flex items-center justify-center gap-2 border border-white/20 active:bg-white/30 active:scale-95 transition-all text-base"},[...u[8]||(u[8]=[s("span",{class:"text-xl"},"🌍",-1),s("span",null,"メイン",-1)])]),s("button",{onClick:u[2]||(u[2]=d=>l("tree")),class:"flex-1 py-4 bg-white/15 backdrop-blur-xl rounded-2xl text-white font-bold flex items-center justify-center gap-2 border border-white/20 active:bg-white/30 active:scale-95 transition-all text-base"},[...u[9]||(u[9]=[s("span",{class:"text-xl"},"🌳",-1),s("span",null,"ツリー",-1)])])])])]))}},gg=Xe(pg,[["__scopeId","data-v-3e10494a"]]),vg={key:1,class:"progress-ring",viewBox:"0 0 80 80"},mg=["stroke","stroke-dashoffset"],bg={class:"node-label"},xg={key:3,class:"unlock-indicator"},hg={__name:"TechNodeAdvanced",props:{node:{type:Object,required:!0}},emits:["select","buy"],setup(e){const t=e,o=2*Math.PI*36,n=ee(()=>{const b="relative cursor-pointer transition-all duration-300";switch(t.node.state){case"unlocked":return`${b} hover:scale-110`;case"revealed":return`${b} hover:scale-105 animate-pulse-slow`;case"hint":return`${b} opacity-70`;default:return`${b} opacity-40`}}),l=ee(()=>{const b="relative w-16 h-16 rounded-full flex items-center justify-center transition-all";switch(t.node.state){case"unlocked":return t.node.level>0?`${b} ${r.value} shadow-lg`:`${b} bg-slate-600 shadow-md`;case"revealed":return`${b} bg-amber-900/80 ring-2 ring-amber-400/50 shadow-lg`;case"hint":return`${b} bg-slate-800/80 backdrop-blur`;default:return`${b} bg-slate-900/80`}}),r=ee(()=>{const b=t.node.tier;return{1:"bg-gradient-to-br from-slate-400 to-slate-600",2:"bg-gradient-to-br from-blue-400 to-blue-600",3:"bg-gradient-to-br from-purple-400 to-purple-600",4:"bg-gradient-to-br from-orange-400 to-red-500",5:"bg-gradient-to-br from-pink-400 to-purple-600",6:"bg-gradient-to-br from-yellow-400 to-amber-500"}[b]||"bg-gradient-to-br from-gray-400 to-gray-600"}),i=ee(()=>{const b=t.node.tier;return{1:"glow-slate",2:"glow-blue",3:"glow-purple",4:"glow-orange",5:"glow-pink",6:"glow-gold"}[b]||"glow-slate"}),a=ee(()=>{const b=t.node.tier;return{1:"bg-slate-500",2:"bg-blue-500",3:"bg-purple-500",4:"bg-orange-500",5:"bg-pink-500",6:"bg-amber-500"}[b]||"bg-gray-500"}),c=ee(()=>{const b="text-2xl";switch(t.node.state){case"unlocked":return b;case"revealed":return`${b} animate-pulse`;case"hint":return`${b} filter blur-[2px] opacity-60`;default:return`${b} filter blur-[3px] grayscale opacity-30`}}),u=ee(()=>{switch(t.node.state){case"unlocked":return"text-white font-semibold";case"revealed":return"text-amber-300 font-semibold";default:return"text-white/40"}}),d=ee(()=>t.node.state==="revealed"?"#fbbf24":t.node.state==="hint"?"#64748b":"#374151"),g=ee(()=>t.node.state==="locked"?"❓":t.node.icon),x=ee(()=>t.node.state==="locked"||t.node.state==="hint"?"???":t.node.name);return(b,y)=>(f(),v("div",{class:ce(["tech-node",n.value]),onClick:y[0]||(y[0]=_=>b.$emit("select",e.node))},[e.node.state==="unlocked"&&e.node.level>0?(f(),v("div",{key:0,class:ce(["glow-ring",i.value])},null,2)):X("",!0),e.node.state!=="unlocked"?(f(),v("svg",vg,[y[1]||(y[1]=s("circle",{cx:"40",cy:"40",r:"36",fill:"none",stroke:"rgba(255,255,255,0.1)","stroke-width":"3"},null,-1)),s("circle",{cx:"40",cy:"40",r:"36",fill:"none",stroke:d.value,"stroke-width":"3","stroke-linecap":"round","stroke-dasharray":o,"stroke-dashoffset":o*(1-e.node.progressToUnlock/100),class:"progress-stroke"},null,8,mg)])):X("",!0),s("div",{class:ce(["node-body",l.value])},[s("span",{class:ce(["node-icon",c.value])},m(g.value),3)],2),e.node.state==="unlocked"&&e.node.level>0?(f(),v("div",{key:2,class:ce(["level-badge",a.value])},m(e.node.level),3)):X("",!0),s("div",bg,[s("span",{class:ce(u.value)},m(x.value),3)]),e.node.state==="revealed"?(f(),v("div",xg," 🔓 ")):X("",!0)],2))}},yg=Xe(hg,[["__scopeId","data-v-a26387c6"]]),_g={class:"tech-tree-advanced min-h-screen"},wg={class:"fixed inset-0 -z-10"},kg={class:"sticky top-0 z-30 bg-black/85 backdrop-blur-xl border-b border-white/10 ios-safe-top"},$g={class:"p-4 flex items-center gap-3"},Cg={class:"bg-white/15 rounded-2xl px-4 py-2.5 flex items-center gap-2 border border-white/10"},Sg={class:"absolute inset-0 w-full h-full pointer-events-none",style:{overflow:"visible"}},Tg=["x1","y1","x2","y2","stroke","filter"],jg={key:0,class:"fixed bottom-0 left-0 right-0 z-50 bg-slate-900/95 backdrop-blur-xl rounded-t-3xl shadow-2xl border-t border-white/10 ios-safe-bottom",style:{padding:"20px 20px calc(env(safe-area-inset-bottom, 0px) + 20px) 20px"}},Mg={class:"flex items-start gap-4"},Pg={class:"flex-1"},Ig={class:"text-xl font-bold text-white"},Ag={class:"text-sm text-white/60 mt-1 leading-relaxed"},Eg={class:"flex items-center gap-4 mt-3 text-sm flex-wrap"},Dg={class:"text-yellow-300 font-medium"},Og={class:"text-green-400 font-medium"},Ug={class:"text-purple-300 font-medium"},Bg=["disabled"],Ng={key:1,class:"w-full mt-5 py-4 rounded-2xl bg-white/5 text-center text-white/50"},Fg={class:"mt-3 h-3 bg-white/10 rounded-full overflow-hidden mx-8"},Lg={class:"fixed bottom-0 left-0 right-0 p-4 bg-gradient-to-t from-black via-black/90 to-transparent z-30 ios-safe-bottom"},Rg={class:"flex gap-3 max-w-md mx-auto"},Vg={__name:"TechTreeViewAdvanced",emits:["navigate","buy"],setup(e,{emit:t}){const o=zt(),n=t,l=P=>{mt.play("click"),n("navigate",P)},r=j(null),i=j(.7),a=j(0),c=j(0),u=j(!1),d=j({x:0,y:0}),g=j(null),x=j({x:0,y:0}),b=ee(()=>({x:200,y:100})),y=ee(()=>({transform:`translate(${a.value}px, ${c.value}px) scale(${i.value})`,transformOrigin:"top left"})),_=ee(()=>o.facilitiesWithState.map(F=>{const A=F.tier-1,V=o.facilitiesWithState.filter(Ae=>Ae.tier===F.tier),ue=V.findIndex(Ae=>Ae.id===F.id),we=V.length,Ve=(ue-(we-1)/2)*140;return{...F,x:150+Ve,y:80+A*180}})),T=P=>({position:"absolute",left:`${P.x+b.value.x}px`,top:`${P.y+b.value.y}px`,transform:"translate(-50%, -50%)"}),w=ee(()=>{const P=[],G={};_.value.forEach(F=>{G[F.tier]||(G[F.tier]=[]),G[F.tier].push(F)});const N=Object.keys(G).map(Number).sort((F,A)=>F-A);for(let F=0;F<N.length-1;F++){const A=G[N[F]],V=G[N[F+1]];A.forEach(ue=>{V.forEach(we=>{Math.abs(ue.x-we.x)<200&&P.push({id:`${ue.id}-${we.id}`,x1:ue.x,y1:ue.y,x2:we.x,y2:we.y,unlocked:ue.state==="unlocked"&&ue.level>0})})})}return P}),U=P=>{if(P.target.closest(".tech-node"))return;u.value=!0;const G=P.touches?P.touches[0]:P;d.value={x:G.clientX-a.value,y:G.clientY-c.value}},B=P=>{if(!u.value)return;const G=P.touches?P.touches[0]:P;a.value=G.clientX-d.value.x,c.value=G.clientY-d.value.y,x.value={x:a.value*.1,y:c.value*.1}},E=()=>{u.value=!1},ne=P=>{const G=P.deltaY>0?-.1:.1;i.value=Math.max(.3,Math.min(1.5,i.value+G))},de=()=>i.value=Math.min(1.5,i.value+.15),ge=()=>i.value=Math.max(.3,i.value-.15),K=()=>{i.value=.7,a.value=0,c.value=50},S=P=>{mt.play("click"),g.value=P},M=()=>{g.value&&(n("buy",g.value.id),g.value=null)},O=P=>({1:"bg-slate-700",2:"bg-blue-700",3:"bg-purple-700",4:"bg-orange-700",5:"bg-pink-700",6:"bg-amber-600"})[P]||"bg-slate-700",p=P=>P>=1e9?(P/1e9).toFixed(2)+"B":P>=1e6?(P/1e6).toFixed(2)+"M":P>=1e3?(P/1e3).toFixed(1)+"K":Math.floor(P).toLocaleString();return qe(()=>{c.value=50}),(P,G)=>(f(),v("div",_g,[s("div",wg,[me(xi,{progress:H(o).totalEarnedPoints,parallaxOffset:x.value},null,8,["progress","parallaxOffset"])]),s("div",kg,[s("div",$g,[s("button",{onClick:G[0]||(G[0]=N=>l("main")),class:"w-12 h-12 rounded-2xl bg-white/15 flex items-center justify-center text-white active:bg-white/30 active:scale-95 transition-all text-lg"}," ← "),G[5]||(G[5]=s("div",{class:"flex-1"},[s("h1",{class:"text-xl font-bold text-white"},"テックツリー"),s("p",{class:"text-xs text-white/60 mt-0.5"},"ドラッグ＆ズームで探索")],-1)),s("div",Cg,[G[4]||(G[4]=s("span",{class:"text-xl"},"💡",-1)),me(Hn,{value:H(o).knowledgePoints,class:"text-xl font-bold text-yellow-300 tabular-nums"},null,8,["value"])])])]),s("div",{class:"tree-viewport",ref_key:"viewportRef",ref:r,onMousedown:U,onMousemove:B,onMouseup:E,onMouseleave:E,onTouchstartPassive:U,onTouchmovePassive:B,onTouchend:E,onWheel:lt(ne,["prevent"])},[s("div",{class:"tree-world",style:ke(y.value)},[(f(),v("svg",Sg,[G[6]||(G[6]=oo('<defs data-v-a8b5ff6e><linearGradient id="gradient-unlocked" x1="0%" y1="0%" x2="0%" y2="100%" data-v-a8b5ff6e><stop offset="0%" stop-color="#06b6d4" stop-opacity="0.8" data-v-a8b5ff6e></stop><stop offset="50%" stop-color="#8b5cf6" stop-opacity="1" data-v-a8b5ff6e></stop><stop offset="100%" stop-color="#ec4899" stop-opacity="0.8" data-v-a8b5ff6e></stop></linearGradient><linearGradient id="gradient-locked" x1="0%" y1="0%" x2="0%" y2="100%" data-v-a8b5ff6e><stop offset="0%" stop-color="#374151" stop-opacity="0.3" data-v-a8b5ff6e></stop><stop offset="100%" stop-color="#1f2937" stop-opacity="0.5" data-v-a8b5ff6e></stop></linearGradient><filter id="glow-filter" x="-50%" y="-50%" width="200%" height="200%" data-v-a8b5ff6e><feGaussianBlur in="SourceGraphic" stdDeviation="4" result="blur" data-v-a8b5ff6e></feGaussianBlur><feMerge data-v-a8b5ff6e><feMergeNode in="blur" data-v-a8b5ff6e></feMergeNode><feMergeNode in="SourceGraphic" data-v-a8b5ff6e></feMergeNode></feMerge></filter></defs>',1)),(f(!0),v(ie,null,fe(w.value,N=>(f(),v("g",{key:N.id},[s("line",{x1:N.x1+b.value.x,y1:N.y1+b.value.y,x2:N.x2+b.value.x,y2:N.y2+b.value.y,stroke:N.unlocked?"url(#gradient-unlocked)":"url(#gradient-locked)","stroke-width":"3",filter:N.unlocked?"url(#glow-filter)":"",class:ce({"animate-flow":N.unlocked})},null,10,Tg)]))),128))])),(f(!0),v(ie,null,fe(_.value,N=>(f(),Se(yg,{key:N.id,node:N,style:ke(T(N)),onSelect:S,onBuy:F=>P.$emit("buy",N.id)},null,8,["node","style","onBuy"]))),128))],4)],544),s("div",{class:"fixed bottom-32 right-4 flex flex-col gap-3 z-40"},[s("button",{onClick:de,class:"zoom-btn"},"+"),s("button",{onClick:ge,class:"zoom-btn"},"−"),s("button",{onClick:K,class:"zoom-btn text-base"},"🎯")]),me(Gt,{name:"slide-up"},{default:Te(()=>[g.value?(f(),v("div",jg,[s("div",Mg,[s("div",{class:ce(["w-18 h-18 rounded-2xl flex items-center justify-center text-5xl",O(g.value.tier)]),style:{"min-width":"72px","min-height":"72px"}},m(g.value.icon),3),s("div",Pg,[s("h3",Ig,m(g.value.state==="unlocked"||g.value.state==="revealed"?g.value.name:"???"),1),s("p",Ag,m(g.value.state==="unlocked"?g.value.description:"施設の詳細は解放後に公開"),1),s("div",Eg,[s("span",Dg,"💡 "+m(p(g.value.currentCost))+" KP",1),s("span",Og,"⚡ +"+m(g.value.production.toFixed(1))+"/分",1),s("span",Ug,"Lv."+m(g.value.level),1)])]),s("button",{onClick:G[1]||(G[1]=N=>g.value=null),class:"w-10 h-10 flex items-center justify-center text-white/60 active:text-white bg-white/10 rounded-full"},"✕")]),g.value.state==="unlocked"?(f(),v("button",{key:0,onClick:M,disabled:!g.value.canAfford,class:ce(["w-full mt-5 py-4 rounded-2xl font-bold text-lg transition-all active:scale-95",g.value.canAfford?"bg-gradient-to-r from-cyan-500 via-purple-500 to-pink-500 text-white shadow-lg":"bg-white/10 text-white/40"])},m(g.value.level===0?"🔓 解放する":"⬆️ アップグレード"),11,Bg)):(f(),v("div",Ng,[pt(" 🔒 "+m(p(g.value.unlockCondition))+" KP で解放可能 ",1),s("div",Fg,[s("div",{class:"h-full bg-gradient-to-r from-amber-400 to-yellow-300",style:ke({width:g.value.progressToUnlock+"%"})},null,4)])]))])):X("",!0)]),_:1}),s("div",Lg,[s("div",Rg,[s("button",{onClick:G[2]||(G[2]=N=>l("main")),class:"flex-1 py-4 bg-white/15 backdrop-blur-xl rounded-2xl text-white font-bold flex items-center justify-center gap-2 border border-white/20 active:bg-white/30 active:scale-95 transition-all text-base"},[...G[7]||(G[7]=[s("span",{class:"text-xl"},"🌍",-1),s("span",null,"メイン",-1)])]),s("button",{onClick:G[3]||(G[3]=N=>l("list")),class:"flex-1 py-4 bg-white/15 backdrop-blur-xl rounded-2xl text-white font-bold flex items-center justify-center gap-2 border border-white/20 active:bg-white/30 active:scale-95 transition-all text-base"},[...G[8]||(G[8]=[s("span",{class:"text-xl"},"📋",-1),s("span",null,"施設",-1)])])])])]))}},Hg=Xe(Vg,[["__scopeId","data-v-a8b5ff6e"]]),Kg={class:"upgrade-panel min-h-screen pb-32"},Gg={class:"sticky top-0 z-30 bg-indigo-950/95 backdrop-blur-lg border-b border-purple-500/20 ios-safe-top"},Wg={class:"p-4 flex items-center gap-3"},zg={class:"bg-white/15 rounded-2xl px-4 py-2.5 flex items-center gap-2 border border-purple-500/30"},Jg={class:"text-xl font-bold text-yellow-300 tabular-nums"},qg={class:"px-4 py-3 bg-black/30"},Xg={class:"flex gap-3"},Yg={class:"flex-1 bg-white/10 rounded-xl p-3 text-center"},Qg={class:"text-xl font-bold text-cyan-300"},Zg={class:"flex-1 bg-white/10 rounded-xl p-3 text-center"},ev={class:"text-xl font-bold text-purple-300"},tv={class:"p-4 space-y-3"},sv={key:0,class:"text-center py-12"},ov={class:"flex items-start gap-4"},nv={class:"text-4xl"},lv={class:"flex-1 min-w-0"},rv={class:"font-bold text-white text-lg"},iv={class:"text-sm text-white/60 mt-1"},av={class:"mt-3 flex items-center gap-2"},cv={class:"text-yellow-300 font-bold"},uv=["onClick","disabled"],dv={key:1,class:"mt-6"},fv={class:"flex items-center gap-4"},pv={class:"text-3xl opacity-60"},gv={class:"flex-1"},vv={class:"font-bold text-white/60"},mv={class:"text-xs text-white/40"},bv={key:2,class:"mt-6"},xv={class:"flex items-center gap-4"},hv={class:"text-3xl grayscale opacity-30"},yv={class:"flex-1"},_v={class:"text-xs text-white/30"},wv={class:"fixed bottom-0 left-0 right-0 p-4 bg-gradient-to-t from-indigo-950 via-indigo-950/95 to-transparent ios-safe-bottom"},kv={class:"flex gap-3 max-w-md mx-auto"},$v={__name:"UpgradePanel",emits:["navigate"],setup(e,{emit:t}){const o=zt(),n=t,l=y=>{mt.play("click"),n("navigate",y)},r=ee(()=>o.upgradesWithState.filter(y=>y.unlocked&&!y.purchased)),i=ee(()=>o.upgradesWithState.filter(y=>y.purchased)),a=ee(()=>o.upgradesWithState.filter(y=>!y.unlocked&&!y.purchased)),c=ee(()=>o.upgradesWithState.filter(y=>y.unlocked)),u=ee(()=>{var y;return((y=o.purchasedUpgrades)==null?void 0:y.length)||0}),d=ee(()=>{var y;return((y=o.UPGRADES_MASTER)==null?void 0:y.length)||0}),g=y=>o.formatNumber(y),x=y=>{o.buyUpgrade(y)},b=y=>{var _,T;if((_=y.unlockCondition)!=null&&_.facility){const w=o.facilitiesWithState.find(U=>U.id===y.unlockCondition.facility);return`${(w==null?void 0:w.name)||"???"} をLv.${y.unlockCondition.level}にすると解放`}return(T=y.unlockCondition)!=null&&T.totalKP?`累計 ${g(y.unlockCondition.totalKP)} KPで解放`:"条件を満たすと解放"};return(y,_)=>(f(),v("div",Kg,[_[14]||(_[14]=s("div",{class:"fixed inset-0 -z-10"},[s("div",{class:"absolute inset-0 bg-gradient-to-b from-indigo-950 via-purple-950 to-slate-900"}),s("div",{class:"star-layer"})],-1)),s("div",Gg,[s("div",Wg,[s("button",{onClick:_[0]||(_[0]=T=>l("main")),class:"w-12 h-12 rounded-2xl bg-white/15 flex items-center justify-center text-white active:bg-white/30 active:scale-95 transition-all text-lg"}," ← "),_[4]||(_[4]=s("div",{class:"flex-1"},[s("h1",{class:"text-xl font-bold text-white"},"🔬 アップグレード"),s("p",{class:"text-xs text-purple-300 mt-0.5"},"研究効率を永続的に強化")],-1)),s("div",zg,[_[3]||(_[3]=s("span",{class:"text-xl"},"💡",-1)),s("span",Jg,m(g(H(o).knowledgePoints)),1)])])]),s("div",qg,[s("div",Xg,[s("div",Yg,[_[5]||(_[5]=s("p",{class:"text-[10px] text-white/50 uppercase"},"現在の倍率",-1)),s("p",Qg,"×"+m(H(o).totalMultiplier.toFixed(2)),1)]),s("div",Zg,[_[6]||(_[6]=s("p",{class:"text-[10px] text-white/50 uppercase"},"購入済み",-1)),s("p",ev,m(u.value)+"/"+m(d.value),1)])])]),s("div",tv,[r.value.length===0&&c.value.length===0?(f(),v("div",sv,[..._[7]||(_[7]=[s("div",{class:"text-6xl mb-4"},"🔒",-1),s("p",{class:"text-white/60"},"施設レベルを上げてアップグレードを解放しよう",-1)])])):X("",!0),(f(!0),v(ie,null,fe(r.value,T=>(f(),v("div",{key:T.id,class:"upgrade-card available"},[s("div",ov,[s("div",nv,m(T.icon),1),s("div",lv,[s("h3",rv,m(T.name),1),s("p",iv,m(T.description),1),s("div",av,[s("span",cv,"💡 "+m(g(T.cost)),1)])]),s("button",{onClick:w=>x(T.id),disabled:!T.canAfford,class:ce(["buy-button",{"can-afford":T.canAfford}])},m(T.canAfford?"購入":"💡不足"),11,uv)])]))),128)),i.value.length>0?(f(),v("div",dv,[_[9]||(_[9]=s("h2",{class:"text-sm text-white/50 uppercase tracking-wider mb-3"},"✅ 購入済み",-1)),(f(!0),v(ie,null,fe(i.value,T=>(f(),v("div",{key:T.id,class:"upgrade-card purchased"},[s("div",fv,[s("div",pv,m(T.icon),1),s("div",gv,[s("h3",vv,m(T.name),1),s("p",mv,m(T.description),1)]),_[8]||(_[8]=s("div",{class:"text-green-400 text-2xl"},"✓",-1))])]))),128))])):X("",!0),a.value.length>0?(f(),v("div",bv,[_[11]||(_[11]=s("h2",{class:"text-sm text-white/50 uppercase tracking-wider mb-3"},"🔒 未解放",-1)),(f(!0),v(ie,null,fe(a.value,T=>(f(),v("div",{key:T.id,class:"upgrade-card locked"},[s("div",xv,[s("div",hv,m(T.icon),1),s("div",yv,[_[10]||(_[10]=s("h3",{class:"font-bold text-white/40"},"???",-1)),s("p",_v,m(b(T)),1)])])]))),128))])):X("",!0)]),s("div",wv,[s("div",kv,[s("button",{onClick:_[1]||(_[1]=T=>y.$emit("navigate","main")),class:"flex-1 py-4 bg-white/15 backdrop-blur-xl rounded-2xl text-white font-bold flex items-center justify-center gap-2 border border-white/20 active:bg-white/30 active:scale-95 transition-all"},[..._[12]||(_[12]=[s("span",{class:"text-xl"},"🌍",-1),s("span",null,"メイン",-1)])]),s("button",{onClick:_[2]||(_[2]=T=>y.$emit("navigate","prestige")),class:"flex-1 py-4 bg-gradient-to-r from-amber-500 to-orange-500 rounded-2xl text-black font-bold flex items-center justify-center gap-2 active:scale-95 transition-all"},[..._[13]||(_[13]=[s("span",{class:"text-xl"},"🔄",-1),s("span",null,"転生",-1)])])])])]))}},Cv=Xe($v,[["__scopeId","data-v-8e27f725"]]),Sv={class:"prestige-view min-h-screen pb-32 relative overflow-hidden"},Tv={class:"sticky top-0 z-30 bg-amber-950/95 backdrop-blur-lg border-b border-amber-500/20 ios-safe-top"},jv={class:"p-4 flex items-center gap-3"},Mv={class:"p-4"},Pv={class:"bg-black/30 rounded-3xl p-6 mb-6 border border-amber-500/20"},Iv={class:"text-center mb-6"},Av={class:"text-2xl font-bold text-white"},Ev={class:"text-amber-300 mt-2"},Dv={class:"grid grid-cols-2 gap-4 text-center"},Ov={class:"bg-white/10 rounded-2xl p-4"},Uv={class:"text-xl font-bold text-yellow-300"},Bv={class:"bg-white/10 rounded-2xl p-4"},Nv={class:"text-xl font-bold text-amber-300"},Fv={class:"bg-gradient-to-br from-amber-900/50 to-orange-900/50 rounded-3xl p-6 mb-6 border border-amber-400/30"},Lv={class:"text-center"},Rv={key:0,class:"space-y-4"},Vv={class:"bg-black/30 rounded-2xl p-4"},Hv={class:"text-4xl font-bold text-amber-400 animate-pulse"},Kv={class:"bg-black/30 rounded-2xl p-4"},Gv={class:"text-2xl font-bold text-cyan-300"},Wv={class:"text-xs text-green-400 mt-1"},zv={class:"bg-red-900/30 rounded-2xl p-4 border border-red-500/30"},Jv={class:"text-xs text-white/60 mt-2 space-y-1 text-left pl-4"},qv={key:1,class:"space-y-4"},Xv={class:"bg-black/30 rounded-2xl p-6"},Yv={class:"relative h-4 bg-white/10 rounded-full overflow-hidden"},Qv={class:"text-xs text-white/40 mt-2"},Zv={class:"bg-black/30 rounded-3xl p-6 border border-white/10"},em={class:"grid grid-cols-4 gap-3"},tm=["title"],sm={class:"text-2xl"},om={class:"text-xs text-white/40 text-center mt-4"},nm={class:"fixed bottom-0 left-0 right-0 p-4 bg-gradient-to-t from-amber-950 via-amber-950/95 to-transparent ios-safe-bottom"},lm={class:"max-w-md mx-auto space-y-3"},rm={key:1,disabled:"",class:"w-full py-5 bg-white/10 text-white/40 font-bold rounded-2xl text-lg"},im={class:"bg-gradient-to-br from-amber-900 to-orange-900 rounded-3xl p-6 max-w-sm w-full border border-amber-400/50 shadow-2xl"},am={class:"text-center"},cm={class:"text-amber-200 text-sm mb-6"},um={class:"text-amber-400 font-bold"},dm={class:"flex gap-3"},fm={key:0,class:"fixed inset-0 z-50 flex items-center justify-center bg-black/90"},pm={class:"absolute inset-0 pointer-events-none overflow-hidden"},gm={__name:"PrestigeView",emits:["navigate"],setup(e,{emit:t}){const o=zt(),n=t,l=T=>{mt.play("click"),n("navigate",T)},r=j(!1),i=j(!1),a=ee(()=>o.potentialPrestigePoints>0),c=ee(()=>Math.min(100,o.totalEarnedPoints/1e9*100)),u=ee(()=>{const T=o.prestigePoints+o.potentialPrestigePoints;return 1+Math.log10(T+1)*.5}),d=T=>o.formatNumber(T),g=ee(()=>(o.ACHIEVEMENTS_MASTER||[]).slice(0,8).map(w=>{var U;return{...w,unlocked:(U=o.unlockedAchievements)==null?void 0:U.includes(w.id)}})),x=ee(()=>{var T;return((T=o.unlockedAchievements)==null?void 0:T.length)||0}),b=ee(()=>{var T;return((T=o.ACHIEVEMENTS_MASTER)==null?void 0:T.length)||0}),y=()=>{r.value=!1,i.value=!0,setTimeout(()=>{o.prestige(),setTimeout(()=>{i.value=!1,n("navigate","main")},2e3)},500)},_=T=>{const w=T/30*360,U=100+Math.random()*200,B=4+Math.random()*8,E=Math.random()*.5,ne=1+Math.random()*1;return{"--angle":w+"deg","--distance":U+"px",width:B+"px",height:B+"px",animationDelay:E+"s",animationDuration:ne+"s"}};return(T,w)=>(f(),v("div",Sv,[w[25]||(w[25]=s("div",{class:"fixed inset-0 -z-10"},[s("div",{class:"absolute inset-0 bg-gradient-to-b from-amber-950 via-orange-950 to-slate-900"}),s("div",{class:"star-layer"}),s("div",{class:"absolute top-1/3 left-1/2 -translate-x-1/2 w-96 h-96 bg-amber-500/20 rounded-full blur-3xl animate-pulse"})],-1)),s("div",Tv,[s("div",jv,[s("button",{onClick:w[0]||(w[0]=U=>l("main")),class:"w-12 h-12 rounded-2xl bg-white/15 flex items-center justify-center text-white active:bg-white/30 active:scale-95 transition-all text-lg"}," ← "),w[5]||(w[5]=s("div",{class:"flex-1"},[s("h1",{class:"text-xl font-bold text-white"},"🔄 転生"),s("p",{class:"text-xs text-amber-300 mt-0.5"},"新たな始まりへ")],-1))])]),s("div",Mv,[s("div",Pv,[s("div",Iv,[w[6]||(w[6]=s("div",{class:"text-6xl mb-4"},"🌟",-1)),s("h2",Av,"転生レベル "+m(H(o).prestigeLevel),1),s("p",Ev,"現在の転生ボーナス: ×"+m(H(o).prestigeMultiplier.toFixed(2)),1)]),s("div",Dv,[s("div",Ov,[w[7]||(w[7]=s("p",{class:"text-xs text-white/50 mb-1"},"累計獲得KP",-1)),s("p",Uv,m(d(H(o).totalEarnedPoints)),1)]),s("div",Bv,[w[8]||(w[8]=s("p",{class:"text-xs text-white/50 mb-1"},"転生ポイント",-1)),s("p",Nv,m(H(o).prestigePoints),1)])])]),s("div",Fv,[s("div",Lv,[w[16]||(w[16]=s("h3",{class:"text-lg font-bold text-white mb-4"},"転生すると...",-1)),a.value?(f(),v("div",Rv,[s("div",Vv,[w[9]||(w[9]=s("p",{class:"text-amber-200 text-sm mb-2"},"獲得できる転生ポイント",-1)),s("p",Hv," +"+m(H(o).potentialPrestigePoints),1)]),s("div",Kv,[w[10]||(w[10]=s("p",{class:"text-amber-200 text-sm mb-2"},"新しい転生ボーナス",-1)),s("p",Gv," ×"+m(u.value.toFixed(2)),1),s("p",Wv," (+"+m((u.value-H(o).prestigeMultiplier).toFixed(2))+") ",1)]),s("div",zv,[w[13]||(w[13]=s("p",{class:"text-red-300 text-sm"},"⚠️ リセットされるもの",-1)),s("ul",Jv,[s("li",null,"• 現在のKP（"+m(d(H(o).knowledgePoints))+"）",1),w[11]||(w[11]=s("li",null,"• 全施設レベル",-1)),w[12]||(w[12]=s("li",null,"• 購入済みアップグレード",-1))])]),w[14]||(w[14]=s("div",{class:"bg-green-900/30 rounded-2xl p-4 border border-green-500/30"},[s("p",{class:"text-green-300 text-sm"},"✅ 保持されるもの"),s("ul",{class:"text-xs text-white/60 mt-2 space-y-1 text-left pl-4"},[s("li",null,"• 転生ポイント・ボーナス倍率"),s("li",null,"• 獲得した実績"),s("li",null,"• 生涯累計KP")])],-1))])):(f(),v("div",qv,[s("div",Xv,[w[15]||(w[15]=s("p",{class:"text-white/60 text-sm mb-4"},"転生には10億KP以上が必要です",-1)),s("div",Yv,[s("div",{class:"h-full bg-gradient-to-r from-amber-500 to-orange-500 transition-all duration-500",style:ke({width:c.value+"%"})},null,4)]),s("p",Qv,m(d(H(o).totalEarnedPoints))+" / 1B ("+m(c.value.toFixed(1))+"%) ",1)])]))])]),s("div",Zv,[w[17]||(w[17]=s("h3",{class:"text-lg font-bold text-white mb-4"},"🏆 実績",-1)),s("div",em,[(f(!0),v(ie,null,fe(g.value,U=>(f(),v("div",{key:U.id,class:ce(["achievement-badge",{unlocked:U.unlocked}]),title:U.name},[s("span",sm,m(U.icon),1)],10,tm))),128))]),s("p",om,m(x.value)+"/"+m(b.value)+" 達成 ",1)])]),s("div",nm,[s("div",lm,[a.value?(f(),v("button",{key:0,onClick:w[1]||(w[1]=U=>{r.value=!0,H(mt).play("click")}),class:"w-full py-5 bg-gradient-to-r from-amber-400 via-yellow-400 to-amber-400 text-black font-bold rounded-2xl text-xl shadow-2xl active:scale-95 transition-all animate-shimmer"}," 🔄 転生する (+"+m(H(o).potentialPrestigePoints)+" pts) ",1)):(f(),v("button",rm," 🔒 転生条件未達成 ")),s("button",{onClick:w[2]||(w[2]=U=>l("main")),class:"w-full py-4 bg-white/15 backdrop-blur-xl rounded-2xl text-white font-bold flex items-center justify-center gap-2 border border-white/20 active:bg-white/30 active:scale-95 transition-all"},[...w[18]||(w[18]=[s("span",{class:"text-xl"},"🌍",-1),s("span",null,"メインに戻る",-1)])])])]),me(Gt,{name:"fade"},{default:Te(()=>[r.value?(f(),v("div",{key:0,class:"fixed inset-0 z-50 flex items-center justify-center bg-black/80 backdrop-blur-md p-6",onClick:w[4]||(w[4]=lt(U=>r.value=!1,["self"]))},[s("div",im,[s("div",am,[w[22]||(w[22]=s("div",{class:"text-6xl mb-4"},"🔄",-1)),w[23]||(w[23]=s("h2",{class:"text-2xl font-bold text-white mb-2"},"転生しますか？",-1)),s("p",cm,[w[19]||(w[19]=pt(" 全ての進行がリセットされ、",-1)),w[20]||(w[20]=s("br",null,null,-1)),s("span",um,"+"+m(H(o).potentialPrestigePoints)+" 転生ポイント",1),w[21]||(w[21]=pt("を獲得します ",-1))]),s("div",dm,[s("button",{onClick:w[3]||(w[3]=U=>r.value=!1),class:"flex-1 py-4 bg-white/20 rounded-2xl text-white font-bold active:bg-white/30 transition-all"}," キャンセル "),s("button",{onClick:y,class:"flex-1 py-4 bg-gradient-to-r from-amber-400 to-orange-400 rounded-2xl text-black font-bold active:scale-95 transition-all"}," 転生する ")])])])])):X("",!0)]),_:1}),me(Gt,{name:"celebrate"},{default:Te(()=>[i.value?(f(),v("div",fm,[w[24]||(w[24]=s("div",{class:"text-center"},[s("div",{class:"text-8xl mb-6 animate-bounce"},"✨"),s("h2",{class:"text-4xl font-bold text-amber-400 mb-4"},"転生完了！"),s("p",{class:"text-xl text-white"},"新たな旅が始まる...")],-1)),s("div",pm,[(f(),v(ie,null,fe(30,U=>s("div",{key:U,class:"prestige-particle",style:ke(_(U))},null,4)),64))])])):X("",!0)]),_:1})]))}},vm=Xe(gm,[["__scopeId","data-v-684a081c"]]),mm={class:"game-container"},bm={key:0,class:"fixed inset-0 z-50 flex items-center justify-center bg-black/80 backdrop-blur-md p-4"},xm={class:"absolute inset-0 pointer-events-none overflow-hidden"},hm={class:"bg-gradient-to-br from-indigo-900 via-purple-900 to-indigo-950 rounded-3xl p-6 max-w-sm w-full border border-purple-400/50 shadow-2xl text-center relative overflow-hidden"},ym={class:"relative z-10"},_m={class:"bg-black/40 rounded-2xl p-4 mb-4 space-y-3"},wm={class:"flex justify-between items-center text-sm"},km={class:"text-cyan-300 font-bold"},$m={class:"flex justify-between items-center text-sm"},Cm={class:"text-green-300 font-bold"},Sm={class:"bg-gradient-to-br from-yellow-500/20 to-amber-500/20 rounded-2xl p-5 mb-5 border border-yellow-400/30"},Tm={class:"flex items-center justify-center gap-2"},jm={class:"text-5xl font-black text-transparent bg-clip-text bg-gradient-to-r from-yellow-300 via-amber-400 to-yellow-300 animate-pulse"},Mm={class:"text-xs text-yellow-200/60 mt-2"},Pm={__name:"GameView",setup(e){const t=zt(),o=j("main"),n=j(!1),l=j(0),r=g=>{o.value=g},i=g=>{t.buyFacility(g)},a=ee(()=>t.formatNumber(t.pendingOfflineReward)),c=ee(()=>{const g=l.value;if(g<60)return`${g}秒`;if(g<3600)return`${Math.floor(g/60)}分`;const x=Math.floor(g/3600),b=Math.floor(g%3600/60);return x<24?`${x}時間${b}分`:`${Math.floor(x/24)}日${x%24}時間`}),u=g=>({"--delay":`${Math.random()*3}s`,"--x":`${Math.random()*100}%`,"--size":`${4+Math.random()*8}px`,left:`${Math.random()*100}%`,animationDelay:`${Math.random()*2}s`}),d=()=>{t.claimOfflineReward(),n.value=!1};return qe(async()=>{if(await t.initialize(),t.pendingOfflineReward>0){const g=Date.now(),x=t.lastActiveTime||g;l.value=Math.floor((g-x)/1e3),n.value=!0}}),(g,x)=>(f(),v("div",mm,[me(Gt,{name:"fade-slide",mode:"out-in"},{default:Te(()=>[o.value==="main"?(f(),Se(tp,{key:"main",onNavigate:r})):o.value==="list"?(f(),Se(gg,{key:"list",onNavigate:r})):o.value==="tree"?(f(),Se(Hg,{key:"tree",onNavigate:r,onBuy:i})):o.value==="upgrade"?(f(),Se(Cv,{key:"upgrade",onNavigate:r})):o.value==="prestige"?(f(),Se(vm,{key:"prestige",onNavigate:r})):X("",!0)]),_:1}),me(Gt,{name:"fade"},{default:Te(()=>[n.value?(f(),v("div",bm,[s("div",xm,[(f(),v(ie,null,fe(15,b=>s("div",{key:"p"+b,class:"offline-particle",style:ke(u(b))},null,4)),64))]),s("div",hm,[x[9]||(x[9]=s("div",{class:"absolute inset-0 flex items-center justify-center pointer-events-none"},[s("div",{class:"w-64 h-64 rounded-full bg-gradient-radial from-yellow-400/20 via-amber-500/10 to-transparent animate-pulse"})],-1)),s("div",ym,[x[6]||(x[6]=s("div",{class:"text-7xl mb-3 animate-bounce"},"🌙",-1)),x[7]||(x[7]=s("h2",{class:"text-2xl font-bold text-white mb-1"},"おかえりなさい！",-1)),x[8]||(x[8]=s("p",{class:"text-purple-200 text-sm mb-4"}," あなたがいない間に施設が稼働していました ",-1)),s("div",_m,[s("div",wm,[x[0]||(x[0]=s("span",{class:"text-white/60"},"⏱️ 経過時間",-1)),s("span",km,m(c.value),1)]),s("div",$m,[x[1]||(x[1]=s("span",{class:"text-white/60"},"⚡ 生産効率",-1)),s("span",Cm,m(H(t).formatNumber(H(t).currentProduction))+"/分",1)]),x[2]||(x[2]=s("div",{class:"flex justify-between items-center text-sm"},[s("span",{class:"text-white/60"},"📊 オフライン効率"),s("span",{class:"text-amber-300 font-bold"},"50%")],-1))]),s("div",Sm,[x[4]||(x[4]=s("p",{class:"text-xs text-white/50 mb-1 uppercase tracking-wider"},"獲得Knowledge Points",-1)),s("div",Tm,[x[3]||(x[3]=s("span",{class:"text-4xl"},"💡",-1)),s("p",jm," +"+m(a.value),1)]),s("p",Mm,"現在の所持: "+m(H(t).formatNumber(H(t).knowledgePoints))+" KP",1)]),s("button",{onClick:d,class:"w-full py-4 bg-gradient-to-r from-yellow-400 via-amber-400 to-yellow-400 text-black font-bold rounded-2xl text-lg active:scale-95 transition-all shadow-lg hover:shadow-yellow-400/50 relative overflow-hidden group"},[...x[5]||(x[5]=[s("span",{class:"relative z-10"},"🎁 報酬を受け取る！",-1),s("div",{class:"absolute inset-0 bg-gradient-to-r from-transparent via-white/30 to-transparent -translate-x-full group-hover:translate-x-full transition-transform duration-500"},null,-1)])])])])])):X("",!0)]),_:1})]))}},Im=Xe(Pm,[["__scopeId","data-v-9774ea54"]]),ks="sg_cache_";function hi(){const e=r=>{try{const i=localStorage.getItem(ks+r);if(!i)return null;const a=JSON.parse(i);return a.expiresAt&&Date.now()>a.expiresAt?(localStorage.removeItem(ks+r),null):a.data}catch(i){return console.warn("Cache read error:",i),null}},t=(r,i,a=3e5)=>{try{const c={data:i,expiresAt:Date.now()+a,cachedAt:Date.now()};localStorage.setItem(ks+r,JSON.stringify(c))}catch(c){if(console.warn("Cache write error:",c),c.name==="QuotaExceededError"){n();try{localStorage.setItem(ks+r,JSON.stringify({data:i,expiresAt:Date.now()+a}))}catch{}}}},o=r=>{localStorage.removeItem(ks+r)},n=()=>{const r=[];for(let i=0;i<localStorage.length;i++){const a=localStorage.key(i);a&&a.startsWith(ks)&&r.push(a)}r.forEach(i=>localStorage.removeItem(i))};return{getCache:e,setCache:t,clearCache:o,clearAllCache:n,fetchWithCache:async(r,i,a=3e5)=>{const c=e(r);if(c!==null)return c;const u=await i();return u!=null&&t(r,u,a),u}}}const Nt={USER_DATA:e=>`user_${e}`,ACTIVITY:"global_activity",RANKINGS:"rankings",MATERIALS:e=>`materials_${e}`,SHOP_ITEMS:"shop_items",JOBS:"jobs"},Am={class:"space-y-4 mt-8 pb-8"},Em={key:0,class:"space-y-2"},Dm={class:"flex items-center gap-3"},Om={class:"flex-1"},Um={class:"text-white font-bold"},Bm={class:"text-yellow-200"},Nm={class:"text-white/80 text-sm"},Fm={class:"flex justify-between items-center"},Lm={class:"flex gap-2 bg-black/20 p-1 rounded-xl"},Rm=["onClick"],Vm={key:1},Hm={key:0,class:"h-64 flex items-center justify-center"},Km={class:"flex justify-between items-center mb-4"},Gm={class:"font-bold text-gray-700"},Wm=["disabled"],zm={class:"h-48 flex items-end gap-2 pt-6"},Jm={class:"w-full relative flex flex-col-reverse"},qm=["title"],Xm={key:0,class:"absolute bottom-full left-1/2 -translate-x-1/2 mb-2 hidden group-hover:block z-20"},Ym={class:"bg-gray-800 text-white text-xs rounded-lg px-3 py-2 whitespace-nowrap shadow-lg"},Qm={class:"font-bold mb-1"},Zm={key:1,class:"absolute -top-5 left-1/2 -translate-x-1/2 text-xs font-bold text-indigo-600 whitespace-nowrap"},eb={class:"mt-3 flex flex-wrap gap-2 justify-center"},tb={class:"text-[10px] text-gray-600"},sb={class:"mt-4 pt-4 border-t border-gray-200 flex justify-around text-center"},ob={class:"text-2xl font-bold text-indigo-600"},nb={class:"text-2xl font-bold text-green-600"},lb={key:2},rb={key:0,class:"h-64 flex items-center justify-center"},ib={class:"flex justify-between items-center mb-4"},ab={class:"font-bold text-gray-700"},cb=["disabled"],ub={class:"h-52 flex items-end gap-3 pt-6"},db={class:"w-full relative flex flex-col-reverse"},fb=["title"],pb={key:0,class:"absolute bottom-full left-1/2 -translate-x-1/2 mb-2 hidden group-hover:block z-20"},gb={class:"bg-gray-800 text-white text-xs rounded-lg px-3 py-2 whitespace-nowrap shadow-lg"},vb={class:"font-bold mb-1"},mb={key:1,class:"absolute -top-5 left-1/2 -translate-x-1/2 text-xs font-bold text-gray-700 whitespace-nowrap"},bb={class:"text-xs mt-2 text-gray-500"},xb={class:"mt-4 pt-4 border-t border-gray-200"},hb={class:"flex flex-wrap gap-3 justify-center"},yb={class:"text-xs text-gray-600"},_b={class:"text-center mt-3"},wb={class:"text-2xl font-bold text-indigo-600"},kb={class:"text-xs text-gray-500"},$b={key:0,class:"text-center py-4"},Cb={key:1,class:"overflow-x-auto -mx-4 px-4 pb-2"},Sb={class:"flex gap-4",style:{width:"max-content"}},Tb={class:"w-64 flex-shrink-0 bg-gradient-to-br from-indigo-50 to-purple-50 rounded-xl p-4 border border-indigo-200"},jb={key:0,class:"text-center text-gray-400 text-sm py-2"},Mb={key:1,class:"space-y-2"},Pb={class:"text-xs text-gray-700 flex-1 truncate"},Ib={class:"text-xs font-bold text-gray-800"},Ab={class:"pt-2 border-t border-indigo-200"},Eb={class:"text-lg font-bold text-indigo-600 text-center"},Db={class:"w-64 flex-shrink-0 bg-gradient-to-br from-green-50 to-emerald-50 rounded-xl p-4 border border-green-200"},Ob={key:0,class:"text-center text-gray-400 text-sm py-2"},Ub={key:1,class:"space-y-2"},Bb={class:"text-xs text-gray-700 flex-1 truncate"},Nb={class:"text-xs font-bold text-gray-800"},Fb={class:"pt-2 border-t border-green-200"},Lb={class:"text-lg font-bold text-green-600 text-center"},Rb={class:"w-64 flex-shrink-0 bg-gradient-to-br from-orange-50 to-amber-50 rounded-xl p-4 border border-orange-200"},Vb={key:0,class:"text-center text-gray-400 text-sm py-2"},Hb={key:1,class:"space-y-2"},Kb={class:"text-xs text-gray-700 flex-1 truncate"},Gb={class:"text-xs font-bold text-gray-800"},Wb={class:"pt-2 border-t border-orange-200"},zb={class:"text-lg font-bold text-orange-600 text-center"},Jb={key:0,class:"text-center text-gray-500 py-4"},qb={class:"space-y-2 max-h-64 overflow-y-auto"},Xb={class:"flex items-center gap-3"},Yb={class:"font-medium text-gray-800"},Qb={class:"text-xs text-gray-500"},Zb={class:"font-bold text-indigo-600"},ex={key:0,class:"text-center py-4"},tx={key:1,class:"text-center text-gray-500 py-4"},sx={class:"flex items-center gap-3"},ox={class:"text-2xl flex-shrink-0"},nx={class:"flex-1 min-w-0"},lx={class:"flex items-center gap-2"},rx={class:"font-bold text-indigo-600 truncate"},ix={class:"text-sm text-gray-600 truncate"},ax={class:"text-xs text-gray-400"},cx={key:0,class:"mt-2 ml-10"},ux={class:"text-xs text-gray-500 bg-gray-100 rounded-lg px-3 py-2 italic"},dx={key:1,class:"mt-2 ml-10 flex items-center gap-4"},fx=["onClick"],px={key:0,class:"particles"},gx=["onClick"],vx={key:3,class:"mt-3 text-center"},mx={class:"bg-white rounded-2xl w-full max-w-md max-h-[80vh] overflow-hidden"},bx={class:"bg-gradient-to-r from-blue-500 to-indigo-600 p-4 flex justify-between items-center"},xx={class:"p-4 max-h-60 overflow-y-auto space-y-3"},hx={key:0,class:"text-center py-4 text-gray-400"},yx={key:1,class:"text-center py-4 text-gray-400"},_x={class:"flex justify-between items-center"},wx={class:"font-bold text-sm text-indigo-600"},kx={class:"text-xs text-gray-400"},$x={class:"text-sm text-gray-700 mt-1"},Cx={class:"border-t p-3 flex gap-2"},Sx=["disabled"],Tx={key:0,class:"text-center py-4"},jx={key:1,class:"text-center text-gray-500 py-4"},Mx={key:2,class:"space-y-2"},Px={class:"flex-1 min-w-0"},Ix={class:"font-bold text-gray-800 truncate"},Ax={key:0,class:"text-xs text-indigo-500"},Ex={class:"text-xs text-gray-500"},Dx={class:"text-right"},Ox={key:0,class:"text-center py-4"},Ux={key:1,class:"text-center text-gray-500 py-4"},Bx={key:2,class:"space-y-2"},Nx=["onClick"],Fx={class:"flex-1 min-w-0"},Lx={class:"font-bold text-gray-800 truncate"},Rx={key:0,class:"text-xs text-indigo-500"},Vx={class:"flex gap-0.5 mt-1 h-2 rounded overflow-hidden"},Hx=["title"],Kx={class:"text-right"},Gx={class:"bg-white rounded-2xl w-full max-w-sm overflow-hidden animate-pop-in"},Wx={class:"bg-gradient-to-r from-purple-500 to-indigo-600 p-4 flex justify-between items-center"},zx={class:"text-white font-bold"},Jx={class:"p-4"},qx={class:"text-center mb-4 pb-4 border-b"},Xx={class:"text-4xl font-bold text-purple-600"},Yx={class:"space-y-3"},Qx={class:"flex-1 text-gray-700"},Zx={class:"flex items-center gap-2"},eh={class:"w-24 h-2 bg-gray-200 rounded-full overflow-hidden"},th={class:"text-sm font-bold text-gray-600 w-16 text-right"},sh={key:0,class:"text-center py-4"},oh={key:1,class:"text-center text-gray-500 py-4"},nh={key:2,class:"overflow-x-auto pb-2 -mx-4 px-4"},lh={class:"flex gap-3",style:{width:"max-content"}},rh={class:"flex justify-between items-start mb-2"},ih={class:"text-sm font-bold text-indigo-600 truncate flex-1"},ah={class:"font-bold text-gray-800 text-sm mb-1 line-clamp-2"},ch={key:0,class:"text-xs text-gray-500 line-clamp-2 mb-2"},uh={class:"flex items-center gap-1 text-xs text-gray-400"},dh={key:1,class:"mt-3 flex gap-2"},fh=["onClick"],ph=["onClick"],gh={__name:"DataView",emits:["admin"],setup(e,{emit:t}){const o=at(),{getCache:n,setCache:l,clearCache:r}=hi(),{showConfirm:i}=xs(),a=At(),c=t,u=[{key:"weekly",label:"週間",icon:"📈"},{key:"monthly",label:"月別",icon:"📊"}],d=j("weekly"),g=j([]),x=j([]),b=j([]),y=j([]),_=j([]),T=j([]),w=j([]),U=j([]),B=j(!1),E=j([]),ne=j(!1),de=j(null),ge=j([]),K=j(""),S=j(!1),M=j(!1),O=j(!1),p=j(null),P=j(!0),G=j(!0),N=j(!0),F=j(!0),A=j(!0),V=j(0),ue=j(0),we={国語:"#FF6B6B",数学:"#4D96FF",英語:"#FFD93D",理科:"#6BCB77",社会:"#9D4EDD",その他:"#95A5A6",勉強:"#7C3AED"},Ve=ee(()=>Object.entries(we).map(([W,C])=>({name:W,color:C}))),Ae=W=>we[W]||we.その他,tt=ee(()=>B.value?y.value:y.value.slice(0,5)),He=ee(()=>{const W=new Date,C=new Date(W),k=W.getDay()||7;C.setDate(W.getDate()-k+1);const q=C.toISOString().split("T")[0],ve={};_.value.forEach(Ce=>{if(Ce.date>=q){const Fe=Ce.subject||"その他";ve[Fe]=(ve[Fe]||0)+(Ce.minutes||0)}});const be=Object.values(ve).reduce((Ce,Fe)=>Ce+Fe,0);return Object.entries(ve).map(([Ce,Fe])=>({subject:Ce,minutes:Fe,color:Ae(Ce),percent:be>0?Fe/be*100:0})).sort((Ce,Fe)=>Fe.minutes-Ce.minutes)}),et=ee(()=>{const W=new Date,k=new Date(W.getFullYear(),W.getMonth(),1).toISOString().split("T")[0],q={};_.value.forEach(be=>{if(be.date>=k){const Ce=be.subject||"その他";q[Ce]=(q[Ce]||0)+(be.minutes||0)}});const ve=Object.values(q).reduce((be,Ce)=>be+Ce,0);return Object.entries(q).map(([be,Ce])=>({subject:be,minutes:Ce,color:Ae(be),percent:ve>0?Ce/ve*100:0})).sort((be,Ce)=>Ce.minutes-be.minutes)}),re=W=>{if(!W)return"";try{const C=W.split(" "),k=C[0]||"",q=C[1]||"";if(k){const ve=new Date,be=new Date(k),Ce=Math.floor((ve-be)/(1e3*60*60*24));return Ce===0?q?`今日 ${q.substring(0,5)}`:"今日":Ce===1?q?`昨日 ${q.substring(0,5)}`:"昨日":Ce<7?`${Ce}日前`:k.substring(5)}return W}catch{return W}},I=ee(()=>{const W=new Date,C=new Date(W),k=W.getDay()||7;C.setDate(W.getDate()-k+1-V.value*7);const q=new Date(C);q.setDate(C.getDate()+6);const ve=Ce=>`${Ce.getMonth()+1}/${Ce.getDate()}`,be=`${ve(C)} - ${ve(q)}`;return V.value===0?`今週 (${be})`:V.value===1?`先週 (${be})`:be}),je=ee(()=>{const W=new Date,C=["月","火","水","木","金","土","日"],k=[],q=new Date(W),ve=W.getDay()||7;q.setDate(W.getDate()-ve+1-V.value*7),console.log("[DEBUG] currentWeekData computing, allData count:",g.value.length),g.value.length>0&&console.log("[DEBUG] Sample allData item:",g.value[0]);for(let be=0;be<7;be++){const Ce=new Date(q);Ce.setDate(q.getDate()+be);const Fe=Ce.toISOString().split("T")[0],Jt={};g.value.filter(vt=>(vt.date?vt.date.split(" ")[0].trim():"")===Fe).forEach(vt=>{const Et=vt.subject||"その他";Jt[Et]=(Jt[Et]||0)+(vt.minutes||0)});const hs=Object.entries(Jt).map(([vt,Et])=>({subject:vt,minutes:Et,color:Ae(vt)})),Ds=hs.reduce((vt,Et)=>vt+Et.minutes,0),Os=Ce.toDateString()===W.toDateString();k.push({day:C[be],date:Fe,segments:hs.length>0?hs:[{subject:"なし",minutes:0,color:"#E5E7EB"}],total:Ds,isToday:Os})}return console.log("[DEBUG] currentWeekData result:",k),k}),te=ee(()=>je.value.reduce((W,C)=>W+C.total,0)),_e=ee(()=>Math.round(te.value/7)),Ge=ee(()=>{const W=new Date,C=new Date(W.getFullYear(),W.getMonth()-ue.value,1),k=new Date(C.getFullYear(),C.getMonth()+1,0),q=`${C.getFullYear()}年${C.getMonth()+1}月`,ve=`${C.getMonth()+1}/1 - ${C.getMonth()+1}/${k.getDate()}`;return ue.value===0?`今月 (${ve})`:ue.value===1?`先月 (${ve})`:`${q} (${ve})`}),h=ee(()=>{const W=new Date,C=W.getMonth()-ue.value,k=W.getFullYear()+Math.floor(C/12),q=(C%12+12)%12,ve=new Date(k,q,1),be=new Date(k,q+1,0),Ce=[];let Fe=new Date(ve);const Jt=Fe.getDay()||7;Jt!==1&&Fe.setDate(Fe.getDate()-Jt+1);let hs=1;for(;Fe<=be||Ce.length<4;){const Ds=new Date(Fe);Ds.setDate(Fe.getDate()+6);const Os={};for(let Dt=new Date(Fe);Dt<=Ds;Dt.setDate(Dt.getDate()+1)){const Us=Dt.toISOString().split("T")[0];g.value.filter(co=>co.date===Us).forEach(co=>{const Kn=co.subject||"その他";Os[Kn]=(Os[Kn]||0)+(co.minutes||0)})}const vt=Object.entries(Os).map(([Dt,Us])=>({subject:Dt,minutes:Us,color:Ae(Dt)})),Et=vt.reduce((Dt,Us)=>Dt+Us.minutes,0);if(Ce.push({label:`W${hs}`,start:new Date(Fe),end:new Date(Ds),segments:vt.length>0?vt:[{subject:"なし",minutes:0,color:"#E5E7EB"}],total:Et}),Fe=new Date(Fe),Fe.setDate(Fe.getDate()+7),hs++,Ce.length>=5)break}return Ce}),$=ee(()=>h.value.reduce((W,C)=>W+C.total,0)),R=ee(()=>Math.max(...je.value.map(W=>W.total),60)),z=(W,C)=>{if(C===0)return 4;const q=C/R.value*120;return Math.max(0,W/C*q)},J=ee(()=>Math.max(...h.value.map(W=>W.total),60)),Q=(W,C)=>{if(C===0)return 4;const q=C/J.value*140;return Math.max(0,W/C*q)},se=async()=>{var W;if(o.currentUserId)try{const k=await(await fetch(`/api/user/${o.currentUserId}/stats`)).json();console.log("[DEBUG] Stats API response:",k),console.log("[DEBUG] all_records count:",((W=k.all_records)==null?void 0:W.length)||0),console.log("[DEBUG] weekly data:",k.weekly),k.all_records&&Array.isArray(k.all_records)&&k.all_records.length>0?(g.value=k.all_records.map(q=>({date:q.date,minutes:q.minutes,subject:q.subject||"その他"})),_.value=k.all_records.map(q=>({date:q.date,subject:q.subject,minutes:q.minutes}))):k.weekly&&Array.isArray(k.weekly)&&k.weekly.length>0&&(g.value=k.weekly.map(q=>({date:q.date,minutes:q.minutes,day:q.day,subject:q.subject||"その他"}))),console.log("[DEBUG] allData after processing:",g.value),x.value=Array.isArray(k.subject)?k.subject:[],b.value=Array.isArray(k.recent)?k.recent:[]}catch(C){console.error("Failed to fetch stats:",C)}finally{P.value=!1}},le=async()=>{const W=n(Nt.ACTIVITY);if(W){y.value=W,G.value=!1;return}G.value=!0;try{const k=await(await fetch("/api/activity/recent")).json();k.status==="ok"&&(y.value=k.data||[],l(Nt.ACTIVITY,y.value,3*60*1e3))}catch(C){console.error("Failed to fetch global activity:",C)}finally{G.value=!1}},oe=async()=>{const W=n(Nt.RANKINGS);if(W){T.value=W,N.value=!1;return}N.value=!0;try{const k=await(await fetch("/api/ranking/weekly")).json();k.status==="ok"&&(T.value=k.data||[],l(Nt.RANKINGS,T.value,5*60*1e3))}catch(C){console.error("Failed to fetch weekly ranking:",C)}finally{N.value=!1}},Y=async()=>{F.value=!0;try{const C=await(await fetch("/api/ranking/study_time")).json();C.status==="ok"&&(w.value=C.data||[])}catch(W){console.error("Failed to fetch study time ranking:",W)}finally{F.value=!1}},xe=W=>{p.value=W,O.value=!0},ae=W=>{if(!W)return"0分";const C=Math.floor(W/60),k=W%60;return C===0?`${k}分`:k===0?`${C}時間`:`${C}時間${k}分`},pe=async()=>{A.value=!0;try{const C=await(await fetch("/api/goals")).json();C.status==="ok"&&(U.value=C.goals||[])}catch(W){console.error("Failed to fetch goals:",W)}finally{A.value=!1}},$e=W=>{if(!W)return"";const C=new Date(W);return`${C.getMonth()+1}/${C.getDate()}`},Ie=W=>{if(!W)return-999;const C=new Date(W),k=new Date;return k.setHours(0,0,0,0),C.setHours(0,0,0,0),Math.ceil((C-k)/(1e3*60*60*24))},Ue=W=>{const C=Ie(W);return C<0?"期限切れ":C===0?"今日!":C===1?"明日":`あと${C}日`},De=W=>{const C=Ie(W);return C<0?"bg-red-100 text-red-600":C<=3?"bg-orange-100 text-orange-600":C<=7?"bg-yellow-100 text-yellow-600":"bg-green-100 text-green-600"},Qe=async W=>{if(await i({type:"success",title:"目標達成！",message:"この目標を達成済みにしますか？",confirmText:"達成！🎉",cancelText:"キャンセル",icon:"🏆"}))try{(await(await fetch(`/api/goals/${W}/complete`,{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({user_id:o.currentUserId})})).json()).status==="ok"?await pe():a.error("完了処理に失敗しました")}catch(k){console.error("Complete goal error:",k),a.error("完了処理に失敗しました")}},Ze=async W=>{if(await i({type:"danger",title:"目標を削除",message:`この目標を削除しますか？
-この操作は取り消せません。`,confirmText:"削除する",cancelText:"やめる",icon:"🗑️"}))try{(await(await fetch(`/api/goals/${W}?user_id=${o.currentUserId}`,{method:"DELETE"})).json()).status==="ok"?await pe():a.error("削除に失敗しました")}catch(k){console.error("Delete goal error:",k),a.error("削除に失敗しました")}},ct=async()=>{try{const C=await(await fetch("/api/study/active_sessions")).json();C.status==="ok"&&(E.value=C.data||[])}catch(W){console.error("Failed to fetch active sessions:",W)}},D=W=>{if(!W)return"";try{const C=new Date,[k,q,ve]=W.split(":").map(Number),be=new Date;be.setHours(k,q,ve||0),be>C&&be.setDate(be.getDate()-1);const Ce=Math.floor((C-be)/1e3/60);if(Ce<60)return`${Ce}分経過`;const Fe=Math.floor(Ce/60),Jt=Ce%60;return`${Fe}時間${Jt}分経過`}catch{return""}},L=async(W,C)=>{var q;((q=C.liked_by)==null?void 0:q.includes(o.currentUserId))||(C._animating=!0,setTimeout(()=>{C._animating=!1},700)),await Z(C)},Z=async W=>{if(W.row_index)try{const k=await(await fetch("/api/activity/like",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({study_row_index:W.row_index,user_id:o.currentUserId})})).json();k.status==="ok"&&(W.likes=k.likes,W.liked_by=k.liked_by,r(Nt.ACTIVITY))}catch(C){console.error("Toggle like error:",C)}},he=async W=>{if(de.value=W,ge.value=[],K.value="",ne.value=!0,!!W.row_index){S.value=!0;try{const k=await(await fetch(`/api/activity/${W.row_index}/comments`)).json();k.status==="ok"&&(ge.value=k.comments||[])}catch(C){console.error("Fetch comments error:",C)}finally{S.value=!1}}},Pe=async()=>{var W;if(!(!K.value.trim()||!((W=de.value)!=null&&W.row_index))){M.value=!0;try{const k=await(await fetch("/api/activity/comment",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({study_row_index:de.value.row_index,user_id:o.currentUserId,user_name:o.displayName||"",comment:K.value.trim()})})).json();k.status==="ok"?(ge.value.push({user_id:o.currentUserId,user_name:o.displayName||"",comment:K.value.trim(),created_at:k.created_at}),de.value.comments_count=(de.value.comments_count||0)+1,K.value="",r(Nt.ACTIVITY)):a.error(k.message||"コメントの投稿に失敗しました")}catch(C){console.error("Submit comment error:",C),a.error("コメントの投稿に失敗しました")}finally{M.value=!1}}};return qe(()=>{se(),le(),oe(),Y(),pe(),ct(),setInterval(ct,6e4)}),(W,C)=>(f(),v("div",Am,[E.value.length>0?(f(),v("div",Em,[(f(!0),v(ie,null,fe(E.value,k=>(f(),v("div",{key:k.user_id,class:"bg-gradient-to-r from-green-400 to-emerald-500 rounded-xl p-3 shadow-lg animate-pulse-soft"},[s("div",Dm,[C[12]||(C[12]=s("span",{class:"text-2xl"},"📖",-1)),s("div",Om,[s("p",Um,[pt(m(k.user_name)+" が ",1),s("span",Bm,m(k.subject||"勉強"),1),C[11]||(C[11]=pt(" を勉強中 ",-1))]),s("p",Nm," ⏱️ "+m(k.start_time)+" から "+m(D(k.start_time)),1)]),C[13]||(C[13]=s("span",{class:"text-3xl animate-bounce"},"🔥",-1))])]))),128))])):X("",!0),s("div",Fm,[C[14]||(C[14]=s("h2",{class:"text-xl font-bold text-white"},"📊 学習データ",-1)),H(o).isAdmin?(f(),v("button",{key:0,onClick:C[0]||(C[0]=k=>c("admin")),class:"text-white/70 hover:text-white text-sm underline"}," 管理者メニュー ")):X("",!0)]),s("div",Lm,[(f(),v(ie,null,fe(u,k=>s("button",{key:k.key,onClick:q=>d.value=k.key,class:ce(["flex-1 py-2 px-3 rounded-lg text-sm font-medium transition-all",d.value===k.key?"bg-white text-indigo-600 shadow-sm":"text-white/70 hover:text-white"])},m(k.icon)+" "+m(k.label),11,Rm)),64))]),d.value==="weekly"?(f(),v("div",Vm,[me(We,null,{default:Te(()=>[P.value?(f(),v("div",Hm,[...C[15]||(C[15]=[s("div",{class:"text-center"},[s("div",{class:"animate-spin text-4xl mb-2"},"📊"),s("span",{class:"text-gray-400"},"データ読み込み中...")],-1)])])):(f(),v(ie,{key:1},[s("div",Km,[s("button",{onClick:C[1]||(C[1]=k=>V.value++),class:"p-2 rounded-lg bg-indigo-100 text-indigo-600 hover:bg-indigo-200 active:scale-95 transition-all"},[...C[16]||(C[16]=[s("span",{class:"text-lg"},"←",-1)])]),s("h3",Gm,m(I.value),1),s("button",{onClick:C[2]||(C[2]=k=>V.value=Math.max(0,V.value-1)),disabled:V.value===0,class:ce(["p-2 rounded-lg transition-all",V.value===0?"bg-gray-200 text-gray-400 cursor-not-allowed":"bg-indigo-100 text-indigo-600 hover:bg-indigo-200 active:scale-95"])},[...C[17]||(C[17]=[s("span",{class:"text-lg"},"→",-1)])],10,Wm)]),s("div",zm,[(f(!0),v(ie,null,fe(je.value,(k,q)=>(f(),v("div",{key:q,class:"flex-1 flex flex-col items-center min-w-0 group"},[s("div",Jm,[(f(!0),v(ie,null,fe(k.segments,(ve,be)=>(f(),v("div",{key:be,class:"w-full first:rounded-t-lg transition-all duration-500 cursor-pointer hover:opacity-80 relative",style:ke({height:z(ve.minutes,k.total)+"px",backgroundColor:ve.color,minHeight:ve.minutes>0?"4px":"0"}),title:ve.subject+": "+ve.minutes+"分"},null,12,qm))),128)),k.total>0?(f(),v("div",Xm,[s("div",Ym,[s("p",Qm,m(k.date),1),(f(!0),v(ie,null,fe(k.segments.filter(ve=>ve.minutes>0),(ve,be)=>(f(),v("div",{key:be,class:"flex items-center gap-2"},[s("span",{class:"w-2 h-2 rounded-full",style:ke({backgroundColor:ve.color})},null,4),s("span",null,m(ve.subject)+": "+m(ve.minutes)+"分",1)]))),128))]),C[18]||(C[18]=s("div",{class:"absolute left-1/2 -translate-x-1/2 -bottom-1 w-2 h-2 bg-gray-800 rotate-45"},null,-1))])):X("",!0),k.total>0?(f(),v("span",Zm,m(k.total)+"分 ",1)):X("",!0)]),s("p",{class:ce(["text-xs mt-2 font-medium",k.isToday?"text-indigo-600":"text-gray-500"])},m(k.day),3)]))),128))]),s("div",eb,[(f(!0),v(ie,null,fe(Ve.value,(k,q)=>(f(),v("div",{key:q,class:"flex items-center gap-1"},[s("div",{class:"w-2.5 h-2.5 rounded-full",style:ke({backgroundColor:k.color})},null,4),s("span",tb,m(k.name),1)]))),128))]),s("div",sb,[s("div",null,[s("p",ob,m(te.value)+"分",1),C[19]||(C[19]=s("p",{class:"text-xs text-gray-500"},"週合計",-1))]),s("div",null,[s("p",nb,m(_e.value)+"分",1),C[20]||(C[20]=s("p",{class:"text-xs text-gray-500"},"平均/日",-1))])])],64))]),_:1})])):X("",!0),d.value==="monthly"?(f(),v("div",lb,[me(We,null,{default:Te(()=>[P.value?(f(),v("div",rb,[...C[21]||(C[21]=[s("div",{class:"text-center"},[s("div",{class:"animate-spin text-4xl mb-2"},"📊"),s("span",{class:"text-gray-400"},"データ読み込み中...")],-1)])])):(f(),v(ie,{key:1},[s("div",ib,[s("button",{onClick:C[3]||(C[3]=k=>ue.value++),class:"p-2 rounded-lg bg-indigo-100 text-indigo-600 hover:bg-indigo-200 active:scale-95 transition-all"},[...C[22]||(C[22]=[s("span",{class:"text-lg"},"←",-1)])]),s("h3",ab,m(Ge.value),1),s("button",{onClick:C[4]||(C[4]=k=>ue.value=Math.max(0,ue.value-1)),disabled:ue.value===0,class:ce(["p-2 rounded-lg transition-all",ue.value===0?"bg-gray-200 text-gray-400 cursor-not-allowed":"bg-indigo-100 text-indigo-600 hover:bg-indigo-200 active:scale-95"])},[...C[23]||(C[23]=[s("span",{class:"text-lg"},"→",-1)])],10,cb)]),s("div",ub,[(f(!0),v(ie,null,fe(h.value,(k,q)=>(f(),v("div",{key:q,class:"flex-1 flex flex-col items-center group"},[s("div",db,[(f(!0),v(ie,null,fe(k.segments,(ve,be)=>(f(),v("div",{key:be,class:"w-full first:rounded-t-lg transition-all duration-500 cursor-pointer hover:opacity-80",style:ke({height:Q(ve.minutes,k.total)+"px",backgroundColor:ve.color,minHeight:ve.minutes>0?"4px":"0"}),title:ve.subject+": "+ve.minutes+"分"},null,12,fb))),128)),k.total>0?(f(),v("div",pb,[s("div",gb,[s("p",vb,m(k.label),1),(f(!0),v(ie,null,fe(k.segments.filter(ve=>ve.minutes>0),(ve,be)=>(f(),v("div",{key:be,class:"flex items-center gap-2"},[s("span",{class:"w-2 h-2 rounded-full",style:ke({backgroundColor:ve.color})},null,4),s("span",null,m(ve.subject)+": "+m(ve.minutes)+"分",1)]))),128))]),C[24]||(C[24]=s("div",{class:"absolute left-1/2 -translate-x-1/2 -bottom-1 w-2 h-2 bg-gray-800 rotate-45"},null,-1))])):X("",!0),k.total>0?(f(),v("span",mb,m(Math.round(k.total/60*10)/10)+"h ",1)):X("",!0)]),s("p",bb,m(k.label),1)]))),128))]),s("div",xb,[s("div",hb,[(f(!0),v(ie,null,fe(Ve.value,(k,q)=>(f(),v("div",{key:q,class:"flex items-center gap-1.5"},[s("div",{class:"w-3 h-3 rounded-full",style:ke({backgroundColor:k.color})},null,4),s("span",yb,m(k.name),1)]))),128))]),s("div",_b,[s("p",wb,m($.value)+"分",1),s("p",kb,"月合計 ("+m(Math.round($.value/60*10)/10)+"時間)",1)])])],64))]),_:1})])):X("",!0),me(We,null,{default:Te(()=>[C[29]||(C[29]=s("h3",{class:"font-bold text-gray-700 mb-4"},"📊 科目別時間",-1)),P.value?(f(),v("div",$b,[...C[25]||(C[25]=[s("span",{class:"text-gray-400 animate-pulse"},"読み込み中...",-1)])])):(f(),v("div",Cb,[s("div",Sb,[s("div",Tb,[C[26]||(C[26]=s("h4",{class:"text-sm font-bold text-indigo-600 mb-3"},"📚 今週",-1)),He.value.length===0?(f(),v("div",jb," 記録なし ")):(f(),v("div",Mb,[(f(!0),v(ie,null,fe(He.value.slice(0,5),(k,q)=>(f(),v("div",{key:q,class:"flex items-center gap-2"},[s("div",{class:"w-3 h-3 rounded-full flex-shrink-0",style:ke({backgroundColor:k.color})},null,4),s("span",Pb,m(k.subject),1),s("span",Ib,m(k.minutes)+"分",1)]))),128)),s("div",Ab,[s("p",Eb,m(He.value.reduce((k,q)=>k+q.minutes,0))+"分",1)])]))]),s("div",Db,[C[27]||(C[27]=s("h4",{class:"text-sm font-bold text-green-600 mb-3"},"📆 今月",-1)),et.value.length===0?(f(),v("div",Ob," 記録なし ")):(f(),v("div",Ub,[(f(!0),v(ie,null,fe(et.value.slice(0,5),(k,q)=>(f(),v("div",{key:q,class:"flex items-center gap-2"},[s("div",{class:"w-3 h-3 rounded-full flex-shrink-0",style:ke({backgroundColor:k.color})},null,4),s("span",Bb,m(k.subject),1),s("span",Nb,m(k.minutes)+"分",1)]))),128)),s("div",Fb,[s("p",Lb,m(et.value.reduce((k,q)=>k+q.minutes,0))+"分",1)])]))]),s("div",Rb,[C[28]||(C[28]=s("h4",{class:"text-sm font-bold text-orange-600 mb-3"},"🏆 累計",-1)),x.value.length===0?(f(),v("div",Vb," 記録なし ")):(f(),v("div",Hb,[(f(!0),v(ie,null,fe(x.value.slice(0,5),(k,q)=>(f(),v("div",{key:q,class:"flex items-center gap-2"},[s("div",{class:"w-3 h-3 rounded-full flex-shrink-0",style:ke({backgroundColor:k.color})},null,4),s("span",Kb,m(k.subject),1),s("span",Gb,m(k.minutes)+"分",1)]))),128)),s("div",Wb,[s("p",zb,m(x.value.reduce((k,q)=>k+q.minutes,0))+"分",1)])]))])])]))]),_:1}),me(We,null,{default:Te(()=>[C[30]||(C[30]=s("h3",{class:"font-bold text-gray-700 mb-4"},"🕐 最近の記録",-1)),b.value.length===0?(f(),v("div",Jb," 記録がありません ")):X("",!0),s("div",qb,[(f(!0),v(ie,null,fe(b.value,(k,q)=>(f(),v("div",{key:q,class:"flex justify-between items-center py-2 border-b last:border-0 border-gray-100"},[s("div",Xb,[s("div",{class:"w-2 h-8 rounded-full",style:ke({backgroundColor:Ae(k.subject)})},null,4),s("div",null,[s("p",Yb,m(k.subject),1),s("p",Qb,m(k.date),1)])]),s("span",Zb,m(k.minutes)+"分",1)]))),128))])]),_:1}),me(We,null,{default:Te(()=>[s("div",{class:"flex justify-between items-center mb-4"},[C[31]||(C[31]=s("h3",{class:"font-bold text-gray-700"},"🌍 みんなの活動",-1)),s("button",{onClick:le,class:"text-xs text-blue-500 hover:text-blue-700"},"🔄 更新")]),G.value?(f(),v("div",ex,[...C[32]||(C[32]=[s("span",{class:"text-gray-400 animate-pulse"},"読み込み中...",-1)])])):y.value.length===0?(f(),v("div",tx," 活動履歴がありません ")):(f(),v("div",{key:2,class:ce(["space-y-2",B.value?"max-h-none":"max-h-96"]),style:{"overflow-y":"auto"}},[(f(!0),v(ie,null,fe(tt.value,(k,q)=>{var ve,be;return f(),v("div",{key:q,class:"py-2 px-3 border-b last:border-0 border-gray-100 bg-gradient-to-r from-white to-gray-50 rounded-lg"},[s("div",sx,[s("div",ox,m(k.icon),1),s("div",nx,[s("div",lx,[s("span",rx,m(k.user_name),1),s("span",{class:ce(["text-xs px-2 py-0.5 rounded-full",k.type==="study"?"bg-blue-100 text-blue-600":"bg-green-100 text-green-600"])},m(k.type==="study"?"勉強":"お手伝い"),3)]),s("p",ix,m(k.description),1),s("p",ax,m(re(k.timestamp)),1)])]),k.comment?(f(),v("div",cx,[s("p",ux," 💬 "+m(k.comment),1)])):X("",!0),k.type==="study"?(f(),v("div",dx,[s("button",{onClick:Ce=>L(Ce,k),class:ce(["like-button flex items-center gap-1 text-sm transition-all relative",(ve=k.liked_by)!=null&&ve.includes(H(o).currentUserId)?"text-pink-500":"text-gray-400 hover:text-pink-400"])},[s("span",{class:ce(["heart-icon text-lg transition-transform",{"animate-heart-pop":k._animating}])},m((be=k.liked_by)!=null&&be.includes(H(o).currentUserId)?"❤️":"🤍"),3),s("span",null,m(k.likes||0),1),k._animating?(f(),v("span",px,[...C[33]||(C[33]=[s("span",{class:"particle particle-1"},"❤️",-1),s("span",{class:"particle particle-2"},"💗",-1),s("span",{class:"particle particle-3"},"💕",-1),s("span",{class:"particle particle-4"},"✨",-1),s("span",{class:"particle particle-5"},"💖",-1),s("span",{class:"particle particle-6"},"💓",-1)])])):X("",!0)],10,fx),s("button",{onClick:Ce=>he(k),class:"flex items-center gap-1 text-sm text-gray-400 hover:text-blue-400 transition-all"},[C[34]||(C[34]=s("span",null,"💬",-1)),s("span",null,m(k.comments_count||0),1)],8,gx)])):X("",!0)])}),128))],2)),y.value.length>5?(f(),v("div",vx,[s("button",{onClick:C[5]||(C[5]=k=>B.value=!B.value),class:"text-sm text-indigo-500 hover:text-indigo-700 font-medium"},m(B.value?"▲ 閉じる":"▼ もっと見る ("+y.value.length+"件)"),1)])):X("",!0)]),_:1}),ne.value?(f(),v("div",{key:3,class:"fixed inset-0 bg-black/50 z-50 flex items-center justify-center p-4",onClick:C[8]||(C[8]=lt(k=>ne.value=!1,["self"]))},[s("div",mx,[s("div",bx,[C[35]||(C[35]=s("h3",{class:"text-white font-bold"},"💬 コメント",-1)),s("button",{onClick:C[6]||(C[6]=k=>ne.value=!1),class:"text-white/80 hover:text-white"},"✕")]),s("div",xx,[S.value?(f(),v("div",hx,"読み込み中...")):ge.value.length===0?(f(),v("div",yx," コメントはまだありません ")):(f(!0),v(ie,{key:2},fe(ge.value,(k,q)=>(f(),v("div",{key:q,class:"bg-gray-50 rounded-lg p-3"},[s("div",_x,[s("span",wx,m(k.user_name),1),s("span",kx,m(re(k.created_at)),1)]),s("p",$x,m(k.comment),1)]))),128))]),s("div",Cx,[Ee(s("input",{"onUpdate:modelValue":C[7]||(C[7]=k=>K.value=k),placeholder:"コメントを入力...",class:"flex-1 px-3 py-2 border rounded-lg focus:outline-none focus:border-blue-400",onKeyup:Xc(Pe,["enter"])},null,544),[[Ke,K.value]]),s("button",{onClick:Pe,disabled:!K.value.trim()||M.value,class:"px-4 py-2 bg-blue-500 text-white rounded-lg disabled:bg-gray-300 font-medium"}," 送信 ",8,Sx)])])])):X("",!0),me(We,null,{default:Te(()=>[s("div",{class:"flex justify-between items-center mb-4"},[C[36]||(C[36]=s("h3",{class:"font-bold text-gray-700"},"🏆 週間XPランキング",-1)),s("button",{onClick:oe,class:"text-xs text-blue-500 hover:text-blue-700"},"🔄 更新")]),N.value?(f(),v("div",Tx,[...C[37]||(C[37]=[s("span",{class:"text-gray-400 animate-pulse"},"読み込み中...",-1)])])):T.value.length===0?(f(),v("div",jx," ランキングデータがありません ")):(f(),v("div",Mx,[(f(!0),v(ie,null,fe(T.value,(k,q)=>{var ve;return f(),v("div",{key:q,class:ce(["flex items-center gap-3 py-3 px-4 rounded-xl transition-all",q===0?"bg-gradient-to-r from-yellow-50 to-amber-50 border-2 border-yellow-400":q===1?"bg-gradient-to-r from-gray-50 to-slate-100 border border-gray-300":q===2?"bg-gradient-to-r from-orange-50 to-amber-50 border border-orange-300":"bg-gray-50",k.user_id===H(o).currentUserId&&"ring-2 ring-indigo-400"])},[s("div",{class:ce(["w-10 h-10 rounded-full flex items-center justify-center font-bold text-lg",[q===0?"bg-yellow-400 text-yellow-900":q===1?"bg-gray-300 text-gray-700":q===2?"bg-orange-400 text-orange-900":"bg-gray-200 text-gray-600"]])},m(q===0?"👑":q===1?"🥈":q===2?"🥉":k.rank),3),s("div",Px,[s("p",Ix,[pt(m(k.display_name)+" ",1),k.user_id===H(o).currentUserId?(f(),v("span",Ax,"(あなた)")):X("",!0)]),s("p",Ex,"Lv."+m(k.level||1),1)]),s("div",Dx,[s("p",{class:ce(["font-bold text-lg",q<3?"text-amber-600":"text-gray-700"])},m(((ve=k.weekly_exp)==null?void 0:ve.toLocaleString())||0),3),C[38]||(C[38]=s("p",{class:"text-[10px] text-gray-400"},"XP",-1))])],2)}),128))]))]),_:1}),me(We,null,{default:Te(()=>[s("div",{class:"flex justify-between items-center mb-4"},[C[39]||(C[39]=s("h3",{class:"font-bold text-gray-700"},[pt("📚 勉強時間ランキング "),s("span",{class:"text-xs text-gray-400 font-normal"},"(過去7日間)")],-1)),s("button",{onClick:Y,class:"text-xs text-blue-500 hover:text-blue-700"},"🔄 更新")]),F.value?(f(),v("div",Ox,[...C[40]||(C[40]=[s("span",{class:"text-gray-400 animate-pulse"},"読み込み中...",-1)])])):w.value.length===0?(f(),v("div",Ux," 勉強データがありません ")):(f(),v("div",Bx,[(f(!0),v(ie,null,fe(w.value.slice(0,10),(k,q)=>{var ve;return f(),v("div",{key:k.user_id,onClick:be=>xe(k),class:ce(["flex items-center gap-3 py-3 px-4 rounded-xl transition-all cursor-pointer hover:scale-[1.02]",q===0?"bg-gradient-to-r from-purple-50 to-indigo-50 border-2 border-purple-400":q===1?"bg-gradient-to-r from-blue-50 to-cyan-50 border border-blue-300":q===2?"bg-gradient-to-r from-teal-50 to-emerald-50 border border-teal-300":"bg-gray-50 hover:bg-gray-100",k.user_id===H(o).currentUserId&&"ring-2 ring-indigo-400"])},[s("div",{class:ce(["w-10 h-10 rounded-full flex items-center justify-center font-bold text-lg",[q===0?"bg-purple-500 text-white":q===1?"bg-blue-400 text-white":q===2?"bg-teal-400 text-white":"bg-gray-200 text-gray-600"]])},m(q===0?"🏆":q===1?"🥈":q===2?"🥉":k.rank),3),s("div",Fx,[s("p",Lx,[pt(m(k.display_name)+" ",1),k.user_id===H(o).currentUserId?(f(),v("span",Rx,"(あなた)")):X("",!0)]),s("div",Vx,[(f(!0),v(ie,null,fe((ve=k.subjects)==null?void 0:ve.slice(0,5),(be,Ce)=>(f(),v("div",{key:Ce,style:ke({width:`${Math.max(10,be.minutes/k.total_minutes*100)}%`,backgroundColor:we[be.subject]||"#95A5A6"}),title:`${be.subject}: ${be.minutes}分`},null,12,Hx))),128))])]),s("div",Kx,[s("p",{class:ce(["font-bold text-lg",q<3?"text-purple-600":"text-gray-700"])},m(ae(k.total_minutes)),3),C[41]||(C[41]=s("p",{class:"text-[10px] text-gray-400"},"タップで詳細",-1))])],10,Nx)}),128))]))]),_:1}),O.value&&p.value?(f(),v("div",{key:4,class:"fixed inset-0 bg-black/50 z-50 flex items-center justify-center p-4",onClick:C[10]||(C[10]=lt(k=>O.value=!1,["self"]))},[s("div",Gx,[s("div",Wx,[s("h3",zx,"📊 "+m(p.value.display_name)+" の勉強詳細",1),s("button",{onClick:C[9]||(C[9]=k=>O.value=!1),class:"text-white/80 hover:text-white text-xl"},"✕")]),s("div",Jx,[s("div",qx,[s("p",Xx,m(ae(p.value.total_minutes)),1),C[42]||(C[42]=s("p",{class:"text-sm text-gray-500"},"過去7日間の勉強時間",-1))]),s("div",Yx,[C[43]||(C[43]=s("h4",{class:"font-bold text-gray-700 text-sm"},"科目別内訳",-1)),(f(!0),v(ie,null,fe(p.value.subjects,(k,q)=>(f(),v("div",{key:q,class:"flex items-center gap-3"},[s("div",{class:"w-4 h-4 rounded",style:ke({backgroundColor:we[k.subject]||"#95A5A6"})},null,4),s("span",Qx,m(k.subject),1),s("div",Zx,[s("div",eh,[s("div",{class:"h-full rounded-full transition-all",style:ke({width:`${k.minutes/p.value.total_minutes*100}%`,backgroundColor:we[k.subject]||"#95A5A6"})},null,4)]),s("span",th,m(ae(k.minutes)),1)])]))),128))])])])])):X("",!0),me(We,null,{default:Te(()=>[s("div",{class:"flex justify-between items-center mb-4"},[C[44]||(C[44]=s("h3",{class:"font-bold text-gray-700"},"🎯 みんなの目標",-1)),s("button",{onClick:pe,class:"text-xs text-blue-500 hover:text-blue-700"},"🔄 更新")]),A.value?(f(),v("div",sh,[...C[45]||(C[45]=[s("span",{class:"text-gray-400 animate-pulse"},"読み込み中...",-1)])])):U.value.length===0?(f(),v("div",oh," 目標がまだありません ")):(f(),v("div",nh,[s("div",lh,[(f(!0),v(ie,null,fe(U.value,k=>(f(),v("div",{key:k.id,class:ce(["w-64 flex-shrink-0 bg-gradient-to-br from-white to-gray-50 rounded-xl p-4 border border-gray-200 shadow-sm",{"ring-2 ring-indigo-400":k.user_id===H(o).currentUserId}])},[s("div",rh,[s("span",ih,m(k.user_name),1),s("span",{class:ce(["text-xs px-2 py-0.5 rounded-full flex-shrink-0 ml-2",De(k.target_date)])},m(Ue(k.target_date)),3)]),s("h4",ah,m(k.title),1),k.description?(f(),v("p",ch,m(k.description),1)):X("",!0),s("div",uh,[C[46]||(C[46]=s("span",null,"🗓️",-1)),s("span",null,m($e(k.target_date)),1)]),k.user_id===H(o).currentUserId?(f(),v("div",dh,[s("button",{onClick:q=>Qe(k.id),class:"flex-1 text-xs py-1.5 rounded-lg bg-green-100 text-green-600 font-medium hover:bg-green-200 transition-colors"}," ✅ 達成 ",8,fh),s("button",{onClick:q=>Ze(k.id),class:"flex-1 text-xs py-1.5 rounded-lg bg-red-50 text-red-500 font-medium hover:bg-red-100 transition-colors"}," 🗑️ 削除 ",8,ph)])):X("",!0)],2))),128))])]))]),_:1})]))}},vh=Xe(gh,[["__scopeId","data-v-11c0e7d7"]]),mh={class:"space-y-4 mt-8"},bh={class:"flex justify-between items-center"},xh={key:0,class:"text-center py-8"},hh={key:0,class:"text-gray-500 text-center py-4"},yh={key:1},_h={class:"flex gap-2 mb-4 overflow-x-auto pb-2"},wh=["onClick"],kh={class:"space-y-2 max-h-96 overflow-y-auto"},$h={class:"flex justify-between items-start mb-2"},Ch={class:"flex items-center gap-2"},Sh={class:"text-lg"},Th={class:"text-xs text-gray-400"},jh={class:"mb-3"},Mh={class:"font-medium text-gray-800"},Ph={class:"text-sm text-gray-500"},Ih={key:0,class:"text-xs text-gray-400 mt-1"},Ah={key:1,class:"text-sm text-yellow-600 mt-1"},Eh={class:"flex gap-2 justify-end"},Dh=["onClick","disabled"],Oh=["onClick","disabled"],Uh={class:"grid grid-cols-3 gap-2"},Bh={key:0,class:"mt-4 space-y-3"},Nh=["disabled"],Fh={key:1,class:"mt-4 space-y-3"},Lh=["value"],Rh=["disabled"],Vh={key:2,class:"mt-4 space-y-3"},Hh=["value"],Kh=["disabled"],Gh={key:0,class:"text-center py-4"},Wh={key:1,class:"space-y-2"},zh=["value"],Jh=["disabled"],qh={class:"space-y-3"},Xh={key:0},Yh=["value"],Qh={class:"bg-gray-50 rounded-lg p-2 text-xs text-gray-500"},Zh={class:"font-medium text-gray-700"},e1=["disabled"],t1={class:"bg-white rounded-2xl p-6 mx-4 max-w-sm w-full shadow-xl"},s1={class:"text-gray-600 mb-4"},o1={class:"flex gap-3"},n1=["disabled"],l1={__name:"AdminView",emits:["exit","viewAsUser"],setup(e,{emit:t}){const o=t,n=at(),{showConfirm:l}=xs(),r=j(!0),i=j(!1),a=j([]),c=j("all"),u=j(""),d=j("success"),g=j(!1),x=j(null),b=j(!0),y=j([]),_=j(""),T=j(null),w=j({title:"",reward:0}),U=j({userId:"",amount:0}),B=j({userId:"",subject:"",minutes:0,comment:""}),E=j({message:"",target:"self",targetUserId:""}),ne=ee(()=>!(!E.value.message.trim()||E.value.target==="individual"&&!E.value.targetUserId)),de=[{key:"all",label:"すべて",icon:"📋"},{key:"study",label:"勉強",icon:"📚"},{key:"job",label:"お手伝い",icon:"🔧"},{key:"shop",label:"ショップ",icon:"🛒"},{key:"mission",label:"ミッション",icon:"🎯"}],ge=ee(()=>c.value==="all"?a.value:a.value.filter(re=>re.type===c.value)),K=re=>re==="all"?a.value.length:a.value.filter(I=>I.type===re).length,S=re=>({study:"📚",job:"🔧",shop:"🛒",mission:"🎯"})[re]||"📋",M=re=>({study:"勉強",job:"お手伝い",shop:"ショップ",mission:"ミッション"})[re]||re,O=re=>({study:"bg-blue-100 text-blue-700",job:"bg-orange-100 text-orange-700",shop:"bg-purple-100 text-purple-700",mission:"bg-green-100 text-green-700"})[re]||"bg-gray-100 text-gray-700",p=re=>{if(!re)return"";try{return new Date(re).toLocaleString("ja-JP",{month:"short",day:"numeric",hour:"2-digit",minute:"2-digit"})}catch{return re}},P=(re,I="success")=>{u.value=re,d.value=I,setTimeout(()=>{u.value=""},3e3)},G=async()=>{r.value=!0;try{const I=await(await fetch("/api/admin/pending")).json();I.status==="ok"&&I.data?a.value=I.data.map(je=>N(je)):a.value=[]}catch(re){console.error("Fetch pending error:",re),P("データの取得に失敗しました","error")}finally{r.value=!1}},N=re=>{const I=re.data||re,je=re.type||"unknown";let te,_e,Ge,h,$,R,z;switch(je){case"study":te=`study_${I.row_index}`,_e=`${I.subject||"勉強"} - ${I.minutes||0}分`,Ge=I.user_id,h=I.user_name||I.user_id,$=I.date,R=I.comment||"",z=I.minutes||0;break;case"job":te=I.job_id,_e=I.title||"お手伝い",Ge=I.worker_id,h=I.worker_name||I.worker_id,$=I.finished_at||I.created_at,R=I.comment||I.description||"",z=I.reward||0;break;case"shop":te=I.request_id,_e=I.item_name||I.item_key||"商品",Ge=I.user_id,h=I.user_name||I.user_id,$=I.created_at,R="",z=I.cost||0;break;case"mission":te=I.mission_id,_e=I.title||"ミッション",Ge=I.user_id,h=I.user_name||I.user_id,$=I.created_at,R=I.description||"",z=I.reward||0;break;default:te=`unknown_${Date.now()}`,_e="不明な項目",Ge="",h="",$="",R="",z=0}return{id:te,type:je,title:_e,userId:Ge,userName:h,date:$,detail:R,reward:z,rawData:I}},F=async re=>{if(!i.value){i.value=!0;try{let I,je;switch(re.type){case"study":I="/api/admin/approve/study",je={row_index:re.rawData.row_index,user_id:re.userId,minutes:re.reward};break;case"job":I="/api/admin/approve/job",je={job_id:re.rawData.job_id};break;case"shop":I="/api/admin/approve/shop",je={request_id:re.rawData.request_id};break;case"mission":I="/api/admin/approve/mission",je={mission_id:re.rawData.mission_id};break;default:throw new Error("Unknown type")}const _e=await(await fetch(I,{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify(je)})).json();_e.status==="ok"?(P(`${re.title} を承認しました`,"success"),a.value=a.value.filter(Ge=>Ge.id!==re.id)):P(_e.message||"承認に失敗しました","error")}catch(I){console.error("Approve error:",I),P("承認処理でエラーが発生しました","error")}finally{i.value=!1}}},A=re=>{x.value=re,g.value=!0},V=async()=>{x.value&&(g.value=!1,await ue(x.value),x.value=null)},ue=async re=>{if(!i.value){i.value=!0;try{let I,je;switch(re.type){case"study":I="/api/admin/reject/study",je={row_index:re.rawData.row_index,user_id:re.userId};break;case"job":I="/api/admin/reject/job",je={job_id:re.rawData.job_id};break;case"shop":I="/api/admin/reject/shop",je={request_id:re.rawData.request_id,user_id:re.userId,cost:re.reward};break;case"mission":I="/api/admin/reject/mission",je={mission_id:re.rawData.mission_id};break;default:throw new Error("Unknown type")}const _e=await(await fetch(I,{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify(je)})).json();_e.status==="ok"?(P(`${re.title} を却下しました`,"success"),a.value=a.value.filter(Ge=>Ge.id!==re.id)):P(_e.message||"却下に失敗しました","error")}catch(I){console.error("Reject error:",I),P("却下処理でエラーが発生しました","error")}finally{i.value=!1}}};qe(()=>{G(),we()});const we=async()=>{b.value=!0;try{const I=await(await fetch("/api/admin/users")).json();I.status==="success"&&I.users&&(y.value=I.users)}catch(re){console.error("Fetch users error:",re)}finally{b.value=!1}},Ve=async()=>{if(!_.value)return;const re=y.value.find(je=>je.user_id===_.value);await n.viewAsUser(_.value,(re==null?void 0:re.user_name)||"")&&o("viewAsUser")},Ae=async()=>{if(!(i.value||!w.value.title||!w.value.reward)){i.value=!0;try{const I=await(await fetch("/api/admin/add_task",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({title:w.value.title,reward:w.value.reward})})).json();I.status==="success"?(P(`ジョブ「${w.value.title}」を追加しました`,"success"),w.value={title:"",reward:0}):P(I.message||"ジョブの追加に失敗しました","error")}catch(re){console.error("Create job error:",re),P("ジョブ追加でエラーが発生しました","error")}finally{i.value=!1}}},tt=async()=>{var re;if(!(i.value||!U.value.userId||!U.value.amount)){i.value=!0;try{const je=await(await fetch("/api/admin/grant_points",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({user_id:U.value.userId,amount:U.value.amount})})).json();if(je.status==="success"){const te=((re=y.value.find(_e=>_e.user_id===U.value.userId))==null?void 0:re.user_name)||"ユーザー";P(`${te} に ${U.value.amount} XP を付与しました`,"success"),U.value={userId:"",amount:0}}else P(je.message||"ポイント付与に失敗しました","error")}catch(I){console.error("Grant points error:",I),P("ポイント付与でエラーが発生しました","error")}finally{i.value=!1}}},He=async()=>{var re;if(!(i.value||!B.value.userId||!B.value.subject||!B.value.minutes)){i.value=!0;try{const je=await(await fetch("/api/admin/manual_study",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({user_id:B.value.userId,subject:B.value.subject,minutes:B.value.minutes,comment:B.value.comment||"管理者による手動記録"})})).json();if(je.status==="ok"){const te=((re=y.value.find(_e=>_e.user_id===B.value.userId))==null?void 0:re.user_name)||"ユーザー";P(`${te} の勉強記録を追加しました（${B.value.minutes}分）`,"success"),B.value={userId:"",subject:"",minutes:0,comment:""}}else P(je.message||"勉強記録の追加に失敗しました","error")}catch(I){console.error("Manual study error:",I),P("勉強記録追加でエラーが発生しました","error")}finally{i.value=!1}}},et=async()=>{var je;if(i.value||!ne.value)return;const re=E.value.target==="self"?"自分だけ（テスト）":E.value.target==="all"?"全員（自分含む）":E.value.target==="users"?"USERのみ":((je=y.value.find(te=>te.user_id===E.value.targetUserId))==null?void 0:je.user_name)||"選択したユーザー";if(await l({type:"info",title:"お知らせ送信確認",message:`${re}にお知らせを送信しますか？
+この操作は取り消せません。`,confirmText:"削除する",cancelText:"やめる",icon:"🗑️"}))try{(await(await fetch(`/api/goals/${W}?user_id=${o.currentUserId}`,{method:"DELETE"})).json()).status==="ok"?await pe():a.error("削除に失敗しました")}catch(k){console.error("Delete goal error:",k),a.error("削除に失敗しました")}},ct=async()=>{try{const C=await(await fetch("/api/study/active_sessions")).json();C.status==="ok"&&(E.value=C.data||[])}catch(W){console.error("Failed to fetch active sessions:",W)}},D=W=>{if(!W)return"";try{const C=new Date,[k,q,ve]=W.split(":").map(Number),be=new Date;be.setHours(k,q,ve||0),be>C&&be.setDate(be.getDate()-1);const Ce=Math.floor((C-be)/1e3/60);if(Ce<60)return`${Ce}分経過`;const Fe=Math.floor(Ce/60),Jt=Ce%60;return`${Fe}時間${Jt}分経過`}catch{return""}},L=async(W,C)=>{var q;((q=C.liked_by)==null?void 0:q.includes(o.currentUserId))||(C._animating=!0,setTimeout(()=>{C._animating=!1},700)),await Z(C)},Z=async W=>{if(W.row_index)try{const k=await(await fetch("/api/activity/like",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({study_row_index:W.row_index,session_id:W.session_id,user_id:o.currentUserId})})).json();k.status==="ok"&&(W.likes=k.likes,W.liked_by=k.liked_by,r(Nt.ACTIVITY))}catch(C){console.error("Toggle like error:",C)}},he=async W=>{if(de.value=W,ge.value=[],K.value="",ne.value=!0,!!W.row_index){S.value=!0;try{const k=await(await fetch(`/api/activity/${W.row_index}/comments?session_id=${encodeURIComponent(W.session_id||"")}`)).json();k.status==="ok"&&(ge.value=k.comments||[])}catch(C){console.error("Fetch comments error:",C)}finally{S.value=!1}}},Pe=async()=>{var W;if(!(!K.value.trim()||!((W=de.value)!=null&&W.row_index))){M.value=!0;try{const k=await(await fetch("/api/activity/comment",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({study_row_index:de.value.row_index,session_id:de.value.session_id,user_id:o.currentUserId,user_name:o.displayName||"",comment:K.value.trim()})})).json();k.status==="ok"?(ge.value.push({user_id:o.currentUserId,user_name:o.displayName||"",comment:K.value.trim(),created_at:k.created_at}),de.value.comments_count=(de.value.comments_count||0)+1,K.value="",r(Nt.ACTIVITY)):a.error(k.message||"コメントの投稿に失敗しました")}catch(C){console.error("Submit comment error:",C),a.error("コメントの投稿に失敗しました")}finally{M.value=!1}}};return qe(()=>{se(),le(),oe(),Y(),pe(),ct(),setInterval(ct,6e4)}),(W,C)=>(f(),v("div",Am,[E.value.length>0?(f(),v("div",Em,[(f(!0),v(ie,null,fe(E.value,k=>(f(),v("div",{key:k.user_id,class:"bg-gradient-to-r from-green-400 to-emerald-500 rounded-xl p-3 shadow-lg animate-pulse-soft"},[s("div",Dm,[C[12]||(C[12]=s("span",{class:"text-2xl"},"📖",-1)),s("div",Om,[s("p",Um,[pt(m(k.user_name)+" が ",1),s("span",Bm,m(k.subject||"勉強"),1),C[11]||(C[11]=pt(" を勉強中 ",-1))]),s("p",Nm," ⏱️ "+m(k.start_time)+" から "+m(D(k.start_time)),1)]),C[13]||(C[13]=s("span",{class:"text-3xl animate-bounce"},"🔥",-1))])]))),128))])):X("",!0),s("div",Fm,[C[14]||(C[14]=s("h2",{class:"text-xl font-bold text-white"},"📊 学習データ",-1)),H(o).isAdmin?(f(),v("button",{key:0,onClick:C[0]||(C[0]=k=>c("admin")),class:"text-white/70 hover:text-white text-sm underline"}," 管理者メニュー ")):X("",!0)]),s("div",Lm,[(f(),v(ie,null,fe(u,k=>s("button",{key:k.key,onClick:q=>d.value=k.key,class:ce(["flex-1 py-2 px-3 rounded-lg text-sm font-medium transition-all",d.value===k.key?"bg-white text-indigo-600 shadow-sm":"text-white/70 hover:text-white"])},m(k.icon)+" "+m(k.label),11,Rm)),64))]),d.value==="weekly"?(f(),v("div",Vm,[me(We,null,{default:Te(()=>[P.value?(f(),v("div",Hm,[...C[15]||(C[15]=[s("div",{class:"text-center"},[s("div",{class:"animate-spin text-4xl mb-2"},"📊"),s("span",{class:"text-gray-400"},"データ読み込み中...")],-1)])])):(f(),v(ie,{key:1},[s("div",Km,[s("button",{onClick:C[1]||(C[1]=k=>V.value++),class:"p-2 rounded-lg bg-indigo-100 text-indigo-600 hover:bg-indigo-200 active:scale-95 transition-all"},[...C[16]||(C[16]=[s("span",{class:"text-lg"},"←",-1)])]),s("h3",Gm,m(I.value),1),s("button",{onClick:C[2]||(C[2]=k=>V.value=Math.max(0,V.value-1)),disabled:V.value===0,class:ce(["p-2 rounded-lg transition-all",V.value===0?"bg-gray-200 text-gray-400 cursor-not-allowed":"bg-indigo-100 text-indigo-600 hover:bg-indigo-200 active:scale-95"])},[...C[17]||(C[17]=[s("span",{class:"text-lg"},"→",-1)])],10,Wm)]),s("div",zm,[(f(!0),v(ie,null,fe(je.value,(k,q)=>(f(),v("div",{key:q,class:"flex-1 flex flex-col items-center min-w-0 group"},[s("div",Jm,[(f(!0),v(ie,null,fe(k.segments,(ve,be)=>(f(),v("div",{key:be,class:"w-full first:rounded-t-lg transition-all duration-500 cursor-pointer hover:opacity-80 relative",style:ke({height:z(ve.minutes,k.total)+"px",backgroundColor:ve.color,minHeight:ve.minutes>0?"4px":"0"}),title:ve.subject+": "+ve.minutes+"分"},null,12,qm))),128)),k.total>0?(f(),v("div",Xm,[s("div",Ym,[s("p",Qm,m(k.date),1),(f(!0),v(ie,null,fe(k.segments.filter(ve=>ve.minutes>0),(ve,be)=>(f(),v("div",{key:be,class:"flex items-center gap-2"},[s("span",{class:"w-2 h-2 rounded-full",style:ke({backgroundColor:ve.color})},null,4),s("span",null,m(ve.subject)+": "+m(ve.minutes)+"分",1)]))),128))]),C[18]||(C[18]=s("div",{class:"absolute left-1/2 -translate-x-1/2 -bottom-1 w-2 h-2 bg-gray-800 rotate-45"},null,-1))])):X("",!0),k.total>0?(f(),v("span",Zm,m(k.total)+"分 ",1)):X("",!0)]),s("p",{class:ce(["text-xs mt-2 font-medium",k.isToday?"text-indigo-600":"text-gray-500"])},m(k.day),3)]))),128))]),s("div",eb,[(f(!0),v(ie,null,fe(Ve.value,(k,q)=>(f(),v("div",{key:q,class:"flex items-center gap-1"},[s("div",{class:"w-2.5 h-2.5 rounded-full",style:ke({backgroundColor:k.color})},null,4),s("span",tb,m(k.name),1)]))),128))]),s("div",sb,[s("div",null,[s("p",ob,m(te.value)+"分",1),C[19]||(C[19]=s("p",{class:"text-xs text-gray-500"},"週合計",-1))]),s("div",null,[s("p",nb,m(_e.value)+"分",1),C[20]||(C[20]=s("p",{class:"text-xs text-gray-500"},"平均/日",-1))])])],64))]),_:1})])):X("",!0),d.value==="monthly"?(f(),v("div",lb,[me(We,null,{default:Te(()=>[P.value?(f(),v("div",rb,[...C[21]||(C[21]=[s("div",{class:"text-center"},[s("div",{class:"animate-spin text-4xl mb-2"},"📊"),s("span",{class:"text-gray-400"},"データ読み込み中...")],-1)])])):(f(),v(ie,{key:1},[s("div",ib,[s("button",{onClick:C[3]||(C[3]=k=>ue.value++),class:"p-2 rounded-lg bg-indigo-100 text-indigo-600 hover:bg-indigo-200 active:scale-95 transition-all"},[...C[22]||(C[22]=[s("span",{class:"text-lg"},"←",-1)])]),s("h3",ab,m(Ge.value),1),s("button",{onClick:C[4]||(C[4]=k=>ue.value=Math.max(0,ue.value-1)),disabled:ue.value===0,class:ce(["p-2 rounded-lg transition-all",ue.value===0?"bg-gray-200 text-gray-400 cursor-not-allowed":"bg-indigo-100 text-indigo-600 hover:bg-indigo-200 active:scale-95"])},[...C[23]||(C[23]=[s("span",{class:"text-lg"},"→",-1)])],10,cb)]),s("div",ub,[(f(!0),v(ie,null,fe(h.value,(k,q)=>(f(),v("div",{key:q,class:"flex-1 flex flex-col items-center group"},[s("div",db,[(f(!0),v(ie,null,fe(k.segments,(ve,be)=>(f(),v("div",{key:be,class:"w-full first:rounded-t-lg transition-all duration-500 cursor-pointer hover:opacity-80",style:ke({height:Q(ve.minutes,k.total)+"px",backgroundColor:ve.color,minHeight:ve.minutes>0?"4px":"0"}),title:ve.subject+": "+ve.minutes+"分"},null,12,fb))),128)),k.total>0?(f(),v("div",pb,[s("div",gb,[s("p",vb,m(k.label),1),(f(!0),v(ie,null,fe(k.segments.filter(ve=>ve.minutes>0),(ve,be)=>(f(),v("div",{key:be,class:"flex items-center gap-2"},[s("span",{class:"w-2 h-2 rounded-full",style:ke({backgroundColor:ve.color})},null,4),s("span",null,m(ve.subject)+": "+m(ve.minutes)+"分",1)]))),128))]),C[24]||(C[24]=s("div",{class:"absolute left-1/2 -translate-x-1/2 -bottom-1 w-2 h-2 bg-gray-800 rotate-45"},null,-1))])):X("",!0),k.total>0?(f(),v("span",mb,m(Math.round(k.total/60*10)/10)+"h ",1)):X("",!0)]),s("p",bb,m(k.label),1)]))),128))]),s("div",xb,[s("div",hb,[(f(!0),v(ie,null,fe(Ve.value,(k,q)=>(f(),v("div",{key:q,class:"flex items-center gap-1.5"},[s("div",{class:"w-3 h-3 rounded-full",style:ke({backgroundColor:k.color})},null,4),s("span",yb,m(k.name),1)]))),128))]),s("div",_b,[s("p",wb,m($.value)+"分",1),s("p",kb,"月合計 ("+m(Math.round($.value/60*10)/10)+"時間)",1)])])],64))]),_:1})])):X("",!0),me(We,null,{default:Te(()=>[C[29]||(C[29]=s("h3",{class:"font-bold text-gray-700 mb-4"},"📊 科目別時間",-1)),P.value?(f(),v("div",$b,[...C[25]||(C[25]=[s("span",{class:"text-gray-400 animate-pulse"},"読み込み中...",-1)])])):(f(),v("div",Cb,[s("div",Sb,[s("div",Tb,[C[26]||(C[26]=s("h4",{class:"text-sm font-bold text-indigo-600 mb-3"},"📚 今週",-1)),He.value.length===0?(f(),v("div",jb," 記録なし ")):(f(),v("div",Mb,[(f(!0),v(ie,null,fe(He.value.slice(0,5),(k,q)=>(f(),v("div",{key:q,class:"flex items-center gap-2"},[s("div",{class:"w-3 h-3 rounded-full flex-shrink-0",style:ke({backgroundColor:k.color})},null,4),s("span",Pb,m(k.subject),1),s("span",Ib,m(k.minutes)+"分",1)]))),128)),s("div",Ab,[s("p",Eb,m(He.value.reduce((k,q)=>k+q.minutes,0))+"分",1)])]))]),s("div",Db,[C[27]||(C[27]=s("h4",{class:"text-sm font-bold text-green-600 mb-3"},"📆 今月",-1)),et.value.length===0?(f(),v("div",Ob," 記録なし ")):(f(),v("div",Ub,[(f(!0),v(ie,null,fe(et.value.slice(0,5),(k,q)=>(f(),v("div",{key:q,class:"flex items-center gap-2"},[s("div",{class:"w-3 h-3 rounded-full flex-shrink-0",style:ke({backgroundColor:k.color})},null,4),s("span",Bb,m(k.subject),1),s("span",Nb,m(k.minutes)+"分",1)]))),128)),s("div",Fb,[s("p",Lb,m(et.value.reduce((k,q)=>k+q.minutes,0))+"分",1)])]))]),s("div",Rb,[C[28]||(C[28]=s("h4",{class:"text-sm font-bold text-orange-600 mb-3"},"🏆 累計",-1)),x.value.length===0?(f(),v("div",Vb," 記録なし ")):(f(),v("div",Hb,[(f(!0),v(ie,null,fe(x.value.slice(0,5),(k,q)=>(f(),v("div",{key:q,class:"flex items-center gap-2"},[s("div",{class:"w-3 h-3 rounded-full flex-shrink-0",style:ke({backgroundColor:k.color})},null,4),s("span",Kb,m(k.subject),1),s("span",Gb,m(k.minutes)+"分",1)]))),128)),s("div",Wb,[s("p",zb,m(x.value.reduce((k,q)=>k+q.minutes,0))+"分",1)])]))])])]))]),_:1}),me(We,null,{default:Te(()=>[C[30]||(C[30]=s("h3",{class:"font-bold text-gray-700 mb-4"},"🕐 最近の記録",-1)),b.value.length===0?(f(),v("div",Jb," 記録がありません ")):X("",!0),s("div",qb,[(f(!0),v(ie,null,fe(b.value,(k,q)=>(f(),v("div",{key:q,class:"flex justify-between items-center py-2 border-b last:border-0 border-gray-100"},[s("div",Xb,[s("div",{class:"w-2 h-8 rounded-full",style:ke({backgroundColor:Ae(k.subject)})},null,4),s("div",null,[s("p",Yb,m(k.subject),1),s("p",Qb,m(k.date),1)])]),s("span",Zb,m(k.minutes)+"分",1)]))),128))])]),_:1}),me(We,null,{default:Te(()=>[s("div",{class:"flex justify-between items-center mb-4"},[C[31]||(C[31]=s("h3",{class:"font-bold text-gray-700"},"🌍 みんなの活動",-1)),s("button",{onClick:le,class:"text-xs text-blue-500 hover:text-blue-700"},"🔄 更新")]),G.value?(f(),v("div",ex,[...C[32]||(C[32]=[s("span",{class:"text-gray-400 animate-pulse"},"読み込み中...",-1)])])):y.value.length===0?(f(),v("div",tx," 活動履歴がありません ")):(f(),v("div",{key:2,class:ce(["space-y-2",B.value?"max-h-none":"max-h-96"]),style:{"overflow-y":"auto"}},[(f(!0),v(ie,null,fe(tt.value,(k,q)=>{var ve,be;return f(),v("div",{key:q,class:"py-2 px-3 border-b last:border-0 border-gray-100 bg-gradient-to-r from-white to-gray-50 rounded-lg"},[s("div",sx,[s("div",ox,m(k.icon),1),s("div",nx,[s("div",lx,[s("span",rx,m(k.user_name),1),s("span",{class:ce(["text-xs px-2 py-0.5 rounded-full",k.type==="study"?"bg-blue-100 text-blue-600":"bg-green-100 text-green-600"])},m(k.type==="study"?"勉強":"お手伝い"),3)]),s("p",ix,m(k.description),1),s("p",ax,m(re(k.timestamp)),1)])]),k.comment?(f(),v("div",cx,[s("p",ux," 💬 "+m(k.comment),1)])):X("",!0),k.type==="study"?(f(),v("div",dx,[s("button",{onClick:Ce=>L(Ce,k),class:ce(["like-button flex items-center gap-1 text-sm transition-all relative",(ve=k.liked_by)!=null&&ve.includes(H(o).currentUserId)?"text-pink-500":"text-gray-400 hover:text-pink-400"])},[s("span",{class:ce(["heart-icon text-lg transition-transform",{"animate-heart-pop":k._animating}])},m((be=k.liked_by)!=null&&be.includes(H(o).currentUserId)?"❤️":"🤍"),3),s("span",null,m(k.likes||0),1),k._animating?(f(),v("span",px,[...C[33]||(C[33]=[s("span",{class:"particle particle-1"},"❤️",-1),s("span",{class:"particle particle-2"},"💗",-1),s("span",{class:"particle particle-3"},"💕",-1),s("span",{class:"particle particle-4"},"✨",-1),s("span",{class:"particle particle-5"},"💖",-1),s("span",{class:"particle particle-6"},"💓",-1)])])):X("",!0)],10,fx),s("button",{onClick:Ce=>he(k),class:"flex items-center gap-1 text-sm text-gray-400 hover:text-blue-400 transition-all"},[C[34]||(C[34]=s("span",null,"💬",-1)),s("span",null,m(k.comments_count||0),1)],8,gx)])):X("",!0)])}),128))],2)),y.value.length>5?(f(),v("div",vx,[s("button",{onClick:C[5]||(C[5]=k=>B.value=!B.value),class:"text-sm text-indigo-500 hover:text-indigo-700 font-medium"},m(B.value?"▲ 閉じる":"▼ もっと見る ("+y.value.length+"件)"),1)])):X("",!0)]),_:1}),ne.value?(f(),v("div",{key:3,class:"fixed inset-0 bg-black/50 z-50 flex items-center justify-center p-4",onClick:C[8]||(C[8]=lt(k=>ne.value=!1,["self"]))},[s("div",mx,[s("div",bx,[C[35]||(C[35]=s("h3",{class:"text-white font-bold"},"💬 コメント",-1)),s("button",{onClick:C[6]||(C[6]=k=>ne.value=!1),class:"text-white/80 hover:text-white"},"✕")]),s("div",xx,[S.value?(f(),v("div",hx,"読み込み中...")):ge.value.length===0?(f(),v("div",yx," コメントはまだありません ")):(f(!0),v(ie,{key:2},fe(ge.value,(k,q)=>(f(),v("div",{key:q,class:"bg-gray-50 rounded-lg p-3"},[s("div",_x,[s("span",wx,m(k.user_name),1),s("span",kx,m(re(k.created_at)),1)]),s("p",$x,m(k.comment),1)]))),128))]),s("div",Cx,[Ee(s("input",{"onUpdate:modelValue":C[7]||(C[7]=k=>K.value=k),placeholder:"コメントを入力...",class:"flex-1 px-3 py-2 border rounded-lg focus:outline-none focus:border-blue-400",onKeyup:Xc(Pe,["enter"])},null,544),[[Ke,K.value]]),s("button",{onClick:Pe,disabled:!K.value.trim()||M.value,class:"px-4 py-2 bg-blue-500 text-white rounded-lg disabled:bg-gray-300 font-medium"}," 送信 ",8,Sx)])])])):X("",!0),me(We,null,{default:Te(()=>[s("div",{class:"flex justify-between items-center mb-4"},[C[36]||(C[36]=s("h3",{class:"font-bold text-gray-700"},"🏆 週間XPランキング",-1)),s("button",{onClick:oe,class:"text-xs text-blue-500 hover:text-blue-700"},"🔄 更新")]),N.value?(f(),v("div",Tx,[...C[37]||(C[37]=[s("span",{class:"text-gray-400 animate-pulse"},"読み込み中...",-1)])])):T.value.length===0?(f(),v("div",jx," ランキングデータがありません ")):(f(),v("div",Mx,[(f(!0),v(ie,null,fe(T.value,(k,q)=>{var ve;return f(),v("div",{key:q,class:ce(["flex items-center gap-3 py-3 px-4 rounded-xl transition-all",q===0?"bg-gradient-to-r from-yellow-50 to-amber-50 border-2 border-yellow-400":q===1?"bg-gradient-to-r from-gray-50 to-slate-100 border border-gray-300":q===2?"bg-gradient-to-r from-orange-50 to-amber-50 border border-orange-300":"bg-gray-50",k.user_id===H(o).currentUserId&&"ring-2 ring-indigo-400"])},[s("div",{class:ce(["w-10 h-10 rounded-full flex items-center justify-center font-bold text-lg",[q===0?"bg-yellow-400 text-yellow-900":q===1?"bg-gray-300 text-gray-700":q===2?"bg-orange-400 text-orange-900":"bg-gray-200 text-gray-600"]])},m(q===0?"👑":q===1?"🥈":q===2?"🥉":k.rank),3),s("div",Px,[s("p",Ix,[pt(m(k.display_name)+" ",1),k.user_id===H(o).currentUserId?(f(),v("span",Ax,"(あなた)")):X("",!0)]),s("p",Ex,"Lv."+m(k.level||1),1)]),s("div",Dx,[s("p",{class:ce(["font-bold text-lg",q<3?"text-amber-600":"text-gray-700"])},m(((ve=k.weekly_exp)==null?void 0:ve.toLocaleString())||0),3),C[38]||(C[38]=s("p",{class:"text-[10px] text-gray-400"},"XP",-1))])],2)}),128))]))]),_:1}),me(We,null,{default:Te(()=>[s("div",{class:"flex justify-between items-center mb-4"},[C[39]||(C[39]=s("h3",{class:"font-bold text-gray-700"},[pt("📚 勉強時間ランキング "),s("span",{class:"text-xs text-gray-400 font-normal"},"(過去7日間)")],-1)),s("button",{onClick:Y,class:"text-xs text-blue-500 hover:text-blue-700"},"🔄 更新")]),F.value?(f(),v("div",Ox,[...C[40]||(C[40]=[s("span",{class:"text-gray-400 animate-pulse"},"読み込み中...",-1)])])):w.value.length===0?(f(),v("div",Ux," 勉強データがありません ")):(f(),v("div",Bx,[(f(!0),v(ie,null,fe(w.value.slice(0,10),(k,q)=>{var ve;return f(),v("div",{key:k.user_id,onClick:be=>xe(k),class:ce(["flex items-center gap-3 py-3 px-4 rounded-xl transition-all cursor-pointer hover:scale-[1.02]",q===0?"bg-gradient-to-r from-purple-50 to-indigo-50 border-2 border-purple-400":q===1?"bg-gradient-to-r from-blue-50 to-cyan-50 border border-blue-300":q===2?"bg-gradient-to-r from-teal-50 to-emerald-50 border border-teal-300":"bg-gray-50 hover:bg-gray-100",k.user_id===H(o).currentUserId&&"ring-2 ring-indigo-400"])},[s("div",{class:ce(["w-10 h-10 rounded-full flex items-center justify-center font-bold text-lg",[q===0?"bg-purple-500 text-white":q===1?"bg-blue-400 text-white":q===2?"bg-teal-400 text-white":"bg-gray-200 text-gray-600"]])},m(q===0?"🏆":q===1?"🥈":q===2?"🥉":k.rank),3),s("div",Fx,[s("p",Lx,[pt(m(k.display_name)+" ",1),k.user_id===H(o).currentUserId?(f(),v("span",Rx,"(あなた)")):X("",!0)]),s("div",Vx,[(f(!0),v(ie,null,fe((ve=k.subjects)==null?void 0:ve.slice(0,5),(be,Ce)=>(f(),v("div",{key:Ce,style:ke({width:`${Math.max(10,be.minutes/k.total_minutes*100)}%`,backgroundColor:we[be.subject]||"#95A5A6"}),title:`${be.subject}: ${be.minutes}分`},null,12,Hx))),128))])]),s("div",Kx,[s("p",{class:ce(["font-bold text-lg",q<3?"text-purple-600":"text-gray-700"])},m(ae(k.total_minutes)),3),C[41]||(C[41]=s("p",{class:"text-[10px] text-gray-400"},"タップで詳細",-1))])],10,Nx)}),128))]))]),_:1}),O.value&&p.value?(f(),v("div",{key:4,class:"fixed inset-0 bg-black/50 z-50 flex items-center justify-center p-4",onClick:C[10]||(C[10]=lt(k=>O.value=!1,["self"]))},[s("div",Gx,[s("div",Wx,[s("h3",zx,"📊 "+m(p.value.display_name)+" の勉強詳細",1),s("button",{onClick:C[9]||(C[9]=k=>O.value=!1),class:"text-white/80 hover:text-white text-xl"},"✕")]),s("div",Jx,[s("div",qx,[s("p",Xx,m(ae(p.value.total_minutes)),1),C[42]||(C[42]=s("p",{class:"text-sm text-gray-500"},"過去7日間の勉強時間",-1))]),s("div",Yx,[C[43]||(C[43]=s("h4",{class:"font-bold text-gray-700 text-sm"},"科目別内訳",-1)),(f(!0),v(ie,null,fe(p.value.subjects,(k,q)=>(f(),v("div",{key:q,class:"flex items-center gap-3"},[s("div",{class:"w-4 h-4 rounded",style:ke({backgroundColor:we[k.subject]||"#95A5A6"})},null,4),s("span",Qx,m(k.subject),1),s("div",Zx,[s("div",eh,[s("div",{class:"h-full rounded-full transition-all",style:ke({width:`${k.minutes/p.value.total_minutes*100}%`,backgroundColor:we[k.subject]||"#95A5A6"})},null,4)]),s("span",th,m(ae(k.minutes)),1)])]))),128))])])])])):X("",!0),me(We,null,{default:Te(()=>[s("div",{class:"flex justify-between items-center mb-4"},[C[44]||(C[44]=s("h3",{class:"font-bold text-gray-700"},"🎯 みんなの目標",-1)),s("button",{onClick:pe,class:"text-xs text-blue-500 hover:text-blue-700"},"🔄 更新")]),A.value?(f(),v("div",sh,[...C[45]||(C[45]=[s("span",{class:"text-gray-400 animate-pulse"},"読み込み中...",-1)])])):U.value.length===0?(f(),v("div",oh," 目標がまだありません ")):(f(),v("div",nh,[s("div",lh,[(f(!0),v(ie,null,fe(U.value,k=>(f(),v("div",{key:k.id,class:ce(["w-64 flex-shrink-0 bg-gradient-to-br from-white to-gray-50 rounded-xl p-4 border border-gray-200 shadow-sm",{"ring-2 ring-indigo-400":k.user_id===H(o).currentUserId}])},[s("div",rh,[s("span",ih,m(k.user_name),1),s("span",{class:ce(["text-xs px-2 py-0.5 rounded-full flex-shrink-0 ml-2",De(k.target_date)])},m(Ue(k.target_date)),3)]),s("h4",ah,m(k.title),1),k.description?(f(),v("p",ch,m(k.description),1)):X("",!0),s("div",uh,[C[46]||(C[46]=s("span",null,"🗓️",-1)),s("span",null,m($e(k.target_date)),1)]),k.user_id===H(o).currentUserId?(f(),v("div",dh,[s("button",{onClick:q=>Qe(k.id),class:"flex-1 text-xs py-1.5 rounded-lg bg-green-100 text-green-600 font-medium hover:bg-green-200 transition-colors"}," ✅ 達成 ",8,fh),s("button",{onClick:q=>Ze(k.id),class:"flex-1 text-xs py-1.5 rounded-lg bg-red-50 text-red-500 font-medium hover:bg-red-100 transition-colors"}," 🗑️ 削除 ",8,ph)])):X("",!0)],2))),128))])]))]),_:1})]))}},vh=Xe(gh,[["__scopeId","data-v-11c0e7d7"]]),mh={class:"space-y-4 mt-8"},bh={class:"flex justify-between items-center"},xh={key:0,class:"text-center py-8"},hh={key:0,class:"text-gray-500 text-center py-4"},yh={key:1},_h={class:"flex gap-2 mb-4 overflow-x-auto pb-2"},wh=["onClick"],kh={class:"space-y-2 max-h-96 overflow-y-auto"},$h={class:"flex justify-between items-start mb-2"},Ch={class:"flex items-center gap-2"},Sh={class:"text-lg"},Th={class:"text-xs text-gray-400"},jh={class:"mb-3"},Mh={class:"font-medium text-gray-800"},Ph={class:"text-sm text-gray-500"},Ih={key:0,class:"text-xs text-gray-400 mt-1"},Ah={key:1,class:"text-sm text-yellow-600 mt-1"},Eh={class:"flex gap-2 justify-end"},Dh=["onClick","disabled"],Oh=["onClick","disabled"],Uh={class:"grid grid-cols-3 gap-2"},Bh={key:0,class:"mt-4 space-y-3"},Nh=["disabled"],Fh={key:1,class:"mt-4 space-y-3"},Lh=["value"],Rh=["disabled"],Vh={key:2,class:"mt-4 space-y-3"},Hh=["value"],Kh=["disabled"],Gh={key:0,class:"text-center py-4"},Wh={key:1,class:"space-y-2"},zh=["value"],Jh=["disabled"],qh={class:"space-y-3"},Xh={key:0},Yh=["value"],Qh={class:"bg-gray-50 rounded-lg p-2 text-xs text-gray-500"},Zh={class:"font-medium text-gray-700"},e1=["disabled"],t1={class:"bg-white rounded-2xl p-6 mx-4 max-w-sm w-full shadow-xl"},s1={class:"text-gray-600 mb-4"},o1={class:"flex gap-3"},n1=["disabled"],l1={__name:"AdminView",emits:["exit","viewAsUser"],setup(e,{emit:t}){const o=t,n=at(),{showConfirm:l}=xs(),r=j(!0),i=j(!1),a=j([]),c=j("all"),u=j(""),d=j("success"),g=j(!1),x=j(null),b=j(!0),y=j([]),_=j(""),T=j(null),w=j({title:"",reward:0}),U=j({userId:"",amount:0}),B=j({userId:"",subject:"",minutes:0,comment:""}),E=j({message:"",target:"self",targetUserId:""}),ne=ee(()=>!(!E.value.message.trim()||E.value.target==="individual"&&!E.value.targetUserId)),de=[{key:"all",label:"すべて",icon:"📋"},{key:"study",label:"勉強",icon:"📚"},{key:"job",label:"お手伝い",icon:"🔧"},{key:"shop",label:"ショップ",icon:"🛒"},{key:"mission",label:"ミッション",icon:"🎯"}],ge=ee(()=>c.value==="all"?a.value:a.value.filter(re=>re.type===c.value)),K=re=>re==="all"?a.value.length:a.value.filter(I=>I.type===re).length,S=re=>({study:"📚",job:"🔧",shop:"🛒",mission:"🎯"})[re]||"📋",M=re=>({study:"勉強",job:"お手伝い",shop:"ショップ",mission:"ミッション"})[re]||re,O=re=>({study:"bg-blue-100 text-blue-700",job:"bg-orange-100 text-orange-700",shop:"bg-purple-100 text-purple-700",mission:"bg-green-100 text-green-700"})[re]||"bg-gray-100 text-gray-700",p=re=>{if(!re)return"";try{return new Date(re).toLocaleString("ja-JP",{month:"short",day:"numeric",hour:"2-digit",minute:"2-digit"})}catch{return re}},P=(re,I="success")=>{u.value=re,d.value=I,setTimeout(()=>{u.value=""},3e3)},G=async()=>{r.value=!0;try{const I=await(await fetch("/api/admin/pending")).json();I.status==="ok"&&I.data?a.value=I.data.map(je=>N(je)):a.value=[]}catch(re){console.error("Fetch pending error:",re),P("データの取得に失敗しました","error")}finally{r.value=!1}},N=re=>{const I=re.data||re,je=re.type||"unknown";let te,_e,Ge,h,$,R,z;switch(je){case"study":te=`study_${I.row_index}`,_e=`${I.subject||"勉強"} - ${I.minutes||0}分`,Ge=I.user_id,h=I.user_name||I.user_id,$=I.date,R=I.comment||"",z=I.minutes||0;break;case"job":te=I.job_id,_e=I.title||"お手伝い",Ge=I.worker_id,h=I.worker_name||I.worker_id,$=I.finished_at||I.created_at,R=I.comment||I.description||"",z=I.reward||0;break;case"shop":te=I.request_id,_e=I.item_name||I.item_key||"商品",Ge=I.user_id,h=I.user_name||I.user_id,$=I.created_at,R="",z=I.cost||0;break;case"mission":te=I.mission_id,_e=I.title||"ミッション",Ge=I.user_id,h=I.user_name||I.user_id,$=I.created_at,R=I.description||"",z=I.reward||0;break;default:te=`unknown_${Date.now()}`,_e="不明な項目",Ge="",h="",$="",R="",z=0}return{id:te,type:je,title:_e,userId:Ge,userName:h,date:$,detail:R,reward:z,rawData:I}},F=async re=>{if(!i.value){i.value=!0;try{let I,je;switch(re.type){case"study":I="/api/admin/approve/study",je={row_index:re.rawData.row_index,session_id:re.rawData.session_id,user_id:re.userId,minutes:re.reward};break;case"job":I="/api/admin/approve/job",je={job_id:re.rawData.job_id};break;case"shop":I="/api/admin/approve/shop",je={request_id:re.rawData.request_id};break;case"mission":I="/api/admin/approve/mission",je={mission_id:re.rawData.mission_id};break;default:throw new Error("Unknown type")}const _e=await(await fetch(I,{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify(je)})).json();_e.status==="ok"?(P(`${re.title} を承認しました`,"success"),a.value=a.value.filter(Ge=>Ge.id!==re.id)):P(_e.message||"承認に失敗しました","error")}catch(I){console.error("Approve error:",I),P("承認処理でエラーが発生しました","error")}finally{i.value=!1}}},A=re=>{x.value=re,g.value=!0},V=async()=>{x.value&&(g.value=!1,await ue(x.value),x.value=null)},ue=async re=>{if(!i.value){i.value=!0;try{let I,je;switch(re.type){case"study":I="/api/admin/reject/study",je={row_index:re.rawData.row_index,session_id:re.rawData.session_id,user_id:re.userId};break;case"job":I="/api/admin/reject/job",je={job_id:re.rawData.job_id};break;case"shop":I="/api/admin/reject/shop",je={request_id:re.rawData.request_id,user_id:re.userId,cost:re.reward};break;case"mission":I="/api/admin/reject/mission",je={mission_id:re.rawData.mission_id};break;default:throw new Error("Unknown type")}const _e=await(await fetch(I,{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify(je)})).json();_e.status==="ok"?(P(`${re.title} を却下しました`,"success"),a.value=a.value.filter(Ge=>Ge.id!==re.id)):P(_e.message||"却下に失敗しました","error")}catch(I){console.error("Reject error:",I),P("却下処理でエラーが発生しました","error")}finally{i.value=!1}}};qe(()=>{G(),we()});const we=async()=>{b.value=!0;try{const I=await(await fetch("/api/admin/users")).json();I.status==="success"&&I.users&&(y.value=I.users)}catch(re){console.error("Fetch users error:",re)}finally{b.value=!1}},Ve=async()=>{if(!_.value)return;const re=y.value.find(je=>je.user_id===_.value);await n.viewAsUser(_.value,(re==null?void 0:re.user_name)||"")&&o("viewAsUser")},Ae=async()=>{if(!(i.value||!w.value.title||!w.value.reward)){i.value=!0;try{const I=await(await fetch("/api/admin/add_task",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({title:w.value.title,reward:w.value.reward})})).json();I.status==="success"?(P(`ジョブ「${w.value.title}」を追加しました`,"success"),w.value={title:"",reward:0}):P(I.message||"ジョブの追加に失敗しました","error")}catch(re){console.error("Create job error:",re),P("ジョブ追加でエラーが発生しました","error")}finally{i.value=!1}}},tt=async()=>{var re;if(!(i.value||!U.value.userId||!U.value.amount)){i.value=!0;try{const je=await(await fetch("/api/admin/grant_points",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({user_id:U.value.userId,amount:U.value.amount})})).json();if(je.status==="success"){const te=((re=y.value.find(_e=>_e.user_id===U.value.userId))==null?void 0:re.user_name)||"ユーザー";P(`${te} に ${U.value.amount} XP を付与しました`,"success"),U.value={userId:"",amount:0}}else P(je.message||"ポイント付与に失敗しました","error")}catch(I){console.error("Grant points error:",I),P("ポイント付与でエラーが発生しました","error")}finally{i.value=!1}}},He=async()=>{var re;if(!(i.value||!B.value.userId||!B.value.subject||!B.value.minutes)){i.value=!0;try{const je=await(await fetch("/api/admin/manual_study",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({user_id:B.value.userId,subject:B.value.subject,minutes:B.value.minutes,comment:B.value.comment||"管理者による手動記録"})})).json();if(je.status==="ok"){const te=((re=y.value.find(_e=>_e.user_id===B.value.userId))==null?void 0:re.user_name)||"ユーザー";P(`${te} の勉強記録を追加しました（${B.value.minutes}分）`,"success"),B.value={userId:"",subject:"",minutes:0,comment:""}}else P(je.message||"勉強記録の追加に失敗しました","error")}catch(I){console.error("Manual study error:",I),P("勉強記録追加でエラーが発生しました","error")}finally{i.value=!1}}},et=async()=>{var je;if(i.value||!ne.value)return;const re=E.value.target==="self"?"自分だけ（テスト）":E.value.target==="all"?"全員（自分含む）":E.value.target==="users"?"USERのみ":((je=y.value.find(te=>te.user_id===E.value.targetUserId))==null?void 0:je.user_name)||"選択したユーザー";if(await l({type:"info",title:"お知らせ送信確認",message:`${re}にお知らせを送信しますか？
 
 「${E.value.message.trim().slice(0,50)}${E.value.message.trim().length>50?"...":""}」`,confirmText:"送信する",cancelText:"キャンセル",icon:"📢"})){i.value=!0;try{const _e=await(await fetch("/api/admin/broadcast",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({message:E.value.message.trim(),target:E.value.target,target_user_id:E.value.targetUserId,sender_user_id:n.originalUserId||n.currentUserId})})).json();if(_e.status==="ok"||_e.status==="success"){const Ge=_e.failed_count>0?`✅ ${_e.sent_count}人に送信成功（⚠️ ${_e.failed_count}人失敗）`:`✅ ${_e.sent_count}人に送信しました`;P(Ge,"success"),E.value={message:"",target:"self",targetUserId:""}}else P(_e.message||"お知らせ送信に失敗しました","error")}catch(te){console.error("Broadcast error:",te),P("お知らせ送信でエラーが発生しました","error")}finally{i.value=!1}}};return(re,I)=>{var je;return f(),v("div",mh,[s("div",bh,[I[18]||(I[18]=s("h2",{class:"text-xl font-bold text-white"},"⚙️ 管理者メニュー",-1)),s("button",{onClick:I[0]||(I[0]=te=>o("exit")),class:"text-white/70 hover:text-white"}," ✕ 閉じる ")]),r.value?(f(),v("div",xh,[...I[19]||(I[19]=[s("div",{class:"animate-spin text-4xl"},"⏳",-1),s("p",{class:"text-white/70 mt-2"},"読み込み中...",-1)])])):(f(),Se(We,{key:1},{default:Te(()=>[s("div",{class:"flex justify-between items-center mb-4"},[I[20]||(I[20]=s("h3",{class:"font-bold text-gray-700"},"📋 承認待ち一覧",-1)),s("button",{onClick:G,class:"text-blue-500 text-sm hover:text-blue-700"}," 🔄 更新 ")]),a.value.length===0?(f(),v("div",hh," 承認待ちの項目はありません ")):(f(),v("div",yh,[s("div",_h,[(f(),v(ie,null,fe(de,te=>s("button",{key:te.key,onClick:_e=>c.value=te.key,class:ce(["px-3 py-1 rounded-full text-sm whitespace-nowrap transition-all",c.value===te.key?"bg-blue-500 text-white":"bg-gray-200 text-gray-600 hover:bg-gray-300"])},m(te.icon)+" "+m(te.label)+" ("+m(K(te.key))+") ",11,wh)),64))]),s("div",kh,[(f(!0),v(ie,null,fe(ge.value,te=>(f(),v("div",{key:te.id,class:"p-3 bg-gray-50 rounded-lg border border-gray-200"},[s("div",$h,[s("div",Ch,[s("span",Sh,m(S(te.type)),1),s("span",{class:ce(["text-xs px-2 py-0.5 rounded-full",O(te.type)])},m(M(te.type)),3)]),s("span",Th,m(p(te.date)),1)]),s("div",jh,[s("p",Mh,m(te.title),1),s("p",Ph,"👤 "+m(te.userName||te.userId),1),te.detail?(f(),v("p",Ih,m(te.detail),1)):X("",!0),te.reward?(f(),v("p",Ah," 💰 報酬: "+m(te.reward)+" XP ",1)):X("",!0)]),s("div",Eh,[s("button",{onClick:_e=>F(te),disabled:i.value,class:"bg-green-500 hover:bg-green-600 disabled:bg-gray-300 text-white px-4 py-1.5 rounded text-sm font-medium transition-colors"}," ✅ 承認 ",8,Dh),s("button",{onClick:_e=>A(te),disabled:i.value,class:"bg-red-500 hover:bg-red-600 disabled:bg-gray-300 text-white px-4 py-1.5 rounded text-sm font-medium transition-colors"}," ❌ 却下 ",8,Oh)])]))),128))])]))]),_:1})),me(We,null,{default:Te(()=>[I[24]||(I[24]=s("h3",{class:"font-bold text-gray-700 mb-3"},"⚡ 管理者アクション",-1)),s("div",Uh,[s("button",{onClick:I[1]||(I[1]=te=>T.value="job"),class:ce(["py-3 rounded-xl font-bold text-sm transition-colors",T.value==="job"?"bg-orange-500 text-white":"bg-gray-200 text-gray-700 hover:bg-gray-300"])}," 🔧 ジョブ ",2),s("button",{onClick:I[2]||(I[2]=te=>T.value="point"),class:ce(["py-3 rounded-xl font-bold text-sm transition-colors",T.value==="point"?"bg-green-500 text-white":"bg-gray-200 text-gray-700 hover:bg-gray-300"])}," 💰 ポイント ",2),s("button",{onClick:I[3]||(I[3]=te=>T.value="study"),class:ce(["py-3 rounded-xl font-bold text-sm transition-colors",T.value==="study"?"bg-blue-500 text-white":"bg-gray-200 text-gray-700 hover:bg-gray-300"])}," 📚 勉強記録 ",2)]),T.value==="job"?(f(),v("div",Bh,[Ee(s("input",{"onUpdate:modelValue":I[4]||(I[4]=te=>w.value.title=te),type:"text",placeholder:"タスク名（例：風呂掃除）",class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-orange-400 focus:outline-none"},null,512),[[Ke,w.value.title]]),Ee(s("input",{"onUpdate:modelValue":I[5]||(I[5]=te=>w.value.reward=te),type:"number",placeholder:"報酬 XP（例：100）",class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-orange-400 focus:outline-none"},null,512),[[Ke,w.value.reward,void 0,{number:!0}]]),s("button",{onClick:Ae,disabled:!w.value.title||!w.value.reward||i.value,class:"w-full py-3 rounded-xl font-bold text-white bg-orange-500 hover:bg-orange-600 disabled:bg-gray-300 disabled:cursor-not-allowed transition-colors"}," 🔧 ジョブを追加 ",8,Nh)])):X("",!0),T.value==="point"?(f(),v("div",Fh,[Ee(s("select",{"onUpdate:modelValue":I[6]||(I[6]=te=>U.value.userId=te),class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-green-400 focus:outline-none"},[I[21]||(I[21]=s("option",{value:""},"ユーザーを選択...",-1)),(f(!0),v(ie,null,fe(y.value,te=>(f(),v("option",{key:te.user_id,value:te.user_id},m(te.user_name),9,Lh))),128))],512),[[Pt,U.value.userId]]),Ee(s("input",{"onUpdate:modelValue":I[7]||(I[7]=te=>U.value.amount=te),type:"number",placeholder:"付与ポイント（例：100）",class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-green-400 focus:outline-none"},null,512),[[Ke,U.value.amount,void 0,{number:!0}]]),s("button",{onClick:tt,disabled:!U.value.userId||!U.value.amount||i.value,class:"w-full py-3 rounded-xl font-bold text-white bg-green-500 hover:bg-green-600 disabled:bg-gray-300 disabled:cursor-not-allowed transition-colors"}," 💰 ポイントを付与 ",8,Rh)])):X("",!0),T.value==="study"?(f(),v("div",Vh,[Ee(s("select",{"onUpdate:modelValue":I[8]||(I[8]=te=>B.value.userId=te),class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-blue-400 focus:outline-none"},[I[22]||(I[22]=s("option",{value:""},"ユーザーを選択...",-1)),(f(!0),v(ie,null,fe(y.value,te=>(f(),v("option",{key:te.user_id,value:te.user_id},m(te.user_name),9,Hh))),128))],512),[[Pt,B.value.userId]]),Ee(s("select",{"onUpdate:modelValue":I[9]||(I[9]=te=>B.value.subject=te),class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-blue-400 focus:outline-none"},[...I[23]||(I[23]=[s("option",{value:""},"科目を選択...",-1),s("option",{value:"国語"},"国語",-1),s("option",{value:"数学"},"数学",-1),s("option",{value:"英語"},"英語",-1),s("option",{value:"理科"},"理科",-1),s("option",{value:"社会"},"社会",-1),s("option",{value:"その他"},"その他",-1)])],512),[[Pt,B.value.subject]]),Ee(s("input",{"onUpdate:modelValue":I[10]||(I[10]=te=>B.value.minutes=te),type:"number",placeholder:"勉強時間（分）",class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-blue-400 focus:outline-none"},null,512),[[Ke,B.value.minutes,void 0,{number:!0}]]),Ee(s("input",{"onUpdate:modelValue":I[11]||(I[11]=te=>B.value.comment=te),type:"text",placeholder:"コメント（任意）",class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-blue-400 focus:outline-none"},null,512),[[Ke,B.value.comment]]),s("button",{onClick:He,disabled:!B.value.userId||!B.value.subject||!B.value.minutes||i.value,class:"w-full py-3 rounded-xl font-bold text-white bg-blue-500 hover:bg-blue-600 disabled:bg-gray-300 disabled:cursor-not-allowed transition-colors"}," 📚 勉強記録を追加 ",8,Kh)])):X("",!0)]),_:1}),me(We,null,{default:Te(()=>[I[27]||(I[27]=s("h3",{class:"font-bold text-gray-700 mb-3"},"👁️ ユーザー視点で確認",-1)),I[28]||(I[28]=s("p",{class:"text-xs text-gray-500 mb-3"},"他のユーザーの画面を一時的に確認できます",-1)),b.value?(f(),v("div",Gh,[...I[25]||(I[25]=[s("span",{class:"text-gray-500"},"ユーザー読み込み中...",-1)])])):(f(),v("div",Wh,[Ee(s("select",{"onUpdate:modelValue":I[12]||(I[12]=te=>_.value=te),class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-indigo-400 focus:outline-none"},[I[26]||(I[26]=s("option",{value:""},"ユーザーを選択...",-1)),(f(!0),v(ie,null,fe(y.value,te=>(f(),v("option",{key:te.user_id,value:te.user_id},m(te.user_name)+" "+m(te.user_id===H(n).originalUserId?"(あなた)":""),9,zh))),128))],512),[[Pt,_.value]]),s("button",{onClick:Ve,disabled:!_.value||_.value===H(n).currentUserId,class:"w-full py-2 rounded-xl font-bold text-white bg-indigo-500 hover:bg-indigo-600 disabled:bg-gray-300 disabled:cursor-not-allowed transition-colors"}," 👁️ この視点で見る ",8,Jh)]))]),_:1}),me(We,null,{default:Te(()=>{var te;return[I[34]||(I[34]=s("h3",{class:"font-bold text-gray-700 mb-3"},"📢 お知らせを送信",-1)),I[35]||(I[35]=s("p",{class:"text-xs text-gray-500 mb-3"},"LINE通知を送信します",-1)),s("div",qh,[s("div",null,[I[30]||(I[30]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"通知先",-1)),Ee(s("select",{"onUpdate:modelValue":I[13]||(I[13]=_e=>E.value.target=_e),class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-purple-400 focus:outline-none"},[...I[29]||(I[29]=[s("option",{value:"self"},"🔔 自分だけ（テスト送信）",-1),s("option",{value:"all"},"👨‍👩‍👧‍👦 全員（自分含む）",-1),s("option",{value:"users"},"👦 USERのみ",-1),s("option",{value:"individual"},"👤 個別ユーザー",-1)])],512),[[Pt,E.value.target]])]),E.value.target==="individual"?(f(),v("div",Xh,[I[32]||(I[32]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"送信先ユーザー",-1)),Ee(s("select",{"onUpdate:modelValue":I[14]||(I[14]=_e=>E.value.targetUserId=_e),class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-purple-400 focus:outline-none"},[I[31]||(I[31]=s("option",{value:""},"ユーザーを選択...",-1)),(f(!0),v(ie,null,fe(y.value,_e=>(f(),v("option",{key:_e.user_id,value:_e.user_id},m(_e.user_name),9,Yh))),128))],512),[[Pt,E.value.targetUserId]])])):X("",!0),Ee(s("textarea",{"onUpdate:modelValue":I[15]||(I[15]=_e=>E.value.message=_e),rows:"3",placeholder:"お知らせ内容を入力...",class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-purple-400 focus:outline-none resize-none"},null,512),[[Ke,E.value.message]]),s("div",Qh,[I[33]||(I[33]=pt(" 📨 送信先: ",-1)),s("span",Zh,m(E.value.target==="self"?"自分":E.value.target==="all"?"全員（"+y.value.length+"人）":E.value.target==="users"?"USERのみ（"+y.value.filter(_e=>_e.role!=="ADMIN").length+"人）":((te=y.value.find(_e=>_e.user_id===E.value.targetUserId))==null?void 0:te.user_name)||"選択してください"),1)]),s("button",{onClick:et,disabled:!ne.value||i.value,class:"w-full py-3 rounded-xl font-bold text-white bg-purple-500 hover:bg-purple-600 disabled:bg-gray-300 disabled:cursor-not-allowed transition-colors"}," 📢 "+m(E.value.target==="self"?"テスト送信":E.value.target==="individual"?"送信":E.value.target==="users"?"USERに送信":"全員に送信"),9,e1)])]}),_:1}),g.value?(f(),v("div",{key:2,class:"fixed inset-0 bg-black/50 flex items-center justify-center z-50",onClick:I[17]||(I[17]=lt(te=>g.value=!1,["self"]))},[s("div",t1,[I[36]||(I[36]=s("h3",{class:"text-lg font-bold text-gray-800 mb-3"},"⚠️ 却下の確認",-1)),s("p",s1," 「"+m((je=x.value)==null?void 0:je.title)+"」を本当に却下しますか？ ",1),s("div",o1,[s("button",{onClick:I[16]||(I[16]=te=>g.value=!1),class:"flex-1 py-2 bg-gray-200 text-gray-700 rounded-lg font-medium hover:bg-gray-300"}," キャンセル "),s("button",{onClick:V,disabled:i.value,class:"flex-1 py-2 bg-red-500 text-white rounded-lg font-medium hover:bg-red-600 disabled:bg-gray-300"}," 却下する ",8,n1)])])])):X("",!0),u.value?(f(),v("div",{key:3,class:ce(["fixed bottom-4 left-1/2 transform -translate-x-1/2 px-4 py-2 rounded-lg shadow-lg transition-opacity",d.value==="success"?"bg-green-500 text-white":"bg-red-500 text-white"])},m(u.value),3)):X("",!0)])}}},r1={class:"fixed inset-0 bg-black/50 backdrop-blur-sm z-50 flex items-center justify-center px-6"},i1={class:"bg-white rounded-2xl shadow-2xl w-full max-w-sm overflow-hidden animate-fadeInUp"},a1={class:"p-6 text-center"},c1={class:"text-4xl mb-2"},u1={class:"text-xl font-bold text-gray-800"},d1={class:"text-amber-600 font-bold text-lg mt-2"},f1={class:"px-6 pb-4"},p1={class:"p-4 border-t flex gap-3"},g1={__name:"BuyModal",props:{item:{type:Object,default:null}},emits:["confirm","cancel"],setup(e,{emit:t}){const o=t,n=j(""),l=()=>{o("confirm",n.value),n.value=""};return(r,i)=>{var a,c,u;return f(),Se(ms,{to:"body"},[s("div",r1,[s("div",i1,[i[3]||(i[3]=s("div",{class:"bg-gradient-to-r from-amber-500 to-orange-500 p-4"},[s("h3",{class:"text-white font-bold text-lg text-center"},"🛒 購入確認")],-1)),s("div",a1,[s("p",c1,m((a=e.item)==null?void 0:a.icon),1),s("h4",u1,m((c=e.item)==null?void 0:c.name),1),s("p",d1,m((u=e.item)==null?void 0:u.cost)+" XP ",1)]),s("div",f1,[i[2]||(i[2]=s("label",{class:"block text-sm font-medium text-gray-700 mb-2"}," 💬 コメント (任意) ",-1)),Ee(s("input",{"onUpdate:modelValue":i[0]||(i[0]=d=>n.value=d),type:"text",class:"w-full p-3 border border-gray-200 rounded-lg focus:ring-2 focus:ring-amber-500 focus:border-transparent",placeholder:"親へのメッセージ..."},null,512),[[Ke,n.value]])]),s("div",p1,[s("button",{onClick:i[1]||(i[1]=d=>o("cancel")),class:"flex-1 py-3 bg-gray-200 text-gray-700 rounded-xl font-medium"}," キャンセル "),s("button",{onClick:l,class:"flex-1 py-3 bg-gradient-to-r from-amber-500 to-orange-500 text-white rounded-xl font-bold"}," 購入申請 ")])])])])}}},v1={class:"fixed inset-0 bg-black/50 backdrop-blur-sm z-50 flex items-center justify-center px-6"},m1={class:"bg-white rounded-2xl shadow-2xl w-full max-w-sm overflow-hidden animate-fadeInUp max-h-[80vh] flex flex-col"},b1={class:"p-4 overflow-y-auto flex-1"},x1={key:0,class:"text-center py-8"},h1={key:1,class:"text-center text-gray-500 py-8"},y1={key:2,class:"space-y-3"},_1=["onClick"],w1={class:"text-3xl"},k1={class:"flex-1"},$1={class:"font-bold text-gray-800"},C1={class:"text-xs text-gray-500"},S1={class:"text-amber-600 font-bold whitespace-nowrap"},T1={class:"p-4 border-t shrink-0"},j1={__name:"ShopListModal",emits:["close"],setup(e,{emit:t}){const o=Vn(),n=t;return(l,r)=>(f(),Se(ms,{to:"body"},[s("div",v1,[s("div",m1,[r[2]||(r[2]=s("div",{class:"bg-gradient-to-r from-amber-500 to-orange-500 p-4 shrink-0"},[s("h3",{class:"text-white font-bold text-lg text-center"},"🏪 ショップ")],-1)),s("div",b1,[H(o).loading?(f(),v("div",x1,[...r[1]||(r[1]=[s("div",{class:"animate-spin rounded-full h-8 w-8 border-4 border-amber-300 border-t-amber-600 mx-auto"},null,-1),s("p",{class:"mt-2 text-gray-500"},"読み込み中...",-1)])])):H(o).shopItems.length===0?(f(),v("div",h1," 商品がありません ")):(f(),v("div",y1,[(f(!0),v(ie,null,fe(H(o).shopItems,i=>(f(),v("button",{key:i.key,onClick:a=>H(o).openBuyModal(i),class:"w-full bg-white border border-gray-200 rounded-xl p-3 flex items-center gap-4 transition-all hover:shadow-md active:scale-95 text-left"},[s("span",w1,m(i.icon),1),s("div",k1,[s("p",$1,m(i.name),1),s("p",C1,m(i.description),1)]),s("div",S1,m(i.cost)+" XP ",1)],8,_1))),128))]))]),s("div",T1,[s("button",{onClick:r[0]||(r[0]=i=>n("close")),class:"w-full py-3 bg-gray-100 text-gray-600 rounded-xl font-medium transition-colors hover:bg-gray-200"}," 閉じる ")])])])]))}},M1={class:"bg-white rounded-2xl p-6 w-[90%] max-w-md shadow-2xl animate-pop-in"},P1={class:"text-xl font-bold text-gray-800 mb-4"},I1={class:"mb-4"},A1={class:"mb-4"},E1={class:"mb-6"},D1=["min"],O1={key:0,class:"mb-6 p-4 bg-indigo-50 rounded-xl"},U1={class:"text-center"},B1={class:"text-3xl font-bold text-indigo-600"},N1={class:"flex gap-3"},F1=["disabled"],L1={__name:"GoalModal",props:{editGoal:{type:Object,default:null}},emits:["close","created","updated"],setup(e,{emit:t}){const o=e,n=t,l=at(),r=At(),i=j(""),a=j(""),c=j(""),u=j(!1),d=ee(()=>!!o.editGoal),g=ee(()=>new Date().toISOString().split("T")[0]),x=ee(()=>{if(!c.value)return-1;const _=new Date(c.value),T=new Date;return T.setHours(0,0,0,0),_.setHours(0,0,0,0),Math.ceil((_-T)/(1e3*60*60*24))}),b=ee(()=>i.value.trim()&&c.value&&x.value>=0);qe(()=>{o.editGoal&&(i.value=o.editGoal.title||"",a.value=o.editGoal.description||"",c.value=o.editGoal.target_date||"")});const y=async()=>{if(!(!b.value||u.value)){u.value=!0;try{if(d.value){const T=await(await fetch(`/api/goals/${o.editGoal.id}`,{method:"PUT",headers:{"Content-Type":"application/json"},body:JSON.stringify({user_id:l.currentUserId,title:i.value.trim(),description:a.value.trim(),target_date:c.value})})).json();T.status==="ok"?(n("updated"),n("close")):r.error("目標の更新に失敗しました: "+(T.message||"Unknown error"))}else{const T=await(await fetch("/api/goals",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({user_id:l.currentUserId,user_name:l.user.name,title:i.value.trim(),description:a.value.trim(),target_date:c.value})})).json();T.status==="ok"?(n("created"),n("close")):r.error("目標の保存に失敗しました: "+(T.message||"Unknown error"))}}catch(_){console.error("Goal save error:",_),r.error("目標の保存に失敗しました")}finally{u.value=!1}}};return(_,T)=>(f(),v("div",{class:"fixed inset-0 z-50 flex items-center justify-center bg-black/50",onClick:T[4]||(T[4]=lt(w=>n("close"),["self"]))},[s("div",M1,[s("h3",P1,m(d.value?"✏️ 目標を編集":"🎯 目標を設定"),1),s("div",I1,[T[5]||(T[5]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"タイトル *",-1)),Ee(s("input",{"onUpdate:modelValue":T[0]||(T[0]=w=>i.value=w),type:"text",placeholder:"例：期末テストで80点以上",class:"w-full px-4 py-3 border-2 border-gray-200 rounded-xl focus:border-indigo-400 focus:outline-none transition-colors",maxlength:"50"},null,512),[[Ke,i.value]])]),s("div",A1,[T[6]||(T[6]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"詳細（任意）",-1)),Ee(s("textarea",{"onUpdate:modelValue":T[1]||(T[1]=w=>a.value=w),placeholder:"目標達成のための具体的な計画など...",class:"w-full px-4 py-3 border-2 border-gray-200 rounded-xl focus:border-indigo-400 focus:outline-none transition-colors resize-none",rows:"3",maxlength:"200"},null,512),[[Ke,a.value]])]),s("div",E1,[T[7]||(T[7]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"目標日 *",-1)),Ee(s("input",{"onUpdate:modelValue":T[2]||(T[2]=w=>c.value=w),type:"date",min:g.value,class:"w-full px-4 py-3 border-2 border-gray-200 rounded-xl focus:border-indigo-400 focus:outline-none transition-colors"},null,8,D1),[[Ke,c.value]]),T[8]||(T[8]=s("p",{class:"text-xs text-gray-500 mt-1"},"目標達成を目指す日付を選んでください",-1))]),c.value&&x.value>=0?(f(),v("div",O1,[s("p",U1,[s("span",B1,m(x.value),1),T[9]||(T[9]=s("span",{class:"text-gray-600"},"日後",-1))])])):X("",!0),s("div",N1,[s("button",{onClick:T[3]||(T[3]=w=>n("close")),class:"flex-1 py-3 rounded-xl font-bold text-gray-600 bg-gray-100 hover:bg-gray-200 transition-colors"}," キャンセル "),s("button",{onClick:y,disabled:!b.value||u.value,class:"flex-1 py-3 rounded-xl font-bold text-white bg-gradient-to-r from-indigo-500 to-purple-500 hover:opacity-90 transition-opacity disabled:opacity-50 disabled:cursor-not-allowed"},m(u.value?"保存中...":d.value?"✏️ 更新する":"🎯 設定する"),9,F1)])])]))}},R1=Xe(L1,[["__scopeId","data-v-adafb92f"]]),V1={class:"fixed inset-0 bg-black/50 backdrop-blur-sm z-50 flex items-center justify-center p-4"},H1={class:"bg-white rounded-2xl shadow-2xl w-full max-w-md max-h-[90vh] overflow-hidden"},K1={class:"bg-gradient-to-r from-green-500 to-emerald-600 p-4 flex justify-between items-center"},G1={class:"flex border-b"},W1={class:"p-4 overflow-y-auto",style:{"max-height":"calc(90vh - 140px)"}},z1={key:0},J1={key:0,class:"text-center py-8"},q1={key:1,class:"text-center py-8"},X1={key:2,class:"space-y-3"},Y1={class:"w-16 h-20 flex-shrink-0 rounded-lg overflow-hidden bg-gray-200"},Q1=["src","alt"],Z1={key:1,class:"w-full h-full flex items-center justify-center text-3xl bg-gray-100"},ey={key:2,class:"w-full h-full flex items-center justify-center text-2xl"},ty={class:"flex-1 min-w-0"},sy={class:"font-bold text-gray-800 truncate"},oy={class:"text-xs text-gray-500"},ny={key:0,class:"text-xs text-gray-400 mt-1 line-clamp-2"},ly={class:"text-[10px] text-gray-400 mt-1"},ry=["onClick"],iy={key:1,class:"space-y-4"},ay={class:"mb-2"},cy={class:"flex gap-2 flex-wrap"},uy=["onClick"],dy={class:"mt-3"},fy={class:"block w-full"},py={key:0,class:"text-xs text-blue-500 mt-1 text-center"},gy={class:"text-center"},vy={class:"w-20 h-24 mx-auto rounded-lg bg-gray-100 flex items-center justify-center overflow-hidden border-2 border-gray-200"},my=["src"],by=["src"],xy={key:2,class:"text-3xl"},hy={key:3,class:"text-3xl"},yy=["disabled"],_y={__name:"MaterialsView",emits:["close"],setup(e,{emit:t}){const o=t,n=at(),{getCache:l,setCache:r,clearCache:i}=hi(),{showConfirm:a}=xs(),c=At(),u=j("list"),d=j(!0),g=j(!1),x=j([]),b=j(!1),y=j(""),_=j({name:"",subject:"",description:"",image_url:""}),T=j(""),w=["📕","📗","📘","📙","📓","📔","📒","📚","✏️","📝","📐","📏","🔢","🔤","🔬","🧪","🌍","🗺️","🎨","🎵","💻","🏃","⚽","🎯"],U=S=>{T.value=S,y.value="",_.value.image_url=`emoji:${S}`},B=async S=>{var O;const M=(O=S.target.files)==null?void 0:O[0];if(M){if(M.size>5*1024*1024){c.warning("画像サイズは5MB以下にしてください");return}b.value=!0,T.value="";try{const p=await E(M,200,250);y.value=p,_.value.image_url=p}catch(p){console.error("Image processing error:",p),c.error("画像の処理に失敗しました")}finally{b.value=!1,S.target.value=""}}},E=(S,M,O)=>new Promise((p,P)=>{const G=new FileReader;G.onload=N=>{const F=new Image;F.onload=()=>{const A=document.createElement("canvas");let{width:V,height:ue}=F;if(V>M||ue>O){const Ae=Math.min(M/V,O/ue);V=Math.round(V*Ae),ue=Math.round(ue*Ae)}A.width=V,A.height=ue,A.getContext("2d").drawImage(F,0,0,V,ue);const Ve=A.toDataURL("image/jpeg",.7);p(Ve)},F.onerror=P,F.src=N.target.result},G.onerror=P,G.readAsDataURL(S)}),ne=S=>{if(!S)return"";try{return S.split(" ")[0]}catch{return S}},de=async()=>{const S=Nt.MATERIALS(n.currentUserId),M=l(S);if(M){x.value=M,d.value=!1;return}d.value=!0;try{const p=await(await fetch(`/api/materials/user/${n.currentUserId}`)).json();p.status==="ok"&&(x.value=p.materials||[],r(S,x.value,5*60*1e3))}catch(O){console.error("Failed to fetch materials:",O)}finally{d.value=!1}},ge=async()=>{if(!(!_.value.name||g.value)){g.value=!0;try{const M=await(await fetch("/api/materials",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({user_id:n.currentUserId,name:_.value.name,subject:_.value.subject,description:_.value.description,image_url:_.value.image_url})})).json();M.status==="ok"?(c.success("教材を登録しました！"),_.value={name:"",subject:"",description:"",image_url:""},T.value="",y.value="",u.value="list",i(Nt.MATERIALS(n.currentUserId)),await de()):c.error(M.message||"登録に失敗しました")}catch(S){console.error("Failed to add material:",S),c.error("エラーが発生しました")}finally{g.value=!1}}},K=async S=>{if(await a({type:"danger",title:"教材を削除",message:"この教材を削除しますか？",confirmText:"削除する",cancelText:"キャンセル",icon:"📕"}))try{const p=await(await fetch(`/api/materials/${S}?user_id=${n.currentUserId}`,{method:"DELETE"})).json();p.status==="ok"?(x.value=x.value.filter(P=>P.material_id!==S),i(Nt.MATERIALS(n.currentUserId))):c.error(p.message||"削除に失敗しました")}catch(O){console.error("Failed to delete material:",O)}};return qe(()=>{de()}),(S,M)=>(f(),v("div",V1,[s("div",H1,[s("div",K1,[M[10]||(M[10]=s("h2",{class:"text-white font-bold text-lg"},"📖 マイ教材",-1)),s("button",{onClick:M[0]||(M[0]=O=>o("close")),class:"text-white/80 hover:text-white text-xl"},"✕")]),s("div",G1,[s("button",{onClick:M[1]||(M[1]=O=>u.value="list"),class:ce(["flex-1 py-3 font-medium transition-colors",u.value==="list"?"text-green-600 border-b-2 border-green-500":"text-gray-500"])}," 📚 教材一覧 ",2),s("button",{onClick:M[2]||(M[2]=O=>u.value="add"),class:ce(["flex-1 py-3 font-medium transition-colors",u.value==="add"?"text-green-600 border-b-2 border-green-500":"text-gray-500"])}," ➕ 新規登録 ",2)]),s("div",W1,[u.value==="list"?(f(),v("div",z1,[d.value?(f(),v("div",J1,[...M[11]||(M[11]=[s("span",{class:"text-gray-400 animate-pulse"},"読み込み中...",-1)])])):x.value.length===0?(f(),v("div",q1,[M[12]||(M[12]=s("span",{class:"text-6xl"},"📖",-1)),M[13]||(M[13]=s("p",{class:"text-gray-500 mt-4"},"教材がまだ登録されていません",-1)),s("button",{onClick:M[3]||(M[3]=O=>u.value="add"),class:"mt-4 px-4 py-2 bg-green-500 text-white rounded-lg font-medium"}," 教材を登録する ")])):(f(),v("div",X1,[(f(!0),v(ie,null,fe(x.value,O=>(f(),v("div",{key:O.material_id,class:"flex gap-3 p-3 bg-gray-50 rounded-xl border border-gray-100"},[s("div",Y1,[O.image_url&&!O.image_url.startsWith("emoji:")?(f(),v("img",{key:0,src:O.image_url,alt:O.name,class:"w-full h-full object-cover"},null,8,Q1)):O.image_url&&O.image_url.startsWith("emoji:")?(f(),v("div",Z1,m(O.image_url.replace("emoji:","")),1)):(f(),v("div",ey," 📕 "))]),s("div",ty,[s("h4",sy,m(O.name),1),s("p",oy,m(O.subject),1),O.description?(f(),v("p",ny,m(O.description),1)):X("",!0),s("p",ly,"登録日: "+m(ne(O.created_at)),1)]),s("button",{onClick:p=>K(O.material_id),class:"text-red-400 hover:text-red-600 self-start"}," 🗑️ ",8,ry)]))),128))]))])):X("",!0),u.value==="add"?(f(),v("div",iy,[s("div",null,[M[14]||(M[14]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"教材名 *",-1)),Ee(s("input",{"onUpdate:modelValue":M[4]||(M[4]=O=>_.value.name=O),type:"text",placeholder:"例: 計算ドリル3年生",class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-green-400 focus:outline-none"},null,512),[[Ke,_.value.name]])]),s("div",null,[M[16]||(M[16]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"科目",-1)),Ee(s("select",{"onUpdate:modelValue":M[5]||(M[5]=O=>_.value.subject=O),class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-green-400 focus:outline-none"},[...M[15]||(M[15]=[oo('<option value="">選択してください</option><option value="国語">国語</option><option value="数学">数学</option><option value="英語">英語</option><option value="理科">理科</option><option value="社会">社会</option><option value="その他">その他</option>',7)])],512),[[Pt,_.value.subject]])]),s("div",null,[M[17]||(M[17]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"説明（任意）",-1)),Ee(s("textarea",{"onUpdate:modelValue":M[6]||(M[6]=O=>_.value.description=O),placeholder:"教材の内容や目標など",rows:"2",class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-green-400 focus:outline-none resize-none"},null,512),[[Ke,_.value.description]])]),s("div",null,[M[19]||(M[19]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"アイコン",-1)),s("div",ay,[s("div",cy,[(f(),v(ie,null,fe(w,O=>s("button",{key:O,onClick:p=>U(O),class:ce(["w-10 h-10 rounded-lg text-xl flex items-center justify-center transition-all",T.value===O?"bg-green-100 border-2 border-green-500 scale-110":"bg-gray-100 hover:bg-gray-200"])},m(O),11,uy)),64))])]),s("div",dy,[s("label",fy,[M[18]||(M[18]=s("div",{class:"flex items-center justify-center gap-2 py-3 bg-blue-50 border-2 border-blue-200 rounded-xl text-blue-600 font-medium cursor-pointer hover:bg-blue-100 transition-colors"},[s("span",null,"📷"),s("span",null,"写真フォルダから選択")],-1)),s("input",{type:"file",accept:"image/*",class:"hidden",onChange:B},null,32)]),b.value?(f(),v("p",py,"画像を処理中...")):X("",!0)]),M[20]||(M[20]=s("p",{class:"text-xs text-gray-400 my-2 text-center"},"または画像URLを入力：",-1)),Ee(s("input",{"onUpdate:modelValue":M[7]||(M[7]=O=>_.value.image_url=O),type:"url",placeholder:"https://...",class:"w-full p-3 border-2 border-gray-200 rounded-xl focus:border-green-400 focus:outline-none",onInput:M[8]||(M[8]=O=>{T.value="",y.value=""})},null,544),[[Ke,_.value.image_url]])]),s("div",gy,[s("div",vy,[y.value?(f(),v("img",{key:0,src:y.value,alt:"Preview",class:"w-full h-full object-cover"},null,8,my)):_.value.image_url&&!_.value.image_url.startsWith("emoji:")&&!T.value?(f(),v("img",{key:1,src:_.value.image_url,alt:"Preview",class:"w-full h-full object-cover",onError:M[9]||(M[9]=O=>_.value.image_url="")},null,40,by)):T.value?(f(),v("span",xy,m(T.value),1)):(f(),v("span",hy,"📕"))]),M[21]||(M[21]=s("p",{class:"text-xs text-gray-400 mt-1"},"プレビュー",-1))]),s("button",{onClick:ge,disabled:!_.value.name||g.value,class:"w-full py-3 bg-green-500 text-white font-bold rounded-xl disabled:bg-gray-300 disabled:cursor-not-allowed hover:bg-green-600 transition-colors"},m(g.value?"登録中...":"📖 教材を登録"),9,yy)])):X("",!0)])])]))}},wy={class:"fixed inset-0 bg-black/50 backdrop-blur-sm z-50 flex items-center justify-center p-4"},ky={class:"bg-white rounded-2xl shadow-2xl w-full max-w-md max-h-[90vh] overflow-hidden"},$y={class:"bg-gradient-to-r from-blue-500 to-indigo-600 p-4 flex justify-between items-center"},Cy={class:"flex overflow-x-auto bg-gray-50 border-b scrollbar-hide"},Sy=["onClick"],Ty={class:"ml-1 text-xs text-gray-400"},jy={class:"p-4 overflow-y-auto",style:{"max-height":"calc(90vh - 180px)"}},My={key:0,class:"text-center py-8"},Py={key:1,class:"text-center py-8"},Iy={class:"text-gray-500"},Ay={key:2,class:"grid grid-cols-3 gap-3"},Ey=["onClick"],Dy=["src","alt"],Oy={key:1,class:"w-full h-full flex flex-col items-center justify-center p-2 text-white"},Uy={class:"text-[10px] text-center font-medium line-clamp-2"},By={class:"text-xs text-gray-700 mt-1 truncate font-medium"},Ny={class:"text-[10px] text-gray-400 truncate"},Fy={key:0,class:"mt-1"},Ly={class:"h-1 bg-gray-200 rounded-full overflow-hidden"},Ry={class:"text-[9px] text-gray-400 text-right"},Vy={key:0,class:"absolute inset-0 bg-black/50 flex items-center justify-center p-4"},Hy={class:"bg-white rounded-xl w-full max-w-sm p-4 shadow-xl"},Ky={class:"space-y-3"},Gy=["value"],Wy={class:"flex gap-2 mt-4"},zy=["disabled"],Jy={key:1,class:"absolute inset-0 bg-black/50 flex items-center justify-center p-4"},qy={class:"bg-white rounded-xl w-full max-w-sm p-4 shadow-xl"},Xy={class:"flex gap-4"},Yy=["src","alt"],Qy={key:1,class:"w-full h-full flex items-center justify-center text-white"},Zy={class:"flex-1 min-w-0"},e_={class:"font-bold text-lg text-gray-800 line-clamp-2"},t_={class:"text-sm text-gray-500"},s_={class:"text-xs text-gray-400 mt-1"},o_={key:0,class:"text-xs text-gray-400"},n_={key:0,class:"mt-4 p-3 bg-gray-50 rounded-lg"},l_={class:"flex items-center gap-2"},r_=["max"],i_={class:"text-gray-500"},a_=["disabled"],c_={class:"flex gap-2 mt-4"},u_={__name:"BookshelfView",emits:["close"],setup(e,{emit:t}){const o=at(),{playSound:n}=rs(),{showConfirm:l}=xs(),r=At(),i=t,a=[{name:"国語",color:"#E57373"},{name:"算数",color:"#4FC3F7"},{name:"理科",color:"#81C784"},{name:"社会",color:"#FFD54F"},{name:"英語",color:"#7986CB"},{name:"その他",color:"#90A4AE"}],c=j(!0),u=j([]),d=j("国語"),g=j(!1),x=j(!1),b=j(null),y=j(null),_=j({title:"",author:"",subject:"国語",cover_url:"",total_pages:null}),T=ee(()=>u.value.filter(K=>K.subject===d.value)),w=K=>u.value.filter(S=>S.subject===K).length,U=K=>{const S=a.find(O=>O.name===K),M=(S==null?void 0:S.color)||"#90A4AE";return`linear-gradient(135deg, ${M} 0%, ${M}AA 100%)`},B=async()=>{if(o.currentUserId){c.value=!0;try{const S=await(await fetch(`/api/bookshelf/${o.currentUserId}`)).json();S.status==="ok"&&(u.value=S.books||[])}catch(K){console.error("Failed to fetch books:",K)}finally{c.value=!1}}},E=async()=>{if(!(!_.value.title||x.value)){x.value=!0;try{const S=await(await fetch("/api/bookshelf/add",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({user_id:o.currentUserId,..._.value})})).json();S.status==="ok"?(n("success"),g.value=!1,_.value={title:"",author:"",subject:d.value,cover_url:"",total_pages:null},await B()):r.error("追加に失敗しました: "+(S.message||""))}catch(K){console.error("Add book error:",K),r.error("追加に失敗しました")}finally{x.value=!1}}},ne=K=>{n("click"),b.value=K,y.value=K.current_page||0},de=async()=>{if(!(!b.value||!y.value))try{(await(await fetch(`/api/bookshelf/${b.value.book_id}/progress`,{method:"PUT",headers:{"Content-Type":"application/json"},body:JSON.stringify({user_id:o.currentUserId,current_page:y.value})})).json()).status==="ok"?(n("success"),b.value=null,await B()):r.error("更新に失敗しました")}catch(K){console.error("Update progress error:",K),r.error("更新に失敗しました")}},ge=async K=>{if(await l({type:"danger",title:"本の削除",message:`この本を本棚から削除しますか？
 読書記録も一緒に削除されます。`,confirmText:"削除する",cancelText:"キャンセル",icon:"📕"}))try{(await(await fetch(`/api/bookshelf/${K}`,{method:"DELETE",headers:{"Content-Type":"application/json"},body:JSON.stringify({user_id:o.currentUserId})})).json()).status==="ok"?(n("click"),b.value=null,await B()):r.error("削除に失敗しました")}catch(M){console.error("Delete book error:",M),r.error("削除に失敗しました")}};return qe(()=>{B()}),(K,S)=>(f(),v("div",wy,[s("div",ky,[s("div",$y,[S[12]||(S[12]=s("h2",{class:"text-white font-bold text-lg"},"📚 マイ本棚",-1)),s("button",{onClick:S[0]||(S[0]=M=>i("close")),class:"text-white/80 hover:text-white text-xl"},"✕")]),s("div",Cy,[(f(),v(ie,null,fe(a,M=>s("button",{key:M.name,onClick:O=>d.value=M.name,class:ce(["flex-shrink-0 px-4 py-3 font-medium transition-colors text-sm whitespace-nowrap",d.value===M.name?"text-blue-600 border-b-2 border-blue-500 bg-white":"text-gray-500 hover:bg-gray-100"])},[s("span",{style:ke({color:M.color})},"●",4),pt(" "+m(M.name)+" ",1),s("span",Ty,"("+m(w(M.name))+")",1)],10,Sy)),64))]),s("div",jy,[c.value?(f(),v("div",My,[...S[13]||(S[13]=[s("span",{class:"text-gray-400 animate-pulse"},"読み込み中...",-1)])])):T.value.length===0?(f(),v("div",Py,[S[14]||(S[14]=s("div",{class:"text-6xl mb-4"},"📕",-1)),s("p",Iy,m(d.value)+"の本がまだありません",1),s("button",{onClick:S[1]||(S[1]=M=>g.value=!0),class:"mt-4 px-4 py-2 bg-blue-500 text-white rounded-lg font-medium hover:bg-blue-600 transition-colors"}," + 本を追加する ")])):(f(),v("div",Ay,[(f(!0),v(ie,null,fe(T.value,M=>(f(),v("div",{key:M.book_id,class:"relative group"},[s("div",{onClick:O=>ne(M),class:"aspect-[3/4] rounded-lg overflow-hidden shadow-md cursor-pointer transition-transform hover:scale-105 bg-gradient-to-br",style:ke({background:U(M.subject)})},[M.cover_url?(f(),v("img",{key:0,src:M.cover_url,alt:M.title,class:"w-full h-full object-cover"},null,8,Dy)):(f(),v("div",Oy,[S[15]||(S[15]=s("span",{class:"text-3xl mb-1"},"📖",-1)),s("span",Uy,m(M.title),1)]))],12,Ey),s("p",By,m(M.title),1),s("p",Ny,m(M.author||"著者不明"),1),M.progress!==void 0?(f(),v("div",Fy,[s("div",Ly,[s("div",{class:"h-full bg-green-500 transition-all",style:ke({width:M.progress+"%"})},null,4)]),s("p",Ry,m(M.progress)+"%",1)])):X("",!0)]))),128)),s("div",{onClick:S[2]||(S[2]=M=>g.value=!0),class:"aspect-[3/4] rounded-lg border-2 border-dashed border-gray-300 flex flex-col items-center justify-center cursor-pointer hover:border-blue-400 hover:bg-blue-50 transition-colors"},[...S[16]||(S[16]=[s("span",{class:"text-2xl text-gray-400"},"+",-1),s("span",{class:"text-xs text-gray-400"},"追加",-1)])])]))]),g.value?(f(),v("div",Vy,[s("div",Hy,[S[22]||(S[22]=s("h3",{class:"font-bold text-lg mb-4"},"📚 本を追加",-1)),s("div",Ky,[s("div",null,[S[17]||(S[17]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"タイトル *",-1)),Ee(s("input",{"onUpdate:modelValue":S[3]||(S[3]=M=>_.value.title=M),type:"text",placeholder:"例: 計算ドリル3年生",class:"w-full p-2.5 border-2 border-gray-200 rounded-lg focus:border-blue-400 focus:outline-none text-sm"},null,512),[[Ke,_.value.title]])]),s("div",null,[S[18]||(S[18]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"著者",-1)),Ee(s("input",{"onUpdate:modelValue":S[4]||(S[4]=M=>_.value.author=M),type:"text",placeholder:"例: 山田太郎",class:"w-full p-2.5 border-2 border-gray-200 rounded-lg focus:border-blue-400 focus:outline-none text-sm"},null,512),[[Ke,_.value.author]])]),s("div",null,[S[19]||(S[19]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"科目",-1)),Ee(s("select",{"onUpdate:modelValue":S[5]||(S[5]=M=>_.value.subject=M),class:"w-full p-2.5 border-2 border-gray-200 rounded-lg focus:border-blue-400 focus:outline-none text-sm"},[(f(),v(ie,null,fe(a,M=>s("option",{key:M.name,value:M.name},m(M.name),9,Gy)),64))],512),[[Pt,_.value.subject]])]),s("div",null,[S[20]||(S[20]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"表紙画像URL (任意)",-1)),Ee(s("input",{"onUpdate:modelValue":S[6]||(S[6]=M=>_.value.cover_url=M),type:"url",placeholder:"https://...",class:"w-full p-2.5 border-2 border-gray-200 rounded-lg focus:border-blue-400 focus:outline-none text-sm"},null,512),[[Ke,_.value.cover_url]])]),s("div",null,[S[21]||(S[21]=s("label",{class:"block text-sm font-medium text-gray-700 mb-1"},"総ページ数",-1)),Ee(s("input",{"onUpdate:modelValue":S[7]||(S[7]=M=>_.value.total_pages=M),type:"number",placeholder:"100",class:"w-full p-2.5 border-2 border-gray-200 rounded-lg focus:border-blue-400 focus:outline-none text-sm"},null,512),[[Ke,_.value.total_pages,void 0,{number:!0}]])])]),s("div",Wy,[s("button",{onClick:S[8]||(S[8]=M=>g.value=!1),class:"flex-1 py-2.5 rounded-lg border-2 border-gray-200 font-medium text-gray-600"}," キャンセル "),s("button",{onClick:E,disabled:!_.value.title||x.value,class:"flex-1 py-2.5 rounded-lg bg-blue-500 text-white font-medium disabled:opacity-50 disabled:cursor-not-allowed"},m(x.value?"追加中...":"追加する"),9,zy)])])])):X("",!0),b.value?(f(),v("div",Jy,[s("div",qy,[s("div",Xy,[s("div",{class:"w-24 h-32 flex-shrink-0 rounded-lg overflow-hidden shadow-md",style:ke({background:U(b.value.subject)})},[b.value.cover_url?(f(),v("img",{key:0,src:b.value.cover_url,alt:b.value.title,class:"w-full h-full object-cover"},null,8,Yy)):(f(),v("div",Qy,[...S[23]||(S[23]=[s("span",{class:"text-4xl"},"📖",-1)])]))],4),s("div",Zy,[s("h3",e_,m(b.value.title),1),s("p",t_,m(b.value.author||"著者不明"),1),s("p",s_,"📚 "+m(b.value.subject),1),b.value.total_pages?(f(),v("p",o_,"📄 "+m(b.value.total_pages)+"ページ",1)):X("",!0)])]),b.value.total_pages?(f(),v("div",n_,[S[24]||(S[24]=s("label",{class:"block text-sm font-medium text-gray-700 mb-2"},"進捗を更新",-1)),s("div",l_,[Ee(s("input",{"onUpdate:modelValue":S[9]||(S[9]=M=>y.value=M),type:"number",max:b.value.total_pages,min:"0",placeholder:"現在のページ",class:"flex-1 p-2 border-2 border-gray-200 rounded-lg text-sm"},null,8,r_),[[Ke,y.value,void 0,{number:!0}]]),s("span",i_,"/ "+m(b.value.total_pages),1)]),s("button",{onClick:de,disabled:!y.value,class:"w-full mt-2 py-2 rounded-lg bg-green-500 text-white font-medium disabled:opacity-50"}," 進捗を保存 ",8,a_)])):X("",!0),s("div",c_,[s("button",{onClick:S[10]||(S[10]=M=>ge(b.value.book_id)),class:"flex-1 py-2.5 rounded-lg border-2 border-red-200 font-medium text-red-600 hover:bg-red-50"}," 🗑️ 削除 "),s("button",{onClick:S[11]||(S[11]=M=>b.value=null),class:"flex-1 py-2.5 rounded-lg bg-gray-100 font-medium text-gray-600"}," 閉じる ")])])])):X("",!0)])]))}},d_=Xe(u_,[["__scopeId","data-v-67a7295e"]]),f_={class:"relative bg-white rounded-2xl shadow-2xl max-w-md w-full max-h-[80vh] overflow-y-auto animate-modal-in"},p_={__name:"Modal",emits:["close"],setup(e,{emit:t}){const o=t,n=l=>{l.key==="Escape"&&o("close")};return qe(()=>{document.addEventListener("keydown",n),document.body.style.overflow="hidden"}),As(()=>{document.removeEventListener("keydown",n),document.body.style.overflow=""}),(l,r)=>(f(),Se(ms,{to:"body"},[s("div",{class:"fixed inset-0 z-50 flex items-center justify-center p-4",onClick:r[1]||(r[1]=lt(i=>o("close"),["self"]))},[r[3]||(r[3]=s("div",{class:"absolute inset-0 bg-black/50 backdrop-blur-sm"},null,-1)),s("div",f_,[s("button",{onClick:r[0]||(r[0]=i=>o("close")),class:"absolute top-4 right-4 w-8 h-8 rounded-full bg-gray-100 hover:bg-gray-200 flex items-center justify-center transition-colors z-10"},[...r[2]||(r[2]=[s("span",{class:"text-gray-500"},"✕",-1)])]),Br(l.$slots,"default",{},void 0,!0)])])]))}},St=Xe(p_,[["__scopeId","data-v-22447a02"]]),g_={class:"space-y-4 mt-8 pb-8"},v_={class:"flex items-center gap-4 mb-4"},m_={class:"w-16 h-16 rounded-full bg-gradient-to-br from-indigo-500 to-purple-500 flex items-center justify-center overflow-hidden"},b_=["src"],x_={key:1,class:"text-3xl"},h_={class:"flex-1"},y_={class:"font-bold text-lg text-gray-800"},__={class:"text-sm text-gray-500"},w_={key:0,class:"text-xs text-orange-500 font-medium"},k_={class:"divide-y divide-gray-100"},$_={class:"py-3"},C_={class:"flex-1"},S_={class:"text-xs text-gray-500"},T_={class:"py-3"},j_={class:"py-3"},M_={class:"py-3"},P_={key:0,class:"py-3"},I_={key:1,class:"py-3"},A_={class:"text-xs text-gray-500 space-y-1"},E_={class:"p-6"},D_={key:0,class:"text-center py-8 text-gray-500"},O_={key:1,class:"space-y-2"},U_={class:"text-2xl"},B_={class:"font-bold text-gray-800"},N_={class:"text-xs text-gray-500"},F_={class:"p-6"},L_={class:"space-y-4"},R_={class:"bg-gradient-to-r from-blue-50 to-indigo-50 rounded-xl p-4"},V_={class:"text-2xl font-bold text-indigo-600"},H_={class:"bg-gradient-to-r from-green-50 to-emerald-50 rounded-xl p-4"},K_={class:"text-2xl font-bold text-green-600"},G_={class:"bg-gradient-to-r from-purple-50 to-pink-50 rounded-xl p-4"},W_={class:"text-2xl font-bold text-purple-600"},z_={class:"p-6"},J_={class:"space-y-2"},q_=["onClick"],X_={class:"text-white text-lg"},Y_={class:"flex-1 text-left"},Q_={class:"font-bold text-gray-800"},Z_={class:"text-xs text-gray-500"},ew={key:0,class:"text-indigo-500 text-xl"},tw={class:"p-6"},sw={class:"flex gap-2 mt-4"},Vl="1.0.0",ow={__name:"OtherView",emits:["admin"],setup(e,{emit:t}){const o=t,n=at(),l=At(),r=j(!1),i=j(!1),a=j(!1),c=j(!1),u=j(!1),d=j(!1),g=j(!1),x=j(!1),b=j(!1),y=j(!1),_=j([]),T=j(localStorage.getItem("sg_theme")||"default"),w=j(""),U=!1,B=[{id:"default",name:"スタンダード",description:"標準のカラーテーマ",icon:"☀️",preview:"linear-gradient(135deg, #667eea 0%, #764ba2 100%)"},{id:"ocean",name:"オーシャン",description:"爽やかな海のテーマ",icon:"🌊",preview:"linear-gradient(135deg, #00c6fb 0%, #005bea 100%)"},{id:"forest",name:"フォレスト",description:"自然を感じる緑のテーマ",icon:"🌲",preview:"linear-gradient(135deg, #11998e 0%, #38ef7d 100%)"},{id:"sunset",name:"サンセット",description:"暖かみのある夕焼けテーマ",icon:"🌅",preview:"linear-gradient(135deg, #f093fb 0%, #f5576c 100%)"},{id:"dark",name:"ダークモード",description:"目に優しいダークテーマ",icon:"🌙",preview:"linear-gradient(135deg, #232526 0%, #414345 100%)"}],E=ee(()=>{const O=B.find(p=>p.id===T.value);return O?O.name:"スタンダード"}),ne=O=>{if(O<1)return`${Math.round(O*60)}分`;const p=Math.floor(O),P=Math.round((O-p)*60);return P>0?`${p}時間${P}分`:`${p}時間`},de=()=>{l.info("通知設定は準備中です")},ge=()=>{l.info("サウンド設定は準備中です")},K=()=>{l.info("フィードバック機能は準備中です")},S=O=>{T.value=O,localStorage.setItem("sg_theme",O),l.success(`テーマを「${E.value}」に変更しました`),u.value=!1},M=async()=>{if(!w.value.trim()){l.warning("ヘルプ内容を入力してください");return}l.success("ヘルプを送信しました！ありがとう！ 🎉"),w.value="",d.value=!1};return qe(async()=>{if(n.currentUserId)try{const p=await(await fetch(`/api/user/${n.currentUserId}/achievements`)).json();p.status==="ok"&&(_.value=p.achievements||[])}catch(O){console.warn("Failed to load achievements:",O)}}),(O,p)=>(f(),v("div",g_,[p[66]||(p[66]=s("div",{class:"flex justify-between items-center"},[s("h2",{class:"text-xl font-bold text-white"},"⚙️ その他")],-1)),me(We,null,{default:Te(()=>[s("div",v_,[s("div",m_,[H(n).user.avatar_url?(f(),v("img",{key:0,src:H(n).user.avatar_url,class:"w-full h-full object-cover",alt:"avatar"},null,8,b_)):(f(),v("span",x_,"👤"))]),s("div",h_,[s("h3",y_,m(H(n).user.name),1),s("p",__," Lv."+m(H(n).user.level)+" · "+m(H(n).user.rank_name),1),H(n).isGuestMode?(f(),v("p",w_," ⚠️ ゲストモード ")):X("",!0)])])]),_:1}),me(We,null,{default:Te(()=>[s("div",k_,[s("div",$_,[p[28]||(p[28]=s("h4",{class:"text-xs text-gray-400 uppercase tracking-wide mb-2"},"設定",-1)),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:p[0]||(p[0]=P=>u.value=!0)},[p[24]||(p[24]=s("span",{class:"text-xl"},"🎨",-1)),s("div",C_,[p[23]||(p[23]=s("p",{class:"font-medium text-gray-800"},"テーマの選択",-1)),s("p",S_,m(E.value),1)]),p[25]||(p[25]=s("span",{class:"text-gray-400"},"›",-1))]),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:de},[...p[26]||(p[26]=[s("span",{class:"text-xl"},"🔔",-1),s("div",{class:"flex-1"},[s("p",{class:"font-medium text-gray-800"},"通知設定")],-1),s("span",{class:"text-gray-400"},"›",-1)])]),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:ge},[...p[27]||(p[27]=[s("span",{class:"text-xl"},"🎵",-1),s("div",{class:"flex-1"},[s("p",{class:"font-medium text-gray-800"},"サウンド設定")],-1),s("span",{class:"text-gray-400"},"›",-1)])])]),s("div",T_,[p[31]||(p[31]=s("h4",{class:"text-xs text-gray-400 uppercase tracking-wide mb-2"},"データ",-1)),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:p[1]||(p[1]=P=>c.value=!0)},[...p[29]||(p[29]=[s("span",{class:"text-xl"},"📊",-1),s("div",{class:"flex-1"},[s("p",{class:"font-medium text-gray-800"},"学習統計"),s("p",{class:"text-xs text-gray-500"},"詳細な学習分析")],-1),s("span",{class:"text-gray-400"},"›",-1)])]),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:p[2]||(p[2]=P=>a.value=!0)},[...p[30]||(p[30]=[s("span",{class:"text-xl"},"🏆",-1),s("div",{class:"flex-1"},[s("p",{class:"font-medium text-gray-800"},"実績一覧"),s("p",{class:"text-xs text-gray-500"},"獲得した実績")],-1),s("span",{class:"text-gray-400"},"›",-1)])])]),s("div",j_,[p[38]||(p[38]=s("h4",{class:"text-xs text-gray-400 uppercase tracking-wide mb-2"},"サポート",-1)),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:p[3]||(p[3]=P=>r.value=!0)},[...p[32]||(p[32]=[s("span",{class:"text-xl"},"❓",-1),s("div",{class:"flex-1"},[s("p",{class:"font-medium text-gray-800"},"使い方ガイド")],-1),s("span",{class:"text-gray-400"},"›",-1)])]),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:p[4]||(p[4]=P=>d.value=!0)},[...p[33]||(p[33]=[s("span",{class:"text-xl"},"📚",-1),s("div",{class:"flex-1"},[s("p",{class:"font-medium text-gray-800"},"ヘルプを書いてみよう"),s("p",{class:"text-xs text-gray-500"},"アプリの使い方を共有")],-1),s("span",{class:"text-gray-400"},"›",-1)])]),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:K},[...p[34]||(p[34]=[s("span",{class:"text-xl"},"📝",-1),s("div",{class:"flex-1"},[s("p",{class:"font-medium text-gray-800"},"フィードバック")],-1),s("span",{class:"text-gray-400"},"›",-1)])]),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:p[5]||(p[5]=P=>i.value=!0)},[p[36]||(p[36]=s("span",{class:"text-xl"},"ℹ️",-1)),s("div",{class:"flex-1"},[p[35]||(p[35]=s("p",{class:"font-medium text-gray-800"},"アプリについて",-1)),s("p",{class:"text-xs text-gray-500"},"Version "+m(Vl))]),p[37]||(p[37]=s("span",{class:"text-gray-400"},"›",-1))])]),s("div",M_,[p[40]||(p[40]=s("h4",{class:"text-xs text-gray-400 uppercase tracking-wide mb-2"},"ゲームについて",-1)),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:p[6]||(p[6]=P=>y.value=!0)},[...p[39]||(p[39]=[s("span",{class:"text-xl"},"🎮",-1),s("div",{class:"flex-1"},[s("p",{class:"font-medium text-gray-800"},"ゲームの遊び方"),s("p",{class:"text-xs text-gray-500"},"バトル・進化システムの説明")],-1),s("span",{class:"text-gray-400"},"›",-1)])])]),H(n).isAdmin?(f(),v("div",P_,[p[44]||(p[44]=s("h4",{class:"text-xs text-gray-400 uppercase tracking-wide mb-2"},"🔒 ゲーム仕様・進行度（管理者）",-1)),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:p[7]||(p[7]=P=>g.value=!0)},[...p[41]||(p[41]=[s("span",{class:"text-xl"},"⚔️",-1),s("div",{class:"flex-1"},[s("p",{class:"font-medium text-gray-800"},"バトルシステム詳細"),s("p",{class:"text-xs text-gray-500"},"計算式・パラメータ")],-1),s("span",{class:"text-gray-400"},"›",-1)])]),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:p[8]||(p[8]=P=>x.value=!0)},[...p[42]||(p[42]=[s("span",{class:"text-xl"},"🥚",-1),s("div",{class:"flex-1"},[s("p",{class:"font-medium text-gray-800"},"進化システム詳細"),s("p",{class:"text-xs text-gray-500"},"計算式・進化条件")],-1),s("span",{class:"text-gray-400"},"›",-1)])]),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:p[9]||(p[9]=P=>b.value=!0)},[...p[43]||(p[43]=[s("span",{class:"text-xl"},"📈",-1),s("div",{class:"flex-1"},[s("p",{class:"font-medium text-gray-800"},"開発進捗"),s("p",{class:"text-xs text-gray-500"},"実装状況の確認")],-1),s("span",{class:"text-gray-400"},"›",-1)])])])):X("",!0),H(n).isAdmin?(f(),v("div",I_,[p[46]||(p[46]=s("h4",{class:"text-xs text-gray-400 uppercase tracking-wide mb-2"},"管理者",-1)),s("button",{class:"w-full flex items-center gap-3 py-3 px-2 hover:bg-gray-50 rounded-lg transition-colors text-left",onClick:p[10]||(p[10]=P=>o("admin"))},[...p[45]||(p[45]=[s("span",{class:"text-xl"},"🔧",-1),s("div",{class:"flex-1"},[s("p",{class:"font-medium text-gray-800"},"管理者メニュー"),s("p",{class:"text-xs text-gray-500"},"承認・設定管理")],-1),s("span",{class:"text-gray-400"},"›",-1)])])])):X("",!0)])]),_:1}),H(U)?(f(),Se(We,{key:0,class:"opacity-50"},{default:Te(()=>[p[47]||(p[47]=s("h4",{class:"text-xs text-gray-400 mb-2"},"🔧 Debug Info",-1)),s("div",A_,[s("p",null,"User ID: "+m(H(n).currentUserId),1),s("p",null,"Guest Mode: "+m(H(n).isGuestMode),1),s("p",null,"Role: "+m(H(n).user.role),1)])]),_:1})):X("",!0),r.value?(f(),Se(St,{key:1,onClose:p[11]||(p[11]=P=>r.value=!1)},{default:Te(()=>[...p[48]||(p[48]=[s("div",{class:"p-6"},[s("h3",{class:"text-xl font-bold mb-4"},"📖 使い方ガイド"),s("div",{class:"space-y-4 text-sm text-gray-600"},[s("div",null,[s("h4",{class:"font-bold text-gray-800 mb-1"},"📖 勉強タブ"),s("p",null,"勉強を開始・記録します。科目を選んでタイマーをスタート！")]),s("div",null,[s("h4",{class:"font-bold text-gray-800 mb-1"},"⚔️ ゲームタブ"),s("p",null,"勉強で溜まったエネルギーでモンスターとバトル！進化ゲームも楽しめます。")]),s("div",null,[s("h4",{class:"font-bold text-gray-800 mb-1"},"📊 データタブ"),s("p",null,"学習記録やランキングを確認できます。")]),s("div",null,[s("h4",{class:"font-bold text-gray-800 mb-1"},"🛒 ショップ"),s("p",null,"勉強で稼いだEXPでご褒美アイテムと交換！")])])],-1)])]),_:1})):X("",!0),i.value?(f(),Se(St,{key:2,onClose:p[12]||(p[12]=P=>i.value=!1)},{default:Te(()=>[s("div",{class:"p-6 text-center"},[p[49]||(p[49]=s("div",{class:"text-6xl mb-4"},"📚",-1)),p[50]||(p[50]=s("h3",{class:"text-xl font-bold mb-2"},"Study Guardian",-1)),s("p",{class:"text-gray-500 text-sm mb-4"},"Version "+m(Vl)),p[51]||(p[51]=s("p",{class:"text-sm text-gray-600 mb-4"},[pt(" 学習習慣を楽しく身につける"),s("br"),pt(" ゲーミフィケーション学習アプリ ")],-1)),p[52]||(p[52]=s("div",{class:"text-xs text-gray-400"},[s("p",null,"© 2025-2026 ISSA Family"),s("p",{class:"mt-1"},"Made with ❤️ for better studying")],-1))])]),_:1})):X("",!0),a.value?(f(),Se(St,{key:3,onClose:p[13]||(p[13]=P=>a.value=!1)},{default:Te(()=>[s("div",E_,[p[54]||(p[54]=s("h3",{class:"text-xl font-bold mb-4"},"🏆 実績一覧",-1)),_.value.length===0?(f(),v("div",D_,[...p[53]||(p[53]=[s("span",{class:"text-4xl block mb-2"},"🎯",-1),s("p",null,"まだ実績がありません",-1),s("p",{class:"text-sm"},"勉強を続けて実績を獲得しよう！",-1)])])):(f(),v("div",O_,[(f(!0),v(ie,null,fe(_.value,P=>(f(),v("div",{key:P.id,class:"flex items-center gap-3 p-3 bg-gradient-to-r from-yellow-50 to-amber-50 rounded-xl"},[s("span",U_,m(P.icon||"🏅"),1),s("div",null,[s("p",B_,m(P.name),1),s("p",N_,m(P.description),1)])]))),128))]))])]),_:1})):X("",!0),c.value?(f(),Se(St,{key:4,onClose:p[14]||(p[14]=P=>c.value=!1)},{default:Te(()=>[s("div",F_,[p[58]||(p[58]=s("h3",{class:"text-xl font-bold mb-4"},"📊 学習統計",-1)),s("div",L_,[s("div",R_,[p[55]||(p[55]=s("p",{class:"text-sm text-gray-500"},"総学習時間",-1)),s("p",V_,m(ne(H(n).user.total_hours||0)),1)]),s("div",H_,[p[56]||(p[56]=s("p",{class:"text-sm text-gray-500"},"累計EXP",-1)),s("p",K_,m((H(n).user.xp||0).toLocaleString())+" EXP ",1)]),s("div",G_,[p[57]||(p[57]=s("p",{class:"text-sm text-gray-500"},"現在のレベル",-1)),s("p",W_," Lv."+m(H(n).user.level),1)])])])]),_:1})):X("",!0),u.value?(f(),Se(St,{key:5,onClose:p[15]||(p[15]=P=>u.value=!1)},{default:Te(()=>[s("div",z_,[p[59]||(p[59]=s("h3",{class:"text-xl font-bold mb-4"},"🎨 テーマの選択",-1)),s("div",J_,[(f(),v(ie,null,fe(B,P=>s("button",{key:P.id,onClick:G=>S(P.id),class:ce(["w-full flex items-center gap-3 p-4 rounded-xl border-2 transition-all",T.value===P.id?"border-indigo-500 bg-indigo-50":"border-gray-200 hover:border-gray-300"])},[s("div",{class:"w-10 h-10 rounded-lg flex items-center justify-center",style:ke({background:P.preview})},[s("span",X_,m(P.icon),1)],4),s("div",Y_,[s("p",Q_,m(P.name),1),s("p",Z_,m(P.description),1)]),T.value===P.id?(f(),v("span",ew,"✓")):X("",!0)],10,q_)),64))])])]),_:1})):X("",!0),d.value?(f(),Se(St,{key:6,onClose:p[18]||(p[18]=P=>d.value=!1)},{default:Te(()=>[s("div",tw,[p[60]||(p[60]=s("h3",{class:"text-xl font-bold mb-4"},"📚 ヘルプを書いてみよう",-1)),p[61]||(p[61]=s("p",{class:"text-sm text-gray-500 mb-4"}," アプリの使い方や、便利な機能を他のユーザーに教えてあげよう！ ",-1)),Ee(s("textarea",{"onUpdate:modelValue":p[16]||(p[16]=P=>w.value=P),placeholder:"例: 勉強を始める前に科目を選ぶと、後から振り返りやすいよ！",class:"w-full h-32 p-3 border border-gray-200 rounded-xl resize-none focus:outline-none focus:ring-2 focus:ring-indigo-500"},null,512),[[Ke,w.value]]),s("div",sw,[s("button",{onClick:p[17]||(p[17]=P=>d.value=!1),class:"flex-1 py-2 px-4 rounded-xl border border-gray-300 text-gray-600 hover:bg-gray-50"}," キャンセル "),s("button",{onClick:M,class:"flex-1 py-2 px-4 rounded-xl bg-indigo-500 text-white hover:bg-indigo-600"}," 送信する ")])])]),_:1})):X("",!0),g.value?(f(),Se(St,{key:7,onClose:p[19]||(p[19]=P=>g.value=!1)},{default:Te(()=>[...p[62]||(p[62]=[s("div",{class:"p-6"},[s("h3",{class:"text-xl font-bold mb-4"},"⚔️ バトルシステム仕様"),s("div",{class:"space-y-4 text-sm text-gray-600"},[s("div",{class:"bg-red-50 rounded-xl p-4"},[s("h4",{class:"font-bold text-red-700 mb-2"},"オートバトル"),s("ul",{class:"list-disc list-inside space-y-1"},[s("li",null,"勉強時間に応じてダメージが蓄積"),s("li",null,"1分 = 10ダメージ（基本値）"),s("li",null,"モンスターHP: 100〜1000"),s("li",null,"討伐でゴールド獲得")])]),s("div",{class:"bg-yellow-50 rounded-xl p-4"},[s("h4",{class:"font-bold text-yellow-700 mb-2"},"報酬システム"),s("ul",{class:"list-disc list-inside space-y-1"},[s("li",null,"討伐報酬: 10〜100 Gold"),s("li",null,"レアドロップ: 確率5%"),s("li",null,"ボーナス: 連続討伐で1.5倍")])])])],-1)])]),_:1})):X("",!0),x.value?(f(),Se(St,{key:8,onClose:p[20]||(p[20]=P=>x.value=!1)},{default:Te(()=>[...p[63]||(p[63]=[s("div",{class:"p-6"},[s("h3",{class:"text-xl font-bold mb-4"},"🥚 進化システム仕様"),s("div",{class:"space-y-4 text-sm text-gray-600"},[s("div",{class:"bg-green-50 rounded-xl p-4"},[s("h4",{class:"font-bold text-green-700 mb-2"},"進化段階"),s("ul",{class:"list-disc list-inside space-y-1"},[s("li",null,"🥚 タマゴ → 100ポイント"),s("li",null,"🐣 ベビー → 300ポイント"),s("li",null,"🐥 ヒヨコ → 600ポイント"),s("li",null,"🐤 成長期 → 1000ポイント"),s("li",null,"🐔 成体 → MAX")])]),s("div",{class:"bg-blue-50 rounded-xl p-4"},[s("h4",{class:"font-bold text-blue-700 mb-2"},"ポイント獲得"),s("ul",{class:"list-disc list-inside space-y-1"},[s("li",null,"勉強1分 = 1ポイント"),s("li",null,"目標達成 = +50ポイント"),s("li",null,"連続勉強ボーナス = 1.2倍")])])])],-1)])]),_:1})):X("",!0),y.value?(f(),Se(St,{key:9,onClose:p[21]||(p[21]=P=>y.value=!1)},{default:Te(()=>[...p[64]||(p[64]=[s("div",{class:"p-6"},[s("h3",{class:"text-xl font-bold mb-4"},"🎮 ゲームの遊び方"),s("div",{class:"space-y-4 text-sm"},[s("div",{class:"bg-gradient-to-r from-red-50 to-orange-50 rounded-xl p-4"},[s("div",{class:"flex items-center gap-2 mb-2"},[s("span",{class:"text-2xl"},"⚔️"),s("h4",{class:"font-bold text-gray-800"},"オートバトル")]),s("p",{class:"text-gray-600 mb-2"}," 勉強で溜めたエネルギーを使って、モンスターとバトル！ "),s("ul",{class:"text-xs text-gray-500 space-y-1"},[s("li",null,"• 勉強すると「バトルエネルギー」が貯まる"),s("li",null,"• エネルギーでモンスターに自動で攻撃"),s("li",null,"• 倒すとEXPがもらえる！"),s("li",null,"• どんどん強い敵が出てくるよ")])]),s("div",{class:"bg-gradient-to-r from-green-50 to-emerald-50 rounded-xl p-4"},[s("div",{class:"flex items-center gap-2 mb-2"},[s("span",{class:"text-2xl"},"🥚"),s("h4",{class:"font-bold text-gray-800"},"進化ゲーム")]),s("p",{class:"text-gray-600 mb-2"}," 勉強でペットを育てて進化させよう！ "),s("ul",{class:"text-xs text-gray-500 space-y-1"},[s("li",null,"• 勉強すると「進化エネルギー」が貯まる"),s("li",null,"• エネルギーでペットが成長"),s("li",null,"• 卵→ベビー→キッズ→アダルト→マスターに進化！"),s("li",null,"• 進化するとボーナスがもらえる")])]),s("div",{class:"bg-blue-50 rounded-xl p-3 flex items-start gap-2"},[s("span",{class:"text-lg"},"💡"),s("div",{class:"text-xs text-blue-700"},[s("p",{class:"font-bold"},"ヒント"),s("p",null,"毎日コツコツ勉強すると、エネルギーが効率よく貯まります。連続ボーナスも狙おう！")])])])],-1)])]),_:1})):X("",!0),b.value?(f(),Se(St,{key:10,onClose:p[22]||(p[22]=P=>b.value=!1)},{default:Te(()=>[...p[65]||(p[65]=[s("div",{class:"p-6"},[s("h3",{class:"text-xl font-bold mb-4"},"📈 開発進捗"),s("div",{class:"space-y-3"},[s("div",{class:"flex items-center gap-3"},[s("span",{class:"text-green-500"},"✅"),s("span",{class:"text-sm"},"基礎UI (4タブ構成)")]),s("div",{class:"flex items-center gap-3"},[s("span",{class:"text-green-500"},"✅"),s("span",{class:"text-sm"},"勉強タイマー")]),s("div",{class:"flex items-center gap-3"},[s("span",{class:"text-green-500"},"✅"),s("span",{class:"text-sm"},"承認ワークフロー")]),s("div",{class:"flex items-center gap-3"},[s("span",{class:"text-green-500"},"✅"),s("span",{class:"text-sm"},"オートバトル")]),s("div",{class:"flex items-center gap-3"},[s("span",{class:"text-green-500"},"✅"),s("span",{class:"text-sm"},"進化ゲーム")]),s("div",{class:"flex items-center gap-3"},[s("span",{class:"text-green-500"},"✅"),s("span",{class:"text-sm"},"ショップ・ガチャ")]),s("div",{class:"flex items-center gap-3"},[s("span",{class:"text-green-500"},"✅"),s("span",{class:"text-sm"},"通知システム")]),s("div",{class:"flex items-center gap-3"},[s("span",{class:"text-yellow-500"},"🔄"),s("span",{class:"text-sm"},"テーマ切り替え（実装中）")]),s("div",{class:"flex items-center gap-3"},[s("span",{class:"text-gray-400"},"⬜"),s("span",{class:"text-sm text-gray-400"},"オフライン対応")])])],-1)])]),_:1})):X("",!0)]))}},nw={class:"min-h-screen pb-20 max-w-md mx-auto relative overflow-hidden bg-slate-50"},lw={key:0,class:"fixed top-0 left-0 right-0 bg-orange-500 text-white py-2 px-4 z-50 flex items-center justify-between shadow-lg"},rw={class:"text-sm font-bold"},iw={__name:"App",setup(e){const t=at(),o=Es(),n=fu(),l=Vn(),r=zt(),i=At(),{initLiff:a}=xu(),{playSound:c}=rs(),{state:u,handleConfirm:d,handleCancel:g}=xs(),x=j("study"),b=j(!1),y=j(!1),_=j(!1),T=j(null),w=j(null);ss(()=>t.isGuestMode,G=>{G&&i.warning("カカ！そいはログインに失敗しとっど 👷",5e3)}),qe(async()=>{c("poweron"),await a(),n.startBattleLoop(),r.initialize()});const U=()=>{o.inSession?x.value="timer":o.openSubjectModal()},B=async G=>{const N=typeof G=="string"?G:G.subject,F=typeof G=="object"?G.material:null;await o.startStudy(N,F),x.value="timer"},E=async G=>{const N=await o.finishStudy(G);N>0&&(n.applyStudyDamage(N),r.earnFromStudy(N)>0&&await r.syncToServer()),x.value="study"},ne=async G=>{await l.confirmBuy(G)},de=G=>{G==="admin"&&(x.value="admin")},ge=()=>{x.value="study"},K=async()=>{await t.exitViewAsUser(),x.value="study"},S=()=>{var G;b.value=!1,w.value=null,(G=T.value)!=null&&G.fetchMyGoals&&T.value.fetchMyGoals()},M=()=>{var G;b.value=!1,w.value=null,(G=T.value)!=null&&G.fetchMyGoals&&T.value.fetchMyGoals()},O=()=>{w.value=null,b.value=!0},p=G=>{w.value=G,b.value=!0},P=()=>{b.value=!1,w.value=null};return(G,N)=>(f(),v("div",nw,[me(sd),N[15]||(N[15]=s("div",{class:"absolute top-0 left-0 w-full h-48 bg-gradient-to-br from-indigo-500 via-purple-500 to-pink-500 rounded-b-[40px] z-0"},null,-1)),H(t).isViewingAsOther?(f(),v("div",lw,[s("span",rw,"👁️ "+m(H(t).user.name)+" の視点で表示中",1),s("button",{onClick:K,class:"bg-white text-orange-500 px-3 py-1 rounded-full text-xs font-bold hover:bg-orange-100"}," ✕ 戻る ")])):X("",!0),s("div",{class:ce(["absolute top-4 right-4 z-30",{"mt-10":H(t).isViewingAsOther}])},[me(qu,{onNavigate:de})],2),s("div",{class:ce(["relative z-10 px-6 pt-8",{"mt-10":H(t).isViewingAsOther}])},[H(t).loading?(f(),Se(ku,{key:0})):(f(),v(ie,{key:1},[x.value==="timer"?(f(),Se(f0,{key:0,onBack:N[0]||(N[0]=F=>x.value="study")})):x.value==="game"?(f(),Se(Im,{key:1})):x.value==="admin"?(f(),Se(l1,{key:2,onExit:N[1]||(N[1]=F=>x.value="other"),onViewAsUser:ge})):x.value==="data"?(f(),Se(vh,{key:3,onAdmin:N[2]||(N[2]=F=>x.value="admin")})):x.value==="other"?(f(),Se(ow,{key:4,onAdmin:N[3]||(N[3]=F=>x.value="admin")})):(f(),Se(r0,{key:5,ref_key:"studyViewRef",ref:T,onTimer:N[4]||(N[4]=F=>x.value="timer"),onOpenGoalModal:O,onOpenMaterials:N[5]||(N[5]=F=>y.value=!0),onOpenBookshelf:N[6]||(N[6]=F=>_.value=!0),onEditGoal:p},null,512))],64))],2),H(o).showSubjectModal?(f(),Se(F0,{key:1,onClose:N[7]||(N[7]=F=>H(o).showSubjectModal=!1),onStart:B})):X("",!0),H(o).showMemoConfirm?(f(),Se(lf,{key:2,memo:H(o).memoToSend,onConfirm:E,onCancel:N[8]||(N[8]=F=>H(o).showMemoConfirm=!1)},null,8,["memo"])):X("",!0),H(l).showBuyModal?(f(),Se(g1,{key:3,item:H(l).selectedItem,onConfirm:ne,onCancel:N[9]||(N[9]=F=>H(l).showBuyModal=!1)},null,8,["item"])):X("",!0),H(l).showShopList?(f(),Se(j1,{key:4,onClose:N[10]||(N[10]=F=>H(l).showShopList=!1)})):X("",!0),b.value?(f(),Se(R1,{key:5,editGoal:w.value,onClose:P,onCreated:S,onUpdated:M},null,8,["editGoal"])):X("",!0),y.value?(f(),Se(_y,{key:6,onClose:N[11]||(N[11]=F=>y.value=!1)})):X("",!0),_.value?(f(),Se(d_,{key:7,onClose:N[12]||(N[12]=F=>_.value=!1)})):X("",!0),me(Mu,{modelValue:x.value,"onUpdate:modelValue":N[13]||(N[13]=F=>x.value=F),"in-session":H(o).inSession},null,8,["modelValue","in-session"]),x.value==="study"?(f(),Se(Pu,{key:8,"in-session":H(o).inSession,onClick:U},null,8,["in-session"])):X("",!0),me(dd,{modelValue:H(u).show,"onUpdate:modelValue":N[14]||(N[14]=F=>H(u).show=F),type:H(u).type,title:H(u).title,message:H(u).message,confirmText:H(u).confirmText,cancelText:H(u).cancelText,icon:H(u).icon,confirmIcon:H(u).confirmIcon,onConfirm:H(d),onCancel:H(g)},null,8,["modelValue","type","title","message","confirmText","cancelText","icon","confirmIcon","onConfirm","onCancel"])]))}};let Hl=0;const aw=1e4;function cw(){const e=Date.now();if(e-Hl>aw){Hl=e;try{At().showRateLimitError()}catch{alert(`429 error!!
@@ -1,102 +1,546 @@
+import inspect
+import sys
+import threading
 import time
+from collections import OrderedDict
 from functools import wraps
 
 
+def _estimate_size(obj, seen=None):
+    """オブジェクトのおおよそのメモリ使用量（バイト）"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += _estimate_size(k, seen) + _estimate_size(v, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += _estimate_size(item, seen)
+    return size
+
+
+class _Flight:
+    """1つのキーに対する進行中の再計算（結果の保存方法も持つ）"""
+
+    def __init__(self, compute, stale_ttl, depends_on, negative_ttl, cache_empty):
+        self.compute = compute
+        self.stale_ttl = stale_ttl
+        self.depends_on = depends_on
+        self.negative_ttl = negative_ttl
+        self.cache_empty = cache_empty
+        self.generation = None
+        self.done = threading.Event()
+        self.result = None
+        self.failed = False
+
+
 class SimpleCache:
-    def __init__(self, ttl=300):
+    """件数上限付きの LRU + TTL キャッシュ
+
+    - max_size を超えたら最も長く使われていないキーから追い出す
+    - 期限切れのキーは読まれたときに加えて、sweep_interval 秒ごとに
+      get / set のついでにまとめて削除する（ユーザー別のキーが溜まり続けないように）
+    - 操作はすべてロック内で行う（gunicorn のスレッドから同時に触られるため）
+    - get_or_compute() は同じキーの同時ミスをまとめ、再計算を1回だけ行う
+    - stale_ttl を指定して保存した値は、TTL 切れ後も stale_ttl 秒の間は
+      古い値をすぐ返し、裏で再計算する（stale-while-revalidate）
+    - 各エントリは元にしたシート名（やユーザー）をタグとして持ち、そのシートへの
+      書き込み時に invalidate_sheet() / invalidate_user() で該当するエントリだけ削除される
+    - 値が None の結果も、TTL を指定すれば別の（短い）TTL で保存できる
+    - persist=True のキャッシュは CacheSnapshot がファイルに書き出し、
+      再起動後に残り TTL のまま読み戻す（スプレッドシートを直接編集される
+      タブのキャッシュには付けない。停止中の編集を見逃すため）
+    """
+
+    # 先行する再計算を待つ上限（秒）。超えたら自分で計算する
+    FLIGHT_TIMEOUT = 30
+
+    _registry = []
+    # 現在のスレッドの API 呼び出し回数を返す関数（sheets_client が設定する）
+    _cost_counter = None
+
+    def __init__(
+        self,
+        ttl=300,
+        max_size=256,
+        name=None,
+        sweep_interval=None,
+        depends_on=(),
+        persist=False,
+    ):
         self.ttl = ttl
-        self.cache = {}
+        self.max_size = max_size
+        # エントリごとに指定が無い場合に依存するシート（タグ）
+        self.depends_on = frozenset(depends_on)
+        self.name = name or f"cache_{len(SimpleCache._registry)}"
+        self.sweep_interval = sweep_interval if sweep_interval is not None else ttl
+        # key -> (値, 保存時刻, TTL, 保持する秒数, タグ)
+        self.cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+        self._flights = {}
+        # clear / invalidate のたびに進める。計算中に無効化された結果は保存しない
+        self._generation = 0
+        self.persist = persist
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "coalesced": 0,
+            "stale_hits": 0,
+            "stale_seconds_total": 0.0,
+            "stale_seconds_max": 0.0,
+            "refresh_errors": 0,
+            "invalidations": 0,
+            "computes": 0,
+            "compute_seconds_total": 0.0,
+            "compute_api_calls": 0,
+        }
+        SimpleCache._registry.append(self)
+
+    @classmethod
+    def all_caches(cls):
+        return list(cls._registry)
+
+    @classmethod
+    def set_cost_counter(cls, counter):
+        cls._cost_counter = counter
+
+    def _api_calls(self):
+        counter = SimpleCache._cost_counter
+        return counter() if counter else 0
+
+    def _sweep_if_due(self, now):
+        # ロック内から呼ぶ
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        expired = [
+            key
+            for key, (_, timestamp, _, keep, _) in self.cache.items()
+            if now - timestamp >= keep
+        ]
+        for key in expired:
+            del self.cache[key]
+        self._stats["expirations"] += len(expired)
+
+    def _store_local(self, key, entry):
+        # ロック内から呼ぶ
+        self.cache[key] = entry
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _lookup(self, key, now):
+        """(値, 経過秒数, TTL) を返す
+
+        無い・保持期間を過ぎていれば None（値が None のエントリと区別する）。
+        ロック内から呼ぶ。
+        """
+        self._sweep_if_due(now)
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        val, timestamp, ttl, keep, _ = entry
+        age = now - timestamp
+        if age >= keep:
+            del self.cache[key]
+            self._stats["expirations"] += 1
+            return None
+        self.cache.move_to_end(key)
+        return val, age, ttl
 
     def get(self, key):
-        if key in self.cache:
-            val, timestamp = self.cache[key]
-            if time.time() - timestamp < self.ttl:
-                return val
-            else:
-                del self.cache[key]
-        return None
+        now = time.time()
+        with self._lock:
+            found = self._lookup(key, now)
+            if found is not None and found[1] < found[2]:
+                self._stats["hits"] += 1
+                return found[0]
+            self._stats["misses"] += 1
+            return None
 
-    def set(self, key, value):
-        self.cache[key] = (value, time.time())
+    def _tags(self, depends_on):
+        return self.depends_on if depends_on is None else frozenset(depends_on)
+
+    def set(self, key, value, stale_ttl=0, depends_on=None, ttl=None):
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        entry = (value, now, ttl, ttl + stale_ttl, self._tags(depends_on))
+        with self._lock:
+            self._sweep_if_due(now)
+            self._store_local(key, entry)
+            self._stats["sets"] += 1
 
     def clear(self):
-        self.cache = {}
+        with self._lock:
+            self.cache = OrderedDict()
+            self._generation += 1
+
+    def is_fresh(self, key):
+        """key の値が TTL 内で保存されているか（ヒット・ミスには数えない）"""
+        now = time.time()
+        with self._lock:
+            found = self._lookup(key, now)
+            return found is not None and found[1] < found[2]
 
     def invalidate(self, key):
         """特定のキーのキャッシュを無効化"""
-        if key in self.cache:
-            del self.cache[key]
+        with self._lock:
+            self.cache.pop(key, None)
+            self._generation += 1
+
+    def invalidate_tag(self, tag):
+        """tag（シート名や user_tag()）が付いたエントリを削除"""
+        with self._lock:
+            keys = [key for key, entry in self.cache.items() if tag in entry[4]]
+            for key in keys:
+                del self.cache[key]
+            # 依存するエントリを計算中かもしれないので、その結果も保存させない
+            if keys or self._flights:
+                self._generation += 1
+            self._stats["invalidations"] += len(keys)
+
+    def _start_flight(self, key, flight):
+        """(実行中の flight, 自分が計算するか) を返す（ロック内から呼ぶ）"""
+        running = self._flights.get(key)
+        if running is not None:
+            return running, False
+        flight.generation = self._generation
+        self._flights[key] = flight
+        return flight, True
+
+    def _run_flight(self, key, flight):
+        try:
+            started = time.perf_counter()
+            calls_before = self._api_calls()
+            val = flight.compute()
+            with self._lock:
+                self._stats["computes"] += 1
+                self._stats["compute_seconds_total"] += time.perf_counter() - started
+                self._stats["compute_api_calls"] += self._api_calls() - calls_before
+                still_valid = flight.generation == self._generation
+            if still_valid and val is not None:
+                # 取得失敗時の空の結果などは保存しない（cache_empty=False）
+                if flight.cache_empty or val:
+                    self.set(
+                        key,
+                        val,
+                        stale_ttl=flight.stale_ttl,
+                        depends_on=flight.depends_on,
+                    )
+            elif still_valid and flight.negative_ttl:
+                # 「データ無し」も短い時間だけ覚えておく
+                self.set(
+                    key, None, depends_on=flight.depends_on, ttl=flight.negative_ttl
+                )
+            flight.result = val
+            return val
+        except BaseException:
+            flight.failed = True
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _refresh_in_background(self, key, flight):
+        def run():
+            try:
+                self._run_flight(key, flight)
+            except Exception as e:
+                with self._lock:
+                    self._stats["refresh_errors"] += 1
+                print(f"【Error】キャッシュ再計算失敗 ({self.name}:{key}): {e}")
+
+        threading.Thread(
+            target=run, name=f"cache-refresh-{self.name}", daemon=True
+        ).start()
+
+    def export_entries(self):
+        """保持期間内のエントリを [(key, エントリ)] で返す（スナップショット用）"""
+        now = time.time()
+        with self._lock:
+            return [
+                (key, entry)
+                for key, entry in self.cache.items()
+                if now - entry[1] < entry[3]
+            ]
+
+    def import_entries(self, entries):
+        """export_entries() の内容を読み戻す（期限切れと既にあるキーは除く）"""
+        now = time.time()
+        restored = 0
+        with self._lock:
+            for key, entry in entries:
+                if key in self.cache or now - entry[1] >= entry[3]:
+                    continue
+                self._store_local(key, entry)
+                restored += 1
+        return restored
+
+    def get_or_compute(
+        self,
+        key,
+        compute,
+        stale_ttl=0,
+        depends_on=None,
+        negative_ttl=None,
+        cache_empty=True,
+    ):
+        """キャッシュに無ければ compute() の結果を保存して返す
+
+        同じキーで同時にミスした場合は最初の1件だけが compute() を呼び、
+        残りはその結果を待つ。先行する計算が失敗したら各自で計算し直す。
+        stale_ttl > 0 の場合、TTL 切れから stale_ttl 秒以内なら古い値を返し、
+        再計算はバックグラウンドのスレッドで行う。
+        depends_on を省略した場合はキャッシュの depends_on を使う。
+        結果が None の場合は negative_ttl 秒だけ保存する（省略時は保存しない）。
+        cache_empty=False なら空リスト・空辞書などの結果も保存しない。
+        """
+        flight = _Flight(compute, stale_ttl, depends_on, negative_ttl, cache_empty)
+        now = time.time()
+        with self._lock:
+            found = self._lookup(key, now)
+            if found is not None:
+                val, age, ttl = found
+                if age < ttl:
+                    self._stats["hits"] += 1
+                    return val
+                if age < ttl + stale_ttl:
+                    stale = age - ttl
+                    self._stats["stale_hits"] += 1
+                    self._stats["stale_seconds_total"] += stale
+                    self._stats["stale_seconds_max"] = max(
+                        self._stats["stale_seconds_max"], stale
+                    )
+                    running, leader = self._start_flight(key, flight)
+                    if leader:
+                        self._refresh_in_background(key, flight)
+                    return val
+            self._stats["misses"] += 1
+            running, leader = self._start_flight(key, flight)
+            if not leader:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            if running.done.wait(self.FLIGHT_TIMEOUT) and not running.failed:
+                return running.result
+            return compute()
+
+        return self._run_flight(key, flight)
+
+    def stats(self):
+        """ヒット率・件数・おおよそのメモリ使用量"""
+        with self._lock:
+            stats = dict(self._stats)
+            entries = list(self.cache.items())
+        lookups = stats["hits"] + stats["misses"] + stats["stale_hits"]
+        stats["stale_seconds_avg"] = (
+            round(stats["stale_seconds_total"] / stats["stale_hits"], 1)
+            if stats["stale_hits"]
+            else 0.0
+        )
+        stats["stale_seconds_max"] = round(stats["stale_seconds_max"], 1)
+        del stats["stale_seconds_total"]
+        computes = stats.pop("computes")
+        compute_seconds = stats.pop("compute_seconds_total")
+        compute_calls = stats.pop("compute_api_calls")
+        calls_per_compute = compute_calls / computes if computes else 0.0
+        stats["recomputes"] = computes
+        stats["avg_compute_seconds"] = (
+            round(compute_seconds / computes, 3) if computes else None
+        )
+        stats["api_calls_per_compute"] = round(calls_per_compute, 2)
+        # ヒットしなければ再計算で同じだけ API を呼んでいたはず、という見積もり
+        stats["api_calls_saved_estimate"] = round(
+            (stats["hits"] + stats["stale_hits"]) * calls_per_compute
+        )
+        stats.update(
+            {
+                "name": self.name,
+                "size": len(entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hit_rate": (
+                    round((stats["hits"] + stats["stale_hits"]) / lookups, 3)
+                    if lookups
+                    else None
+                ),
+                "memory_bytes": _estimate_size(entries),
+            }
+        )
+        return stats
 
 
 # グローバルキャッシュインスタンス
-# 商品リストはあまり変わらないので長め (5分)
-shop_items_cache = SimpleCache(ttl=300)
+# アプリからの書き込みは元にしたシートで無効化されるが、スプレッドシートを
+# 直接編集した分は TTL 切れまで反映されないので、TTL は短いままにする
+# 商品リスト (5分)
+shop_items_cache = SimpleCache(
+    ttl=300, max_size=8, name="shop_items", depends_on=["shop_items"]
+)
 
-# ジョブリストはステータスが変わるので短め (1分)
-job_list_cache = SimpleCache(ttl=60)
+# ジョブリスト・ジョブ名の対応表 (1分)
+job_list_cache = SimpleCache(ttl=60, max_size=8, name="job_list", depends_on=["jobs"])
 
 # ユーザーの状態管理 (5分)
-user_state_cache = SimpleCache(ttl=300)
+user_state_cache = SimpleCache(ttl=300, max_size=512, name="user_state")
 
 # ===== 新規キャッシュ（API 429対策）=====
-# 週間ランキング (2分)
-ranking_cache = SimpleCache(ttl=120)
-
 # ユーザー統計 (2分)
-user_stats_cache = SimpleCache(ttl=120)
+user_stats_cache = SimpleCache(
+    ttl=120, max_size=512, name="user_stats", depends_on=["study_log", "users"]
+)
 
 # 最近のアクティビティ (1分)
-activity_cache = SimpleCache(ttl=60)
+activity_cache = SimpleCache(
+    ttl=60, max_size=32, name="activity", depends_on=["study_log", "jobs"]
+)
 
 # 承認待ちリスト (30秒)
-pending_cache = SimpleCache(ttl=30)
+pending_cache = SimpleCache(
+    ttl=30,
+    max_size=8,
+    name="pending",
+    depends_on=[
+        "study_log",
+        "jobs",
+        "shop_requests",
+        "shop_items",
+        "missions",
+        "users",
+    ],
+)
 
 # 全レコードキャッシュ (シート単位、30秒)
-sheet_data_cache = SimpleCache(ttl=30)
+sheet_data_cache = SimpleCache(ttl=30, max_size=32, name="sheet_data")
+
+# ユーザー情報・ユーザー一覧 (10分、未登録ユーザーの None は30秒)
+user_info_cache = SimpleCache(
+    ttl=600, max_size=256, name="user_info", depends_on=["users"]
+)
+
+# 勉強中セッション (5分)
+active_session_cache = SimpleCache(
+    ttl=300, max_size=256, name="active_session", depends_on=["study_log"]
+)
 
 # 目標データ (2分)
-goals_cache = SimpleCache(ttl=120)
+goals_cache = SimpleCache(ttl=120, max_size=8, name="goals", depends_on=["goals"])
+
+# アーカイブ済みの月別集計 (1時間)
+# アーカイブ処理しか書き込まないシートなので、再起動後もそのまま使える
+monthly_totals_cache = SimpleCache(
+    ttl=3600,
+    max_size=8,
+    name="monthly_totals",
+    depends_on=["monthly_totals"],
+    persist=True,
+)
+
 
+def user_tag(user_id):
+    """ユーザー単位で無効化するためのタグ"""
+    return f"user:{user_id}"
 
-def cached(cache_instance, key_func=None):
+
+def _make_key(func, bound):
+    """関数と引数からキャッシュキーを作る（ハッシュできない引数は repr で代用）"""
+    key = (func.__module__, func.__qualname__, tuple(bound.arguments.items()))
+    try:
+        hash(key)
+    except TypeError:
+        key = repr(key)
+    return key
+
+
+def cached(
+    cache_instance,
+    key_func=None,
+    stale_ttl=0,
+    depends_on=None,
+    negative_ttl=None,
+    user_arg=None,
+    cache_empty=True,
+):
     """
     関数の結果をキャッシュするデコレータ
     :param cache_instance: SimpleCacheのインスタンス
-    :param key_func: 引数からキャッシュキーを生成する関数 (省略時は引数なしとみなす)
+    :param key_func: 引数からキャッシュキーを生成する関数 (省略時は関数名と引数から自動生成)
+    :param stale_ttl: TTL 切れ後も古い値を返してよい秒数（その間は裏で再計算）
+    :param depends_on: 結果の元になるシート名 (省略時はキャッシュの depends_on)
+    :param negative_ttl: 結果が None のときに保存する秒数 (省略時は保存しない)
+    :param user_arg: ユーザーIDを受け取る引数名。invalidate_user() で消せるようになる
+    :param cache_empty: False なら空の結果（取得失敗時の [] / {} など）は保存しない
     """
 
     def decorator(func):
+        signature = inspect.signature(func)
+        base_tags = (
+            cache_instance.depends_on if depends_on is None else frozenset(depends_on)
+        )
+
+        def key_of(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if key_func:
+                return key_func(*args, **kwargs), bound
+            return _make_key(func, bound), bound
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            if key_func:
-                key = key_func(*args, **kwargs)
-            else:
-                # 引数がない場合は関数名を含めてユニークにする
-                key = f"{func.__module__}.{func.__name__}"
+            key, bound = key_of(args, kwargs)
 
-            cached_val = cache_instance.get(key)
-            if cached_val is not None:
-                # print(f"Cache Hit: {func.__name__} key={key}")
-                return cached_val
+            tags = base_tags
+            if user_arg:
+                tags = tags | {user_tag(bound.arguments.get(user_arg))}
 
-            # print(f"Cache Miss: {func.__name__} key={key}")
-            result = func(*args, **kwargs)
-            cache_instance.set(key, result)
-            return result
+            # 同時にミスした呼び出しは1回の計算結果を共有する
+            return cache_instance.get_or_compute(
+                key,
+                lambda: func(*args, **kwargs),
+                stale_ttl=stale_ttl,
+                depends_on=tags,
+                negative_ttl=negative_ttl,
+                cache_empty=cache_empty,
+            )
 
+        def is_cached(*args, **kwargs):
+            """この引数での結果が TTL 内でキャッシュにあるか（計算はしない）"""
+            return cache_instance.is_fresh(key_of(args, kwargs)[0])
+
+        wrapper.is_cached = is_cached
         return wrapper
 
     return decorator
 
 
+def invalidate_tag(tag):
+    """tag が付いた全キャッシュのエントリを削除"""
+    for cache in SimpleCache.all_caches():
+        cache.invalidate_tag(tag)
+
+
+def invalidate_sheet(sheet_name):
+    """sheet_name を元にした全キャッシュのエントリを削除"""
+    invalidate_tag(sheet_name)
+
+
+def invalidate_user(user_id):
+    """user_arg 付きでキャッシュした、そのユーザーの結果を削除"""
+    invalidate_tag(user_tag(user_id))
+
+
 def invalidate_all_caches():
     """全キャッシュをクリア"""
-    shop_items_cache.clear()
-    job_list_cache.clear()
-    user_state_cache.clear()
-    ranking_cache.clear()
-    user_stats_cache.clear()
-    activity_cache.clear()
-    pending_cache.clear()
-    sheet_data_cache.clear()
-    goals_cache.clear()
+    for cache in SimpleCache.all_caches():
+        cache.clear()
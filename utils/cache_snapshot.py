@@ -0,0 +1,131 @@
+import atexit
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+from utils.cache import SimpleCache
+
+
+class CacheSnapshot:
+    """persist=True のキャッシュをファイルに書き出し、起動時に読み戻す
+
+    Render の dyno はアイドル時にスリープし、起動直後はキャッシュが空のため
+    最初の LINE 返信でシートを何度も全件読みしてしまう。終了時と一定間隔で
+    書き出しておき、起動時に保存時刻のまま読み戻す（残り TTL だけ有効）。
+    スリープ中にスプレッドシートを直接編集されたタブは読み戻すと古い値を返すので、
+    対象はアプリしか書き込まないシートのキャッシュ（persist=True）に限る。
+    Render ではインスタンスの再起動で一時ディレクトリが消えるので、
+    CACHE_SNAPSHOT_PATH に永続ディスク（Render の Disk）をマウントしたパスを指定する。
+    未設定・一時ディレクトリ・書き込めない場所の場合は起動時にエラーを出す。
+    """
+
+    INTERVAL = int(os.environ.get("CACHE_SNAPSHOT_INTERVAL", "300"))
+
+    _lock = threading.Lock()
+    _started = False
+
+    @staticmethod
+    def _path():
+        return os.environ.get("CACHE_SNAPSHOT_PATH") or os.path.join(
+            tempfile.gettempdir(), "saga_cache_snapshot.pickle"
+        )
+
+    @classmethod
+    def _check_path(cls):
+        """保存先が再起動後も残る場所かを確認し、問題があればエラーを出す（問題なければ True）"""
+        configured = os.environ.get("CACHE_SNAPSHOT_PATH")
+        path = os.path.abspath(cls._path())
+        directory = os.path.dirname(path)
+        temp_dir = os.path.abspath(tempfile.gettempdir())
+
+        if not configured:
+            problem = "CACHE_SNAPSHOT_PATH が未設定のため一時ディレクトリに保存します"
+        elif os.path.commonpath([path, temp_dir]) == temp_dir:
+            problem = "CACHE_SNAPSHOT_PATH が一時ディレクトリを指しています"
+        elif not os.path.isdir(directory) or not os.access(directory, os.W_OK):
+            problem = "CACHE_SNAPSHOT_PATH のディレクトリが無いか書き込めません"
+        else:
+            return True
+        print(
+            f"【Error】{problem} ({path})。再起動後にキャッシュを復元できないので、"
+            "永続ディスクをマウントしたパス（例: /var/data/saga_cache_snapshot.pickle）を指定してください"
+        )
+        return False
+
+    @staticmethod
+    def _persistent_caches():
+        return [cache for cache in SimpleCache.all_caches() if cache.persist]
+
+    @classmethod
+    def save(cls):
+        """persist=True のキャッシュを書き出す（途中で落ちても壊れないよう置き換えで保存）"""
+        data = {
+            cache.name: cache.export_entries() for cache in cls._persistent_caches()
+        }
+        path = cls._path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with cls._lock:
+            try:
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(
+                        {"saved_at": time.time(), "caches": data},
+                        f,
+                        protocol=pickle.HIGHEST_PROTOCOL,
+                    )
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"【Error】キャッシュのスナップショット保存失敗: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                return 0
+        return sum(len(entries) for entries in data.values())
+
+    @classmethod
+    def load(cls):
+        """書き出したスナップショットを読み戻し、復元した件数を返す"""
+        path = cls._path()
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            print(f"【Error】キャッシュのスナップショット読込失敗: {e}")
+            return 0
+
+        caches = {cache.name: cache for cache in cls._persistent_caches()}
+        restored = 0
+        for name, entries in snapshot.get("caches", {}).items():
+            cache = caches.get(name)
+            if cache is not None:
+                restored += cache.import_entries(entries)
+        return restored
+
+    @classmethod
+    def _run_periodically(cls):
+        while True:
+            time.sleep(cls.INTERVAL)
+            cls.save()
+
+    @classmethod
+    def start(cls):
+        """起動時に1回呼ぶ: 読み戻し、定期保存と終了時の保存を登録"""
+        with cls._lock:
+            if cls._started:
+                return
+            cls._started = True
+
+        cls._check_path()
+        restored = cls.load()
+        if restored:
+            print(f"【Info】キャッシュを {restored} 件復元しました")
+
+        atexit.register(cls.save)
+        if cls.INTERVAL > 0:
+            threading.Thread(
+                target=cls._run_periodically, name="cache-snapshot", daemon=True
+            ).start()
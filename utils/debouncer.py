@@ -1,9 +1,14 @@
+import threading
 import time
 
 
 class Debouncer:
     _cache = {}
     _ttl = 5.0  # 5秒間は同じ操作を無視
+    # 確認と記録を1つの操作にする（同時に届いた連打を両方通さないため）
+    _lock = threading.Lock()
+    _sweep_interval = 60.0
+    _last_sweep = 0.0
 
     @classmethod
     def is_locked(cls, user_id, action_key):
@@ -20,12 +25,18 @@ class Debouncer:
         # たまに全体を掃除するロジックが良いが、
         # ここではシンプルに対象キーのTTLチェックのみ行う。
 
-        last_time = cls._cache.get(key)
+        with cls._lock:
+            # たまに期限切れのエントリをまとめて掃除
+            if now - cls._last_sweep >= cls._sweep_interval:
+                cls._cache = {k: t for k, t in cls._cache.items() if now - t < cls._ttl}
+                cls._last_sweep = now
 
-        if last_time:
-            if now - last_time < cls._ttl:
-                return True  # ロック中
+            last_time = cls._cache.get(key)
 
-        # 新しいタイムスタンプで更新
-        cls._cache[key] = now
-        return False
+            if last_time:
+                if now - last_time < cls._ttl:
+                    return True  # ロック中
+
+            # 新しいタイムスタンプで更新
+            cls._cache[key] = now
+            return False